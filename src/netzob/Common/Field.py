@@ -1110,11 +1110,16 @@ class Field(object):
                     finalRes[j] += res[i][j]
             return finalRes
         else:  # A leaf field
+            # Messages with identical payloads share the same cells,
+            # the alignment is applied once per distinct payload
             res = []
+            cells = {}
             for message in self.getMessages():
-                messageTable = message.applyAlignment()
-                messageElt = messageTable[self.getIndex()]
-                res.append(messageElt)
+                data = message.getReducedStringData()
+                if data not in cells:
+                    messageTable = message.applyAlignment()
+                    cells[data] = messageTable[self.getIndex()]
+                res.append(cells[data])
             return res
 
     def getUniqValuesByField(self):
@@ -62,8 +62,30 @@ class ImportedTrace(object):
         self.type = type
         self.description = description
         self.name = name
-        self.messages = {}
-        self.sessions = {}
+        self._messages = {}
+        self._sessions = {}
+        # A trace file whose messages and sessions are loaded at their first access
+        self.traceFile = None
+
+    def _getMessagesDict(self):
+        self.loadTraceFile()
+        return self._messages
+
+    def _setMessagesDict(self, messages):
+        self.loadTraceFile()
+        self._messages = messages
+
+    messages = property(_getMessagesDict, _setMessagesDict)
+
+    def _getSessionsDict(self):
+        self.loadTraceFile()
+        return self._sessions
+
+    def _setSessionsDict(self, sessions):
+        self.loadTraceFile()
+        self._sessions = sessions
+
+    sessions = property(_getSessionsDict, _setSessionsDict)
 
     def __str__(self):
         return "[{0}: name={1}; messages={2}; sessions={3}; type={4}]".format(self.id,
@@ -80,6 +102,11 @@ class ImportedTrace(object):
         xmlTrace.set("name", str(self.getName()))
         xmlTrace.set("id", str(self.getID()))
 
+        # The messages are saved only if the trace file must be written
+        tracesFile = os.path.join(pathOfTraces, str(self.getID()) + ".gz")
+        if os.path.isfile(tracesFile) and not override:
+            return
+
         # Register the namespace (2 way depending on the version)
         try:
             etree.register_namespace('netzob-common', namespace_common)
@@ -102,13 +129,20 @@ class ImportedTrace(object):
 
         # Creation of the XML File (in buffer)
         # Compress it using gzip and save the .gz
-        tracesFile = os.path.join(pathOfTraces, str(self.getID()) + ".gz")
-        if not os.path.isfile(tracesFile) or override:
-            logging.debug("Save the trace " + str(self.getID()) + " in " + tracesFile)
-            # Compress and write the file
-            gzipFile = gzip.open(tracesFile, 'wb')
-            gzipFile.write(contentOfFile)
-            gzipFile.close()
+        logging.debug("Save the trace " + str(self.getID()) + " in " + tracesFile)
+        # Compress and write the file
+        gzipFile = gzip.open(tracesFile, 'wb')
+        gzipFile.write(contentOfFile)
+        gzipFile.close()
+
+    def loadTraceFile(self):
+        """Loads the messages and the sessions of the trace file
+        given to setTraceFile, if they have not been loaded yet."""
+        if self.traceFile is None:
+            return
+        (tracesFile, namespace_workspace, namespace_common, version) = self.traceFile
+        self.traceFile = None
+        ImportedTrace.loadTraceContent(self, tracesFile, namespace_workspace, namespace_common, version)
 
     def addSession(self, session):
         self.sessions.update({session.id: session})
@@ -186,6 +220,13 @@ class ImportedTrace(object):
     def setName(self, name):
         self.name = name
 
+    def setTraceFile(self, tracesFile, namespace_workspace, namespace_common, version):
+        """Gives the file which contains the messages and the sessions
+        of the trace. They are loaded at their first access, so a
+        trace written by an ImportedTraceWriter is registered without
+        holding its messages."""
+        self.traceFile = (tracesFile, namespace_workspace, namespace_common, version)
+
     #+----------------------------------------------
     #| Static methods
     #+----------------------------------------------
@@ -203,31 +244,35 @@ class ImportedTrace(object):
             if not os.path.isfile(tracesFile):
                 logging.warn("The trace file {0} is referenced but doesn't exist.".format(tracesFile))
             else:
-                gzipFile = gzip.open(tracesFile, 'rb')
-                xml_content = gzipFile.read()
-                gzipFile.close()
-
-                tree = etree.parse(StringIO(xml_content))
-                xmlRoot = tree.getroot()
-
-                # We retrieve the pool of messages
-                xmlMessages = xmlRoot.find("{" + namespace_workspace + "}messages")
-                if xmlMessages is not None:
-                    for xmlMessage in xmlMessages.findall("{" + namespace_common + "}message"):
-                        message = AbstractMessageFactory.loadFromXML(xmlMessage, namespace_common, version)
-                        if message is not None:
-                            importedTrace.addMessage(message)
-
-                # We retrieve the sessions
-                if xmlRoot.find("{" + namespace_workspace + "}sessions") is not None:
-                    xmlSessions = xmlRoot.find("{" + namespace_workspace + "}sessions")
-                    for xmlSession in xmlSessions.findall("{" + namespace_common + "}session"):
-                        session = Session.loadFromXML(xmlSession, namespace_workspace, namespace_common, version, importedTrace)
-                        if session is not None:
-                            importedTrace.addSession(session)
+                ImportedTrace.loadTraceContent(importedTrace, tracesFile, namespace_workspace, namespace_common, version)
             return importedTrace
         return None
 
+    @staticmethod
+    def loadTraceContent(importedTrace, tracesFile, namespace_workspace, namespace_common, version):
+        gzipFile = gzip.open(tracesFile, 'rb')
+        xml_content = gzipFile.read()
+        gzipFile.close()
+
+        tree = etree.parse(StringIO(xml_content))
+        xmlRoot = tree.getroot()
+
+        # We retrieve the pool of messages
+        xmlMessages = xmlRoot.find("{" + namespace_workspace + "}messages")
+        if xmlMessages is not None:
+            for xmlMessage in xmlMessages.findall("{" + namespace_common + "}message"):
+                message = AbstractMessageFactory.loadFromXML(xmlMessage, namespace_common, version)
+                if message is not None:
+                    importedTrace.addMessage(message)
+
+        # We retrieve the sessions
+        if xmlRoot.find("{" + namespace_workspace + "}sessions") is not None:
+            xmlSessions = xmlRoot.find("{" + namespace_workspace + "}sessions")
+            for xmlSession in xmlSessions.findall("{" + namespace_common + "}session"):
+                session = Session.loadFromXML(xmlSession, namespace_workspace, namespace_common, version, importedTrace)
+                if session is not None:
+                    importedTrace.addSession(session)
+
     @staticmethod
     def deleteTrace(trace, pathOfTraces):
         path = os.path.join(pathOfTraces, "{0}.gz".format(trace.id))
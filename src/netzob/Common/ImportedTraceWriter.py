@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from datetime import datetime
+from xml.sax.saxutils import quoteattr
+import logging
+import gzip
+import os
+import tempfile
+import uuid
+from lxml import etree
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.ImportedTrace import ImportedTrace
+from netzob.Common.Models.Factories.AbstractMessageFactory import AbstractMessageFactory
+
+
+class ImportedTraceWriter(object):
+    """Writes an imported trace in its trace file while its messages
+    are imported, batch after batch, so the messages do not have to be
+    held in memory. The messages are gathered in a default session, or
+    in the sessions given with addSession(). The sessions are kept in
+    temporary files until the trace is closed. The trace file is
+    written under a temporary name and renamed when the trace is
+    closed."""
+
+    VERSION = "0.1"
+
+    def __init__(self, pathOfTraces, name, type, description, namespace_workspace, namespace_common, sessionName="Session 1"):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.ImportedTraceWriter.py')
+        self.id = str(uuid.uuid4())
+        self.date = datetime.now()
+        self.name = name
+        self.type = type
+        self.description = description
+        self.namespace_workspace = namespace_workspace
+        self.namespace_common = namespace_common
+        self.sessionID = str(uuid.uuid4())
+        self.sessionName = sessionName
+        self.nbMessages = 0
+        self.tracesFile = os.path.join(pathOfTraces, "{0}.gz".format(self.id))
+        self.partialFile = "{0}.part".format(self.tracesFile)
+        self.gzipFile = gzip.open(self.partialFile, 'wb')
+        self.messagesRef = tempfile.TemporaryFile()
+        self.nbMessagesRef = 0
+        self.sessions = tempfile.TemporaryFile()
+        self.nbSessions = 0
+        self.closed = False
+
+        self.gzipFile.write("<netzob:trace xmlns:netzob={0} xmlns:netzob-common={1} id={2}>".format(quoteattr(namespace_workspace), quoteattr(namespace_common), quoteattr(self.id)))
+        self.gzipFile.write("<netzob:messages>")
+
+    def addMessages(self, messages, defaultSession=True):
+        """Writes a batch of messages in the trace file
+
+        :param defaultSession: whether the messages are part of the
+        default session, or of sessions given with addSession()"""
+        if self.closed:
+            raise ValueError("The trace {0} is closed".format(self.id))
+        xmlMessages = etree.Element("{" + self.namespace_workspace + "}messages", nsmap={'netzob': self.namespace_workspace, 'netzob-common': self.namespace_common})
+        for message in messages:
+            AbstractMessageFactory.save(message, xmlMessages, self.namespace_workspace, self.namespace_common)
+            if defaultSession:
+                self.messagesRef.write("{0}\n".format(message.getID()))
+                self.nbMessagesRef += 1
+        # The children are serialized without the declarations of the namespaces of the trace
+        content = etree.tostring(xmlMessages)
+        self.gzipFile.write(content[content.index(">") + 1:content.rindex("<")])
+        self.nbMessages += len(messages)
+
+    def addSession(self, name, messageIDs, description=""):
+        """Adds a session of messages written apart from the default
+        session"""
+        if self.closed:
+            raise ValueError("The trace {0} is closed".format(self.id))
+        self.writeSession(self.sessions, str(uuid.uuid4()), name, description, messageIDs)
+        self.nbSessions += 1
+
+    def writeSession(self, output, id, name, description, messageIDs):
+        output.write("<netzob-common:session id={0} name={1} description={2}><netzob-common:messages-ref>".format(quoteattr(id), quoteattr(name), quoteattr(description)))
+        for messageID in messageIDs:
+            output.write("<netzob-common:message-ref id={0}/>".format(quoteattr(messageID.strip())))
+        output.write("</netzob-common:messages-ref></netzob-common:session>")
+
+    def close(self):
+        """Writes the session of the messages and closes the trace file.
+
+        :return: the imported trace, whose messages are loaded from
+        its trace file at their first access."""
+        self.gzipFile.write("</netzob:messages><netzob:sessions>")
+        if self.nbMessagesRef > 0 or self.nbSessions == 0:
+            self.messagesRef.seek(0)
+            self.writeSession(self.gzipFile, self.sessionID, self.sessionName, "", self.messagesRef)
+        self.sessions.seek(0)
+        for sessions in iter(lambda: self.sessions.read(65536), ""):
+            self.gzipFile.write(sessions)
+        self.gzipFile.write("</netzob:sessions></netzob:trace>")
+        self.gzipFile.close()
+        self.messagesRef.close()
+        self.sessions.close()
+        self.closed = True
+        os.rename(self.partialFile, self.tracesFile)
+        self.log.info("Wrote {0} messages in the trace {1}".format(self.nbMessages, self.tracesFile))
+
+        importedTrace = ImportedTrace(self.id, self.date, self.type, self.description, self.name)
+        importedTrace.setTraceFile(self.tracesFile, self.namespace_workspace, self.namespace_common, ImportedTraceWriter.VERSION)
+        return importedTrace
+
+    def abort(self):
+        """Closes and removes the trace file, for instance when the
+        import is cancelled"""
+        if self.closed:
+            return
+        self.gzipFile.close()
+        self.messagesRef.close()
+        self.sessions.close()
+        self.closed = True
+        os.unlink(self.partialFile)
+
+    def getID(self):
+        return self.id
+
+    def getNumberOfMessages(self):
+        return self.nbMessages
+
+    def getTracesFile(self):
+        return self.tracesFile
@@ -30,6 +30,8 @@
 #+---------------------------------------------------------------------------+
 from gettext import gettext as _
 import logging
+import select
+import time
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -41,6 +43,7 @@ from netzob.Common.MMSTD.Dictionary.DataTypes.DecimalWordType import DecimalWord
 from netzob.Common.Type.TypeConvertor import TypeConvertor
 from netzob.Common.Property import Property
 from netzob.Common.Type.Format import Format
+from netzob.Common.MMSTD.Actors.Framing.ReassemblyBuffer import ReassemblyBuffer
 
 
 #+---------------------------------------------------------------------------+
@@ -70,6 +73,10 @@ class AbstractChannel():
         self.originalTargetIp = target_ip
         self.originalTargetPort = target_port
 
+        self.socket = None
+        self.framing = None
+        self.reassemblyBuffer = None
+
         self.configureMemory()
 
     def configureMemory(self):
@@ -172,6 +179,77 @@ class AbstractChannel():
     def getMemory(self):
         return self.memory
 
+    #+-----------------------------------------------------------------------+
+    #| Framing
+    #+-----------------------------------------------------------------------+
+    def getFraming(self):
+        return self.framing
+
+    def setFraming(self, framing):
+        """Delimits the messages read and written with the given framing
+        (None to hand the received data as it comes)"""
+        self.framing = framing
+        if framing is None:
+            self.reassemblyBuffer = None
+        else:
+            self.reassemblyBuffer = ReassemblyBuffer(framing)
+
+    def frame(self, data):
+        """Returns the data to send for the given message"""
+        if self.framing is None:
+            return data
+        return self.framing.frame(data)
+
+    def receiveData(self, timeout):
+        """Receives the available data from the socket of the channel,
+        waiting at most timeout seconds (without limit if lower or equal to
+        0). Returns an empty string if nothing has been received and None if
+        the channel is closed"""
+        try:
+            if timeout > 0:
+                ready = select.select([self.socket], [], [], timeout)
+            else:
+                ready = select.select([self.socket], [], [])
+            if not ready[0]:
+                return ""
+            chars = self.socket.recv(65536)
+        except:
+            self.log.debug("Impossible to read from the network socket")
+            return None
+        if len(chars) == 0 and self.getProtocol() != "UDP":
+            return None
+        return chars
+
+    def readFrame(self, timeout):
+        """Returns the next message delimited by the framing, an empty string
+        if no message is complete before the timeout or None if the channel is
+        closed. Messages already received are returned without any read"""
+        message = self.reassemblyBuffer.popMessage()
+        if message is not None:
+            return message
+        if timeout > 0:
+            deadline = time.time() + timeout
+        while True:
+            remaining = timeout
+            if timeout > 0:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+            data = self.receiveData(remaining)
+            if data is None:
+                if self.framing.isFlushedOnTimeout() and self.reassemblyBuffer.hasPendingData():
+                    return self.reassemblyBuffer.flush()
+                return None
+            self.reassemblyBuffer.feed(data)
+            message = self.reassemblyBuffer.popMessage()
+            if message is not None:
+                return message
+            if len(data) == 0 and timeout <= 0:
+                break
+        if self.framing.isFlushedOnTimeout() and self.reassemblyBuffer.hasPendingData():
+            return self.reassemblyBuffer.flush()
+        return ""
+
     def getProperties(self):
         properties = []
         properties.append(Property("Protocol", Format.STRING, self.originalProtocol))
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+from abc import abstractmethod
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+
+
+class AbstractFraming():
+    """AbstractFraming:
+            Defines how the messages exchanged over a stream are delimited.
+            A framing encloses each message sent and extracts the messages from the data received, whatever the way it has been segmented.
+    """
+
+    def __init__(self):
+        """Constructor of AbstractFraming:
+        """
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Framing.AbstractFraming.py')
+
+    def isFlushedOnTimeout(self):
+        """isFlushedOnTimeout:
+                Tell if the incomplete data must be handed as a message when no more data is received.
+
+                @rtype: boolean
+                @return: True if the incomplete data is handed as a message.
+        """
+        return False
+
+    @abstractmethod
+    def getType(self):
+        """getType:
+                Return the type of the framing.
+
+                @rtype: string
+                @return: the type of the framing.
+        """
+        raise NotImplementedError("The current framing doesn't implement 'getType'.")
+
+    @abstractmethod
+    def frame(self, message):
+        """frame:
+                Enclose a message before sending it.
+
+                @type message: string
+                @param message: the message to send.
+                @rtype: string
+                @return: the data to send.
+        """
+        raise NotImplementedError("The current framing doesn't implement 'frame'.")
+
+    @abstractmethod
+    def extract(self, data, start, scanned):
+        """extract:
+                Extract the first message of the received data.
+
+                @type data: bytearray
+                @param data: the received data, which must not be modified.
+                @type start: integer
+                @param start: the position of the first message in the data.
+                @type scanned: integer
+                @param scanned: the length of the data when the previous extraction failed, no message is complete before it.
+                @rtype: (string, integer)
+                @return: the message (a slice of the data) and the position of its end in the data, or None and the minimum length of the data to retry the extraction.
+        """
+        raise NotImplementedError("The current framing doesn't implement 'extract'.")
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.Framing.AbstractFraming import AbstractFraming
+
+
+class DelimiterFraming(AbstractFraming):
+    """DelimiterFraming:
+            Each message is followed by a delimiter (for instance "\\r\\n").
+    """
+
+    TYPE = "Delimiter"
+
+    def __init__(self, delimiter, delimiterKept=False):
+        """Constructor of DelimiterFraming:
+
+                @type delimiter: string
+                @param delimiter: the delimiter which ends each message.
+                @type delimiterKept: boolean
+                @param delimiterKept: True if the delimiter is part of the extracted messages.
+        """
+        AbstractFraming.__init__(self)
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Framing.DelimiterFraming.py')
+        if len(delimiter) == 0:
+            raise ValueError("The delimiter cannot be empty.")
+        self.delimiter = delimiter
+        self.delimiterKept = delimiterKept
+
+    def getType(self):
+        return DelimiterFraming.TYPE
+
+    def frame(self, message):
+        if self.delimiterKept:
+            return message
+        return message + self.delimiter
+
+    def extract(self, data, start, scanned):
+        # The delimiter may overlap the end of the previously scanned data.
+        position = data.find(self.delimiter, max(start, scanned - len(self.delimiter) + 1))
+        if position < 0:
+            return (None, len(data) + 1)
+        end = position + len(self.delimiter)
+        if self.delimiterKept:
+            return (data[start:end], end)
+        return (data[start:position], end)
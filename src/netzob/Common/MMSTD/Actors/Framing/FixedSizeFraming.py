@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.Framing.AbstractFraming import AbstractFraming
+
+
+class FixedSizeFraming(AbstractFraming):
+    """FixedSizeFraming:
+            All the messages have the same size, shorter messages are padded when they are sent.
+    """
+
+    TYPE = "Fixed size"
+
+    def __init__(self, size, padding="\x00"):
+        """Constructor of FixedSizeFraming:
+
+                @type size: integer
+                @param size: the size of the messages in bytes.
+                @type padding: string
+                @param padding: the character appended to the shorter messages.
+        """
+        AbstractFraming.__init__(self)
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Framing.FixedSizeFraming.py')
+        if size <= 0:
+            raise ValueError("The size of the messages must be positive.")
+        self.size = size
+        self.padding = padding
+
+    def getType(self):
+        return FixedSizeFraming.TYPE
+
+    def frame(self, message):
+        if len(message) > self.size:
+            self.log.warn("The message ({0} bytes) is larger than the size of the frames ({1} bytes).".format(len(message), self.size))
+        return message.ljust(self.size, self.padding)
+
+    def extract(self, data, start, scanned):
+        end = start + self.size
+        if len(data) < end:
+            return (None, end)
+        return (data[start:end], end)
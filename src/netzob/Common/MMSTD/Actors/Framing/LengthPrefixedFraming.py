@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+import struct
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.Framing.AbstractFraming import AbstractFraming
+
+
+class LengthPrefixedFraming(AbstractFraming):
+    """LengthPrefixedFraming:
+            Each message is preceded by a header which contains its length as an unsigned integer.
+    """
+
+    TYPE = "Length prefixed"
+    FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+    def __init__(self, headerSize=2, bigEndian=True, headerIncluded=False):
+        """Constructor of LengthPrefixedFraming:
+
+                @type headerSize: integer
+                @param headerSize: the size of the header in bytes (1, 2, 4 or 8).
+                @type bigEndian: boolean
+                @param bigEndian: True if the length is encoded in big endian.
+                @type headerIncluded: boolean
+                @param headerIncluded: True if the length counts the header.
+        """
+        AbstractFraming.__init__(self)
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Framing.LengthPrefixedFraming.py')
+        if not headerSize in LengthPrefixedFraming.FORMATS:
+            raise ValueError("The size of the header must be 1, 2, 4 or 8 bytes.")
+        self.headerSize = headerSize
+        self.headerIncluded = headerIncluded
+        if bigEndian:
+            self.format = ">" + LengthPrefixedFraming.FORMATS[headerSize]
+        else:
+            self.format = "<" + LengthPrefixedFraming.FORMATS[headerSize]
+
+    def getType(self):
+        return LengthPrefixedFraming.TYPE
+
+    def frame(self, message):
+        length = len(message)
+        if self.headerIncluded:
+            length += self.headerSize
+        return struct.pack(self.format, length) + message
+
+    def extract(self, data, start, scanned):
+        headerEnd = start + self.headerSize
+        if len(data) < headerEnd:
+            return (None, headerEnd)
+        length = struct.unpack(self.format, data[start:headerEnd])[0]
+        if self.headerIncluded:
+            length = max(0, length - self.headerSize)
+        end = headerEnd + length
+        if len(data) < end:
+            return (None, end)
+        return (data[headerEnd:end], end)
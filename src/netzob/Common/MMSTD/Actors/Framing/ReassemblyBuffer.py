@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+
+
+class ReassemblyBuffer():
+    """ReassemblyBuffer:
+            Accumulates the data received over a stream and extracts the messages delimited by a framing.
+            The received data is appended to a single growing buffer, so that large messages are neither joined nor copied for each chunk.
+    """
+
+    # The consumed data is discarded once it exceeds this size and the pending data.
+    COMPACTION_SIZE = 65536
+
+    def __init__(self, framing):
+        """Constructor of ReassemblyBuffer:
+
+                @type framing: netzob.Common.MMSTD.Actors.Framing.AbstractFraming.AbstractFraming
+                @param framing: the framing which delimits the messages.
+        """
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Framing.ReassemblyBuffer.py')
+        self.framing = framing
+        # Received data, including the consumed data.
+        self.buffer = bytearray()
+        # Position of the next message.
+        self.offset = 0
+        # Size of the data required before trying to extract the next message.
+        self.required = 0
+        # Size of the data when the previous extraction failed.
+        self.scanned = 0
+
+    def getFraming(self):
+        return self.framing
+
+    def feed(self, data):
+        """feed:
+                Add received data at the end of the buffer.
+
+                @type data: string
+                @param data: the received data.
+        """
+        self.buffer.extend(data)
+
+    def popMessage(self):
+        """popMessage:
+                Extract the next complete message.
+
+                @rtype: string
+                @return: the message, or None if it is not complete.
+        """
+        size = len(self.buffer)
+        if size <= self.offset or size < self.required:
+            return None
+        (message, end) = self.framing.extract(self.buffer, self.offset, max(self.offset, self.scanned))
+        if message is None:
+            self.required = end
+            self.scanned = size
+            return None
+        self.offset = end
+        self.required = 0
+        self.scanned = end
+        if self.offset >= size:
+            self.clear()
+        elif self.offset >= max(ReassemblyBuffer.COMPACTION_SIZE, size - self.offset):
+            del self.buffer[:self.offset]
+            self.scanned -= self.offset
+            self.offset = 0
+        return str(message)
+
+    def popMessages(self):
+        """popMessages:
+                Extract all the complete messages.
+
+                @rtype: string List
+                @return: the messages.
+        """
+        messages = []
+        message = self.popMessage()
+        while message is not None:
+            messages.append(message)
+            message = self.popMessage()
+        return messages
+
+    def hasPendingData(self):
+        """hasPendingData:
+                @rtype: boolean
+                @return: True if some received data has not been extracted.
+        """
+        return len(self.buffer) > self.offset
+
+    def flush(self):
+        """flush:
+                Return and discard the data which has not been extracted.
+
+                @rtype: string
+                @return: the pending data.
+        """
+        data = str(self.buffer[self.offset:])
+        self.clear()
+        return data
+
+    def clear(self):
+        self.buffer = bytearray()
+        self.offset = 0
+        self.required = 0
+        self.scanned = 0
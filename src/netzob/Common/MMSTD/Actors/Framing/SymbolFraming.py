@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Actors.Framing.AbstractFraming import AbstractFraming
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken import VariableReadingToken
+
+
+class SymbolFraming(AbstractFraming):
+    """SymbolFraming:
+            The received data is read until a symbol of the vocabulary parses its beginning, the parsed bytes are the message.
+            The symbols are tried in the order of the vocabulary, with a scratch memory, so a symbol whose messages can be prefixes of longer messages should come after the longer ones.
+            Data which no symbol parses is handed as a message when no more data is received or when it exceeds the maximum size.
+    """
+
+    TYPE = "Symbol"
+
+    def __init__(self, vocabulary, maxSize=65536):
+        """Constructor of SymbolFraming:
+
+                @type vocabulary: netzob.Common.Vocabulary.Vocabulary
+                @param vocabulary: the vocabulary whose symbols delimit the messages.
+                @type maxSize: integer
+                @param maxSize: the maximum size of a message in bytes.
+        """
+        AbstractFraming.__init__(self)
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Framing.SymbolFraming.py')
+        self.vocabulary = vocabulary
+        self.maxSize = maxSize
+
+    def getType(self):
+        return SymbolFraming.TYPE
+
+    def isFlushedOnTimeout(self):
+        return True
+
+    def frame(self, message):
+        return message
+
+    def extract(self, data, start, scanned):
+        if len(data) == start:
+            return (None, len(data) + 1)
+        if len(data) - start > self.maxSize:
+            self.log.warn("No symbol parses the {0} received bytes.".format(self.maxSize))
+            return (data[start:start + self.maxSize], start + self.maxSize)
+        value = TypeConvertor.stringB2bin(str(data[start:]))
+        memory = Memory()
+        for symbol in self.vocabulary.getSymbols():
+            readingToken = VariableReadingToken(False, self.vocabulary, memory, value, 0)
+            symbol.getReadingProgram().read(readingToken)
+            index = readingToken.getIndex()
+            if readingToken.isOk() and index > 0 and index % 8 == 0:
+                self.log.debug("The symbol {0} parses {1} bytes.".format(symbol.getName(), index / 8))
+                end = start + index / 8
+                return (data[start:end], end)
+        return (None, len(data) + 1)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import math
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+
+
+class LatencyHistogram():
+    """LatencyHistogram:
+            Counts latencies in logarithmic buckets (SUBBUCKETS per power of two microseconds), so that millions of values are recorded in constant memory with a relative error below 9%.
+            The histograms of several workers are merged through their dictionary representation.
+    """
+
+    SUBBUCKETS = 8
+
+    def __init__(self):
+        """Constructor of LatencyHistogram"""
+        self.buckets = dict()
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def record(self, latency):
+        """record:
+                Count a latency.
+
+                @type latency: float
+                @param latency: the latency in seconds.
+        """
+        microseconds = latency * 1000000
+        if microseconds < 1:
+            index = 0
+        else:
+            index = int(math.log(microseconds, 2) * LatencyHistogram.SUBBUCKETS)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += latency
+        if self.minimum is None or latency < self.minimum:
+            self.minimum = latency
+        if self.maximum is None or latency > self.maximum:
+            self.maximum = latency
+
+    def merge(self, histogram):
+        """merge:
+                Add the values counted by another histogram.
+
+                @type histogram: netzob.Common.MMSTD.Actors.LoadGenerator.LatencyHistogram.LatencyHistogram
+                @param histogram: the merged histogram.
+        """
+        for (index, count) in histogram.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += histogram.count
+        self.total += histogram.total
+        if histogram.minimum is not None and (self.minimum is None or histogram.minimum < self.minimum):
+            self.minimum = histogram.minimum
+        if histogram.maximum is not None and (self.maximum is None or histogram.maximum > self.maximum):
+            self.maximum = histogram.maximum
+
+    def getPercentile(self, percentile):
+        """getPercentile:
+                Estimate a percentile of the counted latencies by the upper bound of its bucket.
+
+                @type percentile: float
+                @param percentile: the percentile (between 0 and 100).
+                @rtype: float
+                @return: the latency in seconds, or None if nothing has been counted.
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, int(math.ceil(self.count * percentile / 100.0)))
+        seen = 0
+        for index in sorted(self.buckets.keys()):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upperBound = math.pow(2, float(index + 1) / LatencyHistogram.SUBBUCKETS) / 1000000
+                return min(upperBound, self.maximum)
+        return self.maximum
+
+    def getCount(self):
+        return self.count
+
+    def getMinimum(self):
+        return self.minimum
+
+    def getMaximum(self):
+        return self.maximum
+
+    def getMean(self):
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def toDict(self):
+        """toDict:
+                Export the histogram as a dictionary of built-in types (for pickling and JSON).
+
+                @rtype: dict
+                @return: the exported histogram.
+        """
+        return {"buckets": dict(self.buckets), "count": self.count, "total": self.total, "minimum": self.minimum, "maximum": self.maximum}
+
+    @staticmethod
+    def fromDict(values):
+        """fromDict:
+                Create a histogram from its exported dictionary.
+
+                @type values: dict
+                @param values: the exported histogram.
+                @rtype: netzob.Common.MMSTD.Actors.LoadGenerator.LatencyHistogram.LatencyHistogram
+                @return: the histogram.
+        """
+        histogram = LatencyHistogram()
+        histogram.buckets = dict([(int(index), count) for (index, count) in values["buckets"].items()])
+        histogram.count = values["count"]
+        histogram.total = values["total"]
+        histogram.minimum = values["minimum"]
+        histogram.maximum = values["maximum"]
+        return histogram
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+import math
+import multiprocessing
+import Queue
+import random
+import threading
+import time
+import uuid
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+from lxml import etree
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.Project import PROJECT_NAMESPACE, COMMON_NAMESPACE
+from netzob.Common.Vocabulary import Vocabulary
+from netzob.Common.MMSTD.MMSTD import MMSTD
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkClient import EventLoopNetworkClient
+from netzob.Common.MMSTD.Transitions.impl.OpenChannelTransition import OpenChannelTransition
+from netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport import LoadReport
+
+
+class LoadGenerator():
+    """LoadGenerator:
+            Executes concurrent client sessions of an MMSTD against a target, to load-test it with an inferred model.
+            The sessions are shared among worker processes. Each worker opens its sessions at the configured rate (reached linearly during the ramp-up), runs at most 'concurrency' of them at once in small-stack threads and multiplexes their sockets on its own event loop.
+            A session connects, executes transitions picked randomly as a master (pausing 'thinkTime' between them) until it reaches a state without transitions or has executed 'maxTransitions' transitions, and disconnects. The reaction and connection times of the automaton are not honoured.
+            The variables and transitions keep the state of the session which executes them, so each running session works on its own copy of the automaton and of its vocabulary. The copies are reused by the following sessions of the worker.
+    """
+
+    # Stack size of the session threads (the default one of 8MB would limit the number of concurrent sessions)
+    STACK_SIZE = 256 * 1024
+
+    def __init__(self, automaton, vocabulary, targetIP, targetPort, protocol="TCP", bindIP="0.0.0.0"):
+        """Constructor of LoadGenerator:
+
+                @type automaton: netzob.Common.MMSTD.MMSTD.MMSTD
+                @param automaton: the automaton executed by the sessions.
+                @type vocabulary: netzob.Common.Vocabulary.Vocabulary
+                @param vocabulary: the vocabulary of the automaton.
+                @type targetIP: string
+                @param targetIP: the IP of the load-tested server.
+                @type targetPort: integer
+                @param targetPort: the port of the load-tested server.
+                @type protocol: string
+                @param protocol: the transport protocol ("TCP" or "UDP").
+                @type bindIP: string
+                @param bindIP: the IP the sessions are bound to.
+        """
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.LoadGenerator.LoadGenerator.py')
+        self.automaton = automaton
+        self.vocabulary = vocabulary
+        self.targetIP = targetIP
+        self.targetPort = targetPort
+        self.protocol = protocol
+        self.bindIP = bindIP
+        self.nbWorkers = 1
+        self.nbSessions = 1
+        self.concurrency = 1000
+        self.sessionRate = 0
+        self.rampUp = 0
+        self.thinkTime = 0
+        self.maxTransitions = 100
+        self.receptionTimeout = None
+
+    def run(self):
+        """run:
+                Execute all the sessions and wait for their end.
+
+                @rtype: netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport.LoadReport
+                @return: the statistics of the sessions.
+        """
+        self.log.info("Start {0} sessions on {1} workers".format(self.nbSessions, self.nbWorkers))
+        report = LoadReport()
+        startTime = time.time()
+        if self.nbWorkers <= 1:
+            report.merge(self.runWorker(self.nbSessions, self.sessionRate, self.concurrency))
+        else:
+            queue = multiprocessing.Queue()
+            workers = []
+            for i in range(0, self.nbWorkers):
+                nbSessions = self.nbSessions / self.nbWorkers
+                if i < self.nbSessions % self.nbWorkers:
+                    nbSessions += 1
+                concurrency = max(1, self.concurrency / self.nbWorkers)
+                worker = multiprocessing.Process(target=self.executeWorker, args=(queue, nbSessions, float(self.sessionRate) / self.nbWorkers, concurrency))
+                worker.daemon = True
+                workers.append(worker)
+                worker.start()
+            # The results are read before joining the workers, which cannot exit while their queue is full
+            for worker in workers:
+                report.merge(LoadReport.fromDict(queue.get()))
+            for worker in workers:
+                worker.join()
+        report.setDuration(time.time() - startTime)
+        return report
+
+    def executeWorker(self, queue, nbSessions, sessionRate, concurrency):
+        """executeWorker:
+                Body of a worker process: runs its sessions and sends back its report.
+        """
+        # the forked workers would pick the same transitions
+        random.seed()
+        report = LoadReport()
+        try:
+            report = self.runWorker(nbSessions, sessionRate, concurrency)
+        except Exception, e:
+            self.log.warn("The worker has failed: {0}".format(e))
+            report.recordError("worker: {0}".format(e.__class__.__name__))
+        queue.put(report.toDict())
+
+    def runWorker(self, nbSessions, sessionRate, concurrency):
+        """runWorker:
+                Run sessions in the current process.
+
+                @type nbSessions: integer
+                @param nbSessions: the number of sessions.
+                @type sessionRate: float
+                @param sessionRate: the number of sessions started per second (0 to start them as soon as possible).
+                @type concurrency: integer
+                @param concurrency: the maximum number of simultaneous sessions.
+                @rtype: netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport.LoadReport
+                @return: the statistics of the sessions.
+        """
+        report = LoadReport()
+        eventLoop = EventLoop()
+        eventLoop.start()
+        slots = threading.Semaphore(concurrency)
+        models = Queue.Queue()
+        previousStackSize = threading.stack_size(LoadGenerator.STACK_SIZE)
+        sessions = []
+        try:
+            startTime = time.time()
+            for i in range(0, nbSessions):
+                delay = startTime + self.computeSessionStartTime(i, sessionRate) - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                slots.acquire()
+                session = threading.Thread(target=self.executeSession, args=(report, eventLoop, slots, models))
+                session.daemon = True
+                session.start()
+                sessions.append(session)
+            for session in sessions:
+                session.join()
+        finally:
+            threading.stack_size(previousStackSize)
+            eventLoop.stop()
+        return report
+
+    def computeSessionStartTime(self, index, sessionRate):
+        """computeSessionStartTime:
+                Compute when a session starts: the rate increases linearly during the ramp-up.
+
+                @type index: integer
+                @param index: the index of the session.
+                @type sessionRate: float
+                @param sessionRate: the number of sessions started per second once the ramp-up is over.
+                @rtype: float
+                @return: the number of seconds after the start of the first session.
+        """
+        if sessionRate <= 0:
+            return 0.0
+        if self.rampUp <= 0:
+            return index / sessionRate
+        # sessions started during the ramp-up
+        nbRampUpSessions = sessionRate * self.rampUp / 2
+        if index < nbRampUpSessions:
+            return math.sqrt(2 * self.rampUp * index / sessionRate)
+        return self.rampUp + (index - nbRampUpSessions) / sessionRate
+
+    def executeSession(self, report, eventLoop, slots, models):
+        """executeSession:
+                Body of a session thread: borrows a copy of the model from the pool of the worker.
+        """
+        model = None
+        try:
+            try:
+                model = models.get_nowait()
+            except Queue.Empty:
+                model = self.copyModel()
+            (automaton, vocabulary) = model
+            self.runSession(report, eventLoop, automaton, vocabulary)
+        except Exception, e:
+            self.log.warn("The session has failed: {0}".format(e))
+            report.recordError("session: {0}".format(e.__class__.__name__))
+            report.recordSession(False, 0)
+        finally:
+            if model is not None:
+                models.put(model)
+            slots.release()
+
+    def copyModel(self):
+        """copyModel:
+                Copy the automaton and its vocabulary through their XML definitions (the messages are not copied).
+
+                @rtype: (netzob.Common.MMSTD.MMSTD.MMSTD, netzob.Common.Vocabulary.Vocabulary)
+                @return: the copies of the automaton and of the vocabulary.
+        """
+        root = etree.Element("{" + PROJECT_NAMESPACE + "}model")
+        xmlVocabulary = etree.SubElement(root, "{" + PROJECT_NAMESPACE + "}vocabulary")
+        xmlSymbols = etree.SubElement(xmlVocabulary, "{" + PROJECT_NAMESPACE + "}symbols")
+        project = None
+        for symbol in self.vocabulary.getSymbols():
+            symbol.save(xmlSymbols, PROJECT_NAMESPACE, COMMON_NAMESPACE)
+            project = symbol.getProject()
+        self.automaton.save(root, PROJECT_NAMESPACE)
+        vocabulary = Vocabulary.loadVocabulary(xmlVocabulary, PROJECT_NAMESPACE, COMMON_NAMESPACE, "0.1", project)
+        automaton = MMSTD.loadFromXML(root.find("{" + PROJECT_NAMESPACE + "}automata"), vocabulary, PROJECT_NAMESPACE, "0.1")
+        return (automaton, vocabulary)
+
+    def runSession(self, report, eventLoop, automaton, vocabulary):
+        """runSession:
+                Execute a session of the automaton as a master.
+
+                @type report: netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport.LoadReport
+                @param report: the report where the statistics of the session are recorded.
+                @type eventLoop: netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.EventLoop
+                @param eventLoop: the event loop which processes the socket of the session.
+                @type automaton: netzob.Common.MMSTD.MMSTD.MMSTD
+                @param automaton: the copy of the automaton used only by this session.
+                @type vocabulary: netzob.Common.Vocabulary.Vocabulary
+                @param vocabulary: the copy of the vocabulary used only by this session.
+        """
+        channel = EventLoopNetworkClient(str(uuid.uuid4()), Memory(), self.protocol, self.bindIP, 0, self.targetIP, self.targetPort, eventLoop)
+        abstractionLayer = AbstractionLayer(channel, vocabulary, Memory())
+        scheduler = abstractionLayer.getScheduler()
+        scheduler.setAsFastAsPossible(True)
+        if self.receptionTimeout is not None:
+            scheduler.setReceptionTimeout(self.receptionTimeout)
+
+        startTime = time.time()
+        abstractionLayer.connect()
+        if not abstractionLayer.isConnected():
+            report.recordError("connection")
+            report.recordSession(False, time.time() - startTime)
+            return
+
+        success = True
+        state = automaton.getInitialState()
+        nbTransitions = 0
+        while len(state.getTransitions()) > 0 and nbTransitions < self.maxTransitions:
+            transition = random.choice(state.getTransitions())
+            if transition.getType() == OpenChannelTransition.TYPE and abstractionLayer.isConnected():
+                # the session is already connected, opening the channel again would fail
+                state = transition.getOutputState()
+                nbTransitions += 1
+                continue
+            if nbTransitions > 0 and self.thinkTime > 0:
+                time.sleep(self.thinkTime / 1000.0)
+            transitionStartTime = time.time()
+            nextState = transition.executeAsMaster(abstractionLayer)
+            report.recordTransition(transition.getName(), time.time() - transitionStartTime)
+            nbTransitions += 1
+            if nextState is None:
+                report.recordError("transition: {0}".format(transition.getName()))
+                success = False
+                break
+            state = nextState
+
+        if abstractionLayer.isConnected():
+            abstractionLayer.disconnect()
+        report.recordSession(success, time.time() - startTime)
+
+    #+-----------------------------------------------------------------------+
+    #| GETTERS AND SETTERS
+    #+-----------------------------------------------------------------------+
+    def getNumberOfWorkers(self):
+        return self.nbWorkers
+
+    def getNumberOfSessions(self):
+        return self.nbSessions
+
+    def getConcurrency(self):
+        return self.concurrency
+
+    def getSessionRate(self):
+        return self.sessionRate
+
+    def getRampUp(self):
+        return self.rampUp
+
+    def getThinkTime(self):
+        return self.thinkTime
+
+    def getMaxTransitions(self):
+        return self.maxTransitions
+
+    def getReceptionTimeout(self):
+        return self.receptionTimeout
+
+    def setNumberOfWorkers(self, nbWorkers):
+        self.nbWorkers = nbWorkers
+
+    def setNumberOfSessions(self, nbSessions):
+        self.nbSessions = nbSessions
+
+    def setConcurrency(self, concurrency):
+        self.concurrency = concurrency
+
+    def setSessionRate(self, sessionRate):
+        self.sessionRate = sessionRate
+
+    def setRampUp(self, rampUp):
+        self.rampUp = rampUp
+
+    def setThinkTime(self, thinkTime):
+        self.thinkTime = thinkTime
+
+    def setMaxTransitions(self, maxTransitions):
+        self.maxTransitions = maxTransitions
+
+    def setReceptionTimeout(self, receptionTimeout):
+        self.receptionTimeout = receptionTimeout
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import threading
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.LoadGenerator.LatencyHistogram import LatencyHistogram
+
+
+class LoadReport():
+    """LoadReport:
+            Statistics of a load generation: completed and failed sessions, latency histograms of the sessions and of each transition, and error counts.
+            The sessions of a worker record their results concurrently, the reports of the workers are merged through their dictionary representation.
+    """
+
+    def __init__(self):
+        """Constructor of LoadReport"""
+        self.lock = threading.Lock()
+        self.nbCompletedSessions = 0
+        self.nbFailedSessions = 0
+        self.sessionLatencies = LatencyHistogram()
+        self.transitionLatencies = dict()
+        self.errors = dict()
+        self.duration = 0.0
+
+    def recordSession(self, success, duration):
+        """recordSession:
+                Count the end of a session.
+
+                @type success: boolean
+                @param success: true if the session has reached a final state.
+                @type duration: float
+                @param duration: the duration of the session in seconds.
+        """
+        self.lock.acquire()
+        try:
+            if success:
+                self.nbCompletedSessions += 1
+            else:
+                self.nbFailedSessions += 1
+            self.sessionLatencies.record(duration)
+        finally:
+            self.lock.release()
+
+    def recordTransition(self, name, latency):
+        """recordTransition:
+                Count the execution of a transition.
+
+                @type name: string
+                @param name: the name of the transition.
+                @type latency: float
+                @param latency: the duration of its execution in seconds.
+        """
+        self.lock.acquire()
+        try:
+            if not name in self.transitionLatencies:
+                self.transitionLatencies[name] = LatencyHistogram()
+            self.transitionLatencies[name].record(latency)
+        finally:
+            self.lock.release()
+
+    def recordError(self, error):
+        """recordError:
+                Count an error.
+
+                @type error: string
+                @param error: the description of the error.
+        """
+        self.lock.acquire()
+        try:
+            self.errors[error] = self.errors.get(error, 0) + 1
+        finally:
+            self.lock.release()
+
+    def merge(self, report):
+        """merge:
+                Add the statistics of another report (the duration is not merged).
+
+                @type report: netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport.LoadReport
+                @param report: the merged report.
+        """
+        self.nbCompletedSessions += report.nbCompletedSessions
+        self.nbFailedSessions += report.nbFailedSessions
+        self.sessionLatencies.merge(report.sessionLatencies)
+        for (name, histogram) in report.transitionLatencies.items():
+            if not name in self.transitionLatencies:
+                self.transitionLatencies[name] = LatencyHistogram()
+            self.transitionLatencies[name].merge(histogram)
+        for (error, count) in report.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+    def getNumberOfCompletedSessions(self):
+        return self.nbCompletedSessions
+
+    def getNumberOfFailedSessions(self):
+        return self.nbFailedSessions
+
+    def getNumberOfTransitions(self):
+        return sum([histogram.getCount() for histogram in self.transitionLatencies.values()])
+
+    def getSessionLatencies(self):
+        return self.sessionLatencies
+
+    def getTransitionLatencies(self):
+        return self.transitionLatencies
+
+    def getErrors(self):
+        return self.errors
+
+    def getDuration(self):
+        return self.duration
+
+    def setDuration(self, duration):
+        self.duration = duration
+
+    def getSessionThroughput(self):
+        """getSessionThroughput:
+                @rtype: float
+                @return: the number of completed sessions per second.
+        """
+        if self.duration <= 0:
+            return 0.0
+        return self.nbCompletedSessions / self.duration
+
+    def getTransitionThroughput(self):
+        """getTransitionThroughput:
+                @rtype: float
+                @return: the number of executed transitions per second.
+        """
+        if self.duration <= 0:
+            return 0.0
+        return self.getNumberOfTransitions() / self.duration
+
+    def getSummary(self):
+        """getSummary:
+                Format the report as a text table.
+
+                @rtype: string
+                @return: the summary.
+        """
+        lines = []
+        lines.append("Sessions: {0} completed, {1} failed in {2:.3f}s ({3:.1f} sessions/s, {4:.1f} transitions/s)".format(self.nbCompletedSessions, self.nbFailedSessions, self.duration, self.getSessionThroughput(), self.getTransitionThroughput()))
+        lines.append("{0:<30} {1:>8} {2:>10} {3:>10} {4:>10} {5:>10} {6:>10}".format("latency (ms)", "count", "mean", "p50", "p90", "p99", "max"))
+        rows = [("session", self.sessionLatencies)] + sorted(self.transitionLatencies.items())
+        for (name, histogram) in rows:
+            if histogram.getCount() == 0:
+                continue
+            values = [histogram.getMean(), histogram.getPercentile(50), histogram.getPercentile(90), histogram.getPercentile(99), histogram.getMaximum()]
+            lines.append("{0:<30} {1:>8} ".format(name[:30], histogram.getCount()) + " ".join(["{0:>10.3f}".format(value * 1000) for value in values]))
+        for (error, count) in sorted(self.errors.items()):
+            lines.append("Error: {0} ({1})".format(error, count))
+        return "\n".join(lines)
+
+    def toDict(self):
+        """toDict:
+                Export the report as a dictionary of built-in types (for pickling and JSON).
+
+                @rtype: dict
+                @return: the exported report.
+        """
+        return {"completedSessions": self.nbCompletedSessions,
+                "failedSessions": self.nbFailedSessions,
+                "sessionLatencies": self.sessionLatencies.toDict(),
+                "transitionLatencies": dict([(name, histogram.toDict()) for (name, histogram) in self.transitionLatencies.items()]),
+                "errors": dict(self.errors),
+                "duration": self.duration}
+
+    @staticmethod
+    def fromDict(values):
+        """fromDict:
+                Create a report from its exported dictionary.
+
+                @type values: dict
+                @param values: the exported report.
+                @rtype: netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport.LoadReport
+                @return: the report.
+        """
+        report = LoadReport()
+        report.nbCompletedSessions = values["completedSessions"]
+        report.nbFailedSessions = values["failedSessions"]
+        report.sessionLatencies = LatencyHistogram.fromDict(values["sessionLatencies"])
+        report.transitionLatencies = dict([(name, LatencyHistogram.fromDict(histogram)) for (name, histogram) in values["transitionLatencies"].items()])
+        report.errors = dict(values["errors"])
+        report.duration = values["duration"]
+        return report
@@ -80,6 +80,8 @@ class MMSTDVisitor(threading.Thread):
             self.runAsMaster()
         else:
             self.runAsClient()
+        if self.abstractionLayer.getProfiler() is not None:
+            self.abstractionLayer.getProfiler().stop()
         self.log.debug("End of execution for the MMSTDVisitor")
 
     def stop(self):
@@ -120,6 +122,22 @@ class MMSTDVisitor(threading.Thread):
     def getAbstractionLayer(self):
         return self.abstractionLayer
 
+    def isAsFastAsPossible(self):
+        return self.abstractionLayer.getScheduler().isAsFastAsPossible()
+
+    def setAsFastAsPossible(self, asFastAsPossible):
+        """Run the session without honouring the reaction times
+        and the connection times of the automaton"""
+        self.abstractionLayer.getScheduler().setAsFastAsPossible(asFastAsPossible)
+
+    def getProfiler(self):
+        return self.abstractionLayer.getProfiler()
+
+    def setProfiler(self, profiler):
+        """Attach a profiler which measures where the time of the
+        session goes (None to detach it)"""
+        self.abstractionLayer.setProfiler(profiler)
+
     def getProperties(self):
         """Compute and return the list of properties of the actor"""
         properties = []
@@ -0,0 +1,540 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import errno
+import fcntl
+import heapq
+import logging
+import os
+import select
+import socket
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+
+
+class EventLoopConnection(object):
+    """EventLoopConnection:
+            A non-blocking socket whose input and output are buffered and processed by an event loop.
+            Any thread can wait for the received data or send data through it.
+            The condition protects the buffers and is always acquired before the lock of the event loop.
+    """
+
+    RECEPTION_SIZE = 65536
+
+    def __init__(self, eventLoop, sock, datagram=False):
+        """Constructor of EventLoopConnection:
+
+                @type eventLoop: netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.EventLoop
+                @param eventLoop: the event loop which processes the socket.
+                @type sock: socket.socket
+                @param sock: the connected socket.
+                @type datagram: boolean
+                @param datagram: True if each reception is an independent datagram (UDP).
+        """
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.py')
+        self.eventLoop = eventLoop
+        self.socket = sock
+        self.socket.setblocking(False)
+        self.fileno = sock.fileno()
+        self.datagram = datagram
+        self.condition = threading.Condition()
+        self.inputBuffer = []
+        self.outputBuffer = []
+        self.closed = False
+
+    def getSocket(self):
+        return self.socket
+
+    def getFileno(self):
+        return self.fileno
+
+    def isClosed(self):
+        return self.closed
+
+    def handleRead(self):
+        """handleRead:
+                Called by the event loop when the socket is readable: receive everything available without blocking.
+        """
+        chunks = []
+        closed = False
+        while True:
+            try:
+                chunk = self.socket.recv(EventLoopConnection.RECEPTION_SIZE)
+            except socket.error, e:
+                if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                if e.args[0] == errno.EINTR:
+                    continue
+                self.log.debug("Error while receiving from the socket: {0}".format(e))
+                closed = True
+                break
+            if len(chunk) == 0 and not self.datagram:
+                closed = True
+                break
+            chunks.append(chunk)
+            if not self.datagram and len(chunk) < EventLoopConnection.RECEPTION_SIZE:
+                # The socket is drained, the event loop is notified again if more data arrives.
+                break
+        self.condition.acquire()
+        try:
+            self.inputBuffer.extend(chunks)
+            if closed:
+                self.closed = True
+            self.condition.notifyAll()
+        finally:
+            self.condition.release()
+        if closed:
+            self.eventLoop.removeConnection(self)
+
+    def handleWrite(self):
+        """handleWrite:
+                Called by the event loop when the socket is writable: send the pending data.
+        """
+        self.condition.acquire()
+        try:
+            self.flush()
+            if len(self.outputBuffer) == 0:
+                self.eventLoop.setWriteInterest(self, False)
+        finally:
+            self.condition.release()
+
+    def flush(self):
+        """flush:
+                Send as much pending data as possible without blocking. The condition must be held.
+        """
+        while len(self.outputBuffer) > 0:
+            data = self.outputBuffer[0]
+            try:
+                sent = self.socket.send(data)
+            except socket.error, e:
+                if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    return
+                self.log.debug("Error while sending on the socket: {0}".format(e))
+                self.outputBuffer = []
+                return
+            if self.datagram or sent == len(data):
+                self.outputBuffer.pop(0)
+            else:
+                self.outputBuffer[0] = data[sent:]
+
+    def send(self, data):
+        """send:
+                Send the data, directly if the socket accepts it, else through the event loop.
+
+                @type data: string
+                @param data: the data to send.
+                @rtype: boolean
+                @return: False if the connection is closed.
+        """
+        self.condition.acquire()
+        try:
+            if self.closed:
+                return False
+            self.outputBuffer.append(data)
+            if len(self.outputBuffer) == 1:
+                self.flush()
+            if len(self.outputBuffer) > 0:
+                self.eventLoop.setWriteInterest(self, True)
+        finally:
+            self.condition.release()
+        return True
+
+    def receive(self, timeout):
+        """receive:
+                Wait for received data and return all of it (a single datagram for datagram connections).
+
+                @type timeout: float
+                @param timeout: the maximum time to wait in seconds, no limit if lower or equal to 0.
+                @rtype: string
+                @return: the received data, an empty string if none has been received or None if the connection is closed.
+        """
+        self.condition.acquire()
+        try:
+            if not self.waitForInput(timeout):
+                if self.closed:
+                    return None
+                return ""
+            if self.datagram:
+                return self.inputBuffer.pop(0)
+            data = "".join(self.inputBuffer)
+            self.inputBuffer = []
+            return data
+        finally:
+            self.condition.release()
+
+    def waitForInput(self, timeout):
+        """waitForInput:
+                Wait until some data is buffered, the connection is closed or the timeout expires. The condition must be held.
+
+                @rtype: boolean
+                @return: True if some data is buffered.
+        """
+        if len(self.inputBuffer) == 0 and not self.closed and timeout > 0:
+            # A timed wait on a condition polls with sleeps, so the event loop wakes us up at the deadline instead.
+            deadline = time.time() + timeout
+            self.eventLoop.addDeadline(deadline, self)
+            while len(self.inputBuffer) == 0 and not self.closed and time.time() < deadline:
+                self.condition.wait()
+        else:
+            while len(self.inputBuffer) == 0 and not self.closed:
+                self.condition.wait()
+        return len(self.inputBuffer) > 0
+
+    def wakeUp(self):
+        """wakeUp:
+                Wake up the threads waiting for data, so that they check their deadline.
+        """
+        self.condition.acquire()
+        try:
+            self.condition.notifyAll()
+        finally:
+            self.condition.release()
+
+    def close(self):
+        """close:
+                Close the connection and wake up the threads waiting for data.
+        """
+        self.condition.acquire()
+        try:
+            if self.closed and self.socket is None:
+                return
+            self.closed = True
+            self.condition.notifyAll()
+        finally:
+            self.condition.release()
+        self.eventLoop.removeConnection(self)
+        if self.socket is not None:
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            self.socket.close()
+            self.socket = None
+
+
+class EventLoop(threading.Thread):
+    """EventLoop:
+            A single thread which multiplexes the listening and the connected sockets of many channels with epoll (select when epoll is not available).
+            Connections are accepted, read and written without blocking, and without a thread per connection.
+    """
+
+    defaultEventLoop = None
+    defaultEventLoopLock = threading.Lock()
+
+    def __init__(self):
+        """Constructor of EventLoop:
+        """
+        threading.Thread.__init__(self)
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.py')
+        self.daemon = True
+        self.active = True
+        self.lock = threading.Lock()
+        self.connections = dict()
+        self.listeners = dict()
+        self.writers = set()
+        self.deadlines = []
+        (self.wakeupReader, self.wakeupWriter) = os.pipe()
+        for fd in [self.wakeupReader, self.wakeupWriter]:
+            fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+        self.epoll = None
+        if hasattr(select, "epoll"):
+            self.epoll = select.epoll()
+            self.epoll.register(self.wakeupReader, select.EPOLLIN)
+
+    @staticmethod
+    def getDefaultEventLoop():
+        """getDefaultEventLoop:
+                Return the event loop shared by the channels which do not specify one, started on the first call.
+
+                @rtype: netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.EventLoop
+                @return: the default event loop.
+        """
+        EventLoop.defaultEventLoopLock.acquire()
+        try:
+            if EventLoop.defaultEventLoop is None or not EventLoop.defaultEventLoop.isActive():
+                EventLoop.defaultEventLoop = EventLoop()
+                EventLoop.defaultEventLoop.start()
+            return EventLoop.defaultEventLoop
+        finally:
+            EventLoop.defaultEventLoopLock.release()
+
+    def isActive(self):
+        return self.active
+
+    def getNumberOfConnections(self):
+        return len(self.connections)
+
+#+---------------------------------------------------------------------------+
+#| Registration of the sockets                                               |
+#+---------------------------------------------------------------------------+
+    def listen(self, sock, acceptCallback):
+        """listen:
+                Accept the connections of a listening socket. The callback is executed by the event loop with the new connection and the address of the peer.
+
+                @type sock: socket.socket
+                @param sock: the listening socket.
+                @type acceptCallback: function
+                @param acceptCallback: the function called for each accepted connection.
+        """
+        sock.setblocking(False)
+        self.lock.acquire()
+        try:
+            self.listeners[sock.fileno()] = (sock, acceptCallback)
+            if self.epoll is not None:
+                self.epoll.register(sock.fileno(), select.EPOLLIN)
+        finally:
+            self.lock.release()
+        self.wakeUp()
+
+    def removeListener(self, sock):
+        """removeListener:
+                Stop accepting the connections of a listening socket.
+        """
+        self.lock.acquire()
+        try:
+            if self.listeners.pop(sock.fileno(), None) is not None and self.epoll is not None:
+                self.epoll.unregister(sock.fileno())
+        finally:
+            self.lock.release()
+        self.wakeUp()
+
+    def addConnection(self, connection):
+        """addConnection:
+                Process the input and the output of a connection.
+
+                @type connection: netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.EventLoopConnection
+                @param connection: the connection to process.
+                @rtype: netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop.EventLoopConnection
+                @return: the connection.
+        """
+        self.lock.acquire()
+        try:
+            self.connections[connection.getFileno()] = connection
+            if self.epoll is not None:
+                self.epoll.register(connection.getFileno(), select.EPOLLIN)
+        finally:
+            self.lock.release()
+        self.wakeUp()
+        return connection
+
+    def removeConnection(self, connection):
+        """removeConnection:
+                Stop processing a connection.
+        """
+        self.lock.acquire()
+        try:
+            if self.connections.get(connection.getFileno()) is connection:
+                del self.connections[connection.getFileno()]
+                self.writers.discard(connection.getFileno())
+                if self.epoll is not None:
+                    try:
+                        self.epoll.unregister(connection.getFileno())
+                    except (IOError, ValueError):
+                        pass
+        finally:
+            self.lock.release()
+
+    def setWriteInterest(self, connection, interested):
+        """setWriteInterest:
+                Enable or disable the notification of the event loop when the socket of the connection becomes writable.
+        """
+        self.lock.acquire()
+        try:
+            if self.connections.get(connection.getFileno()) is not connection or (connection.getFileno() in self.writers) == interested:
+                return
+            if interested:
+                self.writers.add(connection.getFileno())
+            else:
+                self.writers.discard(connection.getFileno())
+            if self.epoll is not None:
+                if interested:
+                    self.epoll.modify(connection.getFileno(), select.EPOLLIN | select.EPOLLOUT)
+                else:
+                    self.epoll.modify(connection.getFileno(), select.EPOLLIN)
+        finally:
+            self.lock.release()
+        if interested:
+            self.wakeUp()
+
+    def addDeadline(self, deadline, connection):
+        """addDeadline:
+                Wake up the threads waiting for the data of a connection at the given time.
+
+                @type deadline: float
+                @param deadline: the time of the wake up.
+        """
+        self.lock.acquire()
+        try:
+            earliest = len(self.deadlines) == 0 or deadline < self.deadlines[0][0]
+            heapq.heappush(self.deadlines, (deadline, connection))
+        finally:
+            self.lock.release()
+        if earliest:
+            self.wakeUp()
+
+    def expireDeadlines(self):
+        """expireDeadlines:
+                Wake up the connections whose deadline has passed.
+
+                @rtype: float
+                @return: the time to wait until the next deadline in seconds, or None if there is none.
+        """
+        expired = []
+        now = time.time()
+        self.lock.acquire()
+        try:
+            while len(self.deadlines) > 0 and self.deadlines[0][0] <= now:
+                expired.append(heapq.heappop(self.deadlines)[1])
+            timeout = None
+            if len(self.deadlines) > 0:
+                timeout = self.deadlines[0][0] - now
+        finally:
+            self.lock.release()
+        for connection in expired:
+            connection.wakeUp()
+        return timeout
+
+    def wakeUp(self):
+        """wakeUp:
+                Interrupt the wait of the event loop so that it considers the new registrations.
+        """
+        try:
+            os.write(self.wakeupWriter, "x")
+        except OSError:
+            pass
+
+#+---------------------------------------------------------------------------+
+#| Processing of the events                                                  |
+#+---------------------------------------------------------------------------+
+    def wait(self, timeout):
+        """wait:
+                Wait for events on the registered sockets.
+
+                @type timeout: float
+                @param timeout: the maximum time to wait in seconds, or None to wait without limit.
+                @rtype: (int, boolean, boolean) List
+                @return: the list of the file descriptors with events and if they are readable and writable.
+        """
+        events = []
+        if self.epoll is not None:
+            try:
+                if timeout is None:
+                    polled = self.epoll.poll(-1)
+                else:
+                    polled = self.epoll.poll(timeout)
+            except IOError, e:
+                if e.errno == errno.EINTR:
+                    return events
+                raise
+            for (fileno, mask) in polled:
+                events.append((fileno, (mask & (select.EPOLLIN | select.EPOLLERR | select.EPOLLHUP)) != 0, (mask & select.EPOLLOUT) != 0))
+            return events
+
+        self.lock.acquire()
+        try:
+            readers = [self.wakeupReader] + self.listeners.keys() + self.connections.keys()
+            writers = list(self.writers)
+        finally:
+            self.lock.release()
+        try:
+            (readable, writable, exceptional) = select.select(readers, writers, [], timeout)
+        except (select.error, socket.error), e:
+            if e.args[0] in (errno.EINTR, errno.EBADF):
+                return events
+            raise
+        writable = set(writable)
+        for fileno in readable:
+            events.append((fileno, True, fileno in writable))
+            writable.discard(fileno)
+        for fileno in writable:
+            events.append((fileno, False, True))
+        return events
+
+    def run(self):
+        self.log.debug("Start the event loop")
+        while self.active:
+            for (fileno, readable, writable) in self.wait(self.expireDeadlines()):
+                if fileno == self.wakeupReader:
+                    self.drainWakeUps()
+                elif fileno in self.listeners:
+                    self.accept(fileno)
+                else:
+                    connection = self.connections.get(fileno)
+                    if connection is None:
+                        continue
+                    if readable:
+                        connection.handleRead()
+                    if writable:
+                        connection.handleWrite()
+        self.log.debug("End of the event loop")
+
+    def drainWakeUps(self):
+        try:
+            while len(os.read(self.wakeupReader, 4096)) > 0:
+                pass
+        except OSError:
+            pass
+
+    def accept(self, fileno):
+        """accept:
+                Accept all the pending connections of a listening socket.
+        """
+        (sock, acceptCallback) = self.listeners[fileno]
+        while True:
+            try:
+                (clientSocket, address) = sock.accept()
+            except socket.error, e:
+                if e.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ECONNABORTED):
+                    self.log.warn("Error while accepting a connection: {0}".format(e))
+                return
+            connection = self.addConnection(EventLoopConnection(self, clientSocket))
+            try:
+                acceptCallback(connection, address)
+            except Exception, e:
+                self.log.warn("Error while accepting a connection: {0}".format(e))
+                connection.close()
+
+    def stop(self):
+        """stop:
+                Stop the event loop and close its connections.
+        """
+        self.active = False
+        self.wakeUp()
+        for connection in self.connections.values():
+            connection.close()
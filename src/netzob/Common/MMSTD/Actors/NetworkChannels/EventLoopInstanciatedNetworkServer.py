@@ -0,0 +1,88 @@
+# -* - coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+from bitarray import bitarray
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Actors.NetworkChannels.InstanciatedNetworkServer import InstanciatedNetworkServer
+
+
+#+---------------------------------------------------------------------------+
+#| EventLoopInstanciatedNetworkServer:
+#|     Channel of a connection accepted by an event loop network server
+#+---------------------------------------------------------------------------+
+class EventLoopInstanciatedNetworkServer(InstanciatedNetworkServer):
+
+    def __init__(self, idActor, memory, protocol, connection, bind_ip, bind_port, target_ip, target_port):
+        InstanciatedNetworkServer.__init__(self, idActor, memory, protocol, connection.getSocket(), bind_ip, bind_port, target_ip, target_port)
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Network.EventLoopInstanciatedNetworkServer.py')
+        self.connection = connection
+
+    def close(self):
+        self.log.debug("Closing the connection of the instanciated network server")
+        self.connection.close()
+        return True
+
+    def receiveData(self, timeout):
+        return self.connection.receive(timeout)
+
+    def read(self, timeout):
+        self.log.debug("Reading from the connection some data (timeout = " + str(timeout))
+        if self.getFraming() is not None:
+            chars = self.readFrame(timeout)
+        else:
+            chars = self.connection.receive(timeout)
+        if chars is None:
+            self.log.debug("The network connection has been closed")
+            return None
+        if len(chars) == 0:
+            return bitarray(endian='big')
+        result = TypeConvertor.stringB2bin(chars)
+        self.log.debug("Received : {0}".format(TypeConvertor.bin2strhex(result)))
+        return result
+
+    def write(self, message):
+        self.log.debug("Writing to the connection")
+        self.outputMessages.append(message)
+        if not self.connection.send(self.frame(TypeConvertor.bin2string(message))):
+            self.log.warn("Impossible to write on a closed connection")
+
+    def getConnection(self):
+        return self.connection
@@ -0,0 +1,106 @@
+# -* - coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+from gettext import gettext as _
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkClient import NetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop, EventLoopConnection
+
+
+#+---------------------------------------------------------------------------+
+#| EventLoopNetworkClient:
+#|     Network client whose socket is processed by an event loop
+#+---------------------------------------------------------------------------+
+class EventLoopNetworkClient(NetworkClient):
+    """EventLoopNetworkClient:
+            A network client whose non-blocking socket is read and written by a shared event loop, so that thousands of clients can be opened without a thread per socket.
+            It is saved and loaded as a NetworkClient.
+    """
+
+    def __init__(self, id, memory, protocol, bind_ip, bind_port, target_ip, target_port, eventLoop=None):
+        NetworkClient.__init__(self, id, memory, protocol, bind_ip, bind_port, target_ip, target_port)
+        # create logger with the given configuration
+        self.log = logging.getLogger(__name__)
+        self.eventLoop = eventLoop
+        self.connection = None
+
+    def open(self):
+        if not NetworkClient.open(self):
+            return False
+        if self.eventLoop is None:
+            self.eventLoop = EventLoop.getDefaultEventLoop()
+        self.connection = self.eventLoop.addConnection(EventLoopConnection(self.eventLoop, self.socket, self.getProtocol() == "UDP"))
+        return True
+
+    def close(self):
+        self.log.debug("Closing the network client")
+        self.stop()
+        if self.connection is not None:
+            self.connection.close()
+        return True
+
+    def receiveData(self, timeout):
+        if self.connection is None:
+            return None
+        return self.connection.receive(timeout)
+
+    def read(self, timeout):
+        if self.connection is None:
+            self.log.debug("Impossible to read from a closed network client")
+            return None
+        if self.getFraming() is not None:
+            chars = self.readFrame(timeout)
+        else:
+            chars = self.connection.receive(timeout)
+        if chars is None:
+            self.log.debug("The network connection has been closed")
+            return None
+        result = TypeConvertor.string2bin(chars, "big")
+        if len(chars) > 0:
+            self.log.debug("Received : {0}".format(TypeConvertor.bin2strhex(result)))
+        return result
+
+    def write(self, message):
+        self.log.debug("Write down !")
+        self.outputMessages.append(message)
+        if self.connection is None or not self.connection.send(self.frame(TypeConvertor.bin2string(message))):
+            self.log.warn("An error occured while trying to write on the communication channel")
+
+    def getConnection(self):
+        return self.connection
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from gettext import gettext as _
+import logging
+import socket
+import threading
+import time
+import uuid
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.MMSTDVisitor import MMSTDVisitor
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.MMSTD import MMSTD
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkServer import NetworkServer
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopInstanciatedNetworkServer import EventLoopInstanciatedNetworkServer
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+
+
+#+---------------------------------------------------------------------------+
+#| EventLoopNetworkServer:
+#|     TCP network server whose connections are processed by an event loop
+#+---------------------------------------------------------------------------+
+class EventLoopNetworkServer(NetworkServer):
+    """EventLoopNetworkServer:
+            A TCP network server whose listening socket and accepted connections are processed by a shared event loop.
+            Unlike the NetworkServer, it needs neither a handler thread per connection nor fixed sleeps: only the MMSTD visitor of each connection runs in its own thread.
+            It is saved and loaded as a NetworkServer.
+    """
+
+    def __init__(self, id, memory, protocol, bind_ip, bind_port, target_ip, target_port, eventLoop=None):
+        NetworkServer.__init__(self, id, memory, protocol, bind_ip, bind_port, target_ip, target_port)
+        # create logger with the given configuration
+        self.log = logging.getLogger(__name__)
+        self.eventLoop = eventLoop
+        self.listeningSocket = None
+        self.instances = []
+        self.instancesLock = threading.Lock()
+
+    def openServer(self, vocabulary, initialState, master, cb_whenAClientConnects, cb_whenAClientDisconnects, cb_registerInputSymbol, cb_registerOutputSymbol):
+        if self.getProtocol() != "TCP":
+            self.log.warn("The event loop network server only supports TCP, the server cannot be started")
+            return
+
+        self.vocabulary = vocabulary
+        self.initialState = initialState
+        self.master = master
+        self.cbClientConnected = cb_whenAClientConnects
+        self.cbClientDisconnected = cb_whenAClientDisconnects
+        self.cbInputSymbol = cb_registerInputSymbol
+        self.cbOutputSymbol = cb_registerOutputSymbol
+
+        # Instantiates the server, waiting only after a failed attempt
+        maxNumberOfAttempts = 3
+        for nbAttempts in range(0, maxNumberOfAttempts + 1):
+            try:
+                self.log.info("Configure a TCP Network Server to listen on " + str(self.getBindIP()) + ":" + str(self.getBindPort()) + ".")
+                self.listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.listeningSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.listeningSocket.bind((self.getBindIP(), self.getBindPort()))
+                self.listeningSocket.listen(socket.SOMAXCONN)
+                break
+            except socket.error, e:
+                self.log.warn("Impossible to open a server, attempts = " + str(nbAttempts) + "/" + str(maxNumberOfAttempts))
+                self.log.warn("Error reason: {0}".format(e))
+                self.listeningSocket.close()
+                self.listeningSocket = None
+                if nbAttempts < maxNumberOfAttempts:
+                    time.sleep(0.1 * (2 ** nbAttempts))
+
+        if self.listeningSocket is None:
+            self.log.warn("The server cannot be started")
+            return
+        if self.eventLoop is None:
+            self.eventLoop = EventLoop.getDefaultEventLoop()
+        self.log.info("Start the server")
+        self.eventLoop.listen(self.listeningSocket, self.acceptConnection)
+
+    def acceptConnection(self, connection, address):
+        """acceptConnection:
+                Executed by the event loop for each accepted connection: starts an MMSTD visitor on it.
+        """
+        if not self.allowMultipleClients and len(self.instances) > 0:
+            connection.close()
+            return
+        self.log.info("A client has just initiated a connection on the server.")
+        self.cbClientConnected()
+
+        # we create a sub automata
+        automata = MMSTD(self.initialState, self.vocabulary)
+
+        # and duplicate the memory for this instance
+        duplicatedMemory = self.getMemory().duplicate()
+
+        # We create an instantiated network server
+        instanciatedNetworkServer = EventLoopInstanciatedNetworkServer(uuid.uuid4(), duplicatedMemory, "TCP", connection, self.getBindIP(), self.getBindPort(), self.getTargetIP(), self.getTargetPort())
+        instanciatedNetworkServer.setFraming(self.getFraming())
+
+        # Create the input and output abstraction layer
+        abstractionLayer = AbstractionLayer(instanciatedNetworkServer, self.vocabulary, Memory(), self.cbInputSymbol, self.cbOutputSymbol)
+        if self.getScheduler() is not None:
+            abstractionLayer.setScheduler(self.getScheduler().duplicate())
+
+        # And we create an MMSTD visitor for this
+        anID = str(uuid.uuid4())
+        subVisitor = MMSTDVisitor(anID, "Instance-" + anID, automata, self.master, abstractionLayer)
+        subVisitor.setStatusModification_cb(lambda: self.visitorStatusChanged(subVisitor, connection))
+
+        self.instancesLock.acquire()
+        try:
+            self.instances.append(subVisitor)
+        finally:
+            self.instancesLock.release()
+        self.log.info("An MMSTDVistor has been instantiated and assigned to the current network client.")
+        subVisitor.start()
+
+    def visitorStatusChanged(self, subVisitor, connection):
+        """visitorStatusChanged:
+                Closes the connection of a visitor once its execution is over.
+        """
+        if subVisitor.isActive():
+            return
+        self.instancesLock.acquire()
+        try:
+            if not subVisitor in self.instances:
+                return
+            self.instances.remove(subVisitor)
+        finally:
+            self.instancesLock.release()
+        connection.close()
+        self.cbClientDisconnected()
+        self.log.debug("End of the execution of the TCP connection")
+
+    def close(self):
+        self.log.info("Shutdown down the server")
+        if self.listeningSocket is not None:
+            self.eventLoop.removeListener(self.listeningSocket)
+            self.listeningSocket.close()
+            self.listeningSocket = None
+        self.log.info("The server has been shutted down")
+
+    def getGeneratedInstances(self):
+        return self.instances
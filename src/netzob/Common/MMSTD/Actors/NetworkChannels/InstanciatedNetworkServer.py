@@ -95,6 +95,14 @@ class InstanciatedNetworkServer(AbstractChannel):
         self.log.debug("Reading from the socket some data (timeout = " + str(timeout))
         result = bitarray(endian='big')
 
+        if self.getFraming() is not None:
+            chars = self.readFrame(timeout)
+            if chars is None:
+                return None
+            if len(chars) > 0:
+                result = TypeConvertor.stringB2bin(chars)
+            return result
+
         chars = []
         try:
             if timeout > 0:
@@ -123,9 +131,9 @@ class InstanciatedNetworkServer(AbstractChannel):
         # This work only for values between 0x00 and 0x7f
         # self.socket.send(message.tostring())
         if self.protocol == "UDP":
-            self.socket.sendto(TypeConvertor.bin2string(message), (self.getTargetIP(), self.getTargetPort()))
+            self.socket.sendto(self.frame(TypeConvertor.bin2string(message)), (self.getTargetIP(), self.getTargetPort()))
         else:  # TCP
-            self.socket.send(TypeConvertor.bin2string(message))
+            self.socket.sendall(self.frame(TypeConvertor.bin2string(message)))
 
         self.log.debug("Write down !")
 
@@ -113,6 +113,11 @@ class NetworkClient(AbstractChannel):
         return True
 
     def read(self, timeout):
+        if self.getFraming() is not None:
+            chars = self.readFrame(timeout)
+            if chars is None:
+                return None
+            return TypeConvertor.string2bin(chars, "big")
         chars = []
         try:
             if timeout > 0:
@@ -140,7 +145,7 @@ class NetworkClient(AbstractChannel):
         self.outputMessages.append(message)
 
         try:
-            self.outputFile.write(TypeConvertor.bin2string(message))
+            self.outputFile.write(self.frame(TypeConvertor.bin2string(message)))
             self.outputFile.flush()
         except:
             self.log.warn("An error occured while trying to write on the communication channel")
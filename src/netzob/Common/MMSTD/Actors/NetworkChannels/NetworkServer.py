@@ -65,10 +65,24 @@ class ThreadedTCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
         self.bindPort = None
         self.targetIP = None
         self.targetPort = None
+        self.framing = None
+        self.scheduler = None
 
     def getVocabulary(self):
         return self.vocabulary
 
+    def getFraming(self):
+        return self.framing
+
+    def setFraming(self, framing):
+        self.framing = framing
+
+    def getScheduler(self):
+        return self.scheduler
+
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
+
     def getMemory(self):
         return self.memory
 
@@ -170,10 +184,24 @@ class ThreadedUDPServer(SocketServer.ThreadingMixIn, SocketServer.UDPServer):
         self.bindPort = None
         self.targetIP = None
         self.targetPort = None
+        self.framing = None
+        self.scheduler = None
 
     def getVocabulary(self):
         return self.vocabulary
 
+    def getFraming(self):
+        return self.framing
+
+    def setFraming(self, framing):
+        self.framing = framing
+
+    def getScheduler(self):
+        return self.scheduler
+
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
+
     def getMemory(self):
         return self.memory
 
@@ -287,9 +315,12 @@ class TCPConnectionHandler(SocketServer.BaseRequestHandler):
 
         # We create an instantiated network server
         instanciatedNetworkServer = InstanciatedNetworkServer(uuid.uuid4(), duplicatedMemory, "TCP", self.request, self.server.getBindIP(), self.server.getBindPort(), self.server.getTargetIP(), self.server.getTargetPort())
+        instanciatedNetworkServer.setFraming(self.server.getFraming())
 
         # Create the input and output abstraction layer
         abstractionLayer = AbstractionLayer(instanciatedNetworkServer, vocabulary, Memory(), self.server.getCBInputSymbol(), self.server.getCBOutputSymbol())
+        if self.server.getScheduler() is not None:
+            abstractionLayer.setScheduler(self.server.getScheduler().duplicate())
         # abstractionLayer = AbstractionLayer(instanciatedNetworkServer, vocabulary, Memory(vocabulary.getVariables()), self.server.getCBInputSymbol(), self.server.getCBOutputSymbol())
 
         # And we create an MMSTD visitor for this
@@ -365,9 +396,12 @@ class UDPConnectionHandler(SocketServer.DatagramRequestHandler):
 
         # We create an instantiated network server
         instanciatedNetworkServer = InstanciatedNetworkServer(uuid.uuid4(), duplicatedMemory, "UDP", self.request, self.server.getBindIP(), self.server.getBindPort(), self.server.getTargetIP(), self.server.getTargetPort())
+        instanciatedNetworkServer.setFraming(self.server.getFraming())
 
         # Create the input and output abstraction layer
         abstractionLayer = AbstractionLayer(instanciatedNetworkServer, vocabulary, Memory(), self.server.getCBInputSymbol(), self.server.getCBOutputSymbol())
+        if self.server.getScheduler() is not None:
+            abstractionLayer.setScheduler(self.server.getScheduler().duplicate())
         # abstractionLayer = AbstractionLayer(instanciatedNetworkServer, vocabulary, Memory(vocabulary.getVariables()), self.server.getCBInputSymbol(), self.server.getCBOutputSymbol())
 
         # And we create an MMSTD visitor for this
@@ -413,6 +447,13 @@ class NetworkServer(AbstractChannel):
         self.server = None
         self.instantiatedServers = []
         self.allowMultipleClients = True
+        self.scheduler = None
+
+    def getScheduler(self):
+        return self.scheduler
+
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
 
     def openServer(self, vocabulary, initialState, master, cb_whenAClientConnects, cb_whenAClientDisconnects, cb_registerInputSymbol, cb_registerOutputSymbol):
         # Instantiates the server
@@ -437,7 +478,8 @@ class NetworkServer(AbstractChannel):
                 if nbAttempts > maxNumberOfAttempts:
                     finish = True
                     error = True
-            time.sleep(5)
+                else:
+                    time.sleep(5)
 
         if not error:
             self.server.setCBWhenAClientConnects(cb_whenAClientConnects)
@@ -453,6 +495,8 @@ class NetworkServer(AbstractChannel):
             self.server.setTargetPort(self.getTargetPort())
             self.server.setBindIP(self.getBindIP())
             self.server.setBindPort(self.getBindPort())
+            self.server.setFraming(self.getFraming())
+            self.server.setScheduler(self.getScheduler())
 
             self.server.setMultipleConnectionIsAllowed(self.allowMultipleClients)
             self.server_thread = threading.Thread(target=self.server.serve_forever)
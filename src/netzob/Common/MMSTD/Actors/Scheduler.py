@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.SessionProfiler import SessionProfiler
+
+
+#+---------------------------------------------------------------------------+
+#| Scheduler:
+#|     Deadline based timing of the execution of an MMSTD
+#+---------------------------------------------------------------------------+
+class Scheduler():
+    """Scheduler:
+            Computes when the states and transitions of an automaton must act.
+            Reaction times are deadlines relative to the arrival of the last
+            message (the time spent abstracting and specializing is deduced
+            from them) and the deliberate waits can be skipped by running
+            the session as fast as possible.
+    """
+
+    DEFAULT_RECEPTION_TIMEOUT = 5
+
+    def __init__(self, asFastAsPossible=False, receptionTimeout=DEFAULT_RECEPTION_TIMEOUT):
+        """Constructor of Scheduler:
+
+                @type asFastAsPossible: boolean
+                @param asFastAsPossible: if true, the reaction and connection times are not honoured.
+                @type receptionTimeout: float
+                @param receptionTimeout: the default number of seconds spent waiting for a message.
+        """
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.Scheduler.py')
+        self.asFastAsPossible = asFastAsPossible
+        self.receptionTimeout = receptionTimeout
+        self.lastReceptionTime = None
+        self.waitedTime = 0.0
+        self.condition = threading.Condition()
+        self.profiler = None
+
+    def duplicate(self):
+        """duplicate:
+                Creates a scheduler with the same configuration for another session.
+
+                @rtype: netzob.Common.MMSTD.Actors.Scheduler.Scheduler
+                @return: the new scheduler.
+        """
+        return Scheduler(self.asFastAsPossible, self.receptionTimeout)
+
+    def markReception(self):
+        """markReception:
+                Records the arrival of a message. It is the origin of the next reaction time.
+        """
+        self.lastReceptionTime = time.time()
+
+    def getReactionDeadline(self, reactionTime):
+        """getReactionDeadline:
+                Computes the instant at which the reaction to the last received message is due.
+
+                @type reactionTime: integer
+                @param reactionTime: the reaction time in milliseconds.
+                @rtype: float
+                @return: the deadline (in seconds since the epoch).
+        """
+        origin = self.lastReceptionTime
+        if origin is None:
+            origin = time.time()
+        return origin + float(reactionTime) / 1000
+
+    def waitReaction(self, reactionTime):
+        """waitReaction:
+                Waits until the reaction to the last received message is due.
+
+                @type reactionTime: integer
+                @param reactionTime: the reaction time in milliseconds.
+        """
+        self.waitUntil(self.getReactionDeadline(reactionTime))
+
+    def wait(self, duration):
+        """wait:
+                Waits the given duration starting from now.
+
+                @type duration: integer
+                @param duration: the duration in milliseconds.
+        """
+        self.waitUntil(time.time() + float(duration) / 1000)
+
+    def waitUntil(self, deadline):
+        """waitUntil:
+                Waits until the deadline unless the session runs as fast as possible.
+                A deadline already over returns immediately.
+
+                @type deadline: float
+                @param deadline: the deadline (in seconds since the epoch).
+        """
+        if self.asFastAsPossible:
+            return
+        remaining = deadline - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+            self.waitedTime += remaining
+            if self.profiler is not None:
+                self.profiler.record(SessionProfiler.PHASE_WAIT, remaining)
+
+    def waitFor(self, predicate, timeout):
+        """waitFor:
+                Waits until the predicate is verified or the timeout expires. The waiting
+                thread is woken up by notify().
+
+                @type predicate: function
+                @param predicate: the condition waited for.
+                @type timeout: float
+                @param timeout: the maximum number of seconds to wait.
+                @rtype: boolean
+                @return: the last value of the predicate.
+        """
+        startTime = time.time()
+        deadline = startTime + timeout
+        self.condition.acquire()
+        try:
+            result = predicate()
+            while not result:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+                result = predicate()
+            return result
+        finally:
+            self.condition.release()
+            if self.profiler is not None:
+                self.profiler.record(SessionProfiler.PHASE_WAIT, time.time() - startTime)
+
+    def notify(self):
+        """notify:
+                Wakes up the threads waiting through waitFor().
+        """
+        self.condition.acquire()
+        try:
+            self.condition.notifyAll()
+        finally:
+            self.condition.release()
+
+    #+-----------------------------------------------------------------------+
+    #| GETTERS AND SETTERS
+    #+-----------------------------------------------------------------------+
+    def isAsFastAsPossible(self):
+        return self.asFastAsPossible
+
+    def getReceptionTimeout(self):
+        return self.receptionTimeout
+
+    def getLastReceptionTime(self):
+        return self.lastReceptionTime
+
+    def getWaitedTime(self):
+        return self.waitedTime
+
+    def getProfiler(self):
+        return self.profiler
+
+    def setAsFastAsPossible(self, asFastAsPossible):
+        self.asFastAsPossible = asFastAsPossible
+
+    def setReceptionTimeout(self, receptionTimeout):
+        self.receptionTimeout = receptionTimeout
+
+    def setProfiler(self, profiler):
+        self.profiler = profiler
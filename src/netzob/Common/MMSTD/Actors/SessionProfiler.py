@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import json
+import logging
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| SessionProfiler:
+#|     Timing instrumentation of an MMSTD session
+#+---------------------------------------------------------------------------+
+class SessionProfiler():
+    """SessionProfiler:
+            Records where the time of a session goes: the time spent reading
+            and writing the channel, abstracting and specializing messages,
+            accessing the memory and waiting on purpose, for the whole session
+            and for each executed step (a transition, or a state while it waits
+            for a message).
+            The memory accesses happen while abstracting and specializing, so
+            their time is included in these phases.
+            Once the profiler is detached, nothing is measured.
+    """
+
+    PHASE_READ = "read"
+    PHASE_WRITE = "write"
+    PHASE_ABSTRACTION = "abstraction"
+    PHASE_SPECIALIZATION = "specialization"
+    PHASE_MEMORY = "memory"
+    PHASE_WAIT = "wait"
+    PHASES = [PHASE_READ, PHASE_WRITE, PHASE_ABSTRACTION, PHASE_SPECIALIZATION, PHASE_MEMORY, PHASE_WAIT]
+
+    def __init__(self, name):
+        """Constructor of SessionProfiler:
+
+                @type name: string
+                @param name: the name of the profiled session.
+        """
+        self.log = logging.getLogger('netzob.Common.MMSTD.Actors.SessionProfiler.py')
+        self.name = name
+        self.startTime = time.time()
+        self.endTime = None
+        self.phases = self.createPhases()
+        self.steps = []
+        self.currentStep = None
+        # phases being measured (a phase nested in itself is only measured once)
+        self.activePhases = set()
+
+    def createPhases(self):
+        return dict([(phase, [0.0, 0]) for phase in SessionProfiler.PHASES])
+
+    def enterStep(self, name):
+        """enterStep:
+                Ends the current step and starts a new one.
+
+                @type name: string
+                @param name: the name of the step (the name of a transition or a state).
+        """
+        now = time.time()
+        self.closeStep(now)
+        self.currentStep = {"name": name, "start": now, "duration": None, "phases": self.createPhases()}
+        self.steps.append(self.currentStep)
+
+    def renameStep(self, name):
+        """renameStep:
+                Renames the current step, when a received message selects the executed transition.
+
+                @type name: string
+                @param name: the new name of the step.
+        """
+        if self.currentStep is not None:
+            self.currentStep["name"] = name
+
+    def leaveStep(self):
+        """leaveStep:
+                Ends the current step.
+        """
+        self.closeStep(time.time())
+
+    def closeStep(self, now):
+        if self.currentStep is not None:
+            self.currentStep["duration"] = now - self.currentStep["start"]
+            self.currentStep = None
+
+    def stop(self):
+        """stop:
+                Ends the session.
+        """
+        now = time.time()
+        self.closeStep(now)
+        self.endTime = now
+
+    def record(self, phase, duration):
+        """record:
+                Adds the duration of an operation to its phase.
+
+                @type phase: string
+                @param phase: the phase of the operation.
+                @type duration: float
+                @param duration: the duration in seconds.
+        """
+        measures = self.phases[phase]
+        measures[0] += duration
+        measures[1] += 1
+        if self.currentStep is not None:
+            measures = self.currentStep["phases"][phase]
+            measures[0] += duration
+            measures[1] += 1
+
+    def wrap(self, phase, function):
+        """wrap:
+                Creates a function which executes the given one and records its duration in the phase.
+
+                @type phase: string
+                @param phase: the phase of the function.
+                @type function: function
+                @param function: the measured function.
+                @rtype: function
+                @return: the measuring function.
+        """
+        def measure(*args, **kwargs):
+            if phase in self.activePhases:
+                return function(*args, **kwargs)
+            self.activePhases.add(phase)
+            startTime = time.time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(phase, time.time() - startTime)
+                self.activePhases.discard(phase)
+        return measure
+
+    #+-----------------------------------------------------------------------+
+    #| GETTERS AND SETTERS
+    #+-----------------------------------------------------------------------+
+    def getName(self):
+        return self.name
+
+    def getDuration(self):
+        endTime = self.endTime
+        if endTime is None:
+            endTime = time.time()
+        return endTime - self.startTime
+
+    def getPhaseTime(self, phase):
+        return self.phases[phase][0]
+
+    def getPhaseCount(self, phase):
+        return self.phases[phase][1]
+
+    def getSteps(self):
+        return self.steps
+
+    #+-----------------------------------------------------------------------+
+    #| Export
+    #+-----------------------------------------------------------------------+
+    def exportPhases(self, phases):
+        return dict([(phase, {"time": measures[0], "count": measures[1]}) for (phase, measures) in phases.items()])
+
+    def toDict(self):
+        """toDict:
+                Exports the measures as a dictionary of built-in types.
+
+                @rtype: dict
+                @return: the session, its phases and its steps (their start is relative to the start of the session).
+        """
+        steps = []
+        for step in self.steps:
+            duration = step["duration"]
+            if duration is None:
+                duration = time.time() - step["start"]
+            steps.append({"name": step["name"], "start": step["start"] - self.startTime, "duration": duration, "phases": self.exportPhases(step["phases"])})
+        return {"session": self.name, "duration": self.getDuration(), "phases": self.exportPhases(self.phases), "steps": steps}
+
+    def toJSON(self):
+        """toJSON:
+                @rtype: string
+                @return: the measures encoded in JSON.
+        """
+        return json.dumps(self.toDict(), indent=2, sort_keys=True)
+
+    def getSummary(self):
+        """getSummary:
+                Formats the measures as a text table, the steps of the same name being aggregated.
+
+                @rtype: string
+                @return: the summary (times in milliseconds).
+        """
+        totals = []
+        names = []
+        for step in self.toDict()["steps"]:
+            if not step["name"] in names:
+                names.append(step["name"])
+                totals.append([0, 0.0] + [0.0] * len(SessionProfiler.PHASES))
+            total = totals[names.index(step["name"])]
+            total[0] += 1
+            total[1] += step["duration"]
+            for (i, phase) in enumerate(SessionProfiler.PHASES):
+                total[2 + i] += step["phases"][phase]["time"]
+        names.append("session " + str(self.name))
+        totals.append([len(self.steps), self.getDuration()] + [self.getPhaseTime(phase) for phase in SessionProfiler.PHASES])
+
+        lines = ["{0:<30} {1:>6} {2:>10}".format("step", "count", "total") + "".join([" {0:>14}".format(phase) for phase in SessionProfiler.PHASES])]
+        for (name, total) in zip(names, totals):
+            lines.append("{0:<30} {1:>6} {2:>10.3f}".format(name[:30], total[0], total[1] * 1000) + "".join([" {0:>14.3f}".format(value * 1000) for value in total[2:]]))
+        return "\n".join(lines)
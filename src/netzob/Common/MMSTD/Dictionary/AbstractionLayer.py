@@ -32,6 +32,7 @@ from gettext import gettext as _
 from bitarray import bitarray
 import datetime
 import logging
+import time
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -50,7 +51,10 @@ from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
 from netzob.Common.MMSTD.Symbols.impl.UnknownSymbol import UnknownSymbol
 from netzob.Common.Type.TypeConvertor import TypeConvertor
 from netzob.Common.MMSTD.Actors.AbstractChannel import AbstractChannel
+from netzob.Common.MMSTD.Actors.Scheduler import Scheduler
+from netzob.Common.MMSTD.Actors.SessionProfiler import SessionProfiler
 from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.SymbolDispatcher import SymbolDispatcher
 
 
 class TimeoutException(Exception):
@@ -77,6 +81,9 @@ class AbstractionLayer():
         self.connected = False
         self.cb_inputSymbol = cb_inputSymbol
         self.cb_outputSymbol = cb_outputSymbol
+        self.symbolDispatcher = None
+        self.scheduler = Scheduler()
+        self.profiler = None
 
     def isConnected(self):
         return self.connected
@@ -84,10 +91,25 @@ class AbstractionLayer():
     def setConnected(self):
         self.log.debug("Connected changes to TRUE")
         self.connected = True
+        self.scheduler.notify()
 
     def setDisconnected(self):
         self.log.debug("Connected changes to FALSE")
         self.connected = False
+        self.scheduler.notify()
+
+    def waitForConnection(self, connected, timeout):
+        """waitForConnection:
+                Waits until the connection status is the expected one.
+
+                @type connected: boolean
+                @param connected: the expected status.
+                @type timeout: float
+                @param timeout: the maximum number of seconds to wait.
+                @rtype: boolean
+                @return: true if the expected status has been reached.
+        """
+        return self.scheduler.waitFor(lambda: self.connected == connected, timeout)
 
     def openServer(self, vocabulary, outputState, isMaster):
         self.log.info("OpenServer " + str(self.communicationChannel))
@@ -99,6 +121,7 @@ class AbstractionLayer():
 #            self.communicationChannel = self.communicationChannel.createNewServer()
             pass
         else:
+            self.communicationChannel.setScheduler(self.scheduler)
             self.communicationChannel.openServer(vocabulary, outputState, isMaster, self.setConnected, self.setDisconnected, self.registerInputSymbol, self.registerOutputSymbol)
 
     def connect(self):
@@ -143,7 +166,12 @@ class AbstractionLayer():
 
     def receiveSymbolWithTimeout(self, timeout):
         # First we read from the input the message
+        profiler = self.profiler
+        if profiler is not None:
+            startTime = time.time()
         receivedData = self.communicationChannel.read(timeout)
+        if profiler is not None:
+            profiler.record(SessionProfiler.PHASE_READ, time.time() - startTime)
 
         nbMaxAttempts = 5
 
@@ -153,12 +181,17 @@ class AbstractionLayer():
             return (None, None)
 
         if len(receivedData) > 0:
+            self.scheduler.markReception()
             now = datetime.datetime.now()
             receptionTime = now.strftime("%H:%M:%S")
             self.log.info("Received following message : " + TypeConvertor.bin2strhex(receivedData))
 
             # Now we abstract the message
+            if profiler is not None:
+                startTime = time.time()
             symbol = self.abstract(receivedData)
+            if profiler is not None:
+                profiler.record(SessionProfiler.PHASE_ABSTRACTION, time.time() - startTime)
 
             # We store the received messages its time and its abstract representation
             self.inputMessages.append([receptionTime, TypeConvertor.bin2strhex(receivedData), symbol.getName()])
@@ -180,7 +213,12 @@ class AbstractionLayer():
 
         self.log.info("Sending symbol '" + str(symbol) + "' over the communication channel")
         # First we specialize the symbol in a message
+        profiler = self.profiler
+        if profiler is not None:
+            startTime = time.time()
         binMessage = self.specialize(symbol)
+        if profiler is not None:
+            profiler.record(SessionProfiler.PHASE_SPECIALIZATION, time.time() - startTime)
         if type(binMessage) == tuple:  # Means EmptySymbol or UnknownSymbol
             (binMessage, dummy) = binMessage
         strMessage = TypeConvertor.bin2strhex(binMessage)
@@ -192,7 +230,11 @@ class AbstractionLayer():
         self.outputMessages.append([sendingTime, strMessage, symbol.getName()])
         self.registerOutputSymbol(sendingTime, strMessage, symbol)
 
+        if profiler is not None:
+            startTime = time.time()
         self.communicationChannel.write(binMessage)
+        if profiler is not None:
+            profiler.record(SessionProfiler.PHASE_WRITE, time.time() - startTime)
 
     def abstract(self, message):
         """abstract:
@@ -204,11 +246,12 @@ class AbstractionLayer():
                 @return: the symbol which content matches the message.
         """
         self.log.debug("We abstract the received message : " + TypeConvertor.bin2strhex(message))
-        # we search in the vocabulary an entry which match the message
-        for symbol in self.vocabulary.getSymbols():
+        value = TypeConvertor.strBitarray2Bitarray(message)
+        # we search in the candidate entries of the vocabulary an entry which match the message
+        for symbol in self.getSymbolDispatcher().getCandidates(value):
             self.log.debug("Try to abstract message through : {0}.".format(symbol.getName()))
-            readingToken = VariableReadingToken(False, self.vocabulary, self.memory, TypeConvertor.strBitarray2Bitarray(message), 0)
-            symbol.getRoot().read(readingToken)
+            readingToken = VariableReadingToken(False, self.vocabulary, self.memory, value, 0)
+            symbol.getReadingProgram().read(readingToken)
 
             logging.debug("ReadingToken: isOk: {0}, index: {1}, len(value): {2}".format(str(readingToken.isOk()), str(readingToken.getIndex()), str(len(readingToken.getValue()))))
             # The message matches if the read is ok and the whole entry was read.
@@ -235,6 +278,25 @@ class AbstractionLayer():
             #===================================================================
         return UnknownSymbol()
 
+    def getSymbolDispatcher(self):
+        """getSymbolDispatcher:
+                Returns the dispatcher of the symbols of the vocabulary, it is
+                rebuilt if the symbols of the vocabulary have changed.
+
+                @rtype: netzob.Common.MMSTD.Dictionary.SymbolDispatcher.SymbolDispatcher
+                @return: the dispatcher of the symbols of the vocabulary.
+        """
+        symbols = self.vocabulary.getSymbols()
+        if self.symbolDispatcher is None or not self.symbolDispatcher.isBuiltFrom(symbols):
+            self.symbolDispatcher = SymbolDispatcher(symbols)
+        return self.symbolDispatcher
+
+    def resetSymbolDispatcher(self):
+        """resetSymbolDispatcher:
+                Forces the dispatcher to be rebuilt, when the variables of the symbols have changed.
+        """
+        self.symbolDispatcher = None
+
     def specialize(self, symbol):
         self.log.info("Specializing the symbol {0}".format(symbol.getName()))
 
@@ -278,6 +340,27 @@ class AbstractionLayer():
     def getOutputMessages(self):
         return self.outputMessages
 
+    def getScheduler(self):
+        return self.scheduler
+
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
+        self.scheduler.setProfiler(self.profiler)
+
+    def getProfiler(self):
+        return self.profiler
+
+    def setProfiler(self, profiler):
+        """setProfiler:
+                Attach a profiler which measures the time spent by the session, or detach it (None).
+
+                @type profiler: netzob.Common.MMSTD.Actors.SessionProfiler.SessionProfiler
+                @param profiler: the profiler.
+        """
+        self.profiler = profiler
+        self.scheduler.setProfiler(profiler)
+        self.memory.setProfiler(profiler, SessionProfiler.PHASE_MEMORY)
+
     def getVocabulary(self):
         return self.vocabulary
 
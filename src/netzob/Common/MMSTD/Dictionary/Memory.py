@@ -44,6 +44,8 @@ from netzob.Common.Type.TypeConvertor import TypeConvertor
 class Memory():
     """Memory:
             Definition of a memory, used to store variable values in a persisting and independent way.
+            The temporary memory is an overlay over the real memory: it only stores the values written and the variables forgotten since the last persistence.
+            The real memory is shared between duplicated memories and copied on the first persistence that modifies it.
     """
 
     def __init__(self):
@@ -52,9 +54,42 @@ class Memory():
         # create logger with the given configuration
         self.log = logging.getLogger('netzob.Common.MMSTD.Dictionary.Memory.py')
         self.memory = dict()
+        # True if the real memory is shared with a duplicated memory and must be copied before being modified.
+        self.shared = False
+        # Values written in the temporary memory.
         self.temporaryMemory = dict()
+        # IDs of the variables of the real memory forgotten by the temporary memory.
+        self.forgotten = set()
+        # False if the temporary memory has been cleaned and does not see the real memory anymore.
+        self.baseVisible = True
+        # Former states of the temporary memory, recorded while a checkpoint is opened.
+        self.journal = []
+        self.openedCheckpoints = 0
+        self.generation = 0
         self.memory_acces_cb = None
 
+    # Operations measured by an attached profiler.
+    PROFILED_OPERATIONS = ["createMemory", "persistMemory", "cleanMemory", "recallMemory", "checkpoint", "rollback", "release",
+                           "hasMemorized", "restore", "memorize", "forget", "recall"]
+
+    def setProfiler(self, profiler, phase=None):
+        """setProfiler:
+                Attach a profiler which measures the memory operations, or detach it (None).
+                The measuring operations shadow the methods on the instance, so that a memory without profiler is not slowed down.
+
+                @type profiler: netzob.Common.MMSTD.Actors.SessionProfiler.SessionProfiler
+                @param profiler: the profiler.
+                @type phase: string
+                @param phase: the phase of the profiler the memory operations are accounted to, required with a profiler.
+        """
+        if profiler is not None and not phase in profiler.PHASES:
+            raise ValueError("The memory operations must be accounted to a phase of the profiler, not {0}.".format(phase))
+        for operation in Memory.PROFILED_OPERATIONS:
+            if profiler is None:
+                self.__dict__.pop(operation, None)
+            else:
+                setattr(self, operation, profiler.wrap(phase, getattr(Memory, operation).__get__(self, Memory)))
+
     def setMemoryAccess_cb(self, cb):
         """Set the callback to execute after a memory access"""
         self.memory_acces_cb = cb
@@ -62,9 +97,9 @@ class Memory():
     def duplicate(self):
         """Duplicates in a new memory"""
         duplicatedMemory = Memory()
-        for k in self.memory.keys():
-            duplicatedMemory.memory[k] = self.memory[k]
-        duplicatedMemory.createMemory()
+        duplicatedMemory.memory = self.memory
+        duplicatedMemory.shared = True
+        self.shared = True
         return duplicatedMemory
 
 #+---------------------------------------------------------------------------+
@@ -72,26 +107,46 @@ class Memory():
 #+---------------------------------------------------------------------------+
     def createMemory(self):
         """createMemory:
-                Reinit the temporary memory and copy all values from the real memory in it.
+                Reinit the temporary memory so that it contains all values of the real memory.
         """
-        self.temporaryMemory = dict()
-        for key in self.memory.keys():
-            self.temporaryMemory[key] = self.memory[key]
+        self.resetTemporaryMemory(True)
 
     def persistMemory(self):
         """persistMemory:
                 Copy all values from the temporary memory into the real memory.
         """
-        self.memory = dict()
-        for key in self.temporaryMemory.keys():
-            self.memory[key] = self.temporaryMemory[key]
+        if not self.baseVisible:
+            self.memory = dict(self.temporaryMemory)
+            self.shared = False
+        elif len(self.temporaryMemory) > 0 or len(self.forgotten) > 0:
+            if self.shared:
+                self.memory = dict(self.memory)
+                self.shared = False
+            for _id in self.forgotten:
+                self.memory.pop(_id, None)
+            self.memory.update(self.temporaryMemory)
+        self.resetTemporaryMemory(True)
 
     def cleanMemory(self):
         """cleanMemory:
                 Remove all variables and values from real and temporary memories.
         """
         # self.memory = dict()  # TODO: impement this change in all calling functions.
+        self.resetTemporaryMemory(False)
+
+    def resetTemporaryMemory(self, baseVisible):
+        """resetTemporaryMemory:
+                Empty the overlay of the temporary memory and close all its checkpoints.
+
+                @type baseVisible: boolean
+                @param baseVisible: True if the temporary memory contains the values of the real memory.
+        """
         self.temporaryMemory = dict()
+        self.forgotten = set()
+        self.baseVisible = baseVisible
+        self.journal = []
+        self.openedCheckpoints = 0
+        self.generation += 1
 
     def recallMemory(self):
         """recallMemory:
@@ -99,15 +154,83 @@ class Memory():
 
                 @return: the value of all variables in the temporary memory.
         """
-        return self.temporaryMemory
+        values = dict()
+        if self.baseVisible:
+            values.update(self.memory)
+            for _id in self.forgotten:
+                values.pop(_id, None)
+        values.update(self.temporaryMemory)
+        return values
 
     def printMemory(self):
         """printMemory:
                 Debug functions which print all values in temporary memory.
         """
         self.log.debug("Memory map:")
-        for _id in self.temporaryMemory.keys():
-            self.log.debug("> " + str(_id) + " = " + str(self.temporaryMemory.get(_id)))
+        for _id, value in self.recallMemory().iteritems():
+            self.log.debug("> " + str(_id) + " = " + str(value))
+
+#+---------------------------------------------------------------------------+
+#| Checkpoints of the temporary memory                                       |
+#+---------------------------------------------------------------------------+
+    def checkpoint(self):
+        """checkpoint:
+                Mark the current state of the temporary memory, in order to roll back to it later.
+                Checkpoints are closed by rollback, release, createMemory, persistMemory and cleanMemory.
+
+                @rtype: tuple
+                @return: the checkpoint.
+        """
+        self.openedCheckpoints += 1
+        return (self.generation, len(self.journal))
+
+    def rollback(self, checkpoint):
+        """rollback:
+                Restore the temporary memory as it was when the given checkpoint was made and close this checkpoint.
+
+                @type checkpoint: tuple
+                @param checkpoint: a checkpoint returned by the function checkpoint.
+                @rtype: boolean
+                @return: True if the temporary memory has been restored.
+        """
+        (generation, position) = checkpoint
+        if generation != self.generation or position > len(self.journal):
+            self.log.warn("The checkpoint has been closed, the temporary memory cannot be restored.")
+            return False
+        while len(self.journal) > position:
+            (_id, written, value, forgotten) = self.journal.pop()
+            if written:
+                self.temporaryMemory[_id] = value
+            else:
+                self.temporaryMemory.pop(_id, None)
+            if forgotten:
+                self.forgotten.add(_id)
+            else:
+                self.forgotten.discard(_id)
+        self.release(checkpoint)
+        return True
+
+    def release(self, checkpoint):
+        """release:
+                Close the given checkpoint and keep the modifications made since.
+
+                @type checkpoint: tuple
+                @param checkpoint: a checkpoint returned by the function checkpoint.
+        """
+        if checkpoint[0] == self.generation and self.openedCheckpoints > 0:
+            self.openedCheckpoints -= 1
+            if self.openedCheckpoints == 0:
+                self.journal = []
+
+    def journalize(self, _id):
+        """journalize:
+                Record the state of a variable in the temporary memory before its modification, if a checkpoint is opened.
+
+                @type _id: string
+                @param _id: the ID of the modified variable.
+        """
+        if self.openedCheckpoints > 0:
+            self.journal.append((_id, _id in self.temporaryMemory, self.temporaryMemory.get(_id), _id in self.forgotten))
 
 #+---------------------------------------------------------------------------+
 #| Functions on temporary memory elements                                    |
@@ -119,7 +242,10 @@ class Memory():
                 @param variable: the given variable we search in memory.
                 @return: True if the variable has been found in the memory.
         """
-        return variable.getID() in self.temporaryMemory.keys()
+        _id = variable.getID()
+        if _id in self.temporaryMemory:
+            return True
+        return self.baseVisible and _id not in self.forgotten and _id in self.memory
 
     def restore(self, variable):
         """restore:
@@ -127,8 +253,11 @@ class Memory():
 
                 @param variable: the given variable, the value of which we want to restore.
         """
-        if variable.getID() in self.memory.keys():
-            self.temporaryMemory[variable.getID()] = self.memory[variable.getID()]
+        _id = variable.getID()
+        if _id in self.memory:
+            self.journalize(_id)
+            self.temporaryMemory[_id] = self.memory[_id]
+            self.forgotten.discard(_id)
             if self.memory_acces_cb is not None:
                 value = variable.getCurrentValue()
                 if value is not None:
@@ -142,7 +271,10 @@ class Memory():
                 @param variable: the given variable, the value of which we want to save.
         """
         if variable.getCurrentValue() is not None:
-            self.temporaryMemory[variable.getID()] = variable.getCurrentValue()
+            _id = variable.getID()
+            self.journalize(_id)
+            self.temporaryMemory[_id] = variable.getCurrentValue()
+            self.forgotten.discard(_id)
             if self.memory_acces_cb is not None:
                 value = variable.getCurrentValue()
                 if value is not None:
@@ -154,7 +286,11 @@ class Memory():
                 Remove a variable and its value from the temporary memory.
         """
         if self.hasMemorized(variable):
-            self.temporaryMemory.remove(variable.getID())
+            _id = variable.getID()
+            self.journalize(_id)
+            self.temporaryMemory.pop(_id, None)
+            if _id in self.memory:
+                self.forgotten.add(_id)
             if self.memory_acces_cb is not None:
                 self.memory_acces_cb("D", variable, None)
 
@@ -166,11 +302,16 @@ class Memory():
                 @return: the value of the given variable in the temporary memory.
         """
         if self.hasMemorized(variable):
+            _id = variable.getID()
+            if _id in self.temporaryMemory:
+                value = self.temporaryMemory[_id]
+            else:
+                value = self.memory[_id]
             if self.memory_acces_cb is not None:
-                value = self.temporaryMemory[variable.getID()]
                 if value is not None:
-                    value = TypeConvertor.bin2strhex(value)
-                self.memory_acces_cb("R", variable, value)
-            return self.temporaryMemory[variable.getID()]
+                    self.memory_acces_cb("R", variable, TypeConvertor.bin2strhex(value))
+                else:
+                    self.memory_acces_cb("R", variable, None)
+            return value
         else:
             return None
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+from gettext import gettext as _
+from bitarray import bitarray
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable import AbstractVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.Variables.RepeatVariable import RepeatVariable
+
+
+#+---------------------------------------------------------------------------+
+#| ReadingProgram:
+#|     The read access of the root variable of a symbol compiled in a flat
+#|     list of instructions. Constant data variables are compared in place
+#|     and data variables which are only format checked call their type,
+#|     without the method dispatch, the logging and the vocabulary lookups
+#|     of the variable tree. Other variables are read by the tree itself.
+#|     Each instruction checks the flags it was compiled for, so the reading
+#|     results and the memory accesses are the ones of the root variable.
+#+---------------------------------------------------------------------------+
+class ReadingProgram(object):
+
+    # Compares the current value of a data variable which is not mutable
+    CONSTANT = 0
+    # Checks the format of a data variable which is mutable but not learnable
+    FORMAT = 1
+    # Delegates the read access to the variable
+    VARIABLE = 2
+
+    def __init__(self, root):
+        """Constructor of ReadingProgram:
+
+                @type root: netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable.AggregateVariable
+                @param root: the not mutable and not learnable aggregate which is compiled.
+        """
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.MMSTD.Dictionary.ReadingProgram.py')
+        self.root = root
+        self.structureVersion = AbstractVariable.structureVersion
+        self.children = list(root.getChildren())
+        self.instructions = []
+        # The variables restored after a failure, the variables read by a repeat are not registered since they change at each read.
+        self.variablesByID = dict()
+        self.compile()
+
+    def compile(self):
+        """compile:
+                Computes the instructions executed for each child of the root.
+        """
+        for child in self.children:
+            if child.getVariableType() == DataVariable.TYPE:
+                if not child.isMutable():
+                    self.instructions.append((ReadingProgram.CONSTANT, child))
+                elif not child.isLearnable():
+                    self.instructions.append((ReadingProgram.FORMAT, child))
+                else:
+                    self.instructions.append((ReadingProgram.VARIABLE, child))
+            else:
+                self.instructions.append((ReadingProgram.VARIABLE, child))
+            self.registerVariables(child)
+        self.log.debug("Compiled {0} instructions for {1}".format(len(self.instructions), self.root.getName()))
+
+    def registerVariables(self, variable):
+        self.variablesByID[variable.getID()] = variable
+        if variable.isNode() and variable.getVariableType() != RepeatVariable.TYPE and variable.getChildren() is not None:
+            for child in variable.getChildren():
+                self.registerVariables(child)
+
+    def isCompiledFrom(self, root):
+        """isCompiledFrom:
+                Tells if the program still matches the given root variable.
+
+                @type root: netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable.AggregateVariable
+                @param root: the root variable of the symbol.
+                @rtype: boolean
+                @return: True if the root and its children are the compiled ones and no variable tree has changed since.
+        """
+        if self.structureVersion != AbstractVariable.structureVersion or root is not self.root or root.isMutable() or root.isLearnable():
+            return False
+        children = root.getChildren()
+        if children is None or len(children) != len(self.children):
+            return False
+        for (child, compiledChild) in zip(children, self.children):
+            if child is not compiledChild:
+                return False
+        return True
+
+    def getVariableByID(self, vocabulary, idVar):
+        variable = self.variablesByID.get(idVar)
+        if variable is None:
+            variable = vocabulary.getVariableByID(idVar)
+        return variable
+
+    def read(self, readingToken):
+        """read:
+                Executes the program, as AggregateVariable.read on the root.
+
+                @type readingToken: netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken.VariableReadingToken
+                @param readingToken: a token which contains all critical information on this access.
+        """
+        root = self.root
+        dictOfValues = dict()
+        value = readingToken.getValue()
+        savedIndex = readingToken.getIndex()
+        root.currentValue = bitarray('')
+        memory = readingToken.getMemory()
+        checkpoint = memory.checkpoint()
+
+        for (instruction, variable) in self.instructions:
+            if instruction == ReadingProgram.CONSTANT and not variable.mutable and variable.currentValue is not None:
+                # not mutable and defined: the variable compares its value.
+                localValue = variable.currentValue
+                dictOfValues[variable.id] = localValue
+                index = readingToken.getIndex()
+                end = index + len(localValue)
+                if end <= len(value) and value[index:end] == localValue:
+                    readingToken.setIndex(end)
+                    if not readingToken.isOk():
+                        readingToken.setOk(True)
+                    if len(variable.boundedVariables) > 0:
+                        variable.notifyBoundedVariables("read", readingToken, localValue)
+                else:
+                    readingToken.setOk(False)
+            elif instruction == ReadingProgram.FORMAT and variable.mutable and not variable.learnable and variable.currentValue is not None:
+                # mutable, not learnable and defined: the variable checks the format of the value.
+                dictOfValues[variable.id] = variable.currentValue
+                variable.type.compareFormat(readingToken)
+                if readingToken.isOk() and len(variable.boundedVariables) > 0:
+                    variable.notifyBoundedVariables("read", readingToken, variable.currentValue)
+            else:
+                for key, val in variable.getDictOfValues(readingToken).iteritems():
+                    dictOfValues[key] = val
+                variable.read(readingToken)
+            if not readingToken.isOk():
+                break
+
+        if not readingToken.isOk():
+            # The root is not learnable, we restore every executed children and the index.
+            readingToken.setIndex(savedIndex)
+            memory.rollback(checkpoint)
+            vocabulary = readingToken.getVocabulary()
+            for key, val in dictOfValues.iteritems():
+                self.getVariableByID(vocabulary, key).setCurrentValue(val)
+        else:
+            memory.release(checkpoint)
+            root.currentValue = value[savedIndex:readingToken.getIndex()]
+            if len(root.boundedVariables) > 0:
+                root.notifyBoundedVariables("read", readingToken, root.currentValue)
+
+    def getRoot(self):
+        return self.root
+
+    def getInstructions(self):
+        return self.instructions
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable import AbstractVariable
+
+
+#+---------------------------------------------------------------------------+
+#| RelationGraph:
+#|     The relations of the root variable of a symbol, computed once from its
+#|     progeny. It gives the position of each variable in the progeny, so a
+#|     relation variable knows if it points to the left or to the right of
+#|     the tree without walking it, and the variables of the tree by ID. The
+#|     graph is stamped with the structure version of the variables and
+#|     computed again when a tree changes.
+#+---------------------------------------------------------------------------+
+class RelationGraph(object):
+
+    def __init__(self, root):
+        """Constructor of RelationGraph:
+
+                @type root: netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable.AggregateVariable
+                @param root: the root variable of the symbol.
+        """
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.MMSTD.Dictionary.RelationGraph.py')
+        self.root = root
+        self.structureVersion = AbstractVariable.structureVersion
+        self.positions = dict()
+        self.variables = dict()
+        self.compute()
+
+    def compute(self):
+        """compute:
+                Computes the position of the first occurrence of each variable of the progeny.
+        """
+        for (position, variable) in enumerate(self.root.getProgeny()):
+            if variable.getID() not in self.positions:
+                self.positions[variable.getID()] = position
+                self.variables[variable.getID()] = variable
+        self.log.debug("Computed the relation graph of {0}: {1} variables".format(self.root.getName(), len(self.positions)))
+
+    def isComputedFrom(self, root):
+        """isComputedFrom:
+                Tells if the graph still matches the given root variable.
+
+                @type root: netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable.AggregateVariable
+                @param root: the root variable of the symbol.
+                @rtype: boolean
+                @return: True if the root is the computed one and no tree has changed since.
+        """
+        return root is self.root and self.structureVersion == AbstractVariable.structureVersion
+
+    def isDirectPointer(self, relation):
+        """isDirectPointer:
+                Tells if the relation variable points to a variable found before it in the progeny, as ComputedRelationVariable.findDirectPointer.
+
+                @type relation: netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable.ComputedRelationVariable
+                @param relation: a relation variable.
+                @rtype: boolean
+                @return: False if the relation variable is before the pointed variable or if the pointed variable is not in the tree.
+        """
+        if relation.getPointedID() is None:
+            return True
+        position = self.positions.get(relation.getID())
+        if position is None:
+            # The pointing variable is not in this tree.
+            return True
+        pointedPosition = self.positions.get(relation.getPointedID())
+        return pointedPosition is not None and pointedPosition <= position
+
+    def getVariableByID(self, variableID):
+        """getVariableByID:
+                Returns the variable of the tree which has the given ID.
+
+                @type variableID: string
+                @param variableID: the ID of the searched variable.
+                @rtype: netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable.AbstractVariable
+                @return: the variable or None if it is not in the tree.
+        """
+        return self.variables.get(variableID)
+
+    def getRoot(self):
+        return self.root
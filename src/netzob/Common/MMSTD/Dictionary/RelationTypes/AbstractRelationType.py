@@ -30,6 +30,7 @@
 #+---------------------------------------------------------------------------+
 from abc import abstractmethod
 from gettext import gettext as _
+from bitarray import bitarray
 import logging
 
 #+---------------------------------------------------------------------------+
@@ -47,6 +48,9 @@ class AbstractRelationType():
             It defines the type of a relation variable.
     """
 
+    # The maximum number of computed values memorized by a relation type.
+    MAX_COMPUTED_VALUES = 1024
+
     def __init__(self, sized, minChars=0, maxChars=0, delimiter=None, factor=1, offset=0):
         """Constructor of AbstractRelationType:
 
@@ -65,6 +69,7 @@ class AbstractRelationType():
         self.associatedDataType = self.makeAssociatedDataType(sized, minChars, maxChars, delimiter)
         self.factor = factor
         self.offset = offset
+        self.computedValues = dict()
 
     def toString(self):
         return "{0}, factor: {1}, offset: {2}, associatedDataType: {3}".format(self.getType(), self.factor, self.offset, self.associatedDataType.toString())
@@ -109,6 +114,42 @@ class AbstractRelationType():
         """
         raise NotImplementedError("The current type does not implement 'computeValue'.")
 
+    def getComputationKey(self, value):
+        """getComputationKey:
+                Return what the computed value depends on in the given value.
+                Overwritten by the relation types which do not depend on the whole value.
+
+                @type value: bitarray
+                @param value: the value of the pointed variable.
+                @rtype: object
+                @return: a hashable key which identifies the computed value.
+        """
+        if value is None:
+            return None
+        return (len(value), value.tobytes())
+
+    def getComputedValue(self, value):
+        """getComputedValue:
+                Return the computed value of the given value. The values which have already been computed are memorized, so
+                reading or writing many relations does not compute them again.
+
+                @type value: bitarray
+                @param value: the value of the pointed variable.
+                @rtype: bitarray
+                @return: the computed value.
+        """
+        key = self.getComputationKey(value)
+        computedValue = self.computedValues.get(key)
+        if computedValue is None:
+            computedValue = self.computeValue(value)
+            if computedValue is None:
+                return None
+            if len(self.computedValues) >= AbstractRelationType.MAX_COMPUTED_VALUES:
+                self.computedValues.clear()
+            self.computedValues[key] = computedValue
+        # The computed value is given to the tokens which may modify it.
+        return bitarray(computedValue)
+
 #+---------------------------------------------------------------------------+
 #| Getters and setters                                                       |
 #+---------------------------------------------------------------------------+
@@ -129,6 +170,7 @@ class AbstractRelationType():
 
     def setAssociatedDataType(self, dataType):
         self.associatedDataType = dataType
+        self.computedValues.clear()
 
 #+---------------------------------------------------------------------------+
 #| Static methods                                                            |
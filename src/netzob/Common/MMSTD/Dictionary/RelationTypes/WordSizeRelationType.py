@@ -67,6 +67,14 @@ class WordSizeRelationType(AbstractRelationType):
         """
         return DecimalWordType(sized, minChars, maxChars, delimiter)
 
+    def getComputationKey(self, value):
+        """getComputationKey:
+                The size only depends on the length of the value.
+        """
+        if value is None:
+            return None
+        return len(value)
+
     def computeValue(self, value):
         """computeValue:
         """
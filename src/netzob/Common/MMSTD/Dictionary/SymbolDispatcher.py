@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+from gettext import gettext as _
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable import AbstractVariable
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.AlternateVariable import AlternateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.Variables.RepeatVariable import RepeatVariable
+
+
+#+---------------------------------------------------------------------------+
+#| SymbolDispatcher:
+#|     Narrows the symbols of a vocabulary which can abstract a message.
+#|     The static leading bits of each symbol (constant, not learnable data
+#|     variables) are indexed in a prefix tree of bytes, and the bounds of
+#|     the number of bits each symbol can read are computed. Symbols which
+#|     cannot statically be excluded (learnable, relation, ...) are kept
+#|     as candidates of any message, so the first candidate which reads the
+#|     message is the symbol the sequential scan would have returned.
+#|     The dispatcher is rebuilt when the symbols, their root variables, a
+#|     tree of variables or the values and flags it indexed change.
+#+---------------------------------------------------------------------------+
+class SymbolDispatcher(object):
+
+    def __init__(self, symbols):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.MMSTD.Dictionary.SymbolDispatcher.py')
+        self.symbols = list(symbols)
+        self.symbolIDs = map(id, self.symbols)
+        self.structureVersion = AbstractVariable.structureVersion
+        self.roots = [symbol.getRoot() for symbol in self.symbols]
+        # the mutable and learnable flags of the visited variables and the
+        # values of the indexed constants, checked before each dispatch
+        self.flags = []
+        self.values = []
+        # each node is [children, entries], children are indexed by 8 bits strings
+        # and each entry is (index of the symbol, remaining prefix bits, minBits, maxBits)
+        self.root = [dict(), []]
+        self.depth = 0
+        for (index, symbol) in enumerate(self.symbols):
+            self.registerSymbol(index, symbol)
+
+    def registerSymbol(self, index, symbol):
+        """registerSymbol:
+                Computes the static prefix and the length bounds of the symbol and
+                stores them in the prefix tree.
+
+                @type index: integer
+                @param index: the position of the symbol in the vocabulary.
+                @type symbol: netzob.Common.Symbol.Symbol
+                @param symbol: the registered symbol.
+        """
+        try:
+            (prefix, complete, minBits, maxBits) = self.computeConstraints(symbol.getRoot())
+        except Exception, e:
+            self.log.debug("No constraint can be computed for symbol {0}: {1}".format(symbol.getName(), str(e)))
+            (prefix, complete, minBits, maxBits) = ("", False, 0, None)
+
+        node = self.root
+        nbBytes = len(prefix) / 8
+        for i in range(nbBytes):
+            key = prefix[i * 8:(i + 1) * 8]
+            child = node[0].get(key)
+            if child is None:
+                child = [dict(), []]
+                node[0][key] = child
+            node = child
+        self.depth = max(self.depth, nbBytes)
+        node[1].append((index, prefix[nbBytes * 8:], minBits, maxBits))
+
+    def computeConstraints(self, variable):
+        """computeConstraints:
+                Computes the constraints any value read by the variable satisfies.
+
+                @type variable: netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable.AbstractVariable
+                @param variable: the variable which constraints are computed.
+                @rtype: tuple
+                @return: the static prefix (as a string of 0 and 1), True if the prefix is the whole value,
+                         and the minimum and maximum number of read bits (None if unbounded).
+        """
+        unconstrained = ("", False, 0, None)
+        if variable is None:
+            return unconstrained
+        self.flags.append((variable, variable.isMutable(), variable.isLearnable()))
+        if variable.isLearnable():
+            return unconstrained
+        variableType = variable.getVariableType()
+
+        if variableType == DataVariable.TYPE:
+            if not variable.isMutable():
+                value = variable.getCurrentValue()
+                if value is not None:
+                    value = value.copy()
+                self.values.append((variable, value))
+                if value is None:
+                    return unconstrained
+                return (value.to01(), True, len(value), len(value))
+            # A mutable variable which can not learn only checks the format of the value.
+            return ("", False, 0, 0)
+
+        if variableType == AggregateVariable.TYPE:
+            children = variable.getChildren()
+            # A mutable aggregate sorts its children to read the value.
+            if children is None or len(children) == 0 or variable.isMutable():
+                return unconstrained
+            prefix = ""
+            complete = True
+            minBits = 0
+            maxBits = 0
+            for child in children:
+                (childPrefix, childComplete, childMin, childMax) = self.computeConstraints(child)
+                if complete:
+                    prefix += childPrefix
+                    complete = childComplete
+                minBits += childMin
+                if maxBits is not None:
+                    if childMax is None:
+                        maxBits = None
+                    else:
+                        maxBits += childMax
+            return (prefix, complete, minBits, maxBits)
+
+        if variableType == AlternateVariable.TYPE:
+            children = variable.getChildren()
+            if children is None or len(children) == 0:
+                return unconstrained
+            constraints = [self.computeConstraints(child) for child in children]
+            # The common prefix of the children
+            prefix = constraints[0][0]
+            for (childPrefix, childComplete, childMin, childMax) in constraints[1:]:
+                i = 0
+                while i < len(prefix) and i < len(childPrefix) and prefix[i] == childPrefix[i]:
+                    i += 1
+                prefix = prefix[:i]
+            complete = len(constraints) == 1 and constraints[0][1]
+            minBits = min([c[2] for c in constraints])
+            maxBits = None
+            if not None in [c[3] for c in constraints]:
+                maxBits = max([c[3] for c in constraints])
+            return (prefix, complete, minBits, maxBits)
+
+        if variableType == RepeatVariable.TYPE:
+            (minIterations, maxIterations) = variable.getNumberIterations()
+            (childPrefix, childComplete, childMin, childMax) = self.computeConstraints(variable.getChild())
+            prefix = ""
+            if minIterations > 0:
+                prefix = childPrefix
+            maxBits = None
+            if childMax is not None:
+                maxBits = childMax * maxIterations
+            return (prefix, False, childMin * minIterations, maxBits)
+
+        return unconstrained
+
+    def getCandidates(self, message):
+        """getCandidates:
+                Returns, in the order of the vocabulary, the symbols which may abstract the message.
+
+                @type message: bitarray
+                @param message: the received message.
+                @rtype: list
+                @return: the candidate symbols.
+        """
+        size = len(message)
+        # the remaining prefix of an entry is shorter than a byte
+        bits = message[:(self.depth + 1) * 8].to01()
+        indexes = []
+        node = self.root
+        i = 0
+        while node is not None:
+            for (index, tail, minBits, maxBits) in node[1]:
+                if size < minBits or (maxBits is not None and size > maxBits):
+                    continue
+                if not bits.startswith(tail, i):
+                    continue
+                indexes.append(index)
+            if i + 8 > len(bits):
+                break
+            node = node[0].get(bits[i:i + 8])
+            i += 8
+        indexes.sort()
+        return [self.symbols[index] for index in indexes]
+
+    def isBuiltFrom(self, symbols):
+        """isBuiltFrom:
+                Tells if the dispatcher was built from the provided symbols.
+
+                @type symbols: list
+                @param symbols: the symbols of the vocabulary.
+                @rtype: boolean
+                @return: True if the symbols are the indexed ones, in the same order, with
+                         the same root variables and no tree of variables, indexed value or
+                         flag has changed since.
+        """
+        if self.structureVersion != AbstractVariable.structureVersion or map(id, symbols) != self.symbolIDs:
+            return False
+        for (symbol, root) in zip(symbols, self.roots):
+            if symbol.getRoot() is not root:
+                return False
+        for (variable, mutable, learnable) in self.flags:
+            if variable.isMutable() != mutable or variable.isLearnable() != learnable:
+                return False
+        for (variable, value) in self.values:
+            if variable.getCurrentValue() != value:
+                return False
+        return True
+
+    def getSymbols(self):
+        return self.symbols
+
+    def getDepth(self):
+        return self.depth
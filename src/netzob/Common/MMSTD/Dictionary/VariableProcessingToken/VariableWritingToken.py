@@ -60,6 +60,10 @@ class VariableWritingToken(AbstractVariableProcessingToken):
         AbstractVariableProcessingToken.__init__(self, negative, vocabulary, memory, value)
         self.generationStrategy = generationStrategy
         self.index = len(value)
+        # The value made by the last update from the segments of the chopped value, its length and its number of segments.
+        self.updatedValue = None
+        self.updatedLength = 0
+        self.updatedSegments = 0
 
     def toString(self):
         """toString:
@@ -75,6 +79,25 @@ class VariableWritingToken(AbstractVariableProcessingToken):
         self.index = 0
         for linkedValue in self.getLinkedValue():
             self.appendValue(linkedValue[1])
+        self.markValueUpdated()
+
+    def markValueUpdated(self):
+        """markValueUpdated:
+                Remembers that the value is the concatenation of each segment of the chopped value.
+        """
+        self.updatedValue = self.value
+        self.updatedLength = len(self.value)
+        self.updatedSegments = len(self.getLinkedValue())
+
+    def isValueUpdated(self):
+        """isValueUpdated:
+                Tells if the value is still the concatenation of each segment of the chopped value, so a modified segment can be
+                replaced in the value without concatenating every segment again.
+
+                @rtype: boolean
+                @return: True if neither the value nor the segments have changed since the last update.
+        """
+        return self.updatedValue is self.value and self.updatedLength == len(self.value) == self.index and self.updatedSegments == len(self.getLinkedValue())
 
     def setValueForVariable(self, variable, value):
         """setValueForVariable:
@@ -83,10 +106,28 @@ class VariableWritingToken(AbstractVariableProcessingToken):
         """
         # we are interesting in the last value.
         if self.getLinkedValue() is not None:
+            updated = self.isValueUpdated() and value is not None
+            end = len(self.value)
             for linkedValue in reversed(self.getLinkedValue()):  # We iterate the list in reverse order.
+                if linkedValue[1] is None:
+                    updated = False
                 if linkedValue[0] == variable.getID():
+                    if updated:
+                        # Only the segment is replaced. The value is not modified in place: it may be a value saved by a variable.
+                        # It is copied and truncated, which is faster than slicing its beginning.
+                        newValue = bitarray(self.value)
+                        del newValue[end - len(linkedValue[1]):]
+                        newValue.extend(value)
+                        newValue.extend(self.value[end:])
+                        self.value = newValue
+                        self.index = len(self.value)
+                        linkedValue[1] = value
+                        self.markValueUpdated()
+                        return
                     linkedValue[1] = value
                     break
+                if updated:
+                    end -= len(linkedValue[1])
         # refresh the computed value
         self.updateValue()
 
@@ -94,8 +135,32 @@ class VariableWritingToken(AbstractVariableProcessingToken):
         """write:
                 A variable writes a value in the token.
         """
+        updated = self.isValueUpdated()
         self.appendLinkedValue([variable.getID(), value])
-        self.updateValue()
+        if updated:
+            # The value is not extended in place: it may be a value saved by a variable.
+            if value is not None:
+                self.value = self.value + value
+                self.index = len(self.value)
+            self.markValueUpdated()
+        else:
+            self.updateValue()
+
+    def appendSegment(self, variableID, value):
+        """appendSegment:
+                Appends the segment written by a variable to the chopped value and extends the value with it.
+                Unlike write, the value is extended in place: it must not be a value saved by a variable.
+
+                @type variableID: string
+                @param variableID: the ID of the variable which writes the segment.
+                @type value: bitarray
+                @param value: the written segment.
+        """
+        updated = self.isValueUpdated()
+        self.linkedValue.append([variableID, value])
+        self.appendValue(value)
+        if updated:
+            self.markValueUpdated()
 
 #+---------------------------------------------------------------------------+
 #| Getters and setters                                                       |
@@ -118,6 +118,15 @@ class AbstractNodeVariable(AbstractVariable):
         self.log.debug("-  {0}: shuffleChildren.".format(self.toString()))
         if self.getChildren() is not None:
             random.shuffle(self.getChildren())
+            self.notifyStructureChange()
+
+    def notifyStructureChange(self):
+        """notifyStructureChange:
+                Called each time the list of children changes.
+        """
+        # A variable without father is not in a tree yet (a clone being built for instance).
+        if len(self.fathers) > 0:
+            AbstractVariable.incrementStructureVersion()
 
 #+---------------------------------------------------------------------------+
 #| Functions inherited from AbstractVariable                                 |
@@ -202,16 +211,19 @@ class AbstractNodeVariable(AbstractVariable):
         if self.children is not None:
             self.children.append(child)
             child.addFather(self)
+            self.notifyStructureChange()
 
     def removeChild(self, child):
         if self.children is not None:
             self.children.remove(child)
             child.removeFather(self)
+            self.notifyStructureChange()
 
     def insertChild(self, i, child):
         if self.children is not None:
             self.children.insert(i, child)
             child.addFather(self)
+            self.notifyStructureChange()
 
     def indexOfChild(self, child):
         if self.children is not None:
@@ -49,6 +49,9 @@ class AbstractVariable(object):
             An abstract variable defined in a dictionary.
     """
 
+    # Incremented each time a tree of variables changes, the structures computed from the trees (relation graphs) are checked against it.
+    structureVersion = 0
+
     def __init__(self, _id, name, mutable, learnable, node):
         """Constructor of AbstractVariable:
 
@@ -119,6 +122,29 @@ class AbstractVariable(object):
         progeny.append(self)
         return progeny
 
+    def resolveDictOfValues(self, dictOfValues, processingToken):
+        """resolveDictOfValues:
+                Associate each variable ID of a dictionary of values with its variable.
+                Variables are searched in the progeny of this variable first, and then in the whole vocabulary (pointed variables of relations).
+
+                @type dictOfValues: String*bitarray dict
+                @param dictOfValues: a dictionary returned by getDictOfValues.
+                @type processingToken: netzob.Common.MMSTD.Dictionary.VariableProcessingToken.AbstractVariableProcessingToken.AbstractVariableProcessingToken
+                @param processingToken: a token which contains all critical information on this access.
+                @rtype: (netzob.Common.MMSTD.Dictionary.Variable.AbstractVariable.AbstractVariable, bitarray) List
+                @return: a list of couples variable - value.
+        """
+        progeny = dict()
+        for variable in self.getProgeny():
+            progeny[variable.getID()] = variable
+        variablesAndValues = []
+        for key, val in dictOfValues.iteritems():
+            variable = progeny.get(key)
+            if variable is None:
+                variable = processingToken.getVocabulary().getVariableByID(key)
+            variablesAndValues.append((variable, val))
+        return variablesAndValues
+
     def notifyBoundedVariables(self, access, processingToken, value=None):
         """notifyBoundedVariables:
                 Notify every variable that are bounded to the current variable with a set of segment of the read value.
@@ -299,6 +325,7 @@ class AbstractVariable(object):
 
     def setID(self, _id):
         self.id = _id
+        AbstractVariable.incrementStructureVersion()
 
     def setMutable(self, mutable):
         self.mutable = mutable
@@ -335,6 +362,12 @@ class AbstractVariable(object):
 #+---------------------------------------------------------------------------+
 #| Static methods                                                            |
 #+---------------------------------------------------------------------------+
+    @staticmethod
+    def incrementStructureVersion():
+        """incrementStructureVersion:
+                Tells that a tree of variables has changed, so that the structures computed from the trees are computed again.
+        """
+        AbstractVariable.structureVersion += 1
 
     @staticmethod
     def loadFromXML(xmlRoot, namespace, version, symbol):
@@ -78,6 +78,8 @@ class AggregateVariable(AbstractNodeVariable):
         # We save the state of the underlying variables and the readingToken index before the first treatment.
         globalDictOfValues = dict()
         globalSavedIndex = readingToken.getIndex()
+        memory = readingToken.getMemory()
+        globalCheckpoint = memory.checkpoint()
 
         childrenLeft = self.getChildren()
         orderedChildren = []
@@ -97,10 +99,12 @@ class AggregateVariable(AbstractNodeVariable):
                 dictOfValue = child.getDictOfValues(readingToken)
                 for key, val in dictOfValue.iteritems():
                     localDictOfValues[key] = val
+                localCheckpoint = memory.checkpoint()
 
                 # Child execution.
                 child.read(readingToken)
                 if readingToken.isOk():
+                    memory.release(localCheckpoint)
                     # We have found a suitable child, so we remove it from childrenLeft and add it (at the end, to respect the order) to the orderedChildren list.
                     orderedChildren.append(child)
                     childrenLeft.remove(child)
@@ -111,10 +115,9 @@ class AggregateVariable(AbstractNodeVariable):
                     # It was not a good candidate, so we restore the former values and continue.
                     readingToken.setIndex(localSavedIndex)
                     # We restore values for the child and its successors.
-                    child.restore(readingToken)
-                    vocabulary = readingToken.getVocabulary()
-                    for key, val in localDictOfValues.iteritems():
-                        vocabulary.getVariableByID(key).setCurrentValue(val)
+                    memory.rollback(localCheckpoint)
+                    for (variable, val) in child.resolveDictOfValues(localDictOfValues, readingToken):
+                        variable.setCurrentValue(val)
 
         if not childrenLeft is None:
             # If something went wrong and we can adapt, we learn to adapt.
@@ -126,14 +129,13 @@ class AggregateVariable(AbstractNodeVariable):
         # If it has failed we restore every executed children and the index.
         if not readingToken.isOk():
             readingToken.setIndex(globalSavedIndex)
-            vocabulary = readingToken.getVocabulary()
-            for key, val in globalDictOfValues.iteritems():
-                child = vocabulary.getVariableByID(key)
+            # We restore the cached values.
+            memory.rollback(globalCheckpoint)
+            for (child, val) in self.resolveDictOfValues(globalDictOfValues, readingToken):
                 # We restore the current values.
                 child.setCurrentValue(val)
-                # We restore the cached values.
-                child.restore(readingToken)
         else:
+            memory.release(globalCheckpoint)
             # The value of the variable is simply the value we 'ate'.
             self.currentValue = readingToken.getValue()[globalSavedIndex:readingToken.getIndex()]
 
@@ -153,6 +155,8 @@ class AggregateVariable(AbstractNodeVariable):
         dictOfValues = dict()
         savedIndex = readingToken.getIndex()
         self.currentValue = bitarray('')
+        memory = readingToken.getMemory()
+        checkpoint = memory.checkpoint()
 
         for child in self.getChildren():
             # Memorize each child susceptible to be restored. One by one.
@@ -173,14 +177,15 @@ class AggregateVariable(AbstractNodeVariable):
             # If it is still not OK.
             if not readingToken.isOk():
                 readingToken.setIndex(savedIndex)
-                vocabulary = readingToken.getVocabulary()
-                for key, val in dictOfValues.iteritems():
-                    child = vocabulary.getVariableByID(key)
+                # We restore the cached values.
+                memory.rollback(checkpoint)
+                for (child, val) in self.resolveDictOfValues(dictOfValues, readingToken):
                     # We restore the current values.
                     child.setCurrentValue(val)
-                    # We restore the cached values.
-                    child.restore(readingToken)
+            else:
+                memory.release(checkpoint)
         else:
+            memory.release(checkpoint)
             # The value of the variable is simply the value we 'ate'.
             self.currentValue = readingToken.getValue()[savedIndex:readingToken.getIndex()]
 
@@ -243,6 +248,8 @@ class AggregateVariable(AbstractNodeVariable):
         dictOfValues = dict()
         savedValue = writingToken.getValue()
         savedIndex = writingToken.getIndex()
+        memory = writingToken.getMemory()
+        checkpoint = memory.checkpoint()
         for child in self.getChildren():
             # Memorize each child susceptible to be restored. One by one.
             dictOfValue = child.getDictOfValues(writingToken)
@@ -257,14 +264,13 @@ class AggregateVariable(AbstractNodeVariable):
         # If it has failed we restore every executed children and the value.
         if not writingToken.isOk():
             writingToken.setValue(savedValue)
-            vocabulary = writingToken.getVocabulary()
-            for key, val in dictOfValues.iteritems():
-                child = vocabulary.getVariableByID(key)
+            # We restore the cached values.
+            memory.rollback(checkpoint)
+            for (child, val) in self.resolveDictOfValues(dictOfValues, writingToken):
                 # We restore the current values.
                 child.setCurrentValue(val)
-                # We restore the cached values.
-                child.restore(writingToken)
         else:
+            memory.release(checkpoint)
             # The value of the variable is simply the value we made.
             self.currentValue = writingToken.getValue()[savedIndex:writingToken.getIndex()]
 
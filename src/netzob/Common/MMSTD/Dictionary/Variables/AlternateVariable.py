@@ -74,24 +74,23 @@ class AlternateVariable(AbstractNodeVariable):
         """
         self.log.debug("[ {0} (Alternate): readChildren:".format(AbstractVariable.toString(self)))
         savedIndex = readingToken.getIndex()
+        memory = readingToken.getMemory()
         for child in self.getChildren():
             # Memorized values for the child and its successors.
-            dictOfValues = dict()
-            dictOfValue = child.getDictOfValues(readingToken)
-            for key, val in dictOfValue.iteritems():
-                dictOfValues[key] = val
+            dictOfValues = child.getDictOfValues(readingToken)
+            checkpoint = memory.checkpoint()
 
             child.read(readingToken)
             if readingToken.isOk():
+                memory.release(checkpoint)
                 break
             else:
                 readingToken.setIndex(savedIndex)
 
                 # We restore values for the child and its successors.
-                child.restore(readingToken)
-                vocabulary = readingToken.getVocabulary()
-                for key, val in dictOfValues.iteritems():
-                    vocabulary.getVariableByID(key).setCurrentValue(val)
+                memory.rollback(checkpoint)
+                for (variable, val) in child.resolveDictOfValues(dictOfValues, readingToken):
+                    variable.setCurrentValue(val)
 
         if readingToken.isOk():
             # The value of the variable is simply the value we 'ate'.
@@ -157,9 +156,7 @@ class AlternateVariable(AbstractNodeVariable):
         self.removefather(fakeFather)
         # We restore the action induced by the fake father.
         readingToken.setIndex(savedIndex)
-        vocabulary = readingToken.getVocabulary()
-        for key, val in dictOfValues.iteritems():
-            child = vocabulary.getVariableByID(key)
+        for (child, val) in self.resolveDictOfValues(dictOfValues, readingToken):
             # We restore the current values.
             child.setCurrentValue(val)
             # We restore the cached values.
@@ -181,24 +178,23 @@ class AlternateVariable(AbstractNodeVariable):
 
         savedValue = writingToken.getValue()
         savedIndex = writingToken.getIndex()
+        memory = writingToken.getMemory()
         for child in self.getChildren():
             # Memorized values for the child and its successor.
-            dictOfValues = dict()
-            dictOfValue = child.getDictOfValues(writingToken)
-            for key, val in dictOfValue.iteritems():
-                dictOfValues[key] = val
+            dictOfValues = child.getDictOfValues(writingToken)
+            checkpoint = memory.checkpoint()
 
             child.write(writingToken)
             if writingToken.isOk() and writingToken.getValue() is not None:
+                memory.release(checkpoint)
                 break
             else:
                 writingToken.setValue(savedValue)
 
                 # We restore values for the child and its successor.
-                child.restore(writingToken)
-                vocabulary = writingToken.getVocabulary()
-                for key, val in dictOfValues.iteritems():
-                    vocabulary.getVariableByID(key).setCurrentValue(val)
+                memory.rollback(checkpoint)
+                for (variable, val) in child.resolveDictOfValues(dictOfValues, writingToken):
+                    variable.setCurrentValue(val)
 
         if writingToken.isOk():
             # The value of the variable is simply the value we made.
@@ -76,23 +76,10 @@ class ComputedRelationVariable(AbstractVariable):
                 A reverse pointer or right pointer points from the left of a tree to its right.
         """
         if self.pointedID is None:
-            return True
             self.log.debug("No pointed ID.")
-        treeElements = self.symbol.getRoot().getProgeny()
-        found = False
-        for element in treeElements:
-            if not found and element.getID() == self.pointedID:
-                self.log.debug("We found the pointed value.")
-                found = True
-            if element.getID() == self.getID():
-                if found:
-                    self.log.debug("The pointing value is after the pointed value in the same tree.")
-                    return True
-                else:
-                    self.log.debug("The pointing value is before the pointed value or in a different tree.")
-                    return False
-        self.log.debug("Default case.")
-        return True
+            return True
+        # The positions of the variables in the tree are computed once per symbol.
+        return self.symbol.getRelationGraph().isDirectPointer(self)
 
     def retrieveValue(self, processingToken):
         """retrieveValue:
@@ -169,9 +156,9 @@ class ComputedRelationVariable(AbstractVariable):
     def computeValue(self, value):
         """computeValue:
                 Compute the value of the relation variable from the given value..
+                The relation type memorizes the values it has already computed.
         """
-        self.log.debug("- {0}: computeValue.".format(self.toString()))
-        return self.relationType.computeValue(value)
+        return self.relationType.getComputedValue(value)
 
     def writeValue(self, writingToken):
         """writeValue:
@@ -380,7 +367,8 @@ class ComputedRelationVariable(AbstractVariable):
         if readingToken.isOk():
             self.notifyBoundedVariables("read", readingToken, pointedValue)
 
-        self.log.debug("Variable {0}: {1}. ]".format(self.getName(), readingToken.toString()))
+        # The value of the token is not rendered: a relation is notified each time its pointed variable is written.
+        self.log.debug("Variable {0}: isOk: {1}. ]".format(self.getName(), str(readingToken.isOk())))
 
     def notifiedWrite(self, writingToken):
         """notify:
@@ -408,7 +396,8 @@ class ComputedRelationVariable(AbstractVariable):
         if writingToken.isOk():
             self.notifyBoundedVariables("write", writingToken)
 
-        self.log.debug("Variable {0}: {1}. ]".format(self.getName(), writingToken.toString()))
+        # The value of the token is not rendered: a relation is notified each time its pointed variable is written.
+        self.log.debug("Variable {0}: isOk: {1}. ]".format(self.getName(), str(writingToken.isOk())))
 
 #+---------------------------------------------------------------------------+
 #| Getters and setters                                                       |
@@ -424,7 +413,10 @@ class ComputedRelationVariable(AbstractVariable):
             if self.pointedVariable.getID() == self.pointedID:
                 # The pointed variable is already set.
                 return self.pointedVariable
-        self.pointedVariable = self.symbol.getProject().getVocabulary().getVariableByID(self.pointedID)
+        # The pointed variable is searched in the tree of the symbol before the whole vocabulary.
+        self.pointedVariable = self.symbol.getRelationGraph().getVariableByID(self.pointedID)
+        if self.pointedVariable is None:
+            self.pointedVariable = self.symbol.getProject().getVocabulary().getVariableByID(self.pointedID)
         return self.pointedVariable
 
     def getDataType(self):
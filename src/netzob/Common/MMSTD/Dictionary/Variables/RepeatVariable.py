@@ -229,6 +229,12 @@ class RepeatVariable(AbstractNodeVariable):
             progeny.extend(self.child.getProgeny())
         return progeny
 
+    def notifyStructureChange(self):
+        """notifyStructureChange:
+                The children are the iterations of the child made at each access, they are not part of the progeny.
+        """
+        pass
+
     def read(self, readingToken):
         """read:
                 Each child tries sequentially to read a part of the read value.
@@ -316,6 +322,7 @@ class RepeatVariable(AbstractNodeVariable):
 
     def setChild(self, child):
         self.child = child
+        AbstractVariable.incrementStructureVersion()
 
 #+---------------------------------------------------------------------------+
 #| Static methods                                                            |
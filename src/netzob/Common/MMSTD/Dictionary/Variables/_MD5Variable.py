@@ -57,6 +57,9 @@ class MD5Variable(Variable):
         self.id_var = id_var
         self.binVal = None
         self.strVal = None
+        # The last hashed data and its digest, the data is hashed again only when it changes.
+        self.hashedData = None
+        self.digest = None
 
     def getValue(self, negative, dictionary):
         return (self.binVal, self.strVal)
@@ -66,16 +69,23 @@ class MD5Variable(Variable):
         var = dictionary.getVariableByID(self.id_var)
         (binToHash, strToHash) = var.getValue(negative, dictionary)
 
+        md5Hex = self.computeDigest(binToHash)
+        self.binVal = TypeConvertor.hex2bin(md5Hex)
+        self.strVal = TypeConvertor.bin2strhex(self.binVal)
+        self.log.debug("Generated MD5 = " + self.strVal)
+
+    def computeDigest(self, binToHash):
         toHash = TypeConvertor.bin2string(binToHash)
+        if self.hashedData is not None and self.hashedData == (self.init, toHash):
+            return self.digest
         self.log.debug("Will hash the followings : " + toHash)
 
         md5core = hashlib.md5(self.init)
         md5core.update(toHash)
 
-        md5Hex = md5core.digest()
-        self.binVal = TypeConvertor.hex2bin(md5Hex)
-        self.strVal = TypeConvertor.bin2strhex(self.binVal)
-        self.log.debug("Generated MD5 = " + self.strVal)
+        self.hashedData = (self.init, toHash)
+        self.digest = md5core.digest()
+        return self.digest
 
     def learn(self, val, indice, isForced, dictionary):
 
@@ -89,13 +99,7 @@ class MD5Variable(Variable):
                 var = dictionary.getVariableByID(self.id_var)
                 (binToHash, strToHash) = var.getValue(False, dictionary)
 
-                toHash = TypeConvertor.bin2string(binToHash)
-                self.log.debug("Will hash the followings : " + toHash)
-
-                md5core = hashlib.md5(self.init)
-                md5core.update(toHash)
-
-                md5Hex = md5core.digest()
+                md5Hex = self.computeDigest(binToHash)
 
                 self.log.debug("We should received an MD5 = " + str(TypeConvertor.hex2bin(md5Hex)))
                 self.log.debug("We have received " + str(binVal))
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports                                                  |
+#+---------------------------------------------------------------------------+
+from gettext import gettext as _
+from bitarray import bitarray
+import logging
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports                                               |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports                                                 |
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable import AbstractVariable
+from netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable import ComputedRelationVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.Variables.RepeatVariable import RepeatVariable
+
+
+#+---------------------------------------------------------------------------+
+#| WritingProgram:
+#|     The write access of the root variable of a symbol compiled in a list
+#|     of instructions. Consecutive constant data variables are pre-rendered
+#|     in a template appended at once to the written value, only the values
+#|     of the mutable data variables are generated at emission time, relation
+#|     variables reuse the position of their pointed variable computed at
+#|     compilation time and the other variables are written by the tree
+#|     itself. Each instruction checks the values it was compiled for, so
+#|     the written value, the token segments and the chopped indexes are the
+#|     ones of the root variable.
+#+---------------------------------------------------------------------------+
+class WritingProgram(object):
+
+    # Writes a run of data variables which are not mutable
+    CONSTANT = 0
+    # Generates and writes a data variable which is mutable but not learnable
+    GENERATE = 1
+    # Writes a computed relation variable
+    RELATION = 2
+    # Delegates the write access to the variable
+    VARIABLE = 3
+
+    def __init__(self, root):
+        """Constructor of WritingProgram:
+
+                @type root: netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable.AggregateVariable
+                @param root: the not mutable and not learnable aggregate which is compiled.
+        """
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.MMSTD.Dictionary.WritingProgram.py')
+        self.root = root
+        self.structureVersion = AbstractVariable.structureVersion
+        self.children = list(root.getChildren())
+        self.instructions = []
+        self.variablesByID = dict()
+        self.compile()
+
+    def compile(self):
+        """compile:
+                Computes the instructions executed for the children of the root.
+                An instruction is a tuple (instruction, variables, template).
+        """
+        run = []
+        for child in self.children:
+            self.registerVariables(child)
+            if child.getVariableType() == DataVariable.TYPE and not child.isMutable() and child.getCurrentValue() is not None:
+                segment = bitarray()
+                segment.extend(child.getCurrentValue())
+                if not child.getType().isSized():
+                    segment.extend(child.getType().getDelimiter())
+                run.append((child, child.getCurrentValue(), child.getType(), segment))
+                continue
+            self.appendConstants(run)
+            run = []
+            if child.getVariableType() == ComputedRelationVariable.TYPE:
+                # The position of the pointed variable does not change until the tree changes
+                directPointer = child.findDirectPointer()
+                self.instructions.append((WritingProgram.RELATION, [(child, child.getPointedID(), directPointer)], None))
+            elif child.getVariableType() == DataVariable.TYPE and child.isMutable() and not child.isLearnable():
+                self.instructions.append((WritingProgram.GENERATE, [child], None))
+            else:
+                self.instructions.append((WritingProgram.VARIABLE, [child], None))
+        self.appendConstants(run)
+        self.log.debug("Compiled {0} instructions for {1}".format(len(self.instructions), self.root.getName()))
+
+    def appendConstants(self, run):
+        if len(run) == 0:
+            return
+        template = bitarray()
+        bounded = False
+        for (variable, value, _type, segment) in run:
+            template.extend(segment)
+            bounded = bounded or len(variable.getBoundedVariables()) > 0
+        # Bounded variables are notified once their segment is written
+        if bounded:
+            template = None
+        self.instructions.append((WritingProgram.CONSTANT, run, template))
+
+    def registerVariables(self, variable):
+        self.variablesByID[variable.getID()] = variable
+        if variable.isNode() and variable.getVariableType() != RepeatVariable.TYPE and variable.getChildren() is not None:
+            for child in variable.getChildren():
+                self.registerVariables(child)
+
+    def isCompiledFrom(self, root):
+        """isCompiledFrom:
+                Tells if the program still matches the given root variable.
+
+                @type root: netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable.AggregateVariable
+                @param root: the root variable of the symbol.
+                @rtype: boolean
+                @return: True if the root and its children are the compiled ones and no variable tree has changed since.
+        """
+        if self.structureVersion != AbstractVariable.structureVersion or root is not self.root or root.isMutable():
+            return False
+        children = root.getChildren()
+        if children is None or len(children) != len(self.children):
+            return False
+        for (child, compiledChild) in zip(children, self.children):
+            if child is not compiledChild:
+                return False
+        return True
+
+    def isRunValid(self, run):
+        for (variable, value, _type, segment) in run:
+            if variable.mutable or variable.currentValue is not value or variable.type is not _type:
+                return False
+        return True
+
+    def isRunBound(self, run):
+        for (variable, value, _type, segment) in run:
+            if len(variable.boundedVariables) > 0:
+                return True
+        return False
+
+    def getVariableByID(self, vocabulary, idVar):
+        variable = self.variablesByID.get(idVar)
+        if variable is None:
+            variable = vocabulary.getVariableByID(idVar)
+        return variable
+
+    def write(self, writingToken):
+        """write:
+                Executes the program, as AggregateVariable.write on the root.
+
+                @type writingToken: netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableWritingToken.VariableWritingToken
+                @param writingToken: a token which contains all critical information on this access.
+        """
+        # Segments are appended to the value, which must be made of the segments of the token.
+        if len(writingToken.getValue()) > 0 or len(writingToken.getLinkedValue()) > 0:
+            self.root.write(writingToken)
+            return
+
+        root = self.root
+        root.resetTokenChoppedIndexes()
+        dictOfValues = dict()
+        savedValue = writingToken.getValue()
+        savedIndex = writingToken.getIndex()
+        memory = writingToken.getMemory()
+        checkpoint = memory.checkpoint()
+        # The saved value must not be extended by the appended segments
+        writingToken.setValue(bitarray(savedValue))
+        writingToken.markValueUpdated()
+
+        for (instruction, variables, template) in self.instructions:
+            if instruction == WritingProgram.CONSTANT and self.isRunValid(variables):
+                if template is not None and self.isRunBound(variables):
+                    # A variable bound since the compilation is notified when its segment is written
+                    template = None
+                self.writeConstants(writingToken, variables, template, dictOfValues)
+            elif instruction == WritingProgram.GENERATE and variables[0].mutable and not variables[0].learnable and variables[0].currentValue is not None:
+                variable = variables[0]
+                dictOfValues[variable.id] = variable.currentValue
+                self.writeGenerated(writingToken, variable)
+            elif instruction == WritingProgram.RELATION and variables[0][0].getPointedID() == variables[0][1]:
+                (variable, pointedID, directPointer) = variables[0]
+                for key, val in variable.getDictOfValues(writingToken).iteritems():
+                    dictOfValues[key] = val
+                self.writeRelation(writingToken, variable, directPointer)
+            else:
+                for variable in self.getVariables(instruction, variables):
+                    for key, val in variable.getDictOfValues(writingToken).iteritems():
+                        dictOfValues[key] = val
+                    variable.write(writingToken)
+                    if not writingToken.isOk():
+                        break
+            if not writingToken.isOk():
+                break
+
+        if not writingToken.isOk():
+            writingToken.setValue(savedValue)
+            memory.rollback(checkpoint)
+            vocabulary = writingToken.getVocabulary()
+            for key, val in dictOfValues.iteritems():
+                self.getVariableByID(vocabulary, key).setCurrentValue(val)
+        else:
+            memory.release(checkpoint)
+            root.currentValue = writingToken.getValue()[savedIndex:writingToken.getIndex()]
+            if len(root.boundedVariables) > 0:
+                root.notifyBoundedVariables("write", writingToken)
+
+    def getVariables(self, instruction, variables):
+        if instruction == WritingProgram.VARIABLE or instruction == WritingProgram.GENERATE:
+            return variables
+        return [variable[0] for variable in variables]
+
+    def writeConstants(self, writingToken, run, template, dictOfValues):
+        """writeConstants:
+                Writes the segments of a run of constant data variables, as their writeValue.
+        """
+        linkedValue = writingToken.getLinkedValue()
+        updated = writingToken.isValueUpdated()
+        for (variable, value, _type, segment) in run:
+            dictOfValues[variable.id] = value
+            if template is None:
+                writingToken.appendSegment(variable.id, bitarray(segment))
+            else:
+                linkedValue.append([variable.id, bitarray(segment)])
+            variable.tokenChoppedIndexes = []
+            self.addTokenChoppedIndex(variable, len(linkedValue) - 1)
+            if template is None and writingToken.isOk() and len(variable.boundedVariables) > 0:
+                variable.notifyBoundedVariables("write", writingToken)
+        if template is not None:
+            writingToken.appendValue(template)
+            if updated:
+                writingToken.markValueUpdated()
+
+    def writeGenerated(self, writingToken, variable):
+        """writeGenerated:
+                Generates a new value of a mutable data variable and writes it, as its write access.
+        """
+        variable.tokenChoppedIndexes = []
+        variable.setCurrentValue(variable.type.generateValue(writingToken.getGenerationStrategy()))
+        value = bitarray()
+        value.extend(variable.getValue(writingToken))
+        if not variable.type.isSized():
+            value.extend(variable.type.getDelimiter())
+        writingToken.appendSegment(variable.id, value)
+        self.addTokenChoppedIndex(variable, len(writingToken.getLinkedValue()) - 1)
+        if writingToken.isOk() and len(variable.boundedVariables) > 0:
+            variable.notifyBoundedVariables("write", writingToken)
+
+    def addTokenChoppedIndex(self, variable, choppedIndex):
+        """addTokenChoppedIndex:
+                Adds the index of a segment to the variable and its fathers, as AbstractVariable.addTokenChoppedIndex.
+        """
+        variable.tokenChoppedIndexes.append(choppedIndex)
+        for father in variable.fathers:
+            self.addTokenChoppedIndex(father, choppedIndex)
+
+    def writeRelation(self, writingToken, variable, directPointer):
+        """writeRelation:
+                Writes a computed relation variable, as its write access.
+        """
+        variable.resetTokenChoppedIndexes()
+        variable.directPointer = directPointer
+        if variable.isDefined(writingToken):
+            if not directPointer:
+                # The real value is written at notification time.
+                variable.bindValue(writingToken)
+                variable.guessValue()
+            else:
+                variable.retrieveValue(writingToken)
+            writingToken.appendSegment(variable.id, variable.currentValue)
+        else:
+            writingToken.setOk(False)
+        if writingToken.isOk() and len(variable.boundedVariables) > 0:
+            variable.notifyBoundedVariables("write", writingToken)
+
+    def getRoot(self):
+        return self.root
+
+    def getInstructions(self):
+        return self.instructions
@@ -82,6 +82,13 @@ class MMSTD(Automata):
         # The transitions
         self.transitions = []
 
+        # Indexes of the states and of the transitions by ID, and of the
+        # outgoing and incoming transitions of each state (by state ID)
+        self.statesByID = dict()
+        self.transitionsByID = dict()
+        self.outgoingTransitions = dict()
+        self.incomingTransitions = dict()
+
         # The dictionary
         self.vocabulary = vocabulary
 
@@ -89,60 +96,64 @@ class MMSTD(Automata):
         self.initialState = state
 
     def addState(self, state):
-        if not state in self.states:
+        if not state.getID() in self.statesByID:
             self.states.append(state)
+            self.statesByID[state.getID()] = state
         else:
             logging.debug("The state cannot be added one more time in the grammar.")
 
+    def getStateByID(self, stateID):
+        """getStateByID:
+                Retrieve the state of the automata which has the provided ID.
+                @return: the state or None if none has this ID
+        """
+        return self.statesByID.get(stateID)
+
     #+---------------------------------------------------------------------------+
     #| getTransitionsLeadingToState:
     #|     retrieve all the transitions which ends on the provide state
     #| @return a list of transition
     #+---------------------------------------------------------------------------+
     def getTransitionsLeadingToState(self, state):
-        transitions = []
-        for transition in self.getTransitions():
-            if transition.getOutputState().getID() == state.getID():
-                transitions.append(transition)
-
-        return transitions
+        return list(self.incomingTransitions.get(state.getID(), []))
 
     def getTransitionsStartingFromState(self, state):
         """getTransitionsStartingFromState:
                 Retreive all the transitions which starts from the provide state.
                 @return: a list of transition
         """
-        transitions = []
-        for transition in self.getTransitions():
-            if transition.getInputState().getID() == state.getID():
-                transitions.append(transition)
-        return transitions
+        return list(self.outgoingTransitions.get(state.getID(), []))
 
     def removeState(self, state):
         # First we remove the transitions
-        transitionsToRemove = []
-        for transition in self.transitions:
-            if transition.getOutputState().getID() == state.getID():
-                transitionsToRemove.append(transition)
+        transitionsToRemove = self.getTransitionsLeadingToState(state)
         for transition in state.getTransitions():
-            transitionsToRemove.append(transition)
+            if not transition in transitionsToRemove:
+                transitionsToRemove.append(transition)
 
         for transition in transitionsToRemove:
             self.removeTransition(transition)
 
         self.states.remove(state)
+        self.statesByID.pop(state.getID(), None)
 
     def removeTransition(self, transition):
-        if transition in self.transitions:
-            for state in self.states:
-                self.log.debug("Unregister transition {0} from state {1}".format(transition.getName(), state.getName()))
-                state.unregisterTransition(transition)
+        if transition.getID() in self.transitionsByID:
+            inputState = transition.getInputState()
+            self.log.debug("Unregister transition {0} from state {1}".format(transition.getName(), inputState.getName()))
+            inputState.unregisterTransition(transition)
             self.log.debug("Remove transition {0} from the MMSTD".format(transition.getName()))
             self.transitions.remove(transition)
+            del self.transitionsByID[transition.getID()]
+            self.outgoingTransitions[inputState.getID()].remove(transition)
+            self.incomingTransitions[transition.getOutputState().getID()].remove(transition)
 
     def addTransition(self, transition):
-        if not transition in self.transitions:
+        if not transition.getID() in self.transitionsByID:
             self.transitions.append(transition)
+            self.transitionsByID[transition.getID()] = transition
+            self.outgoingTransitions.setdefault(transition.getInputState().getID(), []).append(transition)
+            self.incomingTransitions.setdefault(transition.getOutputState().getID(), []).append(transition)
 
     #+---------------------------------------------------------------------------+
     #| getOutputTrace:
@@ -157,9 +168,8 @@ class MMSTD(Automata):
         for i in range(0, len(symbols)):
             if state is not None:
                 state = state.executeAsClient(abstractionLayer)
-        outputMessages = abstractionLayer.getOutputMessages()
         generatedSymbols = []
-        for (sendingTime, strMessage, symbol) in outputMessages:
+        for symbol in abstractionLayer.getGeneratedOutputSymbols():
             generatedSymbols.append(symbol)
 
         return (generatedSymbols, state)
@@ -203,29 +213,21 @@ class MMSTD(Automata):
     #+---------------------------------------------------------------------------+
     def getAllStates(self):
         states = []
+        discovered = set()
         toAnalyze = []
         toAnalyze.append(self.initialState)
+        if self.initialState is not None:
+            discovered.add(self.initialState.getID())
         while (len(toAnalyze) > 0):
             currentState = toAnalyze.pop()
             if currentState is not None:
-                found = False
-                for tmpState in states:
-                        if tmpState.getID() == currentState.getID():
-                            found = True
-                if not found:
-                    for transition in currentState.getTransitions():
-                        self.log.info("currentState " + str(currentState.getName()) + " has the following transition : " + str(transition))
-                        outputState = transition.getOutputState()
-                        found = False
-                        for tmpState in states:
-                            if tmpState.getID() == outputState.getID():
-                                found = True
-                        for tmpState in toAnalyze:
-                            if tmpState.getID() == outputState.getID():
-                                found = True
-                        if not found:
-                            toAnalyze.append(outputState)
-                    states.append(currentState)
+                for transition in currentState.getTransitions():
+                    self.log.debug("currentState " + str(currentState.getName()) + " has the following transition : " + str(transition))
+                    outputState = transition.getOutputState()
+                    if not outputState.getID() in discovered:
+                        discovered.add(outputState.getID())
+                        toAnalyze.append(outputState)
+                states.append(currentState)
             else:
                 self.log.error("state = NONE !!")
         return states
@@ -258,7 +260,7 @@ class MMSTD(Automata):
                         break
                 if error:
                     deprecatedTransitions.append(transition)
-        for transiton in deprecatedTransitions:
+        for transition in deprecatedTransitions:
             self.removeTransition(transition)
 
     #+---------------------------------------------------------------------------+
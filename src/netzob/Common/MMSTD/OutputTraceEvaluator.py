@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+----------------------------------------------
+#| Standard library imports
+#+----------------------------------------------
+from gettext import gettext as _
+import logging
+
+#+----------------------------------------------
+#| Related third party imports
+#+----------------------------------------------
+
+#+----------------------------------------------
+#| Local application imports
+#+----------------------------------------------
+from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
+from netzob.Common.MMSTD.Symbols.impl.UnknownSymbol import UnknownSymbol
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+
+
+#+----------------------------------------------
+#| OutputTraceEvaluator:
+#|    Computes the output traces of an MMSTD without
+#|    simulating the abstraction layer. The automata
+#|    is compiled in a table indexed by state and input
+#|    symbol IDs and the traces of the already evaluated
+#|    prefixes are memorized in a prefix tree, so that
+#|    evaluating a suite of tests costs the size of its
+#|    prefix tree. Automata which are not deterministic
+#|    Mealy machines (stochastic outputs, channel
+#|    transitions, ...) are delegated to MMSTD.getOutputTrace
+#+----------------------------------------------
+class OutputTraceEvaluator(object):
+
+    def __init__(self, mmstd):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Common.MMSTD.OutputTraceEvaluator.py')
+        self.mmstd = mmstd
+        # stateID -> {inputSymbolID: (outputSymbol, outputState)}
+        self.table = dict()
+        # stateID -> root of the prefix tree, each node is [state, outputSymbol, children]
+        self.prefixTrees = dict()
+        self.nbNodes = 0
+        self.compiled = self.compile()
+
+    def compile(self):
+        """compile:
+                Computes the transition table of the states reachable from
+                the initial state of the MMSTD.
+
+                @rtype: boolean
+                @return: True if the MMSTD can be evaluated through the table
+        """
+        for state in self.mmstd.getAllStates():
+            transitions = dict()
+            for transition in state.getTransitions():
+                if transition.getType() != SemiStochasticTransition.TYPE or len(transition.getOutputSymbols()) > 1:
+                    self.log.debug("Transition {0} is not deterministic, the MMSTD will be simulated".format(transition.getName()))
+                    self.table = dict()
+                    return False
+                # Like NormalState, the first valid transition is executed
+                inputSymbolID = transition.getInputSymbol().getID()
+                if not inputSymbolID in transitions:
+                    outputSymbol = None
+                    if len(transition.getOutputSymbols()) == 1:
+                        outputSymbol = transition.getOutputSymbols()[0][0]
+                    transitions[inputSymbolID] = (outputSymbol, transition.getOutputState())
+            # A state without transition ends the execution
+            if len(transitions) == 0:
+                transitions = None
+            self.table[state.getID()] = transitions
+        return True
+
+    def getOutputTrace(self, state, symbols):
+        """getOutputTrace:
+                Returns the generated symbols and the end state if we simulate the
+                given symbols as inputs from the provided state, as MMSTD.getOutputTrace.
+                Input symbols are expected to be abstracted in themselves.
+
+                @type state: netzob.Common.MMSTD.States.AbstractState.AbstractState
+                @param state: the state to start from
+                @type symbols: list
+                @param symbols: the input symbols
+                @rtype: tuple
+                @return: the generated symbols and the end state
+        """
+        if not self.compiled or state is None or not state.getID() in self.table:
+            return self.mmstd.getOutputTrace(state, symbols)
+        # Only vocabulary symbols are abstracted in themselves
+        for symbol in symbols:
+            if symbol.getType() == EmptySymbol.TYPE or symbol.getType() == UnknownSymbol.TYPE:
+                return self.mmstd.getOutputTrace(state, symbols)
+
+        node = self.prefixTrees.get(state.getID())
+        if node is None:
+            node = [state, None, dict()]
+            self.prefixTrees[state.getID()] = node
+
+        generatedSymbols = []
+        for symbol in symbols:
+            currentState = node[0]
+            if currentState is None:
+                break
+            child = node[2].get(symbol.getID())
+            if child is None:
+                child = self.computeNode(currentState, symbol)
+                node[2][symbol.getID()] = child
+                self.nbNodes += 1
+            if child[1] is not None:
+                generatedSymbols.append(child[1])
+            node = child
+        return (generatedSymbols, node[0])
+
+    def computeNode(self, state, symbol):
+        transitions = self.table[state.getID()]
+        if transitions is None:
+            return [None, None, dict()]
+        entry = transitions.get(symbol.getID())
+        if entry is None:
+            # The symbol is not accepted, we stay in the same state
+            return [state, None, dict()]
+        (outputSymbol, outputState) = entry
+        return [outputState, outputSymbol, dict()]
+
+    #+----------------------------------------------
+    #| GETTERS
+    #+----------------------------------------------
+    def getMMSTD(self):
+        return self.mmstd
+
+    def isCompiled(self):
+        return self.compiled
+
+    def getNbNodes(self):
+        return self.nbNodes
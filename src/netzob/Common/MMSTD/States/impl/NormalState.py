@@ -107,18 +107,29 @@ class NormalState(AbstractState):
             self.log.warn("The current state has no transitions available.")
             return None
 
+        profiler = abstractionLayer.getProfiler()
+
         # If there is a "special" transition we execute them
         for transition in self.getTransitions():
             if transition.getType() == "OpenChannel" or transition.getType() == "CloseChannel":
+                if profiler is not None:
+                    profiler.enterStep(transition.getName())
                 newState = transition.executeAsClient(abstractionLayer)
+                if profiler is not None:
+                    profiler.leaveStep()
                 return newState
 
         self.activate()
-        # Wait for a message
-
-        tupleReception = abstractionLayer.receiveSymbolWithTimeout(5)
+        # The reception is attributed to the state until it selects a transition
+        if profiler is not None:
+            profiler.enterStep(self.name)
+        # Wait for a message (as long as the most patient transition would)
+        receptionTimeout = max([transition.computeReceptionTimeout(abstractionLayer) for transition in self.getTransitions()])
+        tupleReception = abstractionLayer.receiveSymbolWithTimeout(receptionTimeout)
         if tupleReception == (None, None):
             self.log.warn("Warning the abstraction layer returns null")
+            if profiler is not None:
+                profiler.leaveStep()
             return None
 
         (receivedSymbol, message) = tupleReception
@@ -128,10 +139,16 @@ class NormalState(AbstractState):
             for transition in self.getTransitions():
                 if transition.isValid(receivedSymbol):
                     self.log.debug("Received data '" + str(message) + "' is valid for transition " + str(transition.getID()))
+                    if profiler is not None:
+                        profiler.renameStep(transition.getName())
                     newState = transition.executeAsClient(abstractionLayer)
+                    if profiler is not None:
+                        profiler.leaveStep()
                     self.deactivate()
                     return newState
             self.log.warn("The message abstracted in a symbol is not valid according to the automata")
+        if profiler is not None:
+            profiler.leaveStep()
         self.deactivate()
         return self
 
@@ -155,7 +172,12 @@ class NormalState(AbstractState):
         pickedTransition = self.getTransitions()[idRandom]
         self.log.info("Randomly picked the transition " + pickedTransition.getName())
 
+        profiler = abstractionLayer.getProfiler()
+        if profiler is not None:
+            profiler.enterStep(pickedTransition.getName())
         newState = pickedTransition.executeAsMaster(abstractionLayer)
+        if profiler is not None:
+            profiler.leaveStep()
 
         # in case an error occured while executing the transition
         if newState is None:
@@ -56,6 +56,8 @@ class AbstractTransition():
         self.outputState = outputState
         self.inputState = inputState
         self.active = False
+        # number of seconds spent waiting for a message (None means the default of the scheduler)
+        self.receptionTimeout = None
 
     #+-----------------------------------------------------------------------+
     #| isValid
@@ -140,6 +142,21 @@ class AbstractTransition():
     def isActive(self):
         return self.active
 
+    #+-----------------------------------------------------------------------+
+    #| computeReceptionTimeout
+    #|     computes the number of seconds to wait for a message while
+    #|     executing the transition
+    #| @param abstractionLayer the abstract layer which schedules the execution
+    #| @return the timeout of the transition or the default of the scheduler
+    #+-----------------------------------------------------------------------+
+    def computeReceptionTimeout(self, abstractionLayer):
+        if self.receptionTimeout is not None:
+            return self.receptionTimeout
+        return abstractionLayer.getScheduler().getReceptionTimeout()
+
+    def getReceptionTimeout(self):
+        return self.receptionTimeout
+
     def getType(self):
         return self.type
 
@@ -155,6 +172,9 @@ class AbstractTransition():
     def setInputState(self, inputState):
         self.inputState = inputState
 
+    def setReceptionTimeout(self, receptionTimeout):
+        self.receptionTimeout = receptionTimeout
+
     @staticmethod
     def loadFromXML(states, vocabulary, xmlRoot, namespace, version):
         if xmlRoot.get("{http://www.w3.org/2001/XMLSchema-instance}type", "abstract") == "netzob:OpenChannelTransition":
@@ -30,7 +30,6 @@
 #+---------------------------------------------------------------------------+
 from gettext import gettext as _
 import logging
-import time
 
 
 #+---------------------------------------------------------------------------+
@@ -105,9 +104,10 @@ class CloseChannelTransition(AbstractTransition):
     #+-----------------------------------------------------------------------+
     def closeConnection(self, abstractionLayer):
         self.log.debug("CloseChannelTransition executed.")
-        time.sleep(int(self.disconnectionTime) / 1000)
+        scheduler = abstractionLayer.getScheduler()
+        scheduler.wait(self.disconnectionTime)
         abstractionLayer.disconnect()
-        time.sleep(int(self.disconnectionTime) / 1000)
+        scheduler.wait(self.disconnectionTime)
         return True
 
     def getDescription(self):
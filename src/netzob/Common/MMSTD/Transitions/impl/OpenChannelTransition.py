@@ -30,8 +30,6 @@
 #+---------------------------------------------------------------------------+
 from gettext import gettext as _
 import logging
-import time
-from datetime import datetime
 import uuid
 #+---------------------------------------------------------------------------+
 #| Related third party imports
@@ -54,6 +52,8 @@ from netzob.Common.MMSTD.States.impl.NormalState import NormalState
 class OpenChannelTransition(AbstractTransition):
 
     TYPE = "OpenChannel"
+    # maximum number of seconds an instanciated server waits for the end of the session
+    SESSION_TIMEOUT = 60
 
     def __init__(self, id, name, inputState, outputState, connectionTime, maxNumberOfAttempt):
         AbstractTransition.__init__(self, OpenChannelTransition.TYPE, id, name, inputState, outputState)
@@ -89,37 +89,12 @@ class OpenChannelTransition(AbstractTransition):
             abstractionLayer.openServer(abstractionLayer.getVocabulary(), self.outputState, False)
             self.deactivate()
 
-            startTime = datetime.now()
-
             # Here we wait for someone to connect to our server !
-            finish = abstractionLayer.isConnected()
-            error = False
-            while (not finish):
-                self.log.info("No one is connected !")
-                currentTime = datetime.now()
-                if ((currentTime - startTime).microseconds > self.connectionTime):
-                    finish = True
-                    error = True
-                else:
-                    finish = abstractionLayer.isConnected()
-                time.sleep(1)
-
-            if error:
+            if not abstractionLayer.waitForConnection(True, float(self.connectionTime) / 1000):
                 self.log.warn("No client has connect to our oracle.")
                 return None
             else:
-                error = False
-                startTime = datetime.now()
-                finish = not abstractionLayer.isConnected()
-                while (not finish):
-                    currentTime = datetime.now()
-                    if ((currentTime - startTime).microseconds > 60000):
-                        finish = True
-                        error = True
-                    else:
-                        finish = not abstractionLayer.isConnected()
-                    time.sleep(1)
-                if error:
+                if not abstractionLayer.waitForConnection(False, OpenChannelTransition.SESSION_TIMEOUT):
                     self.log.warn("Stop the server even if the client are still up")
 
                 self.log.debug("The openChannelTransition finishes (the generated instance has been closed)!")
@@ -152,22 +127,8 @@ class OpenChannelTransition(AbstractTransition):
             abstractionLayer.openServer(abstractionLayer.getVocabulary(), self.outputState, True)
             self.deactivate()
 
-            startTime = datetime.now()
-
             # Here we wait for someone to connect to our server !
-            finish = abstractionLayer.isConnected()
-            error = False
-            while (not finish):
-                self.log.info("No one is connected !")
-                currentTime = datetime.now()
-                if ((currentTime - startTime).microseconds > self.connectionTime):
-                    finish = True
-                    error = True
-                else:
-                    finish = abstractionLayer.isConnected()
-                time.sleep(1)
-
-            if error:
+            if not abstractionLayer.waitForConnection(True, float(self.connectionTime) / 1000):
                 self.log.warn("No client has connect to our oracle.")
                 return None
             else:
@@ -193,7 +154,7 @@ class OpenChannelTransition(AbstractTransition):
         i = self.maxNumberOfAttempt
         j = 1
         while (not abstractionLayer.isConnected() and i > 0):
-            time.sleep(int(self.connectionTime) / 1000)
+            abstractionLayer.getScheduler().wait(self.connectionTime)
             abstractionLayer.connect()
             if abstractionLayer.isConnected():
                 self.log.debug("Connected !")
@@ -31,7 +31,6 @@
 from gettext import gettext as _
 import logging
 import random
-import time
 
 
 #+---------------------------------------------------------------------------+
@@ -153,8 +152,8 @@ class SemiStochasticTransition(AbstractTransition):
         if (len(self.outputSymbols) > 0):
             [outputSymbol, probability, reactionTime] = self.pickOutputSymbol()
 
-            # before sending it we simulate the reaction time
-            time.sleep(int(reactionTime) / 1000)
+            # before sending it we simulate the reaction time (relative to the reception of the input symbol)
+            abstractionLayer.getScheduler().waitReaction(reactionTime)
 
             abstractionLayer.writeSymbol(outputSymbol)
         self.deactivate()
@@ -175,8 +174,9 @@ class SemiStochasticTransition(AbstractTransition):
         errors = False
 
         abstractionLayer.writeSymbol(self.inputSymbol)
+        receptionTimeout = self.computeReceptionTimeout(abstractionLayer)
         while (not finish):
-            (receivedSymbol, message) = abstractionLayer.receiveSymbolWithTimeout(5)
+            (receivedSymbol, message) = abstractionLayer.receiveSymbolWithTimeout(receptionTimeout)
             if receivedSymbol is None:
                 self.log.info("Message received = NONE ")
                 finish = True
@@ -219,6 +219,8 @@ class SemiStochasticTransition(AbstractTransition):
         xmlTransition.set("id", str(self.getID()))
         xmlTransition.set("name", str(self.getName()))
         xmlTransition.set("{http://www.w3.org/2001/XMLSchema-instance}type", "netzob:SemiStochasticTransition")
+        if self.getReceptionTimeout() is not None:
+            xmlTransition.set("receptionTimeout", str(self.getReceptionTimeout()))
 
         xmlStartState = etree.SubElement(xmlTransition, "{" + namespace + "}startState")
         xmlStartState.text = str(self.getInputState().getID())
@@ -269,6 +271,8 @@ class SemiStochasticTransition(AbstractTransition):
             return None
 
         transition = SemiStochasticTransition(idTransition, nameTransition, inputStateTransition, outputStateTransition, inputSymbol)
+        if xmlTransition.get("receptionTimeout") is not None:
+            transition.setReceptionTimeout(float(xmlTransition.get("receptionTimeout")))
 
         xmlOutputs = xmlTransition.findall("{" + namespace + "}outputs/{" + namespace + "}output")
         for xmlOutput in xmlOutputs:
@@ -30,7 +30,6 @@
 #+---------------------------------------------------------------------------+
 from gettext import gettext as _
 import logging
-import time
 #+---------------------------------------------------------------------------+
 #| Related third party imports
 #+---------------------------------------------------------------------------+
@@ -53,6 +52,7 @@ class SimpleTransition(AbstractTransition):
         self.log = logging.getLogger('netzob.Common.MMSTD.Transitions.impl.SimpleTransition.py')
         self.outputSymbol = outputSymbol
         self.timeBeforeActing = timeBeforeActing
+        self.receptionTimeout = 3
 
     #+-----------------------------------------------------------------------+
     #| getOutputSymbol
@@ -88,7 +88,7 @@ class SimpleTransition(AbstractTransition):
         self.activate()
         self.log.debug("Executing as a client")
 
-        time.sleep(0.5)
+        abstractionLayer.getScheduler().waitReaction(self.timeBeforeActing)
         # write a message
         abstractionLayer.writeSymbol(self.outputSymbol)
         self.deactivate()
@@ -108,7 +108,7 @@ class SimpleTransition(AbstractTransition):
         abstractionLayer.writeSymbol(self.outputSymbol)
 
         # listen for input symbol for fex secondes
-        abstractionLayer.receiveSymbolWithTimeout(3)
+        abstractionLayer.receiveSymbolWithTimeout(self.computeReceptionTimeout(abstractionLayer))
 
         self.deactivate()
         return self.outputState
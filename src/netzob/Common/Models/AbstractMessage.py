@@ -33,6 +33,7 @@ import logging
 import uuid
 import re
 import copy
+import hashlib
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -90,6 +91,17 @@ class AbstractMessage(object):
         message.id = str(uuid.uuid4())
         return message
 
+    def __getstate__(self):
+        """The logger is replaced by its name so that the message can
+        be pickled, for instance to be sent by a worker process."""
+        state = self.__dict__.copy()
+        state['log'] = self.log.name
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.log = logging.getLogger(state['log'])
+
     def __str__(self):
         if self.session is None:
             sessionID = "None"
@@ -168,6 +180,11 @@ class AbstractMessage(object):
 
         return "".join(self.getStringData()[start:end])
 
+    def getPayloadHash(self):
+        """@return: a digest of the reduced data of the message,
+        identical for all the messages with byte-identical payloads"""
+        return hashlib.sha1(self.getReducedStringData()).digest()
+
     #+----------------------------------------------
     #| compilePattern:
     #|    compile the pattern of the data part in the Discover way (direction, [Token1, Token2...])
@@ -53,6 +53,9 @@ import uuid
 from netzob.Common.Field import Field
 from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import \
     AggregateVariable
+from netzob.Common.MMSTD.Dictionary.ReadingProgram import ReadingProgram
+from netzob.Common.MMSTD.Dictionary.RelationGraph import RelationGraph
+from netzob.Common.MMSTD.Dictionary.WritingProgram import WritingProgram
 from netzob.Common.MMSTD.Symbols.AbstractSymbol import AbstractSymbol
 from netzob.Common.NetzobException import NetzobException
 from netzob.Common.Property import Property
@@ -90,6 +93,10 @@ class Symbol(AbstractSymbol):
         self.field.setName(name)
         self.project = project
         self.pattern = None
+        self.root = None
+        self.readingProgram = None
+        self.writingProgram = None
+        self.relationGraph = None
 
     #+----------------------------------------------
     #| getVariables:
@@ -125,8 +132,13 @@ class Symbol(AbstractSymbol):
 
     def addMessages(self, messages):
         """Add the provided messages in the symbol"""
+        messagesID = set([msg.getID() for msg in self.messages])
         for message in messages:
-            self.addMessage(message)
+            if message.getID() in messagesID:
+                continue
+            messagesID.add(message.getID())
+            message.setSymbol(self)
+            self.messages.append(message)
 
     def addMessage(self, message):
         for msg in self.messages:
@@ -235,18 +247,78 @@ class Symbol(AbstractSymbol):
                 @rtype: bitarray
                 @return: the value this acces writes.
         """
-        self.getRoot().write(writingToken)
+        self.getWritingProgram().write(writingToken)
         result = writingToken.getValue()
 
         return result
 
     def getRoot(self):
+        # The aggregate of all the fields is rebuilt only if the variables of the fields have changed
+        variables = [field.getVariable() for field in self.getExtendedFields()]
+        if self.root is not None and self.root.getID() == self.getID() and len(self.root.getChildren()) == len(variables):
+            sameVariables = True
+            for (child, variable) in zip(self.root.getChildren(), variables):
+                if child is not variable:
+                    sameVariables = False
+                    break
+            if sameVariables:
+                return self.root
+
         # We create an aggregate of all the fields
-        rootSymbol = AggregateVariable(self.getID(), self.getName(), False, False, None)
-        for field in self.getExtendedFields():
-            variable = field.getVariable()
-            rootSymbol.addChild(variable)
-        return rootSymbol
+        if self.root is not None:
+            for child in self.root.getChildren():
+                if self.root in child.getFathers():
+                    child.removeFather(self.root)
+        self.root = AggregateVariable(self.getID(), self.getName(), False, False, None)
+        for variable in variables:
+            self.root.addChild(variable)
+        self.readingProgram = None
+        self.writingProgram = None
+        self.relationGraph = None
+        return self.root
+
+    def getReadingProgram(self):
+        """getReadingProgram:
+                Returns the read access of the root variable compiled in a program.
+                It is compiled again when the root variable changes.
+
+                @rtype: netzob.Common.MMSTD.Dictionary.ReadingProgram.ReadingProgram
+                @return: the program which reads a message as the root variable.
+        """
+        root = self.getRoot()
+        if self.readingProgram is None or not self.readingProgram.isCompiledFrom(root):
+            self.readingProgram = ReadingProgram(root)
+        return self.readingProgram
+
+    def getWritingProgram(self):
+        """getWritingProgram:
+                Returns the write access of the root variable compiled in a program.
+                It is compiled again when the root variable changes.
+
+                @rtype: netzob.Common.MMSTD.Dictionary.WritingProgram.WritingProgram
+                @return: the program which writes a message as the root variable.
+        """
+        root = self.getRoot()
+        if self.writingProgram is None or not self.writingProgram.isCompiledFrom(root):
+            self.writingProgram = WritingProgram(root)
+        return self.writingProgram
+
+    def getRelationGraph(self):
+        """getRelationGraph:
+                Returns the relations of the root variable.
+                It is computed again when the root variable or a tree of variables changes.
+                The fields are not walked while the graph matches the current root: relation variables ask for it at each access
+                and the root is checked at the beginning of each read or write access of the symbol.
+
+                @rtype: netzob.Common.MMSTD.Dictionary.RelationGraph.RelationGraph
+                @return: the relation graph of the root variable.
+        """
+        if self.relationGraph is not None and self.relationGraph.isComputedFrom(self.root):
+            return self.relationGraph
+        root = self.getRoot()
+        if self.relationGraph is None or not self.relationGraph.isComputedFrom(root):
+            self.relationGraph = RelationGraph(root)
+        return self.relationGraph
 
     def getProperties(self):
         properties = []
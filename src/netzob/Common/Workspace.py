@@ -461,15 +461,19 @@ class Workspace(object):
         return (None, _("An unknown error prevented to open the workspace."))
 
     @staticmethod
-    def isSchemaValidateXML(schemaFile, xmlFile):
+    def loadXMLSchema(schemaFile):
+        """Load an XSD schema, which can include the common XSD
+        located besides it
+
+        :return: the lxml XMLSchema, or None if it cannot be read"""
         # is the schema is a file
         if not os.path.isfile(schemaFile):
             logging.warn("The specified schema file (" + str(schemaFile) + ") is not valid : its not a file.")
-            return False
+            return None
         # is it readable
         if not os.access(schemaFile, os.R_OK):
             logging.warn("The specified schema file (" + str(schemaFile) + ") is not readable.")
-            return False
+            return None
 
         schemaF = open(schemaFile, "r")
         schemaContent = schemaF.read()
@@ -477,7 +481,7 @@ class Workspace(object):
 
         if schemaContent is None or len(schemaContent) == 0:
             logging.warn("Impossible to read the schema file (no content found in it)")
-            return False
+            return None
 
         # Extended version of an XSD validator
         # Create an xmlParser for the schema
@@ -488,7 +492,13 @@ class Workspace(object):
 
         schemaParser.resolvers.add(xsdResolver)
         schemaParsed = etree.parse(schemaContent, parser=schemaParser)
-        schema = etree.XMLSchema(schemaParsed)
+        return etree.XMLSchema(schemaParsed)
+
+    @staticmethod
+    def isSchemaValidateXML(schemaFile, xmlFile):
+        schema = Workspace.loadXMLSchema(schemaFile)
+        if schema is None:
+            return False
 
         try:
             xmlRoot = etree.parse(xmlFile)
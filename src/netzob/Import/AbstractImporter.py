@@ -39,6 +39,8 @@ import logging
 from netzob.Common.Field import Field
 from netzob.Common.ProjectConfiguration import ProjectConfiguration
 from netzob.Common.ImportedTrace import ImportedTrace
+from netzob.Common.ImportedTraceWriter import ImportedTraceWriter
+from netzob.Common.Workspace import WORKSPACE_NAMESPACE, COMMON_NAMESPACE
 from netzob.Common.Symbol import Symbol
 from netzob.Common.Session import Session
 from netzob.Common.NetzobException import NetzobImportException
@@ -49,12 +51,18 @@ from netzob.UI.Import.Controllers.ConfirmImportMessagesController import Confirm
 class AbstractImporter(object):
     """Abstract class which provides common methods too any kind of importers"""
 
+    # Number of messages kept by a streamed import to preview them
+    PREVIEW_SIZE = 1000
+    # Number of messages written at once in the imported trace
+    BATCH_SIZE = 500
+
     def __init__(self, type, netzob):
         self.type = type
         self.messages = []
         self.netzob = netzob
         self.status_cb = None
         self.end_cb = None
+        self.cancelled = False
 
     def saveMessagesInCurrentProject(self, messageIDList):
         """Retrieve messages from the provided list of IDs
@@ -100,3 +108,48 @@ class AbstractImporter(object):
 
     def saveMessages(self):
         self.saveMessagesInProject(self.netzob.getCurrentWorkspace(), self.netzob.getCurrentProject(), self.messages)
+
+    def iterMessages(self):
+        """Iterate over the messages of the source, implemented by the
+        importers which can stream them. The iteration stops when the
+        import is cancelled."""
+        raise NotImplementedError("The importer {0} cannot stream its messages".format(self.type))
+
+    def importMessagesInTrace(self, workspace, name, description="", batchSize=None):
+        """Stream the messages given by iterMessages() into a new trace
+        of the workspace, a batch of messages at a time. Only the first
+        PREVIEW_SIZE messages are kept in the importer to be previewed.
+
+        :return: the imported trace registered in the workspace, or None
+        if the import has been cancelled."""
+        if batchSize is None:
+            batchSize = self.BATCH_SIZE
+        self.cancelled = False
+        self.messages = []
+        traceWriter = ImportedTraceWriter(workspace.getPathOfTraces(), name, self.type, description, WORKSPACE_NAMESPACE, COMMON_NAMESPACE)
+        try:
+            batch = []
+            for message in self.iterMessages():
+                if len(self.messages) < self.PREVIEW_SIZE:
+                    self.messages.append(message)
+                batch.append(message)
+                if len(batch) >= batchSize:
+                    traceWriter.addMessages(batch)
+                    batch = []
+            if self.cancelled:
+                logging.info("The import in the trace {0} has been cancelled".format(name))
+                traceWriter.abort()
+                return None
+            traceWriter.addMessages(batch)
+        except:
+            traceWriter.abort()
+            raise
+
+        importedTrace = traceWriter.close()
+        workspace.addImportedTrace(importedTrace)
+        workspace.saveConfigFile()
+        return importedTrace
+
+    def cancel(self):
+        """Stop the streamed import at the next message"""
+        self.cancelled = True
@@ -29,14 +29,12 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 from gettext import gettext as _
-from gi.repository import Gtk
+from gi.repository import Gtk, GObject
 import gi
 import tempfile
 gi.require_version('Gtk', '3.0')
 import logging
 import os
-import time
-import threading
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports
@@ -50,6 +48,7 @@ from netzob.Import.GOTPoisoning.PrototypesRepositoryParser import PrototypesRepo
 from netzob.Import.GOTPoisoning.ParasiteGenerator import ParasiteGenerator
 from netzob.Import.GOTPoisoning.InjectorGenerator import InjectorGenerator
 from netzob.Import.GOTPoisoning.GOTPoisoner import GOTPoisoner
+from netzob.Import.GOTPoisoning.ParasiteReceiver import ParasiteReceiver
 
 
 #+---------------------------------------------------------------------------+
@@ -80,6 +79,7 @@ class ApiImport(object):
         # create logger with the given configuration
         self.log = logging.getLogger('netzob.Import.ApiImport.py')
         self.packets = []
+        self.receiver = None
 
         # First we parse the repository
         repositoryFile = self.netzob.getCurrentWorkspace().getPathOfPrototypes() + os.sep + "repository.xml"
@@ -325,54 +325,33 @@ class ApiImport(object):
         injectorGenerator.writeInjectorToFile()
         injectorGenerator.compileInjector()
 
-        poisoner = GOTPoisoner(parasiteGenerator, injectorGenerator)
-        poisoner.injectProcess(self.selectedProcess.getPid())
-
+        # Create the receptor (FIFO creation) before the parasite is
+        # injected, so that its first records are not missed
         self.fifoFile = parasiteGenerator.getFifoFile()
+        self.hijackedFunctions = parasiteGenerator.getFunctions()
+        self.receiver = ParasiteReceiver(self.fifoFile, self.callback_readRecords)
+        if not self.receiver.createFifo():
+            self.log.error("Cannot execute GOT Poisoning since FIFO file was not created!")
+            self.receiver = None
+            return
+        self.receiver.start()
 
-        self.aSniffThread = threading.Thread(None, self.sniffThread, None, (), {})
-        self.aSniffThread.start()
+        poisoner = GOTPoisoner(parasiteGenerator, injectorGenerator)
+        poisoner.injectProcess(self.selectedProcess.getPid())
 
         self.log.info("Starting the capture of [{0}]".format(self.selectedProcess.getPid()))
         self.log.info("DLL [{0}]".format(self.selectedDLL.getName()))
         self.log.info("Function [{0}]".format(self.selectedFunction.getPrototype()))
 
-    def readFromFifo(self):
-        self.fifo = open(self.fifoFile, 'r')
-        receivedMessage = self.readline(self.fifo)
-        self.log.info("FIFO: {0}".format(receivedMessage))
-        while (receivedMessage != "STOP\n"):
-            self.pktTreestore.append(None, [len(self.packets), "NONE", "NC", receivedMessage, int(time.time())])
-            receivedMessage = self.readline(self.fifo)
-            self.log.info("FIFO: " + receivedMessage)
-
-    def createFifo(self):
-        self.log.info("Creating the FIFO file: {0}".format(self.fifoFile))
-        # Create the fifo
-        try:
-            os.mkfifo(self.fifoFile)
-        except OSError, e:
-            self.log.error("Failed to create FIFO: %s" % e)
-            return False
-        else:
-            self.log.info("The fifo has been created.")
-            return True
-
-    def readline(self, f):
-        s = f.readline()
-        while s == "":
-            time.sleep(0.0001)
-            s = f.readline()
-        return s
-
-    def sniffThread(self):
-        # Create the receptor (FIFO creation)
-        if not self.createFifo():
-            self.log.error("Cannot execute GOT Poisoning since FIFO file was not created!")
-            return
+    def callback_readRecords(self, records):
+        # Called from the thread of the receiver
+        GObject.idle_add(self.displayRecords, records)
 
-        # Read from the fifo
-        self.readFromFifo()
+    def displayRecords(self, records):
+        # Display a batch of records sent by the parasite
+        for (timestamp, function, data) in records:
+            self.pktTreestore.append(None, [len(self.packets), self.hijackedFunctions[function].getName(), "NC", data.encode("hex"), int(timestamp)])
+            self.packets.append(data)
 
     #+----------------------------------------------
     #| Called when launching sniffing process
@@ -380,16 +359,17 @@ class ApiImport(object):
     def stopCaptureFunction(self, button):
         self.log.debug("Stoping the capture...")
 
-        # We first stop the thread
-        if self.aSniffThread is not None and self.aSniffThread.isAlive():
-            self.aSniffThread._Thread__stop()
-        self.aSniffThread = None
+        if self.receiver is None:
+            return
 
-        # now we clean everything
-        self.log.debug("Reading finish, we close the FIFO.")
+        # We first stop the thread, which closes the FIFO: the parasite
+        # stops writing in it
+        self.receiver.stop()
+        self.receiver.join()
+        self.receiver = None
 
-        # Close and remove fifo
-        self.fifo.close()
+        # now we clean everything
+        self.log.debug("Reading finish, we remove the FIFO.")
         os.remove(self.fifoFile)
 
     #+----------------------------------------------
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import os
+
+
+class DelimitedFileReader(object):
+    """Splits a file in the messages separated by a delimiter, reading
+    it in chunks of chunkSize bytes.
+
+    The delimiter is searched in the raw content of the file, so the
+    memory used is bounded by a chunk plus the largest message. A
+    delimiter straddling two chunks is found since the last bytes of a
+    chunk, which may start it, are searched again with the next one.
+    The delimiter can be deleted, kept at the start of the message it
+    precedes or at the end of the message it follows. Without delimiter,
+    the whole file is a single message.
+    """
+
+    DELIMITER_DELETE = 0
+    DELIMITER_KEEP_START = 1
+    DELIMITER_KEEP_END = 2
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, filePath, delimiter, strategy=DELIMITER_DELETE, chunkSize=CHUNK_SIZE):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.File.DelimitedFileReader.py')
+        self.filePath = filePath
+        self.delimiter = delimiter
+        self.strategy = strategy
+        self.chunkSize = max(chunkSize, len(delimiter))
+        self.size = os.path.getsize(filePath)
+        self.bytesRead = 0
+
+    def __iter__(self):
+        """Iterates over the (raw) data of the non empty messages"""
+        delimiter = self.delimiter
+        keepStart = self.strategy == DelimitedFileReader.DELIMITER_KEEP_START
+        keepEnd = self.strategy == DelimitedFileReader.DELIMITER_KEEP_END
+        # Pieces of the current message, and data after them where the
+        # delimiter is searched
+        pieces = []
+        buffer = ""
+        # The current message follows a delimiter
+        delimited = False
+        self.bytesRead = 0
+        f = open(self.filePath, "rb")
+        try:
+            while True:
+                chunk = f.read(self.chunkSize)
+                self.bytesRead += len(chunk)
+                if len(chunk) == 0:
+                    break
+                if len(delimiter) == 0:
+                    pieces.append(chunk)
+                    continue
+                parts = (buffer + chunk).split(delimiter)
+                buffer = parts.pop()
+                if len(parts) > 0:
+                    # The first message started in the previous chunks
+                    pieces.append(parts[0])
+                    parts[0] = "".join(pieces)
+                    pieces = []
+                    for data in parts:
+                        if keepStart and delimited:
+                            data = delimiter + data
+                        if keepEnd:
+                            data = data + delimiter
+                        if len(data) > 0:
+                            yield data
+                        delimited = True
+                # Keeps the bytes which may start a delimiter
+                end = len(buffer) - len(delimiter) + 1
+                if end > 0:
+                    pieces.append(buffer[:end])
+                    buffer = buffer[end:]
+        finally:
+            f.close()
+
+        # Last message, not followed by a delimiter
+        pieces.append(buffer)
+        if keepStart and delimited:
+            pieces.insert(0, delimiter)
+        data = "".join(pieces)
+        if len(data) > 0:
+            yield data
+
+    def getBytesRead(self):
+        return self.bytesRead
+
+    def getSize(self):
+        return self.size
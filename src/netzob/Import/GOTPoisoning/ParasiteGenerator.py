@@ -47,13 +47,22 @@ import os
 #+---------------------------------------------------------------------------+
 class ParasiteGenerator():
 
-    def __init__(self, tmp_folder):
+    # Size of the buffer of records in the parasite
+    BUFFER_SIZE = 1024
+    # Number of pending bytes written at once to the FIFO, by default
+    # each record is written as soon as it is complete
+    FLUSH_SIZE = 1
+
+    def __init__(self, tmp_folder, bufferSize=BUFFER_SIZE, flushSize=FLUSH_SIZE):
         # create logger with the given configuration
         self.log = logging.getLogger('netzob.Import.GOTPoisoning.ParasiteGenerator.py')
         # temporary folder
         self.tmp_folder = tmp_folder
         # fifo file
         self.fifoFile = self.tmp_folder + "/netzob.fifo"
+        # buffering of the records
+        self.bufferSize = bufferSize
+        self.flushSize = min(flushSize, bufferSize)
 
         # list of functions to hijacked
         self.hijackedFunctions = []
@@ -118,99 +127,181 @@ class ParasiteGenerator():
 
     def getSourceCodeOfWriteFunction(self):
         function = '''
-static int _open(char * filename) {
-    /**
-     * sys_open:
-     * %eax <- 5
-     * %ebx <- const char *
-     * %ecx <- int
-     * %edx <- int
-     */
-    long id_fd;
+/**
+ * i386 system calls, made without the libc
+ */
+#define NETZOB_SYS_write 4
+#define NETZOB_SYS_open 5
+#define NETZOB_SYS_close 6
+#define NETZOB_SYS_fcntl 55
+#define NETZOB_SYS_sched_yield 158
+#define NETZOB_SYS_rt_sigprocmask 175
+#define NETZOB_SYS_rt_sigtimedwait 177
+
+#define NETZOB_O_WRONLY 01
+#define NETZOB_O_NONBLOCK 04000
+#define NETZOB_F_SETFL 4
+#define NETZOB_SIG_BLOCK 0
+#define NETZOB_SIG_SETMASK 2
+#define NETZOB_SIGPIPE 13
+#define NETZOB_EPIPE 32
+
+/**
+ * Records are buffered until NETZOB_FLUSH_SIZE bytes are pending
+ */
+#define NETZOB_BUFFER_SIZE ''' + str(self.bufferSize) + '''
+#define NETZOB_FLUSH_SIZE ''' + str(self.flushSize) + '''
+#define NETZOB_HEADER_SIZE 8
+
+/**
+ * State of the transport. The parasite is mapped from its file
+ * without its data segment, so the state is kept in its (writable)
+ * text.
+ */
+static int _fifo __attribute__((section(".text"))) = -1;
+static int _lock __attribute__((section(".text"))) = 0;
+static int _pending __attribute__((section(".text"))) = 0;
+static char _buffer[NETZOB_BUFFER_SIZE] __attribute__((section(".text"))) = {0};
+
+static long _syscall(long number, long arg1, long arg2, long arg3, long arg4) {
+    long ret;
 
     __asm__ __volatile__
     (      "pushl %%ebx\\n\\t"        // sauvegarde EBX
-            "movl %%esi,%%ebx\\n\\t"    // on met ESI dans EBX
-            "mov $0x441, %%cx\\n\\t"        // on set le flag
-            "mov $422, %%dx\\n\\t"
+            "movl %%edi,%%ebx\\n\\t"    // on met EDI dans EBX
             "int $0x80\\n\\t"
             "popl %%ebx"
-            :"=a" (id_fd) //EAX
-            :"a" (SYS_open),
-            "S" ((long) filename),//ESI
-            "d" ((long) 0)//EDX
+            :"=a" (ret) //EAX
+            :"a" (number),
+            "D" (arg1),//EDI
+            "c" (arg2),//ECX
+            "d" (arg3),//EDX
+            "S" (arg4)//ESI
+            :"memory"
    );
+    return ret;
+}
 
-    if (id_fd >= 0) {
-        return (int) id_fd;
+static int _openFifo() {
+    /**
+     * The FIFO is opened once, without blocking so that nothing is
+     * recorded while netzob does not read it, then written in the
+     * blocking mode so that no record is lost
+     */
+    long fd = _syscall(NETZOB_SYS_open, (long) "''' + self.fifoFile + '''", NETZOB_O_WRONLY | NETZOB_O_NONBLOCK, 0, 0);
+    if (fd < 0) {
+        return -1;
     }
-    return -1;
+    _syscall(NETZOB_SYS_fcntl, fd, NETZOB_F_SETFL, NETZOB_O_WRONLY, 0);
+    return (int) fd;
 }
 
-static void _close(int fd) {
+static void _send(char * data, int size) {
     /**
-     * sys_close:
-     * %eax <- 6
-     * %ebx <- fd
+     * SIGPIPE is blocked during the write, so that the process is not
+     * killed when netzob stops reading: the FIFO is closed instead
      */
-    __asm__ __volatile__
-    (      "pushl %%ebx\\n\\t"        // sauvegarde EBX
-            "movl %%esi,%%ebx\\n\\t"    // on met ESI dans EBX
-            "int $0x80\\n\\t"
-            "popl %%ebx"
-            : /* no output */
-            :"a" (SYS_close),
-            "S" ((long) fd)//ESI
-   );
+    unsigned long sigpipe[2] = {1 << (NETZOB_SIGPIPE - 1), 0};
+    unsigned long mask[2];
+    long timeout[2] = {0, 0};
+    long ret = 0;
+
+    _syscall(NETZOB_SYS_rt_sigprocmask, NETZOB_SIG_BLOCK, (long) sigpipe, (long) mask, 8);
+    while (size > 0) {
+        ret = _syscall(NETZOB_SYS_write, _fifo, (long) data, size, 0);
+        if (ret <= 0) {
+            break;
+        }
+        data = data + ret;
+        size = size - ret;
+    }
+    if (ret < 0) {
+        if (ret == -NETZOB_EPIPE) {
+            _syscall(NETZOB_SYS_rt_sigtimedwait, (long) sigpipe, 0, (long) timeout, 8);
+        }
+        _syscall(NETZOB_SYS_close, _fifo, 0, 0, 0);
+        _fifo = -1;
+    }
+    _syscall(NETZOB_SYS_rt_sigprocmask, NETZOB_SIG_SETMASK, (long) mask, 0, 8);
+}
 
+static void _flush() {
+    if (_pending > 0 && _fifo >= 0) {
+        _send(_buffer, _pending);
+    }
+    _pending = 0;
 }
 
-static int _write(int fd, void *buf, int count) {
-    long ret;
+static void _saveRecord(int function, char * param0, int size) {
+    /**
+     * Record: function index (int), size (int), data
+     */
+    int header[2];
+    int i;
 
-    __asm__ __volatile__
-    (
-            "pushl %%ebx\\n\\t"
-            "movl %%esi,%%ebx\\n\\t"
-            "int $0x80\\n\\t"
-            "popl %%ebx"
-            :"=a" (ret)
-            :"a" (SYS_write),
-            "S" ((long) fd),
-            "c" ((long) buf),
-            "d" ((long) count)
-   );
-    if (ret >= 0) {
-        return (int) ret;
+    if (size <= 0) {
+        return;
+    }
+    while (__sync_lock_test_and_set(&_lock, 1)) {
+        _syscall(NETZOB_SYS_sched_yield, 0, 0, 0, 0);
+    }
+    if (_fifo < 0) {
+        _pending = 0;
+        _fifo = _openFifo();
     }
-    return -1;
+    if (_fifo >= 0) {
+        header[0] = function;
+        header[1] = size;
+        if (_pending + NETZOB_HEADER_SIZE + size > NETZOB_BUFFER_SIZE) {
+            _flush();
+        }
+        if (NETZOB_HEADER_SIZE + size > NETZOB_BUFFER_SIZE) {
+            // too large for the buffer
+            _send((char *) header, NETZOB_HEADER_SIZE);
+            if (_fifo >= 0) {
+                _send(param0, size);
+            }
+        } else {
+            for (i = 0; i < NETZOB_HEADER_SIZE; i++) {
+                _buffer[_pending + i] = ((char *) header)[i];
+            }
+            _pending = _pending + NETZOB_HEADER_SIZE;
+            for (i = 0; i < size; i++) {
+                _buffer[_pending + i] = param0[i];
+            }
+            _pending = _pending + size;
+            if (_pending >= NETZOB_FLUSH_SIZE) {
+                _flush();
+            }
+        }
+    }
+    __sync_lock_release(&_lock);
 }
 
-static void _saveString(char * param0) {
+static int _strlen(char * param0) {
     int tailleParam = 0;
-    int i = 0;
     while (param0[tailleParam]!='\\0') {
         tailleParam = tailleParam + 1;
     }
-
-    int fd = _open("''' + self.fifoFile + '''");
-     _write(fd, param0 , tailleParam);
-    _close(fd);
+    return tailleParam;
 }
 
-static void _saveStringWithSize(char * param0, int size) {
-    int fd = _open("''' + self.fifoFile + '''");
-     _write(fd, param0 , size);
-    _close(fd);
-}
+/**
+ * Functions used by the sources of the repository, NETZOB_FUNCTION_ID
+ * is the index of the hijacked function in which they are called
+ */
+#define _saveString(param0) _saveRecord(NETZOB_FUNCTION_ID, (char *) (param0), _strlen((char *) (param0)))
+#define _saveStringWithSize(param0, size) _saveRecord(NETZOB_FUNCTION_ID, (char *) (param0), (int) (size))
 '''
         return function
 
     def getSourceCodeParasiteCoreFunctions(self):
         coreFunctions = ""
 
-        for function in self.hijackedFunctions:
+        for (index, function) in enumerate(self.hijackedFunctions):
+            coreFunctions += "#define NETZOB_FUNCTION_ID " + str(index) + "\n"
             coreFunctions += function.getParasiteFunctionDeclaration() + "\n{\n" + function.getSource() + "\n" + function.getEndOfFunction() + "\n}\n"
+            coreFunctions += "#undef NETZOB_FUNCTION_ID\n"
 #            coreFunctions += function.getParasiteFunctionDeclaration() + "\n{\n" + function.getEndOfFunction()+"\n}\n"
         return coreFunctions
 
@@ -237,7 +328,6 @@ static void _saveStringWithSize(char * param0, int size) {
 //| ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~+
 //| @organization : Amossys, http://www.amossys.fr                            |
 //+---------------------------------------------------------------------------+
-#include <sys/syscall.h>
 #include <sys/types.h>
 
 '''
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from gettext import gettext as _
+import fcntl
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| ParasiteReceiver:
+#|     Receives the records sent by a parasite through its FIFO
+#| ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~+
+#| A record is made of the index of the hijacked function and of the
+#| size of its data, as native integers, followed by the data. The FIFO
+#| is kept open while reading it, the reading thread waits for data
+#| and gives the records to callback(records), a list of
+#| (timestamp, function index, data), at most every batchInterval
+#| seconds.
+#+---------------------------------------------------------------------------+
+class ParasiteReceiver(object):
+
+    HEADER = struct.Struct("=II")
+    CHUNK_SIZE = 65536
+    BATCH_INTERVAL = 0.2
+
+    def __init__(self, fifoFile, callback, batchInterval=BATCH_INTERVAL):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.GOTPoisoning.ParasiteReceiver.py')
+        self.fifoFile = fifoFile
+        self.callback = callback
+        self.batchInterval = batchInterval
+        # Received data which do not make a complete record yet
+        self.remainder = ""
+        self.nbRecords = 0
+        self.fifo = None
+        self.stopped = False
+        self.thread = None
+
+    #+-----------------------------------------------------------------------+
+    #| createFifo
+    #|     Creates the FIFO written by the parasite
+    #| @return True if the FIFO has been created
+    #+-----------------------------------------------------------------------+
+    def createFifo(self):
+        self.log.info("Creating the FIFO file: {0}".format(self.fifoFile))
+        try:
+            os.mkfifo(self.fifoFile)
+        except OSError, e:
+            self.log.error("Failed to create FIFO: %s" % e)
+            return False
+        else:
+            self.log.info("The fifo has been created.")
+            return True
+
+    #+-----------------------------------------------------------------------+
+    #| start
+    #|     Opens the FIFO and starts reading it in a thread
+    #+-----------------------------------------------------------------------+
+    def start(self):
+        # Opened for writing too, so that it never ends when the
+        # parasite closes it, and without waiting for the parasite
+        self.fifo = os.open(self.fifoFile, os.O_RDWR)
+        # Not inherited by the processes launched later, which would
+        # keep it open
+        fcntl.fcntl(self.fifo, fcntl.F_SETFD, fcntl.FD_CLOEXEC)
+        self.stopped = False
+        self.thread = threading.Thread(target=self.receive, name="ParasiteReceiver")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stops the reading, the parasite cannot write to the FIFO
+        anymore once it is closed"""
+        self.stopped = True
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def isRunning(self):
+        return self.thread is not None and self.thread.isAlive()
+
+    def receive(self):
+        """Body of the reading thread"""
+        records = []
+        lastCallback = time.time()
+        try:
+            while not self.stopped:
+                # Waits for data, waking up regularly to check if the
+                # reading is stopped
+                (readable, writable, errors) = select.select([self.fifo], [], [], self.batchInterval)
+                if len(readable) > 0:
+                    timestamp = time.time()
+                    records.extend([(timestamp, function, data) for (function, data) in self.parse(os.read(self.fifo, ParasiteReceiver.CHUNK_SIZE))])
+                if len(records) > 0 and time.time() - lastCallback >= self.batchInterval:
+                    self.callback(records)
+                    records = []
+                    lastCallback = time.time()
+            # Last records already written by the parasite
+            while len(select.select([self.fifo], [], [], 0)[0]) > 0:
+                timestamp = time.time()
+                records.extend([(timestamp, function, data) for (function, data) in self.parse(os.read(self.fifo, ParasiteReceiver.CHUNK_SIZE))])
+        except (OSError, select.error), e:
+            self.log.warn("The FIFO cannot be read: {0}".format(e))
+        finally:
+            os.close(self.fifo)
+            self.fifo = None
+        if len(records) > 0:
+            self.callback(records)
+        self.log.info("{0} records received".format(self.nbRecords))
+
+    #+-----------------------------------------------------------------------+
+    #| parse
+    #|     Extracts the complete records of received data
+    #| @param data received from the FIFO
+    #| @return the list of (function index, data) of the records
+    #+-----------------------------------------------------------------------+
+    def parse(self, data):
+        data = self.remainder + data
+        headerSize = ParasiteReceiver.HEADER.size
+        records = []
+        offset = 0
+        while len(data) - offset >= headerSize:
+            (function, size) = ParasiteReceiver.HEADER.unpack_from(data, offset)
+            end = offset + headerSize + size
+            if end > len(data):
+                break
+            records.append((function, data[offset + headerSize:end]))
+            offset = end
+        self.remainder = data[offset:]
+        self.nbRecords += len(records)
+        return records
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import os
+import select
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Import.Ipc.StraceParser import StraceParser
+
+
+class StraceCaptureStatistics(object):
+    """Counters of a capture"""
+
+    def __init__(self):
+        # Bytes and lines read from strace
+        self.nbBytes = 0
+        self.nbLines = 0
+        # Buffers read or written by the process, and those kept in
+        # messages
+        self.nbSyscalls = 0
+        self.nbMessages = 0
+        # Batches of messages given to the callback
+        self.nbBatches = 0
+
+    def __str__(self):
+        return "bytes={0}, lines={1}, syscalls={2}, messages={3}, batches={4}".format(
+            self.nbBytes, self.nbLines, self.nbSyscalls, self.nbMessages, self.nbBatches)
+
+
+class StraceCapture(object):
+    """Reads the output of strace in a thread and turns it in messages.
+
+    The output is read from a file object, the stderr pipe of strace or
+    a recorded log, in chunks of chunkSize bytes which are parsed at
+    once by a StraceParser. createMessage(direction, fd, data) returns
+    the message of each read or written buffer, or None to filter it
+    out, and the messages are given to callback(messages) at most every
+    batchInterval seconds, so that the UI is not flooded by a chatty
+    process. fdClosed_cb(fd), if set, is called when a file descriptor
+    is closed.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    BATCH_INTERVAL = 0.2
+
+    def __init__(self, stream, createMessage, callback, chunkSize=CHUNK_SIZE, batchInterval=BATCH_INTERVAL):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.Ipc.StraceCapture.py')
+        self.stream = stream
+        self.createMessage = createMessage
+        self.callback = callback
+        self.chunkSize = chunkSize
+        self.batchInterval = batchInterval
+        self.parser = StraceParser()
+        self.statistics = StraceCaptureStatistics()
+        self.stopped = False
+        self.thread = None
+        self.end_cb = None
+        self.fdClosed_cb = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.capture, name="StraceCapture")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stops the capture, the messages already parsed are still
+        given to the callback"""
+        self.stopped = True
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def isRunning(self):
+        return self.thread is not None and self.thread.isAlive()
+
+    def capture(self):
+        """Body of the capture thread"""
+        fd = self.stream.fileno()
+        messages = []
+        lastCallback = time.time()
+        ended = False
+        while not ended:
+            records = []
+            try:
+                # Waits for the output at most until the next batch
+                timeout = max(0, self.batchInterval - (time.time() - lastCallback))
+                if len(messages) == 0:
+                    timeout = self.batchInterval
+                (readable, writable, errors) = select.select([fd], [], [], timeout)
+                if len(readable) > 0:
+                    chunk = os.read(fd, self.chunkSize)
+                    if len(chunk) == 0:
+                        ended = True
+                        records = self.parser.flush()
+                    else:
+                        self.statistics.nbBytes += len(chunk)
+                        records = self.parser.parse(chunk)
+            except (OSError, IOError, select.error), e:
+                self.log.warn("The output of strace cannot be read: {0}".format(e))
+                ended = True
+            if self.stopped:
+                ended = True
+
+            for (direction, fileDescriptor, data) in records:
+                if direction == StraceParser.CLOSE:
+                    if self.fdClosed_cb is not None:
+                        self.fdClosed_cb(fileDescriptor)
+                    continue
+                try:
+                    message = self.createMessage(direction, fileDescriptor, data)
+                except Exception, e:
+                    self.log.debug("A message cannot be created: {0}".format(e))
+                    message = None
+                if message is not None:
+                    messages.append(message)
+
+            if len(messages) > 0 and (ended or time.time() - lastCallback >= self.batchInterval):
+                self.statistics.nbMessages += len(messages)
+                self.statistics.nbBatches += 1
+                self.callback(messages)
+                messages = []
+                lastCallback = time.time()
+        self.log.info("End of the capture: {0}".format(self.getStatistics()))
+        if self.end_cb is not None:
+            self.end_cb(self.getStatistics())
+
+    def getStatistics(self):
+        self.statistics.nbLines = self.parser.nbLines
+        self.statistics.nbSyscalls = self.parser.nbSyscalls
+        return self.statistics
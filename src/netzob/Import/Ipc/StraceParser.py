@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import re
+
+
+class StraceParser(object):
+    """Parses the output of strace -xx in chunks of any size.
+
+    Each complete line is matched against a single precompiled pattern
+    covering all the traced syscalls which transfer a buffer or close a
+    file descriptor, the latter being given as CLOSE records without
+    payload. Lines of other syscalls, failed calls (negative return)
+    and incomplete lines are skipped, the end of a chunk after its last line is kept until
+    the next one. With -xx, strace prints every byte as a \\xNN escape,
+    so a payload is decoded in its hexadecimal form (the netzob raw
+    format) by deleting the escape characters in a single pass.
+    """
+
+    # Direction of the messages given by each syscall
+    SYSCALLS = {
+        "read": "read",
+        "pread64": "read",
+        "recvfrom": "read",
+        "write": "write",
+        "pwrite64": "write",
+        "sendto": "write"
+    }
+
+    # Syscalls which close a file descriptor (dup2 and dup3 close their
+    # second one), so that its number can be reused
+    CLOSING_SYSCALLS = ["close", "dup2", "dup3"]
+    CLOSE = "close"
+
+    # [pid N] syscall(fd, "payload"[...], other arguments) = returned
+    # or [pid N] close(fd) = 0, dup2(oldfd, fd) = fd
+    # Each match consumes a whole line, with empty groups for the other
+    # lines, so that the scan of a chunk never restarts inside a line.
+    # The payload holds no quote since all its bytes are escaped.
+    SYSCALL_REGEX = re.compile(r'(?:(?:\[pid +\d+\] )?(?:(' + "|".join(sorted(SYSCALLS.keys())) +
+                               r')\((\d+), "([^"]*)"(?:\.\.\.)?,[^\n]*\) += (\d+)|(' + "|".join(CLOSING_SYSCALLS) +
+                               r')\((?:\d+, )?(\d+)[^\n]*\) += \d+))?[^\n]*\n')
+
+    def __init__(self):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.Ipc.StraceParser.py')
+        # Incomplete line of the last chunk
+        self.remainder = ""
+        # Number of lines and of read or written buffers parsed
+        self.nbLines = 0
+        self.nbSyscalls = 0
+
+    def parse(self, chunk):
+        """Parses a chunk of the output and returns the list of
+        (direction, fd, hexadecimal payload) of the complete lines"""
+        end = chunk.rfind("\n")
+        if end == -1:
+            self.remainder += chunk
+            return []
+        data = self.remainder + chunk[:end + 1]
+        self.remainder = chunk[end + 1:]
+        return self.parseLines(data)
+
+    def flush(self):
+        """Parses the last line of the output, even without its end of
+        line"""
+        data = self.remainder
+        self.remainder = ""
+        if len(data) == 0:
+            return []
+        return self.parseLines(data + "\n")
+
+    def parseLines(self, data):
+        self.nbLines += data.count("\n")
+        syscalls = StraceParser.SYSCALLS
+        records = []
+        nbTransfers = 0
+        # The groups are empty for the lines of other syscalls, and the
+        # payload is empty when nothing is transferred
+        for (syscall, fd, escaped, returned, closing, closedFD) in StraceParser.SYSCALL_REGEX.findall(data):
+            if len(closedFD) > 0:
+                records.append((StraceParser.CLOSE, int(closedFD), ""))
+            elif len(escaped) > 0:
+                records.append((syscalls[syscall], int(fd), escaped.translate(None, "\\x")))
+                nbTransfers += 1
+        self.nbSyscalls += nbTransfers
+        return records
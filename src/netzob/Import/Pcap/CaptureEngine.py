@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Import.Pcap.RingBuffer import RingBuffer
+
+
+class CaptureStatistics(object):
+    """Counters of a capture"""
+
+    def __init__(self):
+        # Packets read from the source
+        self.nbCaptured = 0
+        # Packets dropped since the ring buffer was full
+        self.nbDropped = 0
+        # Packets dropped by the kernel, if the source gives it
+        self.nbKernelDropped = 0
+        # Packets decoded in messages, and those giving no message
+        # (unsupported or without payload)
+        self.nbDecoded = 0
+        self.nbUndecodable = 0
+        # Batches of messages given to the callback
+        self.nbBatches = 0
+
+    def __str__(self):
+        return "captured={0}, dropped={1}, kernel dropped={2}, decoded={3}, undecodable={4}, batches={5}".format(
+            self.nbCaptured, self.nbDropped, self.nbKernelDropped, self.nbDecoded, self.nbUndecodable, self.nbBatches)
+
+
+class CaptureEngine(object):
+    """Captures packets from a source in a thread and decodes them in
+    an other thread.
+
+    The source provides next() and datalink() as a pcapy reader: a
+    live capture, or a PcapReader replaying a file through the same
+    pipeline. The capture thread only reads the packets, with their
+    timestamps, and puts them in a ring buffer. The decoding thread
+    gets them by batches, decodes them with decodePacket(header, data)
+    which returns a message or None, and gives the messages to
+    callback(messages) at most every batchInterval seconds.
+
+    A live capture drops the packets which arrive while the ring buffer
+    is full. A replay waits for the decoding instead, unless
+    dropWhenFull is set.
+    """
+
+    BUFFER_SIZE = 65536
+    BATCH_SIZE = 1000
+    BATCH_INTERVAL = 0.2
+    # Time waited by the threads when there is nothing to do
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, source, decodePacket, callback, live=True, count=0, bufferSize=BUFFER_SIZE, batchInterval=BATCH_INTERVAL, dropWhenFull=None):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.Pcap.CaptureEngine.py')
+        self.source = source
+        self.decodePacket = decodePacket
+        self.callback = callback
+        self.live = live
+        # Number of packets to capture, 0 for no limit
+        self.count = count
+        self.batchInterval = batchInterval
+        if dropWhenFull is None:
+            dropWhenFull = live
+        self.dropWhenFull = dropWhenFull
+        self.ringBuffer = RingBuffer(bufferSize)
+        self.statistics = CaptureStatistics()
+        self.stopped = False
+        self.captureEnded = False
+        self.captureThread = None
+        self.decodingThread = None
+        self.end_cb = None
+
+    def start(self):
+        self.captureThread = threading.Thread(target=self.capture, name="Capture")
+        self.captureThread.daemon = True
+        self.decodingThread = threading.Thread(target=self.decode, name="Decoding")
+        self.decodingThread.daemon = True
+        self.decodingThread.start()
+        self.captureThread.start()
+
+    def stop(self):
+        """Stops the capture, the packets already captured are still
+        decoded"""
+        self.stopped = True
+
+    def join(self, timeout=None):
+        """Waits until all the captured packets are decoded"""
+        if self.captureThread is not None:
+            self.captureThread.join(timeout)
+        if self.decodingThread is not None:
+            self.decodingThread.join(timeout)
+
+    def isRunning(self):
+        return self.decodingThread is not None and self.decodingThread.isAlive()
+
+    def capture(self):
+        """Body of the capture thread"""
+        ringBuffer = self.ringBuffer
+        try:
+            while not self.stopped and (self.count <= 0 or ringBuffer.nbPut + ringBuffer.nbDropped < self.count):
+                (header, data) = self.source.next()
+                if header is None:
+                    if self.live:
+                        # The read timeout expired
+                        continue
+                    break
+                if not self.dropWhenFull:
+                    while ringBuffer.isFull() and not self.stopped:
+                        time.sleep(CaptureEngine.POLL_INTERVAL)
+                ringBuffer.put((header, data))
+        except Exception, e:
+            self.log.warn("The capture has failed: {0}".format(e))
+        finally:
+            self.updateKernelStatistics()
+            self.captureEnded = True
+
+    def decode(self):
+        """Body of the decoding thread"""
+        messages = []
+        lastCallback = time.time()
+        while True:
+            # Read before getting the last packets, so that none is missed
+            captureEnded = self.captureEnded
+            batch = self.ringBuffer.getBatch(CaptureEngine.BATCH_SIZE)
+            for (header, data) in batch:
+                try:
+                    message = self.decodePacket(header, data)
+                except Exception, e:
+                    self.log.debug("A packet cannot be decoded: {0}".format(e))
+                    message = None
+                if message is None:
+                    self.statistics.nbUndecodable += 1
+                else:
+                    self.statistics.nbDecoded += 1
+                    messages.append(message)
+
+            ended = captureEnded and len(batch) == 0
+            if len(messages) > 0 and (ended or time.time() - lastCallback >= self.batchInterval):
+                self.callback(messages)
+                self.statistics.nbBatches += 1
+                messages = []
+                lastCallback = time.time()
+            if ended:
+                break
+            if len(batch) == 0:
+                time.sleep(CaptureEngine.POLL_INTERVAL)
+        self.log.info("End of the capture: {0}".format(self.getStatistics()))
+        if self.end_cb is not None:
+            self.end_cb(self.getStatistics())
+
+    def updateKernelStatistics(self):
+        # pcapy gives (received, dropped, dropped by the interface)
+        try:
+            stats = self.source.stats()
+            self.statistics.nbKernelDropped = stats[1] + stats[2]
+        except Exception:
+            pass
+
+    def getStatistics(self):
+        self.statistics.nbCaptured = self.ringBuffer.nbPut + self.ringBuffer.nbDropped
+        self.statistics.nbDropped = self.ringBuffer.nbDropped
+        return self.statistics
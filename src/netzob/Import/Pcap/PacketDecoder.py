@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from array import array
+import socket
+import struct
+
+
+class PacketDecoder(object):
+    """Decoder of the Ethernet, Linux SLL, IPv4, IPv6, TCP and UDP
+    headers of the packets read by a PcapReader. The headers are
+    parsed with precompiled structures, so a single decoder is used
+    for all the packets.
+
+    The decoded fields are those given by the impacket decoders: the
+    payload of a layer is what follows its header, and the MAC
+    addresses are written as lowercase hexadecimal bytes separated
+    by colons."""
+
+    DLT_EN10MB = 1
+    DLT_LINUX_SLL = 113
+
+    ETHERTYPE_IP = 0x0800
+    ETHERTYPE_IP6 = 0x86dd
+    # Ethertypes of the VLAN tags
+    ETHERTYPE_VLAN = [0x8100, 0x88a8, 0x9100]
+
+    IPPROTO_TCP = 6
+    IPPROTO_UDP = 17
+    # Extension headers of IPv6 which have the generic layout
+    IP6_EXTENSION_HEADERS = [0, 43, 60]
+
+    ETHERNET = struct.Struct("!6s6sH")
+    VLAN = struct.Struct("!HH")
+    LINUX_SLL = struct.Struct("!HHH8sH")
+    IP = struct.Struct("!BBHHHBBH4s4s")
+    IP6 = struct.Struct("!IHBB16s16s")
+    IP6_EXTENSION = struct.Struct("!BB")
+    PORTS = struct.Struct("!HH")
+    TCP_OFFSET = struct.Struct("!12xB")
+    TCP_SEQUENCE = struct.Struct("!4xI5xB")
+
+    def decodeLayer2(self, datalink, payload):
+        """Decodes the Ethernet or Linux SLL header of the payload.
+
+        :return: (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType)
+        or None if the datalink is not supported"""
+        if datalink == PacketDecoder.DLT_EN10MB:
+            (dst, src, etherType) = PacketDecoder.ETHERNET.unpack_from(payload)
+            headerSize = 14
+            while etherType in PacketDecoder.ETHERTYPE_VLAN:
+                (tag, etherType) = PacketDecoder.VLAN.unpack_from(payload, headerSize)
+                headerSize += 4
+            return ("Ethernet", self.formatMacAddress(src), self.formatMacAddress(dst), payload[headerSize:], etherType)
+        elif datalink == PacketDecoder.DLT_LINUX_SLL:
+            (packetType, addrType, addrLength, addr, etherType) = PacketDecoder.LINUX_SLL.unpack_from(payload)
+            # The address field is padded to 8 bytes, it is cut to its length as impacket does
+            return ("Linux SLL", array('B', addr[:addrLength]), None, payload[16:], etherType)
+        return None
+
+    def decodeLayer3(self, etherType, l2Payload):
+        """Decodes the IPv4 or IPv6 header of the payload.
+
+        :return: (l3Proto, l3SrcAddr, l3DstAddr, l3Payload,
+        ipProtocolNum) or None if the ethertype is not supported"""
+        if etherType == PacketDecoder.ETHERTYPE_IP:
+            (versionAndLength, tos, length, id, offset, ttl, protocol, checksum, src, dst) = PacketDecoder.IP.unpack_from(l2Payload)
+            headerSize = (versionAndLength & 0x0f) * 4
+            return ("IP", socket.inet_ntoa(src), socket.inet_ntoa(dst), l2Payload[headerSize:], protocol)
+        elif etherType == PacketDecoder.ETHERTYPE_IP6:
+            (flow, length, nextHeader, hopLimit, src, dst) = PacketDecoder.IP6.unpack_from(l2Payload)
+            headerSize = 40
+            while nextHeader in PacketDecoder.IP6_EXTENSION_HEADERS:
+                (nextHeader, extensionLength) = PacketDecoder.IP6_EXTENSION.unpack_from(l2Payload, headerSize)
+                headerSize += 8 + extensionLength * 8
+            return ("IPv6", socket.inet_ntop(socket.AF_INET6, src), socket.inet_ntop(socket.AF_INET6, dst), l2Payload[headerSize:], nextHeader)
+        return None
+
+    def decodeLayer4(self, ipProtocolNum, l3Payload):
+        """Decodes the TCP or UDP header of the payload.
+
+        :return: (l4Proto, l4SrcPort, l4DstPort, l4Payload) or None if
+        the protocol is not supported"""
+        if ipProtocolNum == PacketDecoder.IPPROTO_UDP:
+            (srcPort, dstPort) = PacketDecoder.PORTS.unpack_from(l3Payload)
+            return ("UDP", srcPort, dstPort, l3Payload[8:])
+        elif ipProtocolNum == PacketDecoder.IPPROTO_TCP:
+            (srcPort, dstPort) = PacketDecoder.PORTS.unpack_from(l3Payload)
+            (offset,) = PacketDecoder.TCP_OFFSET.unpack_from(l3Payload)
+            return ("TCP", srcPort, dstPort, l3Payload[(offset >> 4) * 4:])
+        return None
+
+    def decodeTCPSequence(self, l3Payload):
+        """Decodes the sequence number and the flags of a TCP header,
+        needed to reassemble the TCP flows.
+
+        :return: (seq, flags)"""
+        return PacketDecoder.TCP_SEQUENCE.unpack_from(l3Payload)
+
+    def formatMacAddress(self, address):
+        address = address.encode("hex")
+        return ":".join([address[i:i + 2] for i in range(0, 12, 2)])
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import cPickle
+import gc
+import logging
+import multiprocessing
+import uuid
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Import.Pcap.PcapReader import PcapReader, PcapReaderException
+
+
+class PcapDecodingTask(object):
+    """Packets of a capture file decoded by a worker: the packets
+    from firstPacket up to lastPacket (excluded), or all of them if
+    lastPacket is None. The first packet of a chunk is at firstOffset
+    in the file (see PcapReader.setOffset())."""
+
+    def __init__(self, fileIndex, filePath, firstPacket=0, lastPacket=None, firstOffset=None):
+        self.fileIndex = fileIndex
+        self.filePath = filePath
+        self.firstPacket = firstPacket
+        self.lastPacket = lastPacket
+        self.firstOffset = firstOffset
+
+    def __str__(self):
+        return "{0}[{1}:{2}]".format(self.filePath, self.firstPacket, self.lastPacket)
+
+
+class ParallelPcapDecoder(object):
+    """Decodes capture files in worker processes.
+
+    The files, or chunks of CHUNK_SIZE packets of the files, are
+    decoded by the function decodeTask(task, namespace), which returns
+    a list of (key, message, payload). The messages of all the tasks
+    are merged in the order of their keys, which starts with the
+    timestamp of the message. The identifiers of the messages are
+    created with createMessageID() from the namespace of the decoding,
+    so they don't depend on the number of workers or on the order the
+    tasks are decoded.
+
+    The workers are forked processes, so decodeTask can use the state
+    of the importer. The messages are sent back pickled."""
+
+    CHUNK_SIZE = 20000
+
+    def __init__(self, decodeTask, nbWorkers=None, chunkSize=CHUNK_SIZE):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.Pcap.ParallelPcapDecoder.py')
+        self.decodeTask = decodeTask
+        if nbWorkers is None:
+            nbWorkers = multiprocessing.cpu_count()
+        self.nbWorkers = nbWorkers
+        self.chunkSize = chunkSize
+
+    def splitFiles(self, filePaths, chunked=True):
+        """Creates the tasks decoding the files. If chunked, the files
+        readable by the PcapReader are split in chunks of packets."""
+        tasks = []
+        for (fileIndex, filePath) in enumerate(filePaths):
+            reader = None
+            if chunked:
+                try:
+                    reader = PcapReader(filePath)
+                except PcapReaderException:
+                    reader = None
+            if reader is None or reader.getNumberOfPackets() <= self.chunkSize:
+                tasks.append(PcapDecodingTask(fileIndex, filePath))
+            else:
+                nbPackets = reader.getNumberOfPackets()
+                for firstPacket in range(0, nbPackets, self.chunkSize):
+                    tasks.append(PcapDecodingTask(fileIndex, filePath, firstPacket, min(firstPacket + self.chunkSize, nbPackets), reader.getPacketOffset(firstPacket)))
+            if reader is not None:
+                reader.close()
+        return tasks
+
+    def decode(self, tasks, status_cb=None, namespace=None):
+        """Decodes the tasks.
+
+        :param namespace: the UUID from which the identifiers of the
+        messages are created, a new one by default
+        :return: the list of (message, payload) of all the tasks, in
+        the order of their keys"""
+        if namespace is None:
+            namespace = uuid.uuid4()
+        results = []
+        if self.nbWorkers <= 1 or len(tasks) <= 1:
+            for (taskIndex, task) in enumerate(tasks):
+                results.extend(self.decodeTask(task, namespace))
+                if status_cb is not None:
+                    status_cb(100.0 * (taskIndex + 1) / len(tasks), None)
+        else:
+            results = self.decodeInWorkers(tasks, namespace, status_cb)
+        results.sort(key=lambda result: result[0])
+        return [(message, payload) for (key, message, payload) in results]
+
+    def decodeInWorkers(self, tasks, namespace, status_cb):
+        taskQueue = multiprocessing.Queue()
+        resultQueue = multiprocessing.Queue()
+        for (taskIndex, task) in enumerate(tasks):
+            taskQueue.put((taskIndex, task))
+        workers = []
+        for i in range(min(self.nbWorkers, len(tasks))):
+            # A worker stops once it gets None
+            taskQueue.put(None)
+            worker = multiprocessing.Process(target=self.executeWorker, args=(taskQueue, resultQueue, namespace))
+            worker.daemon = True
+            workers.append(worker)
+            worker.start()
+
+        # The results are read before joining the workers, which cannot exit while their queue is full
+        results = []
+        errors = []
+        for i in range(len(tasks)):
+            (taskIndex, taskResults, error) = resultQueue.get()
+            if error is not None:
+                errors.append((taskIndex, error))
+            else:
+                results.extend(self.loadResults(taskResults))
+            if status_cb is not None:
+                status_cb(100.0 * (i + 1) / len(tasks), None)
+        for worker in workers:
+            worker.join()
+        if len(errors) > 0:
+            # The error of the first failing task is raised, as when decoding the tasks in sequence
+            raise min(errors)[1]
+        return results
+
+    def loadResults(self, taskResults):
+        # The collections triggered by the numerous unpickled objects would double the time to load them
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            return cPickle.loads(taskResults)
+        finally:
+            if gcEnabled:
+                gc.enable()
+
+    def executeWorker(self, taskQueue, resultQueue, namespace):
+        """Body of a worker process: decodes tasks until it gets None"""
+        # The worker exits once the tasks are decoded, the collections would only slow it down
+        gc.disable()
+        for (taskIndex, task) in iter(taskQueue.get, None):
+            try:
+                # Pickled here, since the queue would silently drop unpicklable results
+                resultQueue.put((taskIndex, cPickle.dumps(self.decodeTask(task, namespace), cPickle.HIGHEST_PROTOCOL), None))
+            except Exception, e:
+                self.log.warn("The decoding of {0} has failed: {1}".format(task, e))
+                try:
+                    cPickle.dumps(e, cPickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    e = RuntimeError(str(e))
+                resultQueue.put((taskIndex, None, e))
+
+    @staticmethod
+    def createMessageID(namespace, task, key):
+        """Returns the identifier of a message of a task, the key
+        identifying the message in its file (the index of its packet
+        for instance)"""
+        return str(uuid.uuid5(namespace, "{0}:{1}".format(task.fileIndex, key)))
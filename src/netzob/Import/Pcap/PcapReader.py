@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from array import array
+import logging
+import mmap
+import os
+import struct
+
+
+class PcapReaderException(Exception):
+    pass
+
+
+class PcapPacketHeader(object):
+    """Header of a packet read by a PcapReader. It provides the
+    accessors of the headers given by pcapy."""
+
+    __slots__ = ['sec', 'usec', 'caplen', 'len']
+
+    def __init__(self, sec, usec, caplen, len):
+        self.sec = sec
+        self.usec = usec
+        self.caplen = caplen
+        self.len = len
+
+    def getts(self):
+        return (self.sec, self.usec)
+
+    def getcaplen(self):
+        return self.caplen
+
+    def getlen(self):
+        return self.len
+
+
+class PcapReader(object):
+    """Reader of pcap and pcapng files, which memory maps the file.
+
+    The packets are read one after the other (next(), loop()) as with
+    pcapy, or accessed by their index (getPacket()). The offsets of the
+    packets are indexed at the first random access.
+
+    The interfaces of a pcapng file are expected to share the link type
+    of the first one, which is returned by datalink()."""
+
+    PCAP_MAGIC = 0xa1b2c3d4
+    PCAP_NANOSECOND_MAGIC = 0xa1b23c4d
+    PCAPNG_SECTION_HEADER = 0x0a0d0d0a
+    PCAPNG_BYTE_ORDER_MAGIC = 0x1a2b3c4d
+
+    PCAPNG_INTERFACE_DESCRIPTION = 0x00000001
+    PCAPNG_PACKET = 0x00000002
+    PCAPNG_SIMPLE_PACKET = 0x00000003
+    PCAPNG_ENHANCED_PACKET = 0x00000006
+
+    PCAPNG_OPTION_END = 0
+    PCAPNG_OPTION_TSRESOL = 9
+
+    FILE_HEADER_SIZE = 24
+    RECORD_HEADER_SIZE = 16
+
+    def __init__(self, filePath):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.Pcap.PcapReader.py')
+        self.filePath = filePath
+        self.file = open(filePath, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        if size < 12:
+            self.file.close()
+            raise PcapReaderException("The file {0} is not a pcap file".format(filePath))
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = size
+        self.offset = 0
+        self.offsets = None
+        self.linktype = None
+        # Link type and timestamp resolution (units per second) of the
+        # interfaces of a pcapng file
+        self.interfaces = []
+
+        (magic,) = struct.unpack_from("<I", self.mmap, 0)
+        if magic == PcapReader.PCAPNG_SECTION_HEADER:
+            self.pcapng = True
+            self.offset = self._readSectionHeader(0)
+        else:
+            self.pcapng = False
+            self._readFileHeader()
+
+    def _readFileHeader(self):
+        if self.size < PcapReader.FILE_HEADER_SIZE:
+            raise PcapReaderException("The file {0} is not a pcap file".format(self.filePath))
+        for endianness in ["<", ">"]:
+            (magic,) = struct.unpack_from(endianness + "I", self.mmap, 0)
+            if magic in [PcapReader.PCAP_MAGIC, PcapReader.PCAP_NANOSECOND_MAGIC]:
+                break
+        else:
+            raise PcapReaderException("The file {0} is not a pcap file".format(self.filePath))
+        self.nanosecond = (magic == PcapReader.PCAP_NANOSECOND_MAGIC)
+        (self.snaplen, self.linktype) = struct.unpack_from(endianness + "II", self.mmap, 16)
+        self.recordHeader = struct.Struct(endianness + "IIII")
+        self.offset = PcapReader.FILE_HEADER_SIZE
+
+    def _readSectionHeader(self, offset):
+        """Reads the section header block of a pcapng file, which gives
+        the byte order of the section.
+
+        :return: the offset of the following block"""
+        for endianness in ["<", ">"]:
+            (magic,) = struct.unpack_from(endianness + "I", self.mmap, offset + 8)
+            if magic == PcapReader.PCAPNG_BYTE_ORDER_MAGIC:
+                break
+        else:
+            raise PcapReaderException("The file {0} is not a pcapng file".format(self.filePath))
+        self.blockHeader = struct.Struct(endianness + "II")
+        self.enhancedPacketHeader = struct.Struct(endianness + "IIIII")
+        self.simplePacketHeader = struct.Struct(endianness + "I")
+        self.obsoletePacketHeader = struct.Struct(endianness + "HHIIII")
+        self.interfaceHeader = struct.Struct(endianness + "HHI")
+        self.optionHeader = struct.Struct(endianness + "HH")
+        self.interfaces = []
+        (blockType, blockLength) = self.blockHeader.unpack_from(self.mmap, offset)
+        return offset + blockLength
+
+    def _readInterfaceDescription(self, offset, blockLength):
+        (linktype, reserved, snaplen) = self.interfaceHeader.unpack_from(self.mmap, offset + 8)
+        resolution = 1000000
+        # Look for the resolution of the timestamps in the options
+        optionOffset = offset + 16
+        end = offset + blockLength - 4
+        while optionOffset + 4 <= end:
+            (code, length) = self.optionHeader.unpack_from(self.mmap, optionOffset)
+            if code == PcapReader.PCAPNG_OPTION_END:
+                break
+            if code == PcapReader.PCAPNG_OPTION_TSRESOL and length >= 1:
+                value = ord(self.mmap[optionOffset + 4])
+                if value & 0x80:
+                    resolution = 2 ** (value & 0x7f)
+                else:
+                    resolution = 10 ** value
+            optionOffset += 4 + ((length + 3) & ~3)
+
+        if self.linktype is None:
+            self.linktype = linktype
+            self.snaplen = snaplen
+        elif linktype != self.linktype:
+            self.log.warning("The interface {0} of {1} has the link type {2} instead of {3}".format(len(self.interfaces), self.filePath, linktype, self.linktype))
+        self.interfaces.append((linktype, resolution, snaplen))
+
+    def _readPacket(self, offset):
+        """Reads the packet at the offset.
+
+        :return: the header, the data and the offset of the following
+        packet, or None if there is no more packet"""
+        if self.pcapng:
+            return self._readBlock(offset)
+
+        if offset + PcapReader.RECORD_HEADER_SIZE > self.size:
+            return None
+        (sec, usec, caplen, length) = self.recordHeader.unpack_from(self.mmap, offset)
+        if self.nanosecond:
+            usec /= 1000
+        offset += PcapReader.RECORD_HEADER_SIZE
+        if offset + caplen > self.size:
+            self.log.warning("The last packet of {0} is truncated".format(self.filePath))
+            return None
+        return (PcapPacketHeader(sec, usec, caplen, length), self.mmap[offset:offset + caplen], offset + caplen)
+
+    def _readBlock(self, offset):
+        """Reads the blocks of a pcapng file from the offset up to the
+        next packet"""
+        while offset + 12 <= self.size:
+            (blockType, blockLength) = self.blockHeader.unpack_from(self.mmap, offset)
+            if blockLength < 12 or offset + blockLength > self.size:
+                self.log.warning("The last block of {0} is truncated".format(self.filePath))
+                return None
+            if blockType == PcapReader.PCAPNG_ENHANCED_PACKET:
+                (interface, high, low, caplen, length) = self.enhancedPacketHeader.unpack_from(self.mmap, offset + 8)
+                return self._createPacket(interface, (high << 32) | low, caplen, length, offset + 28, offset + blockLength)
+            elif blockType == PcapReader.PCAPNG_SIMPLE_PACKET:
+                (length,) = self.simplePacketHeader.unpack_from(self.mmap, offset + 8)
+                caplen = min(length, blockLength - 16)
+                if len(self.interfaces) > 0:
+                    caplen = min(caplen, self.interfaces[0][2] or caplen)
+                header = PcapPacketHeader(0, 0, caplen, length)
+                return (header, self.mmap[offset + 12:offset + 12 + caplen], offset + blockLength)
+            elif blockType == PcapReader.PCAPNG_PACKET:
+                (interface, drops, high, low, caplen, length) = self.obsoletePacketHeader.unpack_from(self.mmap, offset + 8)
+                return self._createPacket(interface, (high << 32) | low, caplen, length, offset + 28, offset + blockLength)
+            elif blockType == PcapReader.PCAPNG_INTERFACE_DESCRIPTION:
+                self._readInterfaceDescription(offset, blockLength)
+            elif blockType == PcapReader.PCAPNG_SECTION_HEADER:
+                offset = self._readSectionHeader(offset)
+                continue
+            offset += blockLength
+        return None
+
+    def _createPacket(self, interface, timestamp, caplen, length, dataOffset, nextOffset):
+        if interface < len(self.interfaces):
+            resolution = self.interfaces[interface][1]
+        else:
+            resolution = 1000000
+        (sec, units) = divmod(timestamp, resolution)
+        usec = (units * 1000000) / resolution
+        return (PcapPacketHeader(int(sec), int(usec), caplen, length), self.mmap[dataOffset:dataOffset + caplen], nextOffset)
+
+    def _buildIndex(self):
+        """Indexes the offsets of all the packets of the file"""
+        offsets = array('L')
+        if self.pcapng:
+            # The blocks are read from the start since they describe the
+            # interfaces and the byte order of the packets
+            offset = self._readSectionHeader(0)
+        else:
+            offset = PcapReader.FILE_HEADER_SIZE
+        while True:
+            if self.pcapng:
+                # Skip the blocks which are not packets
+                packetOffset = self._skipToPacket(offset)
+                if packetOffset is None:
+                    break
+                offset = packetOffset
+            packet = self._readPacket(offset)
+            if packet is None:
+                break
+            offsets.append(offset)
+            offset = packet[2]
+        self.offsets = offsets
+
+    def _skipToPacket(self, offset):
+        while offset + 12 <= self.size:
+            (blockType, blockLength) = self.blockHeader.unpack_from(self.mmap, offset)
+            if blockType in [PcapReader.PCAPNG_ENHANCED_PACKET, PcapReader.PCAPNG_SIMPLE_PACKET, PcapReader.PCAPNG_PACKET]:
+                return offset
+            if blockLength < 12:
+                return None
+            if blockType == PcapReader.PCAPNG_INTERFACE_DESCRIPTION:
+                self._readInterfaceDescription(offset, blockLength)
+            elif blockType == PcapReader.PCAPNG_SECTION_HEADER:
+                offset = self._readSectionHeader(offset)
+                continue
+            offset += blockLength
+        return None
+
+    def datalink(self):
+        """Returns the link type of the packets"""
+        if self.linktype is None and self.pcapng:
+            # The interfaces are described before their first packet
+            offset = self._skipToPacket(self.offset)
+            self.offset = offset if offset is not None else self.size
+        return self.linktype
+
+    def next(self):
+        """Returns the header and the data of the next packet, or
+        (None, '') once all the packets have been read"""
+        packet = self._readPacket(self.offset)
+        if packet is None:
+            return (None, '')
+        (header, data, self.offset) = packet
+        return (header, data)
+
+    def loop(self, count, callback):
+        """Calls the callback with the header and the data of the next
+        count packets, or of all the remaining packets if count is 0"""
+        nb = 0
+        while count <= 0 or nb < count:
+            packet = self._readPacket(self.offset)
+            if packet is None:
+                break
+            (header, data, self.offset) = packet
+            callback(header, data)
+            nb += 1
+        return nb
+
+    def getNumberOfPackets(self):
+        if self.offsets is None:
+            self._buildIndex()
+        return len(self.offsets)
+
+    def getPacket(self, index):
+        """Returns the header and the data of the packet at the index"""
+        if self.offsets is None:
+            self._buildIndex()
+        packet = self._readPacket(self.offsets[index])
+        return (packet[0], packet[1])
+
+    def getPacketOffset(self, index):
+        """Returns the offset of the packet at the index in the file"""
+        if self.offsets is None:
+            self._buildIndex()
+        return self.offsets[index]
+
+    def setOffset(self, offset):
+        """Moves the reading of next() and loop() to the packet at the
+        offset given by getPacketOffset()"""
+        if self.pcapng:
+            # The interfaces are described before the first packet
+            self.datalink()
+        self.offset = offset
+
+    def getBytesRead(self):
+        """Returns the number of bytes of the file read by next()"""
+        return self.offset
+
+    def getSize(self):
+        return self.size
+
+    def close(self):
+        self.mmap.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.getNumberOfPackets()
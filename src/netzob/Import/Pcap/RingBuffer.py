@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+class RingBuffer(object):
+    """Bounded buffer between one producer thread and one consumer
+    thread.
+
+    The slots are allocated once. Only the producer moves the head
+    and only the consumer moves the tail, each after having written or
+    read the slot, so no lock is needed (the assignment of an attribute
+    is atomic). An item put while the buffer is full is dropped and
+    counted."""
+
+    def __init__(self, capacity):
+        # One slot stays empty to tell a full buffer from an empty one
+        self.size = capacity + 1
+        self.slots = [None] * self.size
+        self.head = 0
+        self.tail = 0
+        self.nbPut = 0
+        self.nbDropped = 0
+
+    def put(self, item):
+        """Adds an item, from the producer thread.
+
+        :return: False if the buffer is full and the item is dropped"""
+        head = self.head
+        next = (head + 1) % self.size
+        if next == self.tail:
+            self.nbDropped += 1
+            return False
+        self.slots[head] = item
+        self.head = next
+        self.nbPut += 1
+        return True
+
+    def isFull(self):
+        return (self.head + 1) % self.size == self.tail
+
+    def getBatch(self, maxItems=None):
+        """Removes the oldest items, from the consumer thread.
+
+        :return: the list of at most maxItems items, all the items if
+        maxItems is None"""
+        tail = self.tail
+        head = self.head
+        nbItems = (head - tail) % self.size
+        if maxItems is not None:
+            nbItems = min(nbItems, maxItems)
+        end = tail + nbItems
+        if end <= self.size:
+            batch = self.slots[tail:end]
+            self.slots[tail:end] = [None] * nbItems
+        else:
+            end -= self.size
+            batch = self.slots[tail:] + self.slots[:end]
+            self.slots[tail:] = [None] * (self.size - tail)
+            self.slots[:end] = [None] * end
+        self.tail = end % self.size
+        return batch
+
+    def getCapacity(self):
+        return self.size - 1
+
+    def getNumberOfDropped(self):
+        return self.nbDropped
+
+    def __len__(self):
+        return (self.head - self.tail) % self.size
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from collections import OrderedDict
+import logging
+
+
+class TcpWrite(object):
+    """Data written at once by one end of a TCP flow, made of one or
+    more segments. The context is the one given with its first
+    segment."""
+
+    __slots__ = ['flowID', 'timestamp', 'source', 'destination', 'data', 'context']
+
+    def __init__(self, flowID, timestamp, source, destination, data, context):
+        self.flowID = flowID
+        self.timestamp = timestamp
+        self.source = source
+        self.destination = destination
+        self.data = data
+        self.context = context
+
+
+class TcpStream(object):
+    """One direction of a TCP flow"""
+
+    def __init__(self, source, destination):
+        self.source = source
+        self.destination = destination
+        # Sequence number of the next expected byte
+        self.nextSeq = None
+        # Segments of the write in progress
+        self.pending = []
+        self.pendingSize = 0
+        self.pendingTime = None
+        self.pendingContext = None
+        # Segments received after a gap, by sequence number
+        self.outOfOrder = {}
+        self.outOfOrderSize = 0
+        # The end has sent FIN
+        self.finished = False
+
+
+class TcpFlow(object):
+    """A TCP flow and its two directions"""
+
+    def __init__(self, id):
+        self.id = id
+        self.lastTime = None
+        self.streams = {}
+
+    def getStream(self, source, destination):
+        stream = self.streams.get(source)
+        if stream is None:
+            stream = TcpStream(source, destination)
+            self.streams[source] = stream
+        return stream
+
+    def isFinished(self):
+        """Tells if both ends have sent FIN"""
+        if len(self.streams) < 2:
+            return False
+        for stream in self.streams.values():
+            if not stream.finished:
+                return False
+        return True
+
+
+class TcpReassembler(object):
+    """Reassembles the TCP segments of captured flows into the data
+    written by each end of the flows.
+
+    The segments are given in their capture order with addSegment().
+    Retransmitted data is dropped and the segments received out of
+    order are buffered until the gap before them is filled. The data of
+    a direction is emitted as one write when a segment has the PSH flag,
+    when the other end sends data, when its end sends FIN, or when the
+    flow ends.
+
+    A flow ends once both ends have sent FIN (an end may keep sending
+    after the other one has), on RST, or on timeout. A segment without
+    payload nor SYN does not open a flow, so that the last ACK of a
+    closed flow is ignored.
+
+    The memory is bounded: a flow idle for timeout seconds (of capture
+    time) is closed, the oldest flow is closed when maxFlows flows are
+    open, and the data after a gap is given up waiting for once more
+    than maxBufferSize bytes are buffered (the gap is a loss).
+
+    The writes and the identifiers of the closed flows are retrieved
+    with popWrites() and popClosedFlows(). A flow is closed after its
+    last write."""
+
+    FIN = 0x01
+    SYN = 0x02
+    RST = 0x04
+    PSH = 0x08
+
+    SEQUENCE_MASK = 0xffffffff
+    SEQUENCE_HALF = 0x80000000
+
+    DEFAULT_TIMEOUT = 120.0
+    DEFAULT_MAX_FLOWS = 10000
+    DEFAULT_MAX_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, maxFlows=DEFAULT_MAX_FLOWS, maxBufferSize=DEFAULT_MAX_BUFFER_SIZE):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.Pcap.TcpReassembler.py')
+        self.timeout = timeout
+        self.maxFlows = maxFlows
+        self.maxBufferSize = maxBufferSize
+        # Open flows, from the least recently active
+        self.flows = OrderedDict()
+        self.nbFlows = 0
+        self.lastExpiration = None
+        self.writes = []
+        self.closedFlows = []
+        self.nbRetransmitted = 0
+        self.nbLost = 0
+
+    def addSegment(self, timestamp, source, destination, seq, flags, payload, context=None):
+        """Adds a captured segment.
+
+        :param source: the address and the port of the sender
+        :param destination: the address and the port of the receiver
+        :param context: any information to give back with the write
+        starting with this segment"""
+        if source <= destination:
+            key = (source, destination)
+        else:
+            key = (destination, source)
+        flow = self.flows.pop(key, None)
+        if flow is None:
+            if len(payload) == 0 and not flags & TcpReassembler.SYN:
+                # Nothing to reassemble, the flow is closed or started
+                # before the capture
+                self._expire(timestamp)
+                return
+            if len(self.flows) >= self.maxFlows:
+                (oldestKey, oldestFlow) = self.flows.popitem(last=False)
+                self._closeFlow(oldestFlow)
+            flow = TcpFlow(self.nbFlows)
+            self.nbFlows += 1
+        flow.lastTime = timestamp
+        self.flows[key] = flow
+
+        stream = flow.getStream(source, destination)
+        if flags & TcpReassembler.SYN:
+            stream.nextSeq = (seq + 1) & TcpReassembler.SEQUENCE_MASK
+        elif len(payload) > 0:
+            if stream.nextSeq is None:
+                # The flow started before the capture
+                stream.nextSeq = seq
+            # The other end has finished its write
+            other = flow.streams.get(destination)
+            if other is not None and other.pendingSize > 0:
+                self._emit(flow, other)
+            self._receive(flow, stream, timestamp, seq, flags, payload, context)
+
+        if flags & TcpReassembler.RST:
+            del self.flows[key]
+            self._closeFlow(flow)
+        elif flags & TcpReassembler.FIN:
+            stream.finished = True
+            self._finishStream(flow, stream)
+            if flow.isFinished():
+                del self.flows[key]
+                self._closeFlow(flow)
+
+        self._expire(timestamp)
+
+    def _receive(self, flow, stream, timestamp, seq, flags, payload, context):
+        offset = (seq - stream.nextSeq) & TcpReassembler.SEQUENCE_MASK
+        if offset >= TcpReassembler.SEQUENCE_HALF:
+            # The segment starts with data already received
+            overlap = TcpReassembler.SEQUENCE_HALF * 2 - offset
+            if overlap >= len(payload):
+                self.nbRetransmitted += 1
+                return
+            payload = payload[overlap:]
+        elif offset > 0:
+            previous = stream.outOfOrder.get(seq)
+            if previous is None or len(previous[2]) < len(payload):
+                if previous is not None:
+                    stream.outOfOrderSize -= len(previous[2])
+                stream.outOfOrder[seq] = (timestamp, flags, payload, context)
+                stream.outOfOrderSize += len(payload)
+            if stream.outOfOrderSize > self.maxBufferSize:
+                self._skipGap(flow, stream)
+            return
+
+        self._append(flow, stream, timestamp, flags, payload, context)
+        if len(stream.outOfOrder) > 0:
+            self._drain(flow, stream)
+
+    def _append(self, flow, stream, timestamp, flags, payload, context):
+        if stream.pendingSize == 0:
+            stream.pendingTime = timestamp
+            stream.pendingContext = context
+        stream.pending.append(payload)
+        stream.pendingSize += len(payload)
+        stream.nextSeq = (stream.nextSeq + len(payload)) & TcpReassembler.SEQUENCE_MASK
+        if flags & TcpReassembler.PSH or stream.pendingSize > self.maxBufferSize:
+            self._emit(flow, stream)
+
+    def _relativeSeq(self, stream, seq):
+        """Returns the position of the sequence number from the next
+        expected one, the sequence numbers before it being the lowest"""
+        return (seq - stream.nextSeq + TcpReassembler.SEQUENCE_HALF) & TcpReassembler.SEQUENCE_MASK
+
+    def _drain(self, flow, stream):
+        """Appends the buffered segments which follow the received data"""
+        while len(stream.outOfOrder) > 0:
+            for seq in sorted(stream.outOfOrder.keys(), key=lambda seq: self._relativeSeq(stream, seq)):
+                offset = (seq - stream.nextSeq) & TcpReassembler.SEQUENCE_MASK
+                if offset > 0 and offset < TcpReassembler.SEQUENCE_HALF:
+                    return
+                (timestamp, flags, payload, context) = stream.outOfOrder.pop(seq)
+                stream.outOfOrderSize -= len(payload)
+                if offset > 0:
+                    overlap = TcpReassembler.SEQUENCE_HALF * 2 - offset
+                    if overlap >= len(payload):
+                        continue
+                    payload = payload[overlap:]
+                self._append(flow, stream, timestamp, flags, payload, context)
+                break
+
+    def _skipGap(self, flow, stream):
+        """Gives up the data missing before the first buffered segment"""
+        self.nbLost += 1
+        if stream.pendingSize > 0:
+            self._emit(flow, stream)
+        stream.nextSeq = min(stream.outOfOrder.keys(), key=lambda seq: self._relativeSeq(stream, seq))
+        self._drain(flow, stream)
+
+    def _emit(self, flow, stream):
+        self.writes.append(TcpWrite(flow.id, stream.pendingTime, stream.source, stream.destination, "".join(stream.pending), stream.pendingContext))
+        stream.pending = []
+        stream.pendingSize = 0
+        stream.pendingTime = None
+        stream.pendingContext = None
+
+    def _finishStream(self, flow, stream):
+        """Emits the data of a direction whose end has sent FIN"""
+        while len(stream.outOfOrder) > 0:
+            self._skipGap(flow, stream)
+        if stream.pendingSize > 0:
+            self._emit(flow, stream)
+
+    def _closeFlow(self, flow):
+        streams = flow.streams.values()
+        for stream in streams:
+            while len(stream.outOfOrder) > 0:
+                self._skipGap(flow, stream)
+        # The writes in progress are emitted in the order they started
+        for stream in sorted(streams, key=lambda stream: stream.pendingTime):
+            if stream.pendingSize > 0:
+                self._emit(flow, stream)
+        self.closedFlows.append(flow.id)
+
+    def _expire(self, timestamp):
+        """Closes the flows idle since more than the timeout"""
+        if self.lastExpiration is not None and timestamp - self.lastExpiration < self.timeout / 10:
+            return
+        self.lastExpiration = timestamp
+        while len(self.flows) > 0:
+            key = next(iter(self.flows))
+            flow = self.flows[key]
+            if timestamp - flow.lastTime <= self.timeout:
+                break
+            del self.flows[key]
+            self._closeFlow(flow)
+
+    def flush(self):
+        """Closes all the open flows, once all the segments are added"""
+        while len(self.flows) > 0:
+            (key, flow) = self.flows.popitem(last=False)
+            self._closeFlow(flow)
+        if self.nbRetransmitted > 0 or self.nbLost > 0:
+            self.log.info("{0} retransmitted segments have been dropped and {1} gaps have been skipped".format(self.nbRetransmitted, self.nbLost))
+
+    def popWrites(self):
+        """Returns the writes emitted since the last call"""
+        writes = self.writes
+        self.writes = []
+        return writes
+
+    def popClosedFlows(self):
+        """Returns the identifiers of the flows closed since the last
+        call"""
+        closedFlows = self.closedFlows
+        self.closedFlows = []
+        return closedFlows
+
+    def getNumberOfOpenFlows(self):
+        return len(self.flows)
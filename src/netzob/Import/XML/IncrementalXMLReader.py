@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import bz2
+import logging
+import os
+from lxml import etree
+
+
+class BZ2StreamReader(object):
+    """Read-only file object decompressing a bz2 file as it is read,
+    one chunk of the compressed file at a time"""
+
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, filePath):
+        self.file = open(filePath, "rb")
+        self.decompressor = bz2.BZ2Decompressor()
+        # Decompressed data, read up to offset
+        self.buffer = ""
+        self.offset = 0
+        self.bytesRead = 0
+        self.ended = False
+
+    def read(self, size=-1):
+        while not self.ended and (size < 0 or len(self.buffer) - self.offset < size):
+            chunk = self.file.read(BZ2StreamReader.CHUNK_SIZE)
+            self.bytesRead += len(chunk)
+            if len(chunk) == 0:
+                self.ended = True
+                break
+            self.buffer = self.buffer[self.offset:] + self.decompress(chunk)
+            self.offset = 0
+        if size < 0:
+            size = len(self.buffer) - self.offset
+        data = self.buffer[self.offset:self.offset + size]
+        self.offset += len(data)
+        return data
+
+    def decompress(self, chunk):
+        try:
+            data = self.decompressor.decompress(chunk)
+        except EOFError:
+            # Next stream of a multi-stream file
+            self.decompressor = bz2.BZ2Decompressor()
+            data = self.decompressor.decompress(chunk)
+        if len(self.decompressor.unused_data) > 0:
+            unusedData = self.decompressor.unused_data
+            self.decompressor = bz2.BZ2Decompressor()
+            data += self.decompress(unusedData)
+        return data
+
+    def getBytesRead(self):
+        """Number of compressed bytes read"""
+        return self.bytesRead
+
+    def close(self):
+        self.file.close()
+
+
+class IncrementalXMLReader(object):
+    """Iterates over the children of the root of an XML document which
+    have a given tag, as soon as each of them is parsed.
+
+    The document is parsed incrementally from its file, decompressed on
+    the fly if it is a bz2 file, and validated while it is parsed
+    against an optional lxml XMLSchema. Each element is cleared and
+    removed from the tree once the iteration goes on, so the memory used
+    is bounded by the largest element.
+    """
+
+    def __init__(self, filePath, tag, schema=None, compressed=False):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Import.XML.IncrementalXMLReader.py')
+        self.filePath = filePath
+        self.tag = tag
+        self.schema = schema
+        self.compressed = compressed
+        self.size = os.path.getsize(filePath)
+        self.stream = None
+
+    def __iter__(self):
+        if self.compressed:
+            self.stream = BZ2StreamReader(self.filePath)
+        else:
+            self.stream = open(self.filePath, "rb")
+        try:
+            parameters = {}
+            if self.schema is not None:
+                parameters["schema"] = self.schema
+            for (event, element) in etree.iterparse(self.stream, events=("end",), tag=self.tag, huge_tree=True, **parameters):
+                parent = element.getparent()
+                if parent is None or parent.getparent() is not None:
+                    # Not a child of the root
+                    continue
+                # The previous children of the root are not used anymore
+                while element.getprevious() is not None:
+                    del parent[0]
+                yield element
+                element.clear()
+        finally:
+            self.stream.close()
+
+    def getBytesRead(self):
+        """Number of bytes of the file read"""
+        if self.stream is None:
+            return 0
+        if self.compressed:
+            return self.stream.getBytesRead()
+        try:
+            return self.stream.tell()
+        except ValueError:
+            # closed
+            return self.size
+
+    def getSize(self):
+        return self.size
@@ -383,6 +383,16 @@ class Angluin(LearningAlgorithm):
             idState = idState + 1
 
         self.log.debug("Create the transition of the automata")
+        # Index the words of S and SA and the states by name so that output
+        # states are retrieved without scanning the whole table
+        wordsSandSA = dict()
+        for wordSandSA in self.getSandSAWords():
+            wordsSandSA[wordSandSA.getKey()] = wordSandSA
+        statesByName = dict()
+        for (w2, s2) in wordAndStates:
+            statesByName[s2.getName()] = s2
+        transitions = []
+
         # Create the transitions of the automata
         for (word, state) in wordAndStates:
             self.log.debug("Working on state: {0}".format(str(state.getName())))
@@ -396,40 +406,33 @@ class Angluin(LearningAlgorithm):
                 self.log.debug("> What happen when we send " + str(symbol) + " after " + str(word))
                 self.log.debug(">> " + str(mq))
 
-                for wordSandSA in self.getSandSAWords():
-                    self.log.info("IS " + str(wordSandSA) + " eq " + str(mq))
-                    if wordSandSA == mq:
-                        self.log.info("YES its equal")
-                        rowOutputState = self.getRowOfObservationTable(wordSandSA)
-                        outputStateName = self.appendValuesInRow(rowOutputState)
-                        self.log.debug("rowOutputState = " + str(rowOutputState))
-                        self.log.debug("outputStateName = " + str(outputStateName))
-
-                        # search for the state having this name:
-                        outputState = None
-                        self.log.info("Search for the output state: {0}".format(outputStateName))
-                        for (w2, s2) in wordAndStates:
-                            if s2.getName() == outputStateName:
-                                outputState = s2
-                                self.log.info("  == " + str(s2.getName()))
-                            else:
-                                self.log.info("   != " + str(s2.getName()))
-
-                        if outputState is not None:
-                            inputSymbol = symbol.getSymbolsWhichAreNotEmpty()[0]
-
-                            self.log.info("We create a transition from " + str(state.getName()) + "=>" + str(outputState.getName()))
-                            self.log.info(" input: {0}".format(str(inputSymbol)))
-                            self.log.info(" output: {0}".format(str(value)))
-
-                            transition = SemiStochasticTransition(idTransition, "Transition " + str(idTransition), state, outputState, inputSymbol)
-                            transition.addOutputSymbol(value, 100, 1000)
-                            state.registerTransition(transition)
-
-                            idTransition = idTransition + 1
-
-                        else:
-                            self.log.error("<!!> Impossible to retrieve the output state named " + str(s2.getName()))
+                wordSandSA = wordsSandSA.get(mq.getKey())
+                if wordSandSA is not None:
+                    rowOutputState = self.getRowOfObservationTable(wordSandSA)
+                    outputStateName = self.appendValuesInRow(rowOutputState)
+                    self.log.debug("rowOutputState = " + str(rowOutputState))
+                    self.log.debug("outputStateName = " + str(outputStateName))
+
+                    # search for the state having this name:
+                    self.log.debug("Search for the output state: {0}".format(outputStateName))
+                    outputState = statesByName.get(outputStateName)
+
+                    if outputState is not None:
+                        inputSymbol = symbol.getSymbolsWhichAreNotEmpty()[0]
+
+                        self.log.debug("We create a transition from " + str(state.getName()) + "=>" + str(outputState.getName()))
+                        self.log.debug(" input: {0}".format(str(inputSymbol)))
+                        self.log.debug(" output: {0}".format(str(value)))
+
+                        transition = SemiStochasticTransition(idTransition, "Transition " + str(idTransition), state, outputState, inputSymbol)
+                        transition.addOutputSymbol(value, 100, 1000)
+                        state.registerTransition(transition)
+                        transitions.append(transition)
+
+                        idTransition = idTransition + 1
+
+                    else:
+                        self.log.error("<!!> Impossible to retrieve the output state named " + str(outputStateName))
 
         if startState is not None:
             self.log.info("An infered automata has been computed.")
@@ -437,7 +440,9 @@ class Angluin(LearningAlgorithm):
             self.inferedAutomata = MMSTD(startState, self.dictionary)
             for state in states:
                 self.inferedAutomata.addState(state)
-            self.log.info(self.inferedAutomata.getDotCode())
+            for transition in transitions:
+                self.inferedAutomata.addTransition(transition)
+            self.log.debug(self.inferedAutomata.getDotCode())
 
     def addCounterExamples(self, counterExamples):
         self.log.info("Modify the automata in order to consider the " + str(len(counterExamples)) + " counterexamples")
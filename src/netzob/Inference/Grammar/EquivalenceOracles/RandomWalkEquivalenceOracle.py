@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+----------------------------------------------
+#| Standard library imports
+#+----------------------------------------------
+from gettext import gettext as _
+import logging
+import random
+import time
+from collections import deque
+
+#+----------------------------------------------
+#| Related third party imports
+#+----------------------------------------------
+
+#+----------------------------------------------
+#| Local application imports
+#+----------------------------------------------
+from netzob.Inference.Grammar.EquivalenceOracles.AbstractEquivalenceOracle import AbstractEquivalenceOracle
+from netzob.Inference.Grammar.EquivalenceOracles.TestSuiteExecutor import TestSuiteExecutor
+from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
+from netzob.Common.MMSTD.Symbols.impl.DictionarySymbol import DictionarySymbol
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+
+
+#+----------------------------------------------
+#| RandomWalkEquivalenceOracle:
+#|    Searches for a counterexample by executing randomly
+#|    generated tests: each test reaches a randomly picked
+#|    state of the hypothesis through its access sequence
+#|    and continues with a random walk. The search stops
+#|    when a counterexample is found or when one of the
+#|    budgets (tests, queries, time) is exhausted.
+#|    A negative budget means unlimited. Without a budget
+#|    of tests, the search also stops once a batch of tests
+#|    is entirely answered by the cache: the walks then
+#|    hardly reach new queries.
+#+----------------------------------------------
+class RandomWalkEquivalenceOracle(AbstractEquivalenceOracle):
+
+    def __init__(self, communicationChannel, resetScript, maxTests=1000, maxQueries=-1, maxDuration=-1, minLength=1, maxLength=10, additionalChannels=None, seed=None):
+        AbstractEquivalenceOracle.__init__(self, "RandomWalkEquivalenceOracle")
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Inference.Grammar.EquivalenceOracles.RandomWalkEquivalenceOracle')
+        self.communicationChannel = communicationChannel
+        # Each additional channel reaches another instance of the target
+        # on which tests are executed in parallel
+        self.communicationChannels = [communicationChannel]
+        if additionalChannels is not None:
+            self.communicationChannels.extend(additionalChannels)
+        self.resetScript = resetScript
+        self.maxTests = maxTests
+        self.maxQueries = maxQueries
+        self.maxDuration = maxDuration
+        self.minLength = minLength
+        self.maxLength = maxLength
+        if maxTests < 0 and maxQueries < 0 and maxDuration < 0:
+            self.log.warn("No budget was specified, the number of tests is limited to 1000")
+            self.maxTests = 1000
+        self.random = random.Random(seed)
+        # Number of tests generated before being executed
+        self.batchSize = 10 * len(self.communicationChannels)
+        self.statistics = dict()
+
+    def createTestSuiteExecutor(self, cache):
+        return TestSuiteExecutor(self.communicationChannels, self.resetScript, cache)
+
+    def findCounterExample(self, mmstd, inputSymbols, cache):
+        self.log.info("Search a counterexample with random walks (tests={0}, queries={1}, duration={2})".format(self.maxTests, self.maxQueries, self.maxDuration))
+
+        inputDictionary = []
+        for entry in inputSymbols:
+            inputDictionary.append(DictionarySymbol(entry))
+
+        accessSequences = self.computeAccessSequences(mmstd, inputDictionary)
+        states = accessSequences.keys()
+        executor = self.createTestSuiteExecutor(cache)
+
+        nbTests = 0
+        nbQueries = 0
+        nbCachedTests = 0
+        coveredStates = set()
+        coveredTransitions = set()
+        counterExample = None
+        startTime = time.time()
+
+        while counterExample is None and not self.isBudgetExhausted(nbTests, nbQueries, startTime):
+            # Compute the size of the next batch given the remaining budgets
+            batchSize = self.batchSize
+            if self.maxTests >= 0:
+                batchSize = min(batchSize, self.maxTests - nbTests)
+            if self.maxQueries >= 0:
+                batchSize = min(batchSize, self.maxQueries - nbQueries)
+
+            tests = []
+            for i in range(0, batchSize):
+                state = states[self.random.randint(0, len(states) - 1)]
+                symbols = list(accessSequences[state])
+                for j in range(0, self.random.randint(self.minLength, self.maxLength)):
+                    symbols.append(inputDictionary[self.random.randint(0, len(inputDictionary) - 1)])
+                tests.append(MembershipQuery(symbols))
+                self.updateCoverage(mmstd, symbols, coveredStates, coveredTransitions)
+
+            counterExample = executor.execute(mmstd, tests)
+            nbTests += batchSize
+            nbQueries += executor.getNbExecutedTests()
+            nbCachedTests += executor.getNbCachedTests()
+
+            # The number of distinct walks is bounded, so the cache ends by
+            # answering all of them and the budget of queries may never be reached
+            if counterExample is None and self.maxTests < 0 and executor.getNbExecutedTests() == 0:
+                self.log.info("No new query was produced by the last {0} tests, stop the search".format(batchSize))
+                break
+
+        nbTransitions = len(states) * len(inputDictionary)
+        self.statistics = dict()
+        self.statistics["tests"] = nbTests
+        self.statistics["queries"] = nbQueries
+        self.statistics["cachedTests"] = nbCachedTests
+        self.statistics["duration"] = time.time() - startTime
+        self.statistics["stateCoverage"] = float(len(coveredStates)) / max(1, len(states))
+        self.statistics["transitionCoverage"] = float(len(coveredTransitions)) / max(1, nbTransitions)
+        self.log.info("Random walks statistics: {0}".format(str(self.statistics)))
+
+        return counterExample
+
+    def isBudgetExhausted(self, nbTests, nbQueries, startTime):
+        if self.maxTests >= 0 and nbTests >= self.maxTests:
+            return True
+        if self.maxQueries >= 0 and nbQueries >= self.maxQueries:
+            return True
+        if self.maxDuration >= 0 and time.time() - startTime >= self.maxDuration:
+            return True
+        return False
+
+    def computeAccessSequences(self, mmstd, inputDictionary):
+        """computeAccessSequences:
+                Computes for each reachable state of the hypothesis the shortest
+                sequence of input symbols which leads to it.
+
+                @rtype: dict
+                @return: the access sequence indexed by state
+        """
+        initialState = mmstd.getInitialState()
+        accessSequences = dict()
+        accessSequences[initialState] = []
+        toAnalyze = deque([initialState])
+        while len(toAnalyze) > 0:
+            state = toAnalyze.popleft()
+            for letter in inputDictionary:
+                outputState = self.getNextState(state, letter)
+                if outputState is not None and not outputState in accessSequences:
+                    accessSequences[outputState] = accessSequences[state] + [letter]
+                    toAnalyze.append(outputState)
+        return accessSequences
+
+    def getNextState(self, state, letter):
+        for transition in state.getTransitions():
+            if transition.getType() == SemiStochasticTransition.TYPE and transition.isValid(letter):
+                return transition.getOutputState()
+        return None
+
+    def updateCoverage(self, mmstd, symbols, coveredStates, coveredTransitions):
+        state = mmstd.getInitialState()
+        for symbol in symbols:
+            if state is None:
+                return
+            coveredStates.add(state.getID())
+            coveredTransitions.add((state.getID(), symbol.getID()))
+            state = self.getNextState(state, symbol)
+        if state is not None:
+            coveredStates.add(state.getID())
+
+    #+----------------------------------------------
+    #| GETTERS
+    #+----------------------------------------------
+    def getStatistics(self):
+        """getStatistics:
+                Returns the statistics of the last search: number of generated
+                tests, of executed queries, of cached tests, the duration and the
+                state and transition coverages of the hypothesis.
+        """
+        return self.statistics
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+----------------------------------------------
+#| Standard library imports
+#+----------------------------------------------
+from gettext import gettext as _
+import logging
+import threading
+import os
+
+#+----------------------------------------------
+#| Related third party imports
+#+----------------------------------------------
+
+#+----------------------------------------------
+#| Local application imports
+#+----------------------------------------------
+from netzob.Common.MMSTD.OutputTraceEvaluator import OutputTraceEvaluator
+from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
+from netzob.Inference.Grammar.Oracles.NetworkOracle import NetworkOracle
+from netzob.Inference.Grammar.Oracles.AbstractOracle import AbstractOracle
+
+
+#+----------------------------------------------
+#| TestSuiteExecutor:
+#|    Executes a suite of tests (MQs) against one or
+#|    several instances of the target and compares the
+#|    results with the ones computed on the model.
+#|    One worker is started per communication channel
+#|    (i.e. per instance of the target) and the execution
+#|    is cancelled as soon as a counterexample is found.
+#+----------------------------------------------
+class TestSuiteExecutor(object):
+
+    def __init__(self, communicationChannels, resetScript, cache):
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Inference.Grammar.EquivalenceOracles.TestSuiteExecutor.py')
+        self.communicationChannels = communicationChannels
+        self.resetScript = resetScript
+        self.cache = cache
+        self.evaluator = None
+        self.nbExecutedTests = 0
+        self.nbCachedTests = 0
+
+    @staticmethod
+    def pruneTests(tests):
+        """pruneTests:
+                Removes from the provided tests the duplicated ones and the ones
+                which are a prefix of another test. Since the model is deterministic,
+                executing the longest test also validates all its prefixes.
+
+                @type tests: list
+                @param tests: the membership queries to prune
+                @rtype: list
+                @return: the pruned tests sorted in lexicographic order of their symbols
+        """
+        testsByKey = dict()
+        for test in tests:
+            key = test.getKey()
+            if not key in testsByKey:
+                testsByKey[key] = test
+
+        # In a lexicographically sorted list, a key which prefixes another
+        # one also prefixes the key which immediately follows it
+        sortedKeys = sorted(testsByKey.keys())
+        result = []
+        for i in range(0, len(sortedKeys)):
+            key = sortedKeys[i]
+            if i + 1 < len(sortedKeys) and sortedKeys[i + 1][:len(key)] == key:
+                continue
+            result.append(testsByKey[key])
+        return result
+
+    def orderTests(self, tests):
+        """orderTests:
+                Computes the execution order of the tests: the cached ones are
+                verified first since they don't require any network exchange, the
+                other ones follow in lexicographic order.
+
+                @rtype: tuple
+                @return: the list of cached tests and the list of tests to execute
+        """
+        cachedTests = []
+        testsToExecute = []
+        for test in tests:
+            if self.cache.isCached(test):
+                cachedTests.append(test)
+            else:
+                testsToExecute.append(test)
+        return (cachedTests, testsToExecute)
+
+    def execute(self, mmstd, tests):
+        """execute:
+                Executes the provided tests and returns the first one which
+                invalids the model.
+
+                @type mmstd: netzob.Common.MMSTD.MMSTD.MMSTD
+                @param mmstd: the model to validate
+                @type tests: list
+                @param tests: the membership queries to execute
+                @rtype: netzob.Inference.Grammar.Queries.MembershipQuery.MembershipQuery
+                @return: a counterexample or None if none of the tests invalids the model
+        """
+        prunedTests = TestSuiteExecutor.pruneTests(tests)
+        self.log.info("A number of {0} tests remains after pruning the {1} provided ones".format(len(prunedTests), len(tests)))
+        (cachedTests, testsToExecute) = self.orderTests(prunedTests)
+        self.nbExecutedTests = 0
+        self.nbCachedTests = len(cachedTests)
+
+        # First we verify the tests which results are already known
+        for test in cachedTests:
+            if self.isCounterExample(mmstd, test, self.cache.getCachedResult(test)):
+                return test
+
+        if len(testsToExecute) == 0:
+            return None
+
+        # Then we distribute the other ones over the instances of the target
+        self.pendingTests = list(testsToExecute)
+        self.pendingTests.reverse()
+        self.counterExamples = []
+        self.cancelled = threading.Event()
+        self.testsLock = threading.Lock()
+        self.modelLock = threading.Lock()
+
+        workers = []
+        for communicationChannel in self.communicationChannels:
+            worker = threading.Thread(target=self.executeWorker, args=(mmstd, communicationChannel))
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+
+        self.log.info("{0} tests were executed, {1} were cached".format(self.nbExecutedTests, self.nbCachedTests))
+
+        if len(self.counterExamples) == 0:
+            return None
+
+        # Returns the counterexample which comes first in the execution order
+        # to be independent of the scheduling of the workers
+        counterExample = None
+        for test in testsToExecute:
+            if test in self.counterExamples:
+                counterExample = test
+                break
+        return counterExample
+
+    def executeWorker(self, mmstd, communicationChannel):
+        while not self.cancelled.isSet():
+            with self.testsLock:
+                if len(self.pendingTests) == 0:
+                    return
+                test = self.pendingTests.pop()
+
+            resultQuery = self.executeTest(mmstd, test, communicationChannel)
+            self.cache.cacheResult(test, resultQuery)
+
+            with self.testsLock:
+                self.nbExecutedTests += 1
+
+            with self.modelLock:
+                invalid = self.isCounterExample(mmstd, test, resultQuery)
+
+            if invalid:
+                with self.testsLock:
+                    self.counterExamples.append(test)
+                self.cancelled.set()
+
+    def executeTest(self, mmstd, test, communicationChannel):
+        """executeTest:
+                Submits the provided test to the instance of the target
+                reachable through the communication channel.
+
+                @return: the symbols generated by the target
+        """
+        # The target is simulated in memory
+        if isinstance(communicationChannel, AbstractOracle):
+            return communicationChannel.submitQuery(test)
+
+        if self.resetScript != "":
+            # The script is provided the target of the channel so it can reset
+            # the appropriate instance when several are used
+            os.system("sh {0} {1} {2}".format(self.resetScript, communicationChannel.getOriginalTargetIP(), communicationChannel.getOriginalTargetPort()))
+
+        self.log.debug("Execute test: {0}".format(str(test)))
+
+        isMaster = not communicationChannel.isServer()
+
+        testedMmstd = test.toMMSTD(mmstd.getVocabulary(), isMaster)
+        oracle = NetworkOracle(communicationChannel, isMaster)
+        oracle.setMMSTD(testedMmstd)
+        oracle.start()
+        oracle.join()
+        oracle.stop()
+
+        if isMaster:
+            return oracle.getGeneratedOutputSymbols()
+        else:
+            return oracle.getGeneratedInputSymbols()
+
+    def getEvaluator(self, mmstd):
+        """getEvaluator:
+                Returns the evaluator of the output traces of the model. It is kept
+                while the same model is validated so that the traces of the
+                prefixes shared by successive suites of tests are reused.
+        """
+        if self.evaluator is None or self.evaluator.getMMSTD() is not mmstd:
+            self.evaluator = OutputTraceEvaluator(mmstd)
+        return self.evaluator
+
+    def isCounterExample(self, mmstd, test, resultQuery):
+        (traceTest, stateTest) = self.getEvaluator(mmstd).getOutputTrace(mmstd.getInitialState(), test.getSymbols())
+
+        mqOur = MembershipQuery(traceTest)
+        mqTheir = MembershipQuery(resultQuery)
+
+        if not mqOur.isStrictlyEqual(mqTheir):
+            self.log.info("========================")
+            self.log.info("We found a counter example")
+            self.log.info("========================")
+            self.log.info("TEST: {0}".format(str(test)))
+            self.log.info("OUR: {0}".format(str(mqOur)))
+            self.log.info("THEIR: {0}".format(str(mqTheir)))
+            return True
+
+        self.log.debug("{0} is not a counter example".format(str(test)))
+        return False
+
+    #+----------------------------------------------
+    #| GETTERS
+    #+----------------------------------------------
+    def getNbExecutedTests(self):
+        return self.nbExecutedTests
+
+    def getNbCachedTests(self):
+        return self.nbCachedTests
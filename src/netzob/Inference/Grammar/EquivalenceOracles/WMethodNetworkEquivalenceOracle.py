@@ -30,9 +30,7 @@
 #+----------------------------------------------
 from gettext import gettext as _
 import logging
-import time
 from collections import deque
-import os
 #+----------------------------------------------
 #| Related third party imports
 #+----------------------------------------------
@@ -44,7 +42,7 @@ from netzob.Inference.Grammar.EquivalenceOracles.AbstractEquivalenceOracle impor
 from netzob.Common.MMSTD.Symbols.impl.DictionarySymbol import DictionarySymbol
 from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
 from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
-from netzob.Inference.Grammar.Oracles.NetworkOracle import NetworkOracle
+from netzob.Inference.Grammar.EquivalenceOracles.TestSuiteExecutor import TestSuiteExecutor
 
 
 #+----------------------------------------------
@@ -52,11 +50,16 @@ from netzob.Inference.Grammar.Oracles.NetworkOracle import NetworkOracle
 #+----------------------------------------------
 class WMethodNetworkEquivalenceOracle(AbstractEquivalenceOracle):
 
-    def __init__(self, communicationChannel, maxSize, resetScript):
+    def __init__(self, communicationChannel, maxSize, resetScript, additionalChannels=None):
         AbstractEquivalenceOracle.__init__(self, "WMethodNetworkEquivalenceOracle")
         # create logger with the given configuration
         self.log = logging.getLogger('netzob.Inference.Grammar.EquivalenceOracles.WMethodNetworkEquivalenceOracle')
         self.communicationChannel = communicationChannel
+        # Each additional channel reaches another instance of the target
+        # on which tests are executed in parallel
+        self.communicationChannels = [communicationChannel]
+        if additionalChannels is not None:
+            self.communicationChannels.extend(additionalChannels)
         self.m = maxSize
         self.resetScript = resetScript
 
@@ -228,59 +231,8 @@ class WMethodNetworkEquivalenceOracle(AbstractEquivalenceOracle):
         for t in T:
             self.log.info("=> {0}".format(str(t)))
 
-        testsResults = dict()
-        self.log.info("----> Compute the responses to the the tests over our model and compare them with the real one")
-        i_test = 0
-        # We compute the response to the different tests over our learning model and compare them with the real one
-        for test in T:
-            i_test = i_test + 1
-            # Compute our results
-            (traceTest, stateTest) = mmstd.getOutputTrace(mmstd.getInitialState(), test.getSymbols())
-
-            # Verify the request is not in the cache
-            cachedValue = cache.getCachedResult(test)
-            if cachedValue is None:
-                # Compute real results
-                if self.resetScript != "":
-                    os.system("sh " + self.resetScript)
-
-                self.log.debug("=====================")
-                self.log.debug("Execute test {0}/{1}: {2}".format(str(i_test), str(len(T)), str(test)))
-                self.log.debug("=====================")
-
-                isMaster = not self.communicationChannel.isServer()
-
-                testedMmstd = test.toMMSTD(mmstd.getVocabulary(), isMaster)  # TODO TODO
-                oracle = NetworkOracle(self.communicationChannel, isMaster)  # TODO TODO is master ??
-                oracle.setMMSTD(testedMmstd)
-                oracle.start()
-                while oracle.isAlive():
-                    time.sleep(0.01)
-                oracle.stop()
-
-                if isMaster:
-                    resultQuery = oracle.getGeneratedOutputSymbols()
-                else:
-                    resultQuery = oracle.getGeneratedInputSymbols()
-                cache.cacheResult(test, resultQuery)
-
-            else:
-                resultQuery = cachedValue
-
-            mqOur = MembershipQuery(traceTest)
-            mqTheir = MembershipQuery(resultQuery)
-
-            if not mqOur.isStrictlyEqual(mqTheir):
-                self.log.info("========================")
-                self.log.info("We found a counter example")
-                self.log.info("========================")
-                self.log.info("TEST: {0}".format(str(test)))
-                self.log.info("OUR: {0}".format(str(mqOur)))
-                self.log.info("THEIR: {0}".format(str(mqTheir)))
-                return test
-            else:
-                self.log.info("========================")
-                self.log.info("Not a counter example")
-                self.log.info("========================")
-
-        return None
+        # The tests are pruned, ordered and executed on all the available instances of the target
+        executor = TestSuiteExecutor(self.communicationChannels, self.resetScript, cache)
+        counterExample = executor.execute(mmstd, T)
+        self.log.info("{0} tests were executed over the network and {1} were found in the cache".format(executor.getNbExecutedTests(), executor.getNbCachedTests()))
+        return counterExample
@@ -68,6 +68,12 @@ class GrammarInferer(threading.Thread):
         self.inferedAutomaton = None
         self.hypotheticalAutomaton = None
         self.learner = None
+        self.queryOracle = None
+
+    def setQueryOracle(self, queryOracle):
+        """Submits the membership queries to the provided oracle
+        instead of the communication channel"""
+        self.queryOracle = queryOracle
 
     def run(self):
         self.log.info("Starting the Grammar inferring process")
@@ -922,6 +928,8 @@ class GrammarInferer(threading.Thread):
 
         # we first initialize the angluin's algo
         self.learner = Angluin(self.vocabulary, self.inputDictionary, self.oracle, self.resetScript, self.cb_submitedQuery, self.cb_hypotheticalAutomaton, cache)
+        if self.queryOracle is not None:
+            self.learner.setOracle(self.queryOracle)
 
         while not equivalent and self.active:
             self.log.info("=============================================================================")
@@ -936,7 +944,8 @@ class GrammarInferer(threading.Thread):
             self.log.info("An hypothetical automaton has been computed")
 
             # Execute the call back function for the hypothetial automaton
-            GObject.idle_add(self.cb_hypotheticalAutomaton, self.hypotheticalAutomaton)
+            if self.cb_hypotheticalAutomaton is not None:
+                GObject.idle_add(self.cb_hypotheticalAutomaton, self.hypotheticalAutomaton)
 
             counterExample = self.equivalenceOracle.findCounterExample(self.hypotheticalAutomaton, self.inputDictionary, cache)
 
@@ -957,9 +966,9 @@ class GrammarInferer(threading.Thread):
         # Now we apply indeterminism
         i_session = 0
         sessions = self.vocabulary.getSessions()
-        for session in self.sessions:
+        for session in sessions:
             self.log.info("Re-inject session (" + str(i_session) + ") in the automata")
-            new_automata = self.applyMessagesOnAutomata(automaton, messages)
+            automaton = self.applyMessagesOnAutomata(automaton, session.getMessages())
             i_session = i_session + 1
 
         endTime = time.time()
@@ -58,6 +58,8 @@ class LearningAlgorithm(object):
         self.dictionary = dictionary
         self.inputDictionary = inputDictionary
         self.communicationChannel = communicationChannel
+        # Oracle which answers the queries instead of the communication channel
+        self.oracle = None
         self.inferedAutomata = None
         self.resetScript = resetScript
         self.submitedQueries = []
@@ -72,6 +74,17 @@ class LearningAlgorithm(object):
     def attachStatusCallBack(self, callbackFunction):
         self.callbackFunction = callbackFunction
 
+    def setOracle(self, oracle):
+        """setOracle:
+                Submits the queries to the provided oracle (for instance a
+                simulated one) instead of the target reachable through the
+                communication channel.
+
+                @type oracle: netzob.Inference.Grammar.Oracles.AbstractOracle.AbstractOracle
+                @param oracle: the oracle which answers the queries
+        """
+        self.oracle = oracle
+
     def learn(self):
         self.log.error("The LearningAlgorithm class doesn't support 'learn'.")
         raise NotImplementedError("The LearningAlgorithm class doesn't support 'learn'.")
@@ -86,6 +99,9 @@ class LearningAlgorithm(object):
             self.log.info("The MQ is cached, result obtained: {0} = {1}.".format(str(query), str(cachedValue)))
             return cachedValue[len(cachedValue) - 1]
 
+        if self.oracle is not None:
+            return self.submitOracleQuery(query)
+
         # TODO : must be UPGRADED
         # WARNING
         if self.resetScript != "":
@@ -163,5 +179,18 @@ class LearningAlgorithm(object):
             self.cache.cacheResult(query, resultQuery)
             return resultQuery
 
+    def submitOracleQuery(self, query):
+        resultQuery = self.oracle.submitQuery(query)
+
+        # Register this query and the associated response
+        self.submitedQueries.append([query, resultQuery])
+        self.cache.cacheResult(query, resultQuery)
+
+        if self.callbackFunction is not None:
+            GObject.idle_add(self.callbackFunction, query, resultQuery)
+
+        # return only the last result
+        return resultQuery[len(resultQuery) - 1]
+
     def getInferedAutomata(self):
         return self.inferedAutomata
@@ -29,6 +29,7 @@
 #| Standard library imports
 #+----------------------------------------------
 import logging
+import threading
 
 #+----------------------------------------------
 #| Related third party imports
@@ -50,22 +51,30 @@ class MQCache():
     def __init__(self):
         # create logger with the given configuration
         self.log = logging.getLogger('netzob.Inference.Grammar.MQCache.py')
+        # MQs and their results indexed by the key of the MQ (see MembershipQuery.getKey)
         self.cache = dict()
+        # The cache is shared between the learner and the (possibly
+        # parallel) equivalence oracles
+        self.lock = threading.Lock()
 
     def getCachedResult(self, mq):
-        for cachedMQ in self.cache.keys():
-            if cachedMQ == mq:
-                return self.cache.get(cachedMQ)
+        with self.lock:
+            entry = self.cache.get(mq.getKey())
+        if entry is None:
+            return None
+        return entry[1]
 
-        return None
+    def isCached(self, mq):
+        with self.lock:
+            return mq.getKey() in self.cache
 
     def cacheResult(self, mq, result):
         self.log.debug("Cache the following : " + str(mq) + " == " + str(result))
-        self.cache[mq] = result
+        with self.lock:
+            self.cache[mq.getKey()] = (mq, result)
 
     def dumpCache(self):
-        for mq in self.cache.keys():
-            result = self.cache[mq]
+        for (mq, result) in self.cache.values():
             self.log.debug(str(mq) + ">" + str(result))
 
     def preloadCache(self, datas, vocabulary):
@@ -57,3 +57,7 @@ class AbstractOracle(object):
     def stop(self):
         self.log.error("The oracle doesn't support 'stop'.")
         raise NotImplementedError("The oracle doesn't support 'stop'.")
+
+    def submitQuery(self, query):
+        self.log.error("The oracle doesn't support 'submitQuery'.")
+        raise NotImplementedError("The oracle doesn't support 'submitQuery'.")
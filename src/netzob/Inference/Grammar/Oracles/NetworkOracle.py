@@ -30,7 +30,6 @@
 #+----------------------------------------------
 from gettext import gettext as _
 import logging
-import time
 import threading
 import uuid
 
@@ -76,9 +75,7 @@ class NetworkOracle(threading.Thread):
         anID = str(uuid.uuid4())
         self.oracle = MMSTDVisitor(anID, "MMSTD-NetworkOracle", self.mmstd, self.isMaster, abstractionLayer)
         self.oracle.start()
-
-        while (self.oracle.isAlive()):
-            time.sleep(0.01)
+        self.oracle.join()
 
         self.log.warn("The network ORACLE has finished")
 
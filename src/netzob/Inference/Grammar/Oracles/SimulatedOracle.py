@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+----------------------------------------------
+#| Standard library imports
+#+----------------------------------------------
+from gettext import gettext as _
+import logging
+import threading
+
+#+----------------------------------------------
+#| Related third party imports
+#+----------------------------------------------
+
+#+----------------------------------------------
+#| Local application imports
+#+----------------------------------------------
+from netzob.Inference.Grammar.Oracles.AbstractOracle import AbstractOracle
+from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+
+
+#+----------------------------------------------
+#| SimulatedOracle:
+#|    Answers the queries in memory given a reference
+#|    MMSTD which plays the role of the target. It
+#|    allows to measure the learner independently of
+#|    the network and of the target latency.
+#+----------------------------------------------
+class SimulatedOracle(AbstractOracle):
+
+    TYPE = "SimulatedOracle"
+
+    def __init__(self, reference):
+        AbstractOracle.__init__(self, SimulatedOracle.TYPE)
+        # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Inference.Grammar.Oracle.SimulatedOracle.py')
+        self.reference = reference
+        self.nbQueries = 0
+        self.nbSymbols = 0
+        self.lock = threading.Lock()
+
+    def start(self, mmstd):
+        self.reference = mmstd
+
+    def stop(self):
+        pass
+
+    def submitQuery(self, query):
+        """submitQuery:
+                Computes the symbols the reference emits when the symbols of the
+                query are submitted from its initial state. Symbols which are not
+                accepted in the current state produce an EmptySymbol and don't
+                change the state.
+
+                @type query: netzob.Inference.Grammar.Queries.MembershipQuery.MembershipQuery
+                @param query: the query to submit
+                @rtype: list
+                @return: the output symbols, one per input symbol
+        """
+        symbols = query.getSymbols()
+        with self.lock:
+            self.nbQueries += 1
+            self.nbSymbols += len(symbols)
+
+        result = []
+        state = self.reference.getInitialState()
+        for symbol in symbols:
+            transition = self.getTransition(state, symbol)
+            if transition is None:
+                result.append(EmptySymbol())
+            else:
+                outputSymbols = transition.getOutputSymbols()
+                if len(outputSymbols) > 0:
+                    result.append(outputSymbols[0][0])
+                else:
+                    result.append(EmptySymbol())
+                state = transition.getOutputState()
+        self.log.debug("Simulated query {0} > {1}".format(str(query), [str(s) for s in result]))
+        return result
+
+    def getTransition(self, state, symbol):
+        for transition in state.getTransitions():
+            if transition.getType() == SemiStochasticTransition.TYPE and transition.isValid(symbol):
+                return transition
+        return None
+
+    #+----------------------------------------------
+    #| GETTERS
+    #+----------------------------------------------
+    def getReference(self):
+        return self.reference
+
+    def getNbQueries(self):
+        return self.nbQueries
+
+    def getNbSymbols(self):
+        return self.nbSymbols
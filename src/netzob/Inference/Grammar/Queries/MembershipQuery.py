@@ -140,6 +140,16 @@ class MembershipQuery(object):
             result.addSymbol(symbol)
         return result
 
+    def getKey(self):
+        """getKey:
+                Computes a hashable key which identifies the query: two
+                strictly equal queries share the same key.
+
+                @rtype: tuple
+                @return: the IDs of the not empty symbols of the query.
+        """
+        return tuple([s.getID() for s in self.getSymbolsWhichAreNotEmpty()])
+
     def isStrictlyEqual(self, other):
         if (len(self.getSymbolsWhichAreNotEmpty()) == len(other.getSymbolsWhichAreNotEmpty())):
             symbols = self.getSymbolsWhichAreNotEmpty()
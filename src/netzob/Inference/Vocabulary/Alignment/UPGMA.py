@@ -56,13 +56,18 @@ class UPGMA(object):
     """This class provides the required methods to compute clustering
     between multiple symbols/messages using UPGMA algorithms (see U{http://en.wikipedia.org/wiki/UPGMA}).
     When processing, the matrix of scores is computed by the C extensions (L{_libScoreComputation}
-    and used to regroup messages and symbols into equivalent cluster."""
+    and used to regroup messages and symbols into equivalent cluster.
+    Unless deduplicate is False, messages with byte-identical payloads are
+    aligned only once and clustered as a single weighted symbol whenever
+    this does not change the resulting clusters."""
 
-    def __init__(self, project, symbols, unitSize, cb_status=None, scores={}):
+    def __init__(self, project, symbols, unitSize, cb_status=None, scores={}, deduplicate=True):
         self.project = project
         self.unitSize = unitSize
         self.cb_status = cb_status
         self.scores = scores
+        self.deduplicate = deduplicate
+        self.pendingSymbols = []
 
         # Then we retrieve all the parameters of the CLUSTERING / ALIGNMENT
         self.defaultFormat = self.project.getConfiguration().getVocabularyInferenceParameter(ProjectConfiguration.VOCABULARY_GLOBAL_FORMAT)
@@ -133,27 +138,133 @@ class UPGMA(object):
         iteratively."""
         self.log.debug("Computing the associated matrix")
 
-        # Execute the Clustering part in C
+        # Only one symbol of each group of duplicates is aligned in C
+        if self.deduplicate:
+            groups = self.groupSymbolsByPayload(self.symbols)
+        else:
+            groups = [[symbol] for symbol in self.symbols]
+        self.log.debug("{0} distinct payloads among {1} symbols".format(len(groups), len(self.symbols)))
+
+        self.scores = self.computeScores([group[0] for group in groups], self.cb_executionStatus)
+        if self.scores is None:
+            return (None, None, None)
+
+        # Reduce each group of duplicates either to a single weighted
+        # symbol or to as many symbols sharing the same scores
+        self.pendingSymbols = []
+        reducedSymbols = {}
+        for group in groups:
+            if len(group) > 1:
+                groupScores = self.computeScores(group[:2], lambda stage, donePercent, currentMessage: None)
+                if groupScores is None:
+                    return (None, None, None)
+                reducedSymbols.update(self.reduceDuplicates(group, groupScores[group[0].getID()][group[1].getID()]))
+        if len(reducedSymbols) > 0:
+            symbols = []
+            for symbol in self.symbols:
+                reducedSymbol = reducedSymbols.get(symbol.getID(), symbol)
+                if reducedSymbol is not None:
+                    symbols.append(reducedSymbol)
+            self.symbols = symbols
+
+        # Reduce the UPGMA matrix (merge symbols by similarity)
+        self.computePhylogenicTree()
+
+    def computeScores(self, symbols, cb_status):
+        """Computes in C the similarity scores between the first
+        message of each of the symbols
+        @param symbols: the list of symbols to compare
+        @param cb_status: the callback provided with the status of the computation
+        @return: the scores indexed by the uids of the symbols, None if stopped"""
         debug = False
         wrapper = WrapperArgsFactory("_libScoreComputation.computeSimilarityMatrix")
-        wrapper.typeList[wrapper.function](self.symbols)
-        (listScores) = _libScoreComputation.computeSimilarityMatrix(self.doInternalSlick, self.cb_executionStatus, self.isFinish, debug, wrapper)
+        wrapper.typeList[wrapper.function](symbols)
+        (listScores) = _libScoreComputation.computeSimilarityMatrix(self.doInternalSlick, cb_status, self.isFinish, debug, wrapper)
         # Retrieve the scores for each association of symbols
-        self.scores = {}
+        scores = {}
         for (iuid, juid, score) in listScores:
             if self.isFinish():
-                return (None, None, None)
-
-            if iuid not in self.scores.keys():
-                self.scores[iuid] = {}
-            if juid not in self.scores.keys():
-                self.scores[juid] = {}
-            self.scores[iuid][juid] = score
-            if iuid not in self.scores[juid].keys():
-                self.scores[juid][iuid] = score
+                return None
 
-        # Reduce the UPGMA matrix (merge symbols by similarity)
-        self.computePhylogenicTree()
+            if iuid not in scores.keys():
+                scores[iuid] = {}
+            if juid not in scores.keys():
+                scores[juid] = {}
+            scores[iuid][juid] = score
+            if iuid not in scores[juid].keys():
+                scores[juid][iuid] = score
+        return scores
+
+    def groupSymbolsByPayload(self, symbols):
+        """Groups the symbols made of a single message by the hash of
+        its payload, the other symbols being left alone in their group
+        @param symbols: the list of symbols to group
+        @return: the list of groups, ordered by their first symbol"""
+        groups = []
+        groupIndexes = {}
+        for symbol in symbols:
+            messages = symbol.getMessages()
+            if len(messages) != 1:
+                groups.append([symbol])
+                continue
+            payloadHash = messages[0].getPayloadHash()
+            if payloadHash in groupIndexes:
+                groups[groupIndexes[payloadHash]].append(symbol)
+            else:
+                groupIndexes[payloadHash] = len(groups)
+                groups.append([symbol])
+        return groups
+
+    def reduceDuplicates(self, symbols, score):
+        """Reduces a group of symbols with identical payloads, the
+        first one of them being already in the matrix of scores.
+        If their mutual score is high enough and greater than their score
+        with any other symbol, UPGMA would merge them before any of them
+        is merged with another symbol: they are replaced by the result of
+        this merge, which completion is delayed until the clustering
+        reaches their score. Otherwise each of them is kept with the
+        scores of the first one.
+        @param symbols: the group of symbols with identical payloads
+        @param score: the similarity score of two of them
+        @return: the replacement of each symbol, None if it is removed"""
+        uid = symbols[0].getID()
+        if uid not in self.scores:
+            self.scores[uid] = {}
+        row = self.scores[uid]
+
+        if score >= self.minEquivalence and (len(row) == 0 or score >= max(row.values())):
+            newSymbol = self.mergeSymbols(symbols)
+            newuid = newSymbol.getID()
+            self.scores[newuid] = self.scores.pop(uid)
+            for k in row.keys():
+                self.scores[k][newuid] = self.scores[k].pop(uid)
+            self.pendingSymbols.append((score, newSymbol))
+            self.pendingSymbols.sort(key=lambda pending: pending[0], reverse=True)
+
+            reducedSymbols = dict([(symbol.getID(), None) for symbol in symbols])
+            reducedSymbols[uid] = newSymbol
+            return reducedSymbols
+
+        for symbol in symbols[1:]:
+            suid = symbol.getID()
+            self.scores[suid] = dict(row)
+            for k in row.keys():
+                self.scores[k][suid] = row[k]
+        for symbol1 in symbols:
+            for symbol2 in symbols:
+                if symbol1 is not symbol2:
+                    self.scores[symbol1.getID()][symbol2.getID()] = score
+        return {}
+
+    def completeDuplicates(self, score):
+        """Completes the merge of the groups of duplicates which score is
+        not lower than the given one: as UPGMA would have done, the merged
+        symbol is moved at the end of the symbols.
+        @param score: the score reached by the clustering"""
+        while len(self.pendingSymbols) > 0 and self.pendingSymbols[0][0] >= score:
+            (pendingScore, symbol) = self.pendingSymbols.pop(0)
+            self.symbols.remove(symbol)
+            self.symbols.append(symbol)
 
     def computePhylogenicTree(self):
         """Compute the phylogenic tree
@@ -173,6 +284,7 @@ class UPGMA(object):
             if self.isFinish():
                 return
 
+            self.completeDuplicates(maxScore)
             symbols_uid = [s.getID() for s in self.symbols]  # List of the UID in of symbols
             (i_maximum, j_maximum) = (symbols_uid.index(max_i), symbols_uid.index(max_j))
             size_i = len(self.symbols[i_maximum].getMessages())
@@ -189,6 +301,7 @@ class UPGMA(object):
                 max_i = max(self.scores, key=lambda x: self.scores[x][max(self.scores[x], key=lambda y: self.scores[x][y])])
                 max_j = max(self.scores[max_i], key=lambda y: self.scores[max_i][y])
                 maxScore = self.scores[max_i][max_j]
+        self.completeDuplicates(self.minEquivalence)
 
     def updateScore(self, iuid, juid, newuid, size_i, size_j):
         """Update the score of two merged clusters.
@@ -238,20 +351,26 @@ class UPGMA(object):
             symbol2 = self.symbols.pop(i_maximum)
 
         # Merge the symbols i and j
-        messages = []
-        messages.extend(symbol1.getMessages())
-        messages.extend(symbol2.getMessages())
-
-        newSymbol = Symbol(str(uuid.uuid4()), symbol1.getName(), self.project)
-        newSymbol.setMinEqu(self.minEquivalence)
-        for message in messages:
-            newSymbol.addMessage(message)
+        newSymbol = self.mergeSymbols([symbol1, symbol2])
 
         # Append th new symbol to the "symbols" structure
         self.symbols.append(newSymbol)
 
         return newSymbol.getID()
 
+    def mergeSymbols(self, symbols):
+        """Creates a symbol made of the messages of the given symbols
+        @param symbols: the symbols to merge
+        @return the newly created symbol, named after the first one"""
+        messages = []
+        for symbol in symbols:
+            messages.extend(symbol.getMessages())
+
+        newSymbol = Symbol(str(uuid.uuid4()), symbols[0].getName(), self.project)
+        newSymbol.setMinEqu(self.minEquivalence)
+        newSymbol.addMessages(messages)
+        return newSymbol
+
     def executeOrphanReduction(self):
         """Execute the orphan reduction process by merging symbols
         which are progressively reduced in size."""
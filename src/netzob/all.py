@@ -62,10 +62,25 @@ from netzob.Common.Project import Project
 from netzob.Common import SharedLib
 from netzob.Common.LoggingConfiguration import LoggingConfiguration
 from netzob.Common.MMSTD.Actors.AbstractChannel import AbstractChannel
+from netzob.Common.MMSTD.Actors.Framing.AbstractFraming import AbstractFraming
+from netzob.Common.MMSTD.Actors.Framing.DelimiterFraming import DelimiterFraming
+from netzob.Common.MMSTD.Actors.Framing.FixedSizeFraming import FixedSizeFraming
+from netzob.Common.MMSTD.Actors.Framing.LengthPrefixedFraming import LengthPrefixedFraming
+from netzob.Common.MMSTD.Actors.Framing.ReassemblyBuffer import ReassemblyBuffer
+from netzob.Common.MMSTD.Actors.Framing.SymbolFraming import SymbolFraming
+from netzob.Common.MMSTD.Actors.LoadGenerator.LatencyHistogram import LatencyHistogram
+from netzob.Common.MMSTD.Actors.LoadGenerator.LoadGenerator import LoadGenerator
+from netzob.Common.MMSTD.Actors.LoadGenerator.LoadReport import LoadReport
 from netzob.Common.MMSTD.Actors.MMSTDVisitor import MMSTDVisitor
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopInstanciatedNetworkServer import EventLoopInstanciatedNetworkServer
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkClient import EventLoopNetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkServer import EventLoopNetworkServer
 from netzob.Common.MMSTD.Actors.NetworkChannels.InstanciatedNetworkServer import InstanciatedNetworkServer
 from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkClient import NetworkClient
 from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkServer import NetworkServer
+from netzob.Common.MMSTD.Actors.Scheduler import Scheduler
+from netzob.Common.MMSTD.Actors.SessionProfiler import SessionProfiler
 from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
 from netzob.Common.MMSTD.Dictionary.DataTypes.AbstractType import AbstractType
 from netzob.Common.MMSTD.Dictionary.DataTypes.AbstractWordType import AbstractWordType
@@ -77,16 +92,20 @@ from netzob.Common.MMSTD.Dictionary.DataTypes.IPv4WordType import IPv4WordType
 from netzob.Common.MMSTD.Dictionary.DataTypes.MACWordType import MACWordType
 from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
 from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.ReadingProgram import ReadingProgram
 from netzob.Common.MMSTD.Dictionary.RelationTypes.BinarySizeRelationType import BinarySizeRelationType
 from netzob.Common.MMSTD.Dictionary.RelationTypes.WordSizeRelationType import WordSizeRelationType
+from netzob.Common.MMSTD.Dictionary.SymbolDispatcher import SymbolDispatcher
 from netzob.Common.MMSTD.Dictionary._Variable import Variable
 from netzob.Common.MMSTD.Dictionary.Variables.AbstractVariable import AbstractVariable
 from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
 from netzob.Common.MMSTD.Dictionary.Variables.AlternateVariable import AlternateVariable
 from netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable import ComputedRelationVariable
 from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.WritingProgram import WritingProgram
 from netzob.Common.MMSTD.MemOpexs.MemOpex import MemOpex
 from netzob.Common.MMSTD.MMSTD import MMSTD
+from netzob.Common.MMSTD.OutputTraceEvaluator import OutputTraceEvaluator
 from netzob.Common.MMSTD.States.AbstractState import AbstractState
 from netzob.Common.MMSTD.States.impl.NormalState import NormalState
 from netzob.Common.MMSTD.Symbols.AbstractSymbol import AbstractSymbol
@@ -163,11 +182,14 @@ from netzob.Common.XSDResolver import XSDResolver
 from netzob.Inference.Grammar.Angluin import Angluin
 from netzob.Inference.Grammar.AutomaticGrammarInferenceView import AutomaticGrammarInferenceView
 from netzob.Inference.Grammar.EquivalenceOracles.AbstractEquivalenceOracle import AbstractEquivalenceOracle
+from netzob.Inference.Grammar.EquivalenceOracles.RandomWalkEquivalenceOracle import RandomWalkEquivalenceOracle
+from netzob.Inference.Grammar.EquivalenceOracles.TestSuiteExecutor import TestSuiteExecutor
 from netzob.Inference.Grammar.EquivalenceOracles.WMethodNetworkEquivalenceOracle import WMethodNetworkEquivalenceOracle
 from netzob.Inference.Grammar.GrammarInferer import GrammarInferer
 from netzob.Inference.Grammar.LearningAlgorithm import LearningAlgorithm
 from netzob.Inference.Grammar.MQCache import MQCache
 from netzob.Inference.Grammar.Oracles.NetworkOracle import NetworkOracle
+from netzob.Inference.Grammar.Oracles.SimulatedOracle import SimulatedOracle
 from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
 from netzob.Inference.Vocabulary.Alignment.NeedlemanAndWunsch import NeedlemanAndWunsch
 from netzob.Inference.Vocabulary.Alignment.UPGMA import UPGMA
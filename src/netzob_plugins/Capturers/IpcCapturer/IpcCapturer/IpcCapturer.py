@@ -31,12 +31,10 @@
 from gettext import gettext as _
 import re
 import logging
-import threading
 import os
 import time
 from ptrace.linux_proc import readProcesses, readProcessCmdline
 import subprocess
-from gi.repository import GObject
 import uuid
 
 #+----------------------------------------------
@@ -48,6 +46,8 @@ from netzob.Common.Plugins.Capturers.AbstractCapturer import AbstractCapturer
 from netzob.Common.EnvironmentalDependencies import EnvironmentalDependencies
 from netzob.Common.Type.TypeConvertor import TypeConvertor
 from netzob.Common.NetzobException import NetzobImportException
+from netzob.Import.Ipc.StraceCapture import StraceCapture
+from netzob.Import.Ipc.StraceParser import StraceParser
 
 
 #+----------------------------------------------
@@ -57,10 +57,10 @@ from netzob.Common.NetzobException import NetzobImportException
 class IpcCapturer(AbstractCapturer):
 
     def kill(self):
-        if self.stracePid is not None and self.stracePid.poll() is not None:
+        if self.stracePid is not None and self.stracePid.poll() is None:
             self.stracePid.kill()
-        if self.aSniffThread is not None and self.aSniffThread.isAlive():
-            self.aSniffThread._Thread__stop()
+        if self.capture is not None:
+            self.capture.stop()
 
     #+----------------------------------------------
     #| Constructor:
@@ -71,9 +71,11 @@ class IpcCapturer(AbstractCapturer):
         self.pid = None
         self.sniffOption = None
         self.stracePid = None
-        self.aSniffThread = None
+        self.capture = None
         self.doSniff = False
         self._payloadDict = {}
+        # Types of the file descriptors seen during the capture
+        self._fdTypes = {}
         self.envDeps = EnvironmentalDependencies()
 
         self.selected_fds = set()
@@ -134,9 +136,10 @@ class IpcCapturer(AbstractCapturer):
     #+----------------------------------------------
     #| Called when launching sniffing process
     #+----------------------------------------------
-    def startSniff(self, callback_readMessage):
-        self.callback_readMessage = callback_readMessage
+    def startSniff(self, callback_readMessages):
+        self.callback_readMessages = callback_readMessages
         self.selected_fds.clear()
+        self._fdTypes = {}
         self.doSniff = True
         self.envDeps.captureEnvData()  # Retrieve the environmental data (os specific, system specific, etc.)
         self.messages = []
@@ -149,8 +152,7 @@ class IpcCapturer(AbstractCapturer):
                     # Extract the fd number
                     self.selected_fds.add(int(re.match("(\d+)", model.get_value(iter, 0)).group(1)))
         self.packets = []
-        self.aSniffThread = threading.Thread(None, self.sniffThread, None, (), {})
-        self.aSniffThread.start()
+        self.sniffThread()
 
     #+----------------------------------------------
     #| Called when stopping sniffing process
@@ -158,70 +160,68 @@ class IpcCapturer(AbstractCapturer):
     def stopSniff(self):
         self.doSniff = False
 
-        if self.stracePid is not None:
+        if self.stracePid is not None and self.stracePid.poll() is None:
             self.stracePid.kill()
         self.stracePid = None
-        if self.aSniffThread is not None and self.aSniffThread.isAlive():
-            self.aSniffThread._Thread__stop()
-        self.aSniffThread = None
+        # The capture thread ends with the output of strace, after
+        # giving the last messages
+        self.capture = None
 
     #+----------------------------------------------
-    #| Thread for sniffing a process
+    #| Launch strace and read its output in a thread
     #+----------------------------------------------
     def sniffThread(self):
         logging.info("Launching sniff process")
-        self.stracePid = subprocess.Popen(["/usr/bin/strace", "-xx", "-s", "65536", "-e", "read,write", "-p", str(self.pid)], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        GObject.io_add_watch(self.stracePid.stderr, GObject.IO_IN | GObject.IO_HUP, self.handle_new_pkt)
+        syscalls = ",".join(sorted(StraceParser.SYSCALLS.keys() + StraceParser.CLOSING_SYSCALLS))
+        self.stracePid = subprocess.Popen(["/usr/bin/strace", "-xx", "-s", "65536", "-e", "trace=" + syscalls, "-p", str(self.pid)], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.capture = StraceCapture(self.stracePid.stderr, self.createMessage, self.callback_readMessages)
+        self.capture.fdClosed_cb = self.forgetFD
+        self.capture.start()
 
     #+----------------------------------------------
-    #| Handle new packet received by strace
+    #| Create the message of a buffer read or written
+    #| by the process, called from the capture thread
     #+----------------------------------------------
-    def handle_new_pkt(self, src, event):
-        # Retrieve details from the captured paket
-        data = src.readline()
-        compiledRegex = re.compile("(read|write)\((\d+), \"(.*)\", \d+\)[ \t]*=[ \t]*(\d+)")
-        m = compiledRegex.match(data)
-        if m is None:
-            return self.doSniff
-        direction = data[m.start(1): m.end(1)]
-        fd = int(data[m.start(2): m.end(2)])
-        pkt = data[m.start(3): m.end(3)]
-        pkt = pkt.replace("\\x", "")
-        returnCode = int(data[m.start(4): m.end(4)])
+    def createMessage(self, direction, fd, pkt):
+        category = self.getTypeFromFD(fd)
 
         # Apply filter
-        if self.sniffOption == "fs":
-            if not self.getTypeFromFD(int(fd)) == "fs":
-                return self.doSniff
-        elif self.sniffOption == "network":
-            if not self.getTypeFromFD(int(fd)) == "network":
-                return self.doSniff
-        elif self.sniffOption == "ipc":
-            if not self.getTypeFromFD(int(fd)) == "ipc":
-                return self.doSniff
+        if self.sniffOption in ["fs", "network", "ipc"]:
+            if category != self.sniffOption:
+                return None
         elif self.sniffOption == "filtered":
             if not fd in self.selected_fds:
-                return self.doSniff
+                return None
 
         mUuid = str(uuid.uuid4())
         mTimestamp = int(time.time())
-        message = IPCMessage(mUuid, mTimestamp, pkt, self.getTypeFromFD(int(fd)), fd, direction)
+        message = IPCMessage(mUuid, mTimestamp, pkt, category, fd, direction)
         self._payloadDict[mUuid] = pkt
         self.messages.append(message)
-        self.callback_readMessage(message)
-        return self.doSniff
+        return message
 
     #+----------------------------------------------
     #| GETTERS
     #+----------------------------------------------
+    def forgetFD(self, fd):
+        """Called from the capture thread when the process closes a
+        file descriptor, whose number can then be reused"""
+        self._fdTypes.pop(fd, None)
+
     def getTypeFromFD(self, fd):
-        path = "/proc/" + str(self.pid) + "/fd/" + str(fd)
-        if os.path.realpath(path).find("socket:[", 0) != -1:
-            return "network"
-        elif os.path.isfile(os.path.realpath(path)) or os.path.isdir(os.path.realpath(path)):
-            return "fs"
+        # The type is looked up once per file descriptor until it is
+        # closed, instead of for each of its messages
+        if fd in self._fdTypes:
+            return self._fdTypes[fd]
+        path = os.path.realpath("/proc/" + str(self.pid) + "/fd/" + str(fd))
+        if path.find("socket:[", 0) != -1:
+            fdType = "network"
+        elif os.path.isfile(path) or os.path.isdir(path):
+            fdType = "fs"
         else:
-            return "ipc"
+            fdType = "ipc"
+        self._fdTypes[fd] = fdType
+        return fdType
 
     def getMessageDetails(self, messageID):
         if not messageID in self._payloadDict:
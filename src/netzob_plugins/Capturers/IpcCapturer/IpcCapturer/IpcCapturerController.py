@@ -36,6 +36,7 @@ import time
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
 #+---------------------------------------------------------------------------+
+from gi.repository import GObject
 
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
@@ -93,7 +94,7 @@ class IpcCapturerController(AbstractCapturerController):
     def doReadMessages(self):
         # Launch packets capturing
         try:
-            self.model.startSniff(self.callback_readMessage)
+            self.model.startSniff(self.callback_readMessages)
         except NetzobImportException, importEx:
             if importEx.statusCode == WARNING:
                 self.view.showWarning(importEx.message)
@@ -103,7 +104,16 @@ class IpcCapturerController(AbstractCapturerController):
     def stopSniffing_cb(self, widget):
         self.model.stopSniff()
 
-    def callback_readMessage(self, message):
+    def callback_readMessages(self, messages):
+        # Called from the capture thread
+        GObject.idle_add(self.displayMessages, messages)
+
+    def displayMessages(self, messages):
+        # Display a batch of read messages
+        for message in messages:
+            self.displayMessage(message)
+
+    def displayMessage(self, message):
         shortPayload = message.getStringData()
         if len(shortPayload) > 256:
             shortPayload = shortPayload[:255] + '...'
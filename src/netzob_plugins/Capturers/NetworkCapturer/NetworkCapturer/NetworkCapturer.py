@@ -31,8 +31,6 @@
 from gettext import gettext as _
 import uuid
 import logging
-import threading
-import time
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports
@@ -52,6 +50,8 @@ from netzob.Common.Models.RawMessage import RawMessage
 from netzob.Common.Models.L2NetworkMessage import L2NetworkMessage
 from netzob.Common.Models.L3NetworkMessage import L3NetworkMessage
 from netzob.Common.Models.L4NetworkMessage import L4NetworkMessage
+from netzob.Import.Pcap.CaptureEngine import CaptureEngine
+from netzob.Import.Pcap.PcapReader import PcapReader, PcapReaderException
 
 
 #+---------------------------------------------------------------------------+
@@ -68,13 +68,20 @@ class NetworkCapturer(AbstractCapturer):
     INVALID_LAYER3 = 2
     INVALID_LAYER4 = 3
 
+    # Captured length of the packets, enough for the whole packets
+    SNAPLEN = 65535
+
     def __init__(self, netzob):
         super(NetworkCapturer, self).__init__("NETWORK CAPTURER", netzob)
         # create logger with the given configuration
+        self.log = logging.getLogger('netzob.Capturers.NetworkCapturer.py')
         self.bpfFilter = None
         self.importLayer = 4
+        self.snaplen = NetworkCapturer.SNAPLEN
+        self.bufferSize = CaptureEngine.BUFFER_SIZE
         self._payloadDict = {}
         self.envDeps = EnvironmentalDependencies()
+        self.captureEngine = None
 
     @property
     def payloadDict(self):
@@ -88,6 +95,14 @@ class NetworkCapturer(AbstractCapturer):
             raise
         self.importLayer = importLayer
 
+    def setSnaplen(self, snaplen):
+        self.snaplen = snaplen
+
+    def setBufferSize(self, bufferSize):
+        """Sets the number of packets the capture buffers while they
+        are decoded"""
+        self.bufferSize = bufferSize
+
     def getNetworkDevices(self):
         interfaces = []
         # list of interfaces
@@ -97,40 +112,66 @@ class NetworkCapturer(AbstractCapturer):
             logging.warn("You don't have enough permissions to open any network interface on this system. Please look at the README.rst file for more information.")
         return interfaces
 
-    def readMessages(self, callback_readMessage, device, count, time):
-        """Read all messages from all opened PCAP files"""
-        self.callback_readMessage = callback_readMessage
+    def readMessages(self, callback_readMessages, device, count, time):
+        """Capture count packets on the device, time being the read
+        timeout in milliseconds. The captured messages are given by
+        batches to callback_readMessages, from the decoding thread."""
         self.envDeps.captureEnvData()  # Retrieve the environmental data (os specific, system specific, etc.)
-        self.messages = []
-        aSniffThread = threading.Thread(None, self.sniffingThread, None, (device, count, time), {})
-        aSniffThread.start()
-
-    #+----------------------------------------------
-    #| Thread for sniffing work
-    #+----------------------------------------------
-    def sniffingThread(self, device, count, time):
         logging.info("Launching sniff process on dev {0} with: count={1}, timeout={2}, filter=\"{3}\"".format(device, count, time, self.bpfFilter))
-        sniffer = pcapy.open_live(device, 1024, False, int(time))
+        sniffer = pcapy.open_live(device, self.snaplen, False, int(time))
         try:
             sniffer.setfilter(self.bpfFilter)
         except:
-            logging.warn("The provided filter is not valid (it should respects the BPF format")
-            return
+            errorMessage = _("The provided filter is not valid (it should follow the BPF format)")
+            self.log.warn(errorMessage)
+            raise NetzobImportException("PCAP", errorMessage, ERROR,
+                                        self.INVALID_BPF_FILTER)
+        self._startCapture(sniffer, callback_readMessages, True, int(count))
 
-        self.datalink = sniffer.datalink()
+    def replayMessages(self, callback_readMessages, filePath):
+        """Replay a capture file through the capture pipeline"""
+        try:
+            reader = PcapReader(filePath)
+        except PcapReaderException, e:
+            raise NetzobImportException("PCAP", str(e), ERROR)
+        self._startCapture(reader, callback_readMessages, False, 0)
+
+    def _startCapture(self, source, callback_readMessages, live, count):
+        self.datalink = source.datalink()
         if self.datalink != pcapy.DLT_EN10MB and self.datalink != pcapy.DLT_LINUX_SLL:
             errorMessage = _("This device cannot be sniffed since the "
                              + "layer 2 is not supported ({0})").format(str(self.datalink))
             self.log.warn(errorMessage)
             raise NetzobImportException("PCAP", errorMessage, ERROR,
                                         self.INVALID_LAYER2)
-        else:
-            sniffer.loop(int(count), self._packetHandler)
+        self.messages = []
+        self.callback_readMessages = callback_readMessages
+        self.captureEngine = CaptureEngine(source, self._packetHandler, self._messagesHandler, live, count, self.bufferSize)
+        self.captureEngine.start()
+
+    def stopCapture(self):
+        if self.captureEngine is not None:
+            self.captureEngine.stop()
+
+    def getCaptureStatistics(self):
+        """Returns the counters (captured, dropped packets...) of the
+        last capture"""
+        if self.captureEngine is None:
+            return None
+        return self.captureEngine.getStatistics()
+
+    def _messagesHandler(self, messages):
+        self.messages.extend(messages)
+        self.callback_readMessages(messages)
 
     def _packetHandler(self, header, payload):
-        """Decode a packet"""
+        """Decode a packet, from the decoding thread.
+
+        :return: the message or None if the packet cannot be decoded"""
         mUuid = str(uuid.uuid4())
-        mTimestamp = int(time.time())
+        # Timestamp given by the kernel, with its microseconds
+        (secs, usecs) = header.getts()
+        mTimestamp = secs + (usecs / 1000000.0)
         message = None
         if self.importLayer == 1:
             if len(payload) == 0:
@@ -202,8 +243,7 @@ class NetworkCapturer(AbstractCapturer):
                 l4SrcPort,
                 l4DstPort)
             self._payloadDict[mUuid] = payload
-        self.messages.append(message)
-        self.callback_readMessage(message)
+        return message
 
     def decodeLayer2(self, header, payload):
         def formatMacAddress(arrayMac):
@@ -35,6 +35,7 @@ import os
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
 #+---------------------------------------------------------------------------+
+from gi.repository import GObject
 
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
@@ -118,15 +119,23 @@ class NetworkCapturerController(AbstractCapturerController):
         # Launch packets capturing
         try:
             self.model.setBPFFilter(self.view.filterEntry.get_text().strip())
-            self.model.readMessages(self.callback_readMessage, device, count, time)
+            self.model.readMessages(self.callback_readMessages, device, count, time)
         except NetzobImportException, importEx:
             if importEx.statusCode == WARNING:
                 self.view.showWarning(importEx.message)
             else:
                 NetzobErrorMessage(importEx.message)
 
-    def callback_readMessage(self, message):
-        # Display all read messages
+    def callback_readMessages(self, messages):
+        # Called from the decoding thread of the capture
+        GObject.idle_add(self.displayMessages, messages)
+
+    def displayMessages(self, messages):
+        # Display a batch of read messages
+        for message in messages:
+            self.displayMessage(message)
+
+    def displayMessage(self, message):
         if self.importLayer == 1:
             self.view.listListStore.append([str(message.getID()), False,
                                             message.getStringData()])
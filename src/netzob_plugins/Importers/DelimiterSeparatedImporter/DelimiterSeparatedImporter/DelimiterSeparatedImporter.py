@@ -41,6 +41,7 @@ from netzob.Common.Type.TypeConvertor import TypeConvertor
 from netzob.Common.Models.FileMessage import FileMessage
 from netzob.Common.EnvironmentalDependencies import EnvironmentalDependencies
 from netzob.Import.AbstractImporter import AbstractImporter
+from netzob.Import.File.DelimitedFileReader import DelimitedFileReader
 
 
 #+----------------------------------------------
@@ -63,74 +64,65 @@ class DelimiterSeparatedImporter(AbstractImporter):
         self.importedFiles = []
         self.messageSeparator = ""
         self.messageSeparatorStrategy = None
+        self.chunkSize = DelimitedFileReader.CHUNK_SIZE
 
     def setSourceFiles(self, filePathList):
+        # The content of the files is only read when they are split
         self.importedFiles = []
         for filePath in filePathList:
             size = os.path.getsize(filePath)
+            if not size > 0:
+                continue
             creationDate = datetime.datetime.fromtimestamp(
                 os.path.getctime(filePath))
             modificationDate = datetime.datetime.fromtimestamp(
                 os.path.getmtime(filePath))
             owner = "none"
-            # Retrieve the binary content of the file
-            content = self._getNetzobRawContentOfFile(filePath)
-            if not len(content) > 0:
-                continue
-            # Create a message
-            message = FileMessage(str(uuid.uuid4()), 0,
-                                  content, filePath, creationDate,
-                                  modificationDate, owner, size, 0)
-            self.importedFiles.append(message)
+            self.importedFiles.append((filePath, creationDate, modificationDate, owner, size))
 
     def setSeparator(self, separator, strategy):
         self.messageSeparator = separator
         self.messageSeparatorStrategy = strategy
 
-    def readMessages(self):
-        # Iterate over all imported files and split them
-        # according to the set separator
-        self.messages = []
-        for fileMessage in self.importedFiles:
-            lineNumber = 0
-            if len(self.messageSeparator) > 0:
-                splittedStrHexData = fileMessage.getData().split(self.messageSeparator)
-                if self.messageSeparatorStrategy != DelimiterSeparatedImporter.SEPARATOR_STRATEGY_DELETE:
-                    i_s = 0
-                    l_s = len(splittedStrHexData)
-                    for s in splittedStrHexData:
-                        if self.messageSeparatorStrategy == DelimiterSeparatedImporter.SEPARATOR_STRATEGY_KEEP_END:
-                            if fileMessage.getData().endswith(self.messageSeparator):
-                                limit = l_s
-                            else:
-                                limit = l_s - 1
-                            if i_s < limit:
-                                splittedStrHexData[i_s] = s + self.messageSeparator
+    def setChunkSize(self, chunkSize):
+        """Number of bytes of a file read at once"""
+        self.chunkSize = chunkSize
 
-                        if self.messageSeparatorStrategy == DelimiterSeparatedImporter.SEPARATOR_STRATEGY_KEEP_START:
-                            if fileMessage.getData().startswith(self.messageSeparator):
-                                limit = 0
-                            else:
-                                limit = 1
-                            if i_s >= limit:
-                                splittedStrHexData[i_s] = self.messageSeparator + s
+    def iterMessages(self):
+        """Iterate over the messages of all imported files, split
+        according to the set separator. The files are read in chunks
+        and the progress is reported to the status callback."""
+        separator = TypeConvertor.netzobRawToPythonRaw(self.messageSeparator)
+        strategy = DelimitedFileReader.DELIMITER_DELETE
+        if self.messageSeparatorStrategy == DelimiterSeparatedImporter.SEPARATOR_STRATEGY_KEEP_START:
+            strategy = DelimitedFileReader.DELIMITER_KEEP_START
+        elif self.messageSeparatorStrategy == DelimiterSeparatedImporter.SEPARATOR_STRATEGY_KEEP_END:
+            strategy = DelimitedFileReader.DELIMITER_KEEP_END
 
-                        i_s += 1
+        totalSize = sum([importedFile[4] for importedFile in self.importedFiles])
+        readSize = 0
+        old_status = 0
+        for (filePath, creationDate, modificationDate, owner, size) in self.importedFiles:
+            reader = DelimitedFileReader(filePath, separator, strategy, self.chunkSize)
+            lineNumber = 0
+            for data in reader:
+                if self.cancelled:
+                    return
+                yield FileMessage(str(uuid.uuid4()), 0,
+                                  data.encode("hex"), filePath, creationDate,
+                                  modificationDate, owner, size, lineNumber)
+                lineNumber += 1
 
-            else:
-                splittedStrHexData = [fileMessage.getData()]
-            i_s = 0
-            for s in splittedStrHexData:
-                if len(s) > 0:
-                    message = FileMessage(str(uuid.uuid4()), 0,
-                                          s, fileMessage.getFilename(), fileMessage.getCreationDate(),
-                                          fileMessage.getModificationDate(), fileMessage.getOwner(),
-                                          fileMessage.getSize(), lineNumber)
-                    self.messages.append(message)
-                i_s += 1
+                status = (100 * (readSize + reader.getBytesRead())) / max(totalSize, 1)
+                if self.status_cb is not None and status != old_status:
+                    self.status_cb(float(status), None)
+                    old_status = status
+            readSize += size
 
-    def _getNetzobRawContentOfFile(self, filename):
-        with open(filename, "rb") as file:
-            content = file.read()
-            content = TypeConvertor.stringToNetzobRaw(content)
-        return content
+    def readMessages(self):
+        # Iterate over all imported files and split them
+        # according to the set separator
+        self.cancelled = False
+        self.messages = []
+        for message in self.iterMessages():
+            self.messages.append(message)
@@ -29,11 +29,9 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import logging
-import bz2
 import uuid
 import time
 import dateutil.parser
-from lxml import etree
 from base64 import b64decode
 
 #+---------------------------------------------------------------------------+
@@ -45,6 +43,7 @@ from base64 import b64decode
 #+---------------------------------------------------------------------------+
 from netzob.Import.AbstractImporter import AbstractImporter
 from netzob.Common.Models.L4NetworkMessage import L4NetworkMessage
+from netzob.Import.XML.IncrementalXMLReader import IncrementalXMLReader
 
 
 class OSpyImporter(AbstractImporter):
@@ -58,28 +57,34 @@ class OSpyImporter(AbstractImporter):
         self.filesToBeImported = filePathList
 
     def readMessages(self):
+        self.cancelled = False
         self.messages = []
+        for message in self.iterMessages():
+            self.messages.append(message)
+
+    def iterMessages(self):
+        """Iterate over the messages of all the files, decompressed and
+        parsed incrementally"""
         for filePath in self.filesToBeImported:
-            currentFileMessageList = self._parseOSpyXMLFile(filePath)
-            self.messages.extend(currentFileMessageList)
+            for message in self._parseOSpyXMLFile(filePath):
+                yield message
 
     def _parseOSpyXMLFile(self, filePath):
-        xmlFileContents = self._readBZ2CompressedFile(filePath)
-        self.log.debug("Loading XML structure in memory")
-        xmlRoot = etree.fromstring(xmlFileContents)
-        if xmlRoot is None:
-            self.log.error("Error while loading XML structure in memory")
-            return None
-        # Parse all found messages in the XML structure
-        messageList = []
-        functionList = []
-        for xmlMessage in xmlRoot.findall("Messages"):
+        self.log.debug("Parsing the compressed file: {0}".format(filePath))
+        reader = IncrementalXMLReader(filePath, "Messages", compressed=True)
+        old_status = 0
+        # Parse the messages as soon as they are found in the XML structure
+        for xmlMessage in reader:
+            if self.cancelled:
+                return
             message = self._parseMessage(xmlMessage)
             if message is not None:  # and (message.getL4Protocol() == "EncryptMessage" or message.getL4Protocol() == "DecryptMessage"):
-                messageList.append(message)
-                if not message.getL4Protocol() in functionList:
-                    functionList.append(message.getL4Protocol())
-        return messageList
+                yield message
+
+            status = (100 * reader.getBytesRead()) / max(reader.getSize(), 1)
+            if self.status_cb is not None and status != old_status:
+                self.status_cb(float(status), None)
+                old_status = status
 
     def _parseMessage(self, rootElement):
         mUuid = str(uuid.uuid4())
@@ -142,10 +147,3 @@ class OSpyImporter(AbstractImporter):
                                        "IP", l3SourceAddress, l3DestinationAddress,
                                        l4Protocol, l4SourcePort, l4DestinationPort)
             return message
-
-    def _readBZ2CompressedFile(self, filePath):
-        self.log.debug("Decompressing file: {0}".format(filePath))
-        with open(filePath, "rb") as fileObj:
-            compressedData = fileObj.read()
-            data = bz2.decompress(compressedData)
-            return data
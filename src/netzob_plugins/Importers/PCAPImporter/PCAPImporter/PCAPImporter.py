@@ -30,6 +30,7 @@
 #+---------------------------------------------------------------------------+
 import logging
 import errno
+import os
 import time
 import uuid
 from gettext import gettext as _
@@ -45,6 +46,12 @@ import impacket.ImpactPacket as Packets
 #| Local application imports
 #+---------------------------------------------------------------------------+
 from netzob.Common.NetzobException import NetzobImportException
+from netzob.Common.ImportedTraceWriter import ImportedTraceWriter
+from netzob.Common.Workspace import WORKSPACE_NAMESPACE, COMMON_NAMESPACE
+from netzob.Import.Pcap.PcapReader import PcapReader, PcapReaderException
+from netzob.Import.Pcap.PacketDecoder import PacketDecoder
+from netzob.Import.Pcap.TcpReassembler import TcpReassembler
+from netzob.Import.Pcap.ParallelPcapDecoder import ParallelPcapDecoder
 from netzob.Import.AbstractImporter import AbstractImporter
 from netzob.UI.ModelReturnCodes import ERROR, WARNING, SUCCEDED
 from netzob.Common.Models.RawMessage import RawMessage
@@ -63,6 +70,14 @@ class PCAPImporter(AbstractImporter):
 
     PROTOCOL201 = 201
 
+    # Readers of the PCAP files
+    READER_PCAPY = 0
+    READER_BUILTIN = 1
+
+    # Size of the headers of a PCAP file and of each of its records
+    FILE_HEADER_SIZE = 24
+    RECORD_HEADER_SIZE = 16
+
     def __init__(self, netzob):
         super(PCAPImporter, self).__init__("PCAP IMPORT", netzob)
         # create logger with the given configuration
@@ -71,6 +86,12 @@ class PCAPImporter(AbstractImporter):
         self.bpfFilter = ""
         self.importLayer = 4
         self._payloadDict = {}
+        self.reader = PCAPImporter.READER_PCAPY
+        self.packetDecoder = PacketDecoder()
+        self.tcpReassembly = False
+        self.tcpReassembler = None
+        self.nbWorkers = 1
+        self.nbSkipped = 0
 
     @property
     def payloadDict(self):
@@ -105,22 +126,118 @@ class PCAPImporter(AbstractImporter):
             raise
         self.importLayer = importLayer
 
+    def setReader(self, reader):
+        """Selects the reader of the PCAP files: pcapy, or the built-in
+        reader which memory maps the files and decodes the packets
+        without impacket"""
+        if not reader in [PCAPImporter.READER_PCAPY, PCAPImporter.READER_BUILTIN]:
+            raise
+        self.reader = reader
+
+    def setTCPReassembly(self, tcpReassembly):
+        """Enables the reassembly of the TCP flows when importing the
+        layer 4: the segments are reassembled into one message per
+        write of each end of a flow"""
+        self.tcpReassembly = tcpReassembly
+
+    def setNumberOfWorkers(self, nbWorkers):
+        """Sets the number of processes decoding the files in
+        readMessages(), 0 to use all the available cores"""
+        self.nbWorkers = nbWorkers
+
+    def getNumberOfSkippedPackets(self):
+        """Returns the number of packets skipped by the last streamed
+        import since their layers are unsupported"""
+        return self.nbSkipped
+
+    def _createReassembler(self):
+        if self.tcpReassembly and self.importLayer == 4:
+            self.tcpReassembler = TcpReassembler()
+        else:
+            self.tcpReassembler = None
+
     def readMessages(self):
         """Read all messages from all opened PCAP files"""
         self.messages = []
+        if self.nbWorkers != 1:
+            self._readMessagesInParallel()
+            return
+        self._createReassembler()
         for filePath in self.filesToBeImported:
             self._readMessagesFromFile(filePath)
+        if self.tcpReassembler is not None:
+            self.tcpReassembler.flush()
+            self._addReassembledMessages()
+
+    def _readMessagesInParallel(self):
+        """Read all messages from all opened PCAP files in worker
+        processes. The files read by the built-in reader are split in
+        chunks, unless the TCP flows are reassembled (the flows are
+        then reassembled in each file)."""
+        nbWorkers = self.nbWorkers
+        if nbWorkers == 0:
+            nbWorkers = None
+        decoder = ParallelPcapDecoder(self.decodeTask, nbWorkers)
+        chunked = self.reader == PCAPImporter.READER_BUILTIN and self.bpfFilter == "" and not self.tcpReassembly
+        tasks = decoder.splitFiles(self.filesToBeImported, chunked)
+        for (message, payload) in decoder.decode(tasks, self.status_cb):
+            self.messages.append(message)
+            self._payloadDict[message.getID()] = payload
+
+    def decodeTask(self, task, namespace):
+        """Decode the packets of a task of a ParallelPcapDecoder"""
+        self._createReassembler()
+        packetReader = self._openFile(task.filePath)
+        if task.firstOffset is not None:
+            packetReader.setOffset(task.firstOffset)
+        results = []
+        index = task.firstPacket
+        while task.lastPacket is None or index < task.lastPacket:
+            (header, payload) = packetReader.next()
+            if header is None:
+                break
+            message = self.decodePacket(header, payload, ParallelPcapDecoder.createMessageID(namespace, task, index))
+            if message is not None:
+                results.append(((message.getTimestamp(), task.fileIndex, index), message, payload))
+            if self.tcpReassembler is not None:
+                self._addReassembledResults(results, namespace, task, index)
+            index += 1
+        if self.tcpReassembler is not None:
+            self.tcpReassembler.flush()
+            self._addReassembledResults(results, namespace, task, index)
+        return results
+
+    def _addReassembledResults(self, results, namespace, task, index):
+        for (message, payload, flowID) in self.popReassembledMessages():
+            message.setID(ParallelPcapDecoder.createMessageID(namespace, task, "tcp{0}".format(len(results))))
+            results.append(((message.getTimestamp(), task.fileIndex, index), message, payload))
+        self.tcpReassembler.popClosedFlows()
 
     def _readMessagesFromFile(self, filePath):
         """Read all messages from a given PCAP file"""
-        packetReader = pcapy.open_offline(filePath)
-        try:
-            packetReader.setfilter(self.bpfFilter)
-        except:
-            errorMessage = _("The provided filter is not valid (it should follow the BPF format)")
-            self.log.warn(errorMessage)
-            raise NetzobImportException("PCAP", errorMessage, ERROR,
-                                        self.INVALID_BPF_FILTER)
+        packetReader = self._openFile(filePath)
+        packetReader.loop(0, self._packetHandler)
+
+    def _openFile(self, filePath):
+        """Open a PCAP file, apply the BPF filter and check its
+        datalink can be decoded up to the import layer"""
+        if self.reader == PCAPImporter.READER_BUILTIN and self.bpfFilter != "":
+            self.log.info("The file {0} is read with pcapy since the built-in reader cannot apply BPF filters".format(filePath))
+        if self.reader == PCAPImporter.READER_BUILTIN and self.bpfFilter == "":
+            try:
+                packetReader = PcapReader(filePath)
+            except PcapReaderException, e:
+                self.log.warn(str(e))
+                raise NetzobImportException("PCAP", str(e), ERROR)
+        else:
+            packetReader = pcapy.open_offline(filePath)
+            try:
+                packetReader.setfilter(self.bpfFilter)
+            except:
+                errorMessage = _("The provided filter is not valid (it should follow the BPF format)")
+                self.log.warn(errorMessage)
+                raise NetzobImportException("PCAP", errorMessage, ERROR,
+                                            self.INVALID_BPF_FILTER)
 
         self.log.info("Starting import from {0} (linktype:{0})".format(filePath, str(packetReader.datalink())))
         self.datalink = packetReader.datalink()
@@ -155,61 +272,75 @@ class PCAPImporter(AbstractImporter):
             self.log.warn(errorMessage)
             raise NetzobImportException("PCAP", errorMessage, ERROR,
                                         self.INVALID_LAYER2)
-        else:
-            packetReader.loop(0, self._packetHandler)
+        return packetReader
 
     def _packetHandler(self, header, payload):
         """Decode a packet"""
-        mUuid = str(uuid.uuid4())
+        message = self.decodePacket(header, payload)
+        if message is not None:
+            self.messages.append(message)
+            self._payloadDict[message.getID()] = payload
+        if self.tcpReassembler is not None:
+            self._addReassembledMessages()
+
+    def _addReassembledMessages(self):
+        for (message, payload, flowID) in self.popReassembledMessages():
+            self.messages.append(message)
+            self._payloadDict[message.getID()] = payload
+        self.tcpReassembler.popClosedFlows()
+
+    def decodePacket(self, header, payload, messageID=None):
+        """Decode a packet up to the import layer.
+
+        :return: the message made of the payload of the import layer,
+        or None if this payload is empty or is a TCP segment given to
+        the reassembly of its flow."""
+        if messageID is None:
+            messageID = str(uuid.uuid4())
+        mUuid = messageID
 
         (secs, usecs) = header.getts()
         epoch = secs + (usecs / 1000000.0)
 
         if self.importLayer == 1:
             if len(payload) == 0:
-                return
+                return None
 
             data = payload.encode("hex")
 
-            self.messages.append(
-                RawMessage(
-                    mUuid,
-                    epoch,
-                    data))
-            self._payloadDict[mUuid] = payload
+            return RawMessage(
+                mUuid,
+                epoch,
+                data)
         elif self.importLayer == 2:
             (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = \
                 self.decodeLayer2(header, payload)
             if len(l2Payload) == 0:
-                return
-            self.messages.append(
-                L2NetworkMessage(
-                    mUuid,
-                    epoch,
-                    l2Payload.encode("hex"),
-                    l2Proto,
-                    l2SrcAddr,
-                    l2DstAddr))
-            self._payloadDict[mUuid] = payload
+                return None
+            return L2NetworkMessage(
+                mUuid,
+                epoch,
+                l2Payload.encode("hex"),
+                l2Proto,
+                l2SrcAddr,
+                l2DstAddr)
         elif self.importLayer == 3:
             (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = \
                 self.decodeLayer2(header, payload)
             (l3Proto, l3SrcAddr, l3DstAddr, l3Payload, ipProtocolNum) = \
                 self.decodeLayer3(etherType, l2Payload)
             if len(l3Payload) == 0:
-                return
-            self.messages.append(
-                L3NetworkMessage(
-                    mUuid,
-                    epoch,
-                    l3Payload.encode("hex"),
-                    l2Proto,
-                    l2SrcAddr,
-                    l2DstAddr,
-                    l3Proto,
-                    l3SrcAddr,
-                    l3DstAddr))
-            self._payloadDict[mUuid] = payload
+                return None
+            return L3NetworkMessage(
+                mUuid,
+                epoch,
+                l3Payload.encode("hex"),
+                l2Proto,
+                l2SrcAddr,
+                l2DstAddr,
+                l3Proto,
+                l3SrcAddr,
+                l3DstAddr)
         else:
             (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = \
                 self.decodeLayer2(header, payload)
@@ -217,29 +348,181 @@ class PCAPImporter(AbstractImporter):
                 self.decodeLayer3(etherType, l2Payload)
             (l4Proto, l4SrcPort, l4DstPort, l4Payload) = \
                 self.decodeLayer4(ipProtocolNum, l3Payload)
+            if self.tcpReassembler is not None and l4Proto == "TCP":
+                (seq, flags) = self.packetDecoder.decodeTCPSequence(l3Payload)
+                self.tcpReassembler.addSegment(epoch, (l3SrcAddr, l4SrcPort), (l3DstAddr, l4DstPort), seq, flags, l4Payload,
+                                               (l2Proto, l2SrcAddr, l2DstAddr, l3Proto, payload))
+                return None
             if len(l4Payload) == 0:
-                return
-            self.messages.append(
-                L4NetworkMessage(
-                    mUuid,
-                    epoch,
-                    l4Payload.encode("hex"),
-                    l2Proto,
-                    l2SrcAddr,
-                    l2DstAddr,
-                    l3Proto,
-                    l3SrcAddr,
-                    l3DstAddr,
-                    l4Proto,
-                    l4SrcPort,
-                    l4DstPort))
-            self._payloadDict[mUuid] = payload
+                return None
+            return L4NetworkMessage(
+                mUuid,
+                epoch,
+                l4Payload.encode("hex"),
+                l2Proto,
+                l2SrcAddr,
+                l2DstAddr,
+                l3Proto,
+                l3SrcAddr,
+                l3DstAddr,
+                l4Proto,
+                l4SrcPort,
+                l4DstPort)
+
+    def popReassembledMessages(self):
+        """Returns the messages made of the writes reassembled since
+        the last call, with the packet of their first segment and the
+        identifier of their flow"""
+        messages = []
+        for write in self.tcpReassembler.popWrites():
+            (l2Proto, l2SrcAddr, l2DstAddr, l3Proto, payload) = write.context
+            message = L4NetworkMessage(
+                str(uuid.uuid4()),
+                write.timestamp,
+                write.data.encode("hex"),
+                l2Proto,
+                l2SrcAddr,
+                l2DstAddr,
+                l3Proto,
+                write.source[0],
+                write.destination[0],
+                "TCP",
+                write.source[1],
+                write.destination[1])
+            messages.append((message, payload, write.flowID))
+        return messages
+
+    #+-----------------------------------------------------------------------+
+    #| Streamed import
+    #+-----------------------------------------------------------------------+
+    def iterMessages(self):
+        """Read the messages of the opened PCAP files one packet after
+        the other. The progress, computed on the bytes read, is given
+        to the status callback. Packets whose layers are unsupported
+        are skipped. The reading stops once cancel() is called.
+
+        :return: a generator of (message, payload, flowID). flowID
+        identifies the TCP flow of a reassembled message, and is None
+        for the other messages. Once all the messages of a flow are
+        given, (None, None, flowID) is given."""
+        self._createReassembler()
+        totalSize = sum([os.path.getsize(filePath) for filePath in self.filesToBeImported])
+        readSize = 0
+        self.nbSkipped = 0
+        old_status = 0
+        for filePath in self.filesToBeImported:
+            packetReader = self._openFile(filePath)
+            fileOffset = readSize
+            readSize += PCAPImporter.FILE_HEADER_SIZE
+            while not self.cancelled:
+                (header, payload) = packetReader.next()
+                if header is None:
+                    break
+                if isinstance(packetReader, PcapReader):
+                    readSize = fileOffset + packetReader.getBytesRead()
+                else:
+                    readSize += PCAPImporter.RECORD_HEADER_SIZE + header.getcaplen()
+                try:
+                    message = self.decodePacket(header, payload)
+                except NetzobImportException, e:
+                    if e.statusCode != WARNING:
+                        raise
+                    self.nbSkipped += 1
+                    continue
+
+                status = (100 * readSize) / max(totalSize, 1)
+                if self.status_cb is not None and status != old_status:
+                    self.status_cb(float(status), None)
+                    old_status = status
+                if message is not None:
+                    yield (message, payload, None)
+                if self.tcpReassembler is not None:
+                    for item in self._popReassembledItems():
+                        yield item
+            if self.cancelled:
+                break
+        if self.tcpReassembler is not None and not self.cancelled:
+            self.tcpReassembler.flush()
+            for item in self._popReassembledItems():
+                yield item
+        if self.nbSkipped > 0:
+            self.log.warn("{0} packets whose layers are unsupported have been skipped".format(self.nbSkipped))
+
+    def _popReassembledItems(self):
+        items = self.popReassembledMessages()
+        for flowID in self.tcpReassembler.popClosedFlows():
+            items.append((None, None, flowID))
+        return items
+
+    def importMessagesInTrace(self, workspace, name, description="", batchSize=None):
+        """Stream the messages of the opened PCAP files into a new
+        trace of the workspace, a batch of messages at a time. Only the
+        first PREVIEW_SIZE messages are kept in the importer to be
+        previewed. The messages reassembled from a TCP flow are
+        gathered in a session of this flow.
+
+        :return: the imported trace registered in the workspace, or None
+        if the import has been cancelled."""
+        if batchSize is None:
+            batchSize = self.BATCH_SIZE
+        self.cancelled = False
+        self.messages = []
+        self._payloadDict = {}
+        traceWriter = ImportedTraceWriter(workspace.getPathOfTraces(), name, self.type, description, WORKSPACE_NAMESPACE, COMMON_NAMESPACE)
+        try:
+            batch = []
+            flowBatch = []
+            # Name and messages of the open flows
+            flows = {}
+            for (message, payload, flowID) in self.iterMessages():
+                if message is None:
+                    # The flow is closed
+                    (flowName, messageIDs) = flows.pop(flowID, (None, []))
+                    if len(messageIDs) > 0:
+                        traceWriter.addSession(flowName, messageIDs)
+                    continue
+                if len(self.messages) < self.PREVIEW_SIZE:
+                    self.messages.append(message)
+                    self._payloadDict[message.getID()] = payload
+                if flowID is None:
+                    batch.append(message)
+                    if len(batch) >= batchSize:
+                        traceWriter.addMessages(batch)
+                        batch = []
+                else:
+                    if not flowID in flows:
+                        flows[flowID] = ("TCP {0}:{1} - {2}:{3}".format(message.getL3SourceAddress(), message.getL4SourcePort(),
+                                                                        message.getL3DestinationAddress(), message.getL4DestinationPort()), [])
+                    flows[flowID][1].append(message.getID())
+                    flowBatch.append(message)
+                    if len(flowBatch) >= batchSize:
+                        traceWriter.addMessages(flowBatch, False)
+                        flowBatch = []
+            if self.cancelled:
+                self.log.info("The import of {0} has been cancelled".format(", ".join(self.filesToBeImported)))
+                traceWriter.abort()
+                return None
+            traceWriter.addMessages(batch)
+            traceWriter.addMessages(flowBatch, False)
+        except:
+            traceWriter.abort()
+            raise
+
+        importedTrace = traceWriter.close()
+        workspace.addImportedTrace(importedTrace)
+        workspace.saveConfigFile()
+        return importedTrace
 
     def decodeLayer2(self, header, payload):
         def formatMacAddress(arrayMac):
             return ":".join("{0:0>2}".format(
                 hex(b)[2:]) for b in arrayMac.tolist())
 
+        if self.reader == PCAPImporter.READER_BUILTIN:
+            layer2 = self.packetDecoder.decodeLayer2(self.datalink, payload)
+            if layer2 is not None:
+                return layer2
+
         if self.datalink == pcapy.DLT_EN10MB:
             l2Decoder = Decoders.EthDecoder()
             l2Proto = "Ethernet"
@@ -270,6 +553,11 @@ class PCAPImporter(AbstractImporter):
         return (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType)
 
     def decodeLayer3(self, etherType, l2Payload):
+        if self.reader == PCAPImporter.READER_BUILTIN:
+            layer3 = self.packetDecoder.decodeLayer3(etherType, l2Payload)
+            if layer3 is not None:
+                return layer3
+
         if etherType == Packets.IP.ethertype:
             l3Proto = "IP"
             l3Decoder = Decoders.IPDecoder()
@@ -289,6 +577,11 @@ class PCAPImporter(AbstractImporter):
                                         self.INVALID_LAYER3)
 
     def decodeLayer4(self, ipProtocolNum, l3Payload):
+            if self.reader == PCAPImporter.READER_BUILTIN:
+                layer4 = self.packetDecoder.decodeLayer4(ipProtocolNum, l3Payload)
+                if layer4 is not None:
+                    return layer4
+
             if ipProtocolNum == Packets.UDP.protocol:
                 l4Proto = "UDP"
                 l4Decoder = Decoders.UDPDecoder()
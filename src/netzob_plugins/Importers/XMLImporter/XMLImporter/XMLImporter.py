@@ -30,7 +30,6 @@
 #+---------------------------------------------------------------------------+
 import logging
 import os
-from lxml.etree import ElementTree
 from lxml import etree
 from gettext import gettext as _
 
@@ -44,7 +43,10 @@ from gettext import gettext as _
 from netzob.Common import Project
 from netzob.Common.Workspace import Workspace
 from netzob.Common.Models.Factories.AbstractMessageFactory import AbstractMessageFactory
+from netzob.Common.NetzobException import NetzobImportException
 from netzob.Import.AbstractImporter import AbstractImporter
+from netzob.Import.XML.IncrementalXMLReader import IncrementalXMLReader
+from netzob.UI.ModelReturnCodes import ERROR
 
 
 class XMLImporter(AbstractImporter):
@@ -59,26 +61,44 @@ class XMLImporter(AbstractImporter):
         self.filesToBeImported = filePathList
 
     def readMessages(self):
+        self.cancelled = False
         self.messages = []
         for filePath in self.filesToBeImported:
-            self._readMessagesFromFile(filePath)
+            # The messages of an invalid file are not imported
+            try:
+                self.messages.extend(list(self._iterMessagesOfFile(filePath)))
+            except NetzobImportException, e:
+                logging.error(e.message)
 
-    def _readMessagesFromFile(self, filePath):
+    def iterMessages(self):
+        """Iterate over the messages of all the files, parsed
+        incrementally. An invalid file raises a NetzobImportException
+        once parsed."""
+        for filePath in self.filesToBeImported:
+            for message in self._iterMessagesOfFile(filePath):
+                yield message
+
+    def _iterMessagesOfFile(self, filePath):
         from netzob.Common.ResourcesConfiguration import ResourcesConfiguration
         xmlSchemaPath = os.path.join(ResourcesConfiguration.getStaticResources(), "xsds/0.1/common.xsd")
-        # If we find a version which validates the XML, we parse with the associated function
-        if not Workspace.isSchemaValidateXML(xmlSchemaPath, filePath):
-            logging.error("The specified XML file {0} is not valid "
-                          "according to the XSD ({1}).".format(filePath, xmlSchemaPath))
-        else:
-            logging.debug("XML file valid according to the XSD schema")
+        schema = Workspace.loadXMLSchema(xmlSchemaPath)
+        if schema is None:
+            raise NetzobImportException("XML", _("The XSD ({0}) cannot be loaded.").format(xmlSchemaPath), ERROR)
 
-            # Parse the XML Document as 0.1 version
-            tree = ElementTree()
-            tree.parse(filePath)
-            xmlFile = tree.getroot()
-
-            for xmlMessage in xmlFile.findall("{" + Project.COMMON_NAMESPACE + "}message"):
+        # The file is validated while it is parsed as 0.1 version
+        reader = IncrementalXMLReader(filePath, "{" + Project.COMMON_NAMESPACE + "}message", schema)
+        old_status = 0
+        try:
+            for xmlMessage in reader:
+                if self.cancelled:
+                    return
                 message = AbstractMessageFactory.loadFromXML(xmlMessage, Project.COMMON_NAMESPACE, "0.1")
-                logging.debug("XML String data: " + message.getStringData())
-                self.messages.append(message)
+                yield message
+
+                status = (100 * reader.getBytesRead()) / max(reader.getSize(), 1)
+                if self.status_cb is not None and status != old_status:
+                    self.status_cb(float(status), None)
+                    old_status = status
+        except etree.XMLSyntaxError, e:
+            raise NetzobImportException("XML", _("The specified XML file {0} is not valid "
+                                                 "according to the XSD ({1}): {2}").format(filePath, xmlSchemaPath, e), ERROR)
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import random
+import optparse
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken import VariableReadingToken
+from netzob.Common.MMSTD.Symbols.impl.UnknownSymbol import UnknownSymbol
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the abstraction of messages
+#|   Measures the number of messages abstracted per second by a sequential
+#|   scan of the vocabulary, by the candidates of the symbol dispatcher and
+#|   by the abstraction layer (dispatcher and compiled reading programs),
+#|   on vocabularies of increasing size.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_Abstraction.py
+#+---------------------------------------------------------------------------+
+
+
+def treeRead(vocabulary, memory, symbols, message):
+    for symbol in symbols:
+        readingToken = VariableReadingToken(False, vocabulary, memory, TypeConvertor.strBitarray2Bitarray(message), 0)
+        # the read access of a new root, without the compiled reading program
+        root = AggregateVariable(symbol.getID(), symbol.getName(), False, False, None)
+        for field in symbol.getExtendedFields():
+            root.addChild(field.getVariable())
+        root.read(readingToken)
+        for field in symbol.getExtendedFields():
+            field.getVariable().removeFather(root)
+        if readingToken.isOk() and readingToken.getIndex() == len(readingToken.getValue()):
+            return symbol
+    return UnknownSymbol()
+
+
+def throughput(function, messages):
+    startTime = time.time()
+    for message in messages:
+        function(message)
+    return len(messages) / max(time.time() - startTime, 1e-6)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--sizes", dest="sizes", default="10,50,100,250,500", help="comma separated number of symbols")
+    parser.add_option("-f", "--fields", dest="fields", type="int", default=4, help="number of static fields of each symbol")
+    parser.add_option("-m", "--messages", dest="messages", type="int", default=200, help="number of abstracted messages")
+    parser.add_option("-r", "--seed", dest="seed", type="int", default=0, help="seed of the generator")
+    (options, args) = parser.parse_args()
+
+    print "{0:>8} {1:>12} {2:>12} {3:>12} {4:>12} {5:>12}".format("symbols", "sequential", "dispatched", "compiled", "build", "candidates")
+    for nbSymbols in [int(size) for size in options.sizes.split(",")]:
+        generator = AutomataGenerator(options.seed)
+        contents = []
+        for i in range(0, nbSymbols):
+            values = ["MSG{0:04d}".format(i)] + [" ARG{0}".format(j) for j in range(1, options.fields)]
+            generator.createSymbol(values[0], values)
+            contents.append("".join(values))
+        vocabulary = generator.getVocabulary()
+        memory = Memory()
+        randomizer = random.Random(options.seed)
+        messages = []
+        for i in range(0, options.messages):
+            # one message out of ten is unknown
+            if i % 10 == 0:
+                messages.append(TypeConvertor.stringB2bin("UNKNOWN"))
+            else:
+                messages.append(TypeConvertor.stringB2bin(randomizer.choice(contents)))
+
+        abstractionLayer = AbstractionLayer(None, vocabulary, memory)
+        startTime = time.time()
+        dispatcher = abstractionLayer.getSymbolDispatcher()
+        buildTime = time.time() - startTime
+        nbCandidates = sum([len(dispatcher.getCandidates(message)) for message in messages])
+
+        print "{0:>8} {1:>12.1f} {2:>12.1f} {3:>12.1f} {4:>12.4f} {5:>12.2f}".format(
+            nbSymbols,
+            throughput(lambda message: treeRead(vocabulary, memory, vocabulary.getSymbols(), message), messages),
+            throughput(lambda message: treeRead(vocabulary, memory, dispatcher.getCandidates(message), message), messages),
+            throughput(abstractionLayer.abstract, messages),
+            buildTime,
+            float(nbCandidates) / len(messages))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import os
+import random
+import resource
+import tempfile
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Import.File.DelimitedFileReader import DelimitedFileReader
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the splitting of delimiter separated files
+#|   Measures the throughput and the peak memory of the split of a
+#|   synthetic log in hexadecimal messages, by a DelimitedFileReader
+#|   and by splitting the hexadecimal content of the whole file as the
+#|   DelimiterSeparatedImporter did. Each split is made in a child
+#|   process, so that its peak memory is measured alone.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_DelimitedFileReader.py
+#+---------------------------------------------------------------------------+
+
+
+def generateFile(size):
+    random.seed(0)
+    lines = ["{0:08x} {1}\n".format(i, "x" * random.randint(10, 200)) for i in range(1000)]
+    (fd, filePath) = tempfile.mkstemp(suffix=".log")
+    written = 0
+    while written < size:
+        content = "".join(random.sample(lines, len(lines)))
+        os.write(fd, content)
+        written += len(content)
+    os.close(fd)
+    return filePath
+
+
+def splitChunks(filePath):
+    nbMessages = 0
+    for data in DelimitedFileReader(filePath, "\n"):
+        data.encode("hex")
+        nbMessages += 1
+    return nbMessages
+
+
+def splitWhole(filePath):
+    f = open(filePath, "rb")
+    content = f.read().encode("hex")
+    f.close()
+    return len([data for data in content.split("0a") if len(data) > 0])
+
+
+def measure(split, filePath):
+    # Runs the split in a child process and returns its results
+    (read, write) = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        startTime = time.time()
+        nbMessages = split(filePath)
+        duration = time.time() - startTime
+        os.write(write, "{0} {1} {2}".format(nbMessages, duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+        os._exit(0)
+    os.close(write)
+    result = os.read(read, 1024).split()
+    os.close(read)
+    os.waitpid(pid, 0)
+    return (int(result[0]), float(result[1]), int(result[2]) / 1024.0)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--size", dest="size", type="int", default=200, help="size of the file in MB")
+    (options, args) = parser.parse_args()
+
+    filePath = generateFile(options.size * 1024 * 1024)
+    try:
+        size = os.path.getsize(filePath) / (1024.0 * 1024.0)
+        print "{0:>8} {1:>10} {2:>10} {3:>14}".format("split", "messages", "MB/s", "peak RSS (MB)")
+        for (name, split) in [("chunks", splitChunks), ("whole", splitWhole)]:
+            (nbMessages, duration, memory) = measure(split, filePath)
+            print "{0:>8} {1:>10} {2:>10.1f} {3:>14.1f}".format(name, nbMessages, size / duration, memory)
+    finally:
+        os.unlink(filePath)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import sys
+import time
+import resource
+import optparse
+import multiprocessing
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Inference.Grammar.GrammarInferer import GrammarInferer
+from netzob.Inference.Grammar.Oracles.SimulatedOracle import SimulatedOracle
+from netzob.Inference.Grammar.EquivalenceOracles.RandomWalkEquivalenceOracle import RandomWalkEquivalenceOracle
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the grammar inference process
+#|   Learns randomly generated automata of increasing size through
+#|   a SimulatedOracle, so that the measures only depend on the learner.
+#|   Each size is learnt in its own process to get a clean peak memory.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_GrammarInference.py
+#+---------------------------------------------------------------------------+
+
+
+def learn(nbStates, nbInputs, nbOutputs, maxTests, seed, results):
+    generator = AutomataGenerator(seed)
+    inputSymbols = generator.createSymbols("IN", nbInputs)
+    outputSymbols = generator.createSymbols("OUT", nbOutputs)
+    reference = generator.generateAutomaton(nbStates, inputSymbols, outputSymbols)
+
+    oracle = SimulatedOracle(reference)
+    # The statistics of the equivalence oracle only cover its last search,
+    # the queries of all the searches are counted by their own simulator
+    equivalenceSimulator = SimulatedOracle(reference)
+    equivalenceOracle = RandomWalkEquivalenceOracle(equivalenceSimulator, "", maxTests=maxTests, maxLength=2 * nbStates, seed=seed)
+    inferer = GrammarInferer(generator.getVocabulary(), inputSymbols, None, equivalenceOracle, "", None, None)
+    inferer.setQueryOracle(oracle)
+
+    startTime = time.time()
+    inferer.infer()
+    duration = time.time() - startTime
+
+    results.put({
+        "states": nbStates,
+        "learntStates": len(inferer.getInferedAutomaton().getStates()),
+        "queries": oracle.getNbQueries(),
+        "symbols": oracle.getNbSymbols(),
+        "equivalenceQueries": equivalenceSimulator.getNbQueries(),
+        "duration": duration,
+        "memory": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss})
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--sizes", dest="sizes", default="2,4,8,12", help="comma separated number of states")
+    parser.add_option("-i", "--inputs", dest="inputs", type="int", default=3, help="number of input symbols")
+    parser.add_option("-o", "--outputs", dest="outputs", type="int", default=3, help="number of output symbols")
+    parser.add_option("-t", "--tests", dest="tests", type="int", default=100, help="random walks per equivalence query")
+    parser.add_option("-r", "--seed", dest="seed", type="int", default=0, help="seed of the generator")
+    (options, args) = parser.parse_args()
+
+    print "{0:>8} {1:>8} {2:>10} {3:>10} {4:>10} {5:>10} {6:>10}".format("states", "learnt", "MQ", "symbols", "EQ-MQ", "time (s)", "RSS (kB)")
+    for nbStates in [int(size) for size in options.sizes.split(",")]:
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=learn, args=(nbStates, options.inputs, options.outputs, options.tests, options.seed, results))
+        process.start()
+        result = results.get()
+        process.join()
+        print "{states:>8} {learntStates:>8} {queries:>10} {symbols:>10} {equivalenceQueries:>10} {duration:>10.3f} {memory:>10}".format(**result)
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
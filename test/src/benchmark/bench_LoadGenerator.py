@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import optparse
+import select
+import socket
+import threading
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.Actors.LoadGenerator.LoadGenerator import LoadGenerator
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Headless load generation against a local stand-in
+#|   Concurrent sessions of a PING/PONG automaton (a chain of exchanges
+#|   ending in a final state) are executed against a single threaded
+#|   stand-in answering PONG to each PING.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_LoadGenerator.py -s 5000 -w 4 -c 2000
+#+---------------------------------------------------------------------------+
+
+
+class PongServer(threading.Thread):
+    """Single threaded stand-in which answers PONG to each PING"""
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listeningSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listeningSocket.bind(("127.0.0.1", 0))
+        self.listeningSocket.listen(4096)
+        self.port = self.listeningSocket.getsockname()[1]
+
+    def run(self):
+        poller = select.poll()
+        poller.register(self.listeningSocket.fileno(), select.POLLIN)
+        sockets = dict()
+        while True:
+            for (fileno, event) in poller.poll():
+                if fileno == self.listeningSocket.fileno():
+                    sock = self.listeningSocket.accept()[0]
+                    sockets[sock.fileno()] = sock
+                    poller.register(sock.fileno(), select.POLLIN)
+                    continue
+                sock = sockets[fileno]
+                try:
+                    data = sock.recv(65536)
+                except socket.error:
+                    data = ""
+                if len(data) == 0:
+                    poller.unregister(fileno)
+                    del sockets[fileno]
+                    sock.close()
+                elif data.count("PING") > 0:
+                    sock.sendall("PONG" * data.count("PING"))
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--sessions", dest="sessions", type="int", default=1000, help="number of sessions")
+    parser.add_option("-w", "--workers", dest="workers", type="int", default=2, help="number of worker processes")
+    parser.add_option("-c", "--concurrency", dest="concurrency", type="int", default=1000, help="maximum number of simultaneous sessions")
+    parser.add_option("-r", "--rate", dest="rate", type="float", default=0, help="number of sessions started per second (0: as soon as possible)")
+    parser.add_option("-u", "--ramp-up", dest="rampUp", type="float", default=0, help="duration of the ramp-up in seconds")
+    parser.add_option("-t", "--think-time", dest="thinkTime", type="int", default=0, help="pause between the transitions of a session in milliseconds")
+    parser.add_option("-e", "--exchanges", dest="exchanges", type="int", default=10, help="number of PING/PONG exchanges per session")
+    (options, args) = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    pongServer = PongServer()
+    pongServer.start()
+
+    generator = AutomataGenerator(0)
+    ping = generator.createSymbol("PING")
+    pong = generator.createSymbol("PONG")
+    automaton = generator.createAutomaton(options.exchanges + 1, [(i, ping, pong, i + 1) for i in range(0, options.exchanges)])
+
+    loadGenerator = LoadGenerator(automaton, generator.getVocabulary(), "127.0.0.1", pongServer.port, "TCP", "127.0.0.1")
+    loadGenerator.setNumberOfSessions(options.sessions)
+    loadGenerator.setNumberOfWorkers(options.workers)
+    loadGenerator.setConcurrency(options.concurrency)
+    loadGenerator.setSessionRate(options.rate)
+    loadGenerator.setRampUp(options.rampUp)
+    loadGenerator.setThinkTime(options.thinkTime)
+    print loadGenerator.run().getSummary()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import random
+import optparse
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.OutputTraceEvaluator import OutputTraceEvaluator
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the MMSTD queries
+#|   Measures the discovery of the states, the retrieval of the incoming
+#|   and outgoing transitions of every state, the rendering in dot and the
+#|   simulation of a random trace (by the MMSTD and by a compiled evaluator)
+#|   on generated automata of increasing size.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_MMSTD.py
+#+---------------------------------------------------------------------------+
+
+
+def measure(function, *args):
+    startTime = time.time()
+    function(*args)
+    return time.time() - startTime
+
+
+def queryTransitions(automaton):
+    for state in automaton.getStates():
+        automaton.getTransitionsLeadingToState(state)
+        automaton.getTransitionsStartingFromState(state)
+
+
+def evaluate(automaton, trace):
+    evaluator = OutputTraceEvaluator(automaton)
+    evaluator.getOutputTrace(automaton.getInitialState(), trace)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--sizes", dest="sizes", default="250,500,1000,2000,4000", help="comma separated number of states")
+    parser.add_option("-i", "--inputs", dest="inputs", type="int", default=3, help="number of input symbols")
+    parser.add_option("-l", "--length", dest="length", type="int", default=200, help="length of the simulated trace")
+    parser.add_option("-r", "--seed", dest="seed", type="int", default=0, help="seed of the generator")
+    (options, args) = parser.parse_args()
+
+    generator = AutomataGenerator(options.seed)
+    inputSymbols = generator.createSymbols("IN", options.inputs)
+    outputSymbols = generator.createSymbols("OUT", options.inputs)
+    trace = [random.Random(options.seed).choice(inputSymbols) for i in range(0, options.length)]
+
+    print "{0:>8} {1:>12} {2:>12} {3:>12} {4:>12} {5:>12}".format("states", "allStates", "transitions", "dotCode", "outputTrace", "evaluator")
+    for nbStates in [int(size) for size in options.sizes.split(",")]:
+        automaton = generator.generateAutomaton(nbStates, inputSymbols, outputSymbols)
+        print "{0:>8} {1:>12.4f} {2:>12.4f} {3:>12.4f} {4:>12.4f} {5:>12.4f}".format(
+            nbStates,
+            measure(automaton.getAllStates),
+            measure(queryTransitions, automaton),
+            measure(automaton.getDotCode),
+            measure(automaton.getOutputTrace, automaton.getInitialState(), trace),
+            measure(evaluate, automaton, trace))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import uuid
+from bitarray import bitarray
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.Variables.AlternateVariable import AlternateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken import VariableReadingToken
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the variable memory
+#|   Measures the creation, the persistence and the duplication of memories
+#|   of increasing size, and the parsing of messages against a symbol of
+#|   nested alternates whose learnable leaves memorize their value.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_Memory.py
+#+---------------------------------------------------------------------------+
+
+
+def createAlternate(depth, width, leaves):
+    children = []
+    for i in range(0, width):
+        if depth == 1:
+            value = "V{0:05d}".format(len(leaves))
+            leaf = DataVariable(str(uuid.uuid4()), value, False, True, WordType(True, len(value), len(value)), TypeConvertor.stringB2bin(value))
+            leaves.append(value)
+            children.append(leaf)
+        else:
+            children.append(createAlternate(depth - 1, width, leaves))
+    return AlternateVariable(str(uuid.uuid4()), "alternate", False, False, children)
+
+
+def measure(function, nbIterations, *args):
+    startTime = time.time()
+    for i in range(0, nbIterations):
+        function(*args)
+    return time.time() - startTime
+
+
+def transaction(memory, variables):
+    memory.createMemory()
+    for variable in variables:
+        memory.memorize(variable)
+    memory.persistMemory()
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--sizes", dest="sizes", default="100,1000,10000", help="comma separated number of memorized variables")
+    parser.add_option("-d", "--depth", dest="depth", type="int", default=4, help="depth of the nested alternates")
+    parser.add_option("-w", "--width", dest="width", type="int", default=4, help="number of children of each alternate")
+    parser.add_option("-i", "--iterations", dest="iterations", type="int", default=200, help="number of iterations")
+    (options, args) = parser.parse_args()
+
+    print "{0:>8} {1:>12} {2:>12}".format("size", "transaction", "duplicate")
+    for size in [int(s) for s in options.sizes.split(",")]:
+        memory = Memory()
+        variables = []
+        for i in range(0, size):
+            variables.append(DataVariable(str(uuid.uuid4()), "v", False, True, WordType(True, 1, 1), TypeConvertor.stringB2bin("v")))
+        transaction(memory, variables)
+        print "{0:>8} {1:>12.4f} {2:>12.4f}".format(
+            size,
+            measure(transaction, options.iterations, memory, variables[:10]),
+            measure(memory.duplicate, options.iterations))
+
+    generator = AutomataGenerator(0)
+    symbol = Symbol(str(uuid.uuid4()), "alternates", generator.getProject())
+    leaves = []
+    symbol.getField().setVariable(createAlternate(options.depth, options.width, leaves))
+    generator.getVocabulary().addSymbol(symbol)
+    memory = Memory()
+    messages = [TypeConvertor.stringB2bin(leaves[i]) for i in range(0, len(leaves), max(1, len(leaves) / 20))]
+
+    def parse():
+        for message in messages:
+            memory.createMemory()
+            readingToken = VariableReadingToken(False, generator.getVocabulary(), memory, message, 0)
+            symbol.getRoot().read(readingToken)
+            memory.persistMemory()
+    print "{0:>8} {1:>12} {2:>12}".format("leaves", "messages", "parse")
+    print "{0:>8} {1:>12} {2:>12.4f}".format(len(leaves), len(messages), measure(parse, max(1, options.iterations / 100)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import optparse
+import select
+import socket
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkClient import NetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkServer import NetworkServer
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkClient import EventLoopNetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkServer import EventLoopNetworkServer
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the network channels
+#|   Clients: round trips of the NetworkClient and of the
+#|   EventLoopNetworkClient against a local echo stand-in.
+#|   Servers: opening time and round trips of raw TCP clients against the
+#|   NetworkServer and the EventLoopNetworkServer simulating a PING/PONG
+#|   automaton.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_NetworkChannels.py
+#+---------------------------------------------------------------------------+
+
+
+class EchoServer(threading.Thread):
+    """Single threaded echo stand-in"""
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listeningSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listeningSocket.bind(("127.0.0.1", 0))
+        self.listeningSocket.listen(socket.SOMAXCONN)
+        self.port = self.listeningSocket.getsockname()[1]
+
+    def run(self):
+        poller = select.poll()
+        poller.register(self.listeningSocket.fileno(), select.POLLIN)
+        sockets = dict()
+        while True:
+            for (fileno, event) in poller.poll():
+                if fileno == self.listeningSocket.fileno():
+                    sock = self.listeningSocket.accept()[0]
+                    sockets[sock.fileno()] = sock
+                    poller.register(sock.fileno(), select.POLLIN)
+                    continue
+                sock = sockets[fileno]
+                data = sock.recv(65536)
+                if len(data) == 0:
+                    poller.unregister(fileno)
+                    del sockets[fileno]
+                    sock.close()
+                else:
+                    sock.sendall(data)
+
+
+def runInThreads(function, nbThreads):
+    """Runs the function in concurrent threads and returns the
+    duration and the total number of completed round trips"""
+    completed = []
+    threads = [threading.Thread(target=lambda: completed.append(function())) for i in range(0, nbThreads)]
+    startTime = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.time() - startTime, sum(completed))
+
+
+def benchClients(channelClass, port, nbClients, nbRoundTrips, message):
+    clients = []
+    for i in range(0, nbClients):
+        client = channelClass(str(i), Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", port)
+        if not client.open():
+            raise Exception("Impossible to connect to the echo stand-in")
+        clients.append(client)
+    binMessage = TypeConvertor.stringB2bin(message)
+
+    def roundTrips():
+        client = clients.pop()
+        for i in range(0, nbRoundTrips):
+            client.write(binMessage)
+            received = 0
+            while received < len(binMessage):
+                data = client.read(5)
+                if data is None or len(data) == 0:
+                    client.close()
+                    return i
+                received += len(data)
+        client.close()
+        return nbRoundTrips
+    return runInThreads(roundTrips, nbClients)
+
+
+def benchServer(channelClass, port, nbClients, nbRoundTrips):
+    generator = AutomataGenerator(0)
+    ping = generator.createSymbol("PING")
+    pong = generator.createSymbol("PONG")
+    automaton = generator.createAutomaton(1, [(0, ping, pong, 0)])
+    server = channelClass("server", Memory(), "TCP", "127.0.0.1", port, "127.0.0.1", 0)
+    startTime = time.time()
+    server.openServer(generator.getVocabulary(), automaton.getInitialState(), False, lambda: None, lambda: None, lambda *args: None, lambda *args: None)
+    openingTime = time.time() - startTime
+
+    def roundTrips():
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.settimeout(10)
+        for i in range(0, nbRoundTrips):
+            sock.sendall("PING")
+            received = ""
+            while len(received) < 4:
+                try:
+                    data = sock.recv(4096)
+                except socket.error:
+                    data = ""
+                if len(data) == 0:
+                    sock.close()
+                    return i
+                received += data
+        sock.close()
+        return nbRoundTrips
+    (duration, completed) = runInThreads(roundTrips, nbClients)
+    server.close()
+    return (openingTime, duration, completed)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-c", "--clients", dest="clients", default="1,10,100", help="comma separated numbers of concurrent clients")
+    parser.add_option("-r", "--roundtrips", dest="roundTrips", type="int", default=200, help="number of round trips per client")
+    parser.add_option("-s", "--size", dest="size", type="int", default=64, help="size of the echoed messages")
+    parser.add_option("-p", "--port", dest="port", type="int", default=20700, help="first port of the simulated servers")
+    (options, args) = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    echoServer = EchoServer()
+    echoServer.start()
+    message = "x" * options.size
+
+    print "Clients against the echo stand-in (round trips per second, completed round trips)"
+    print "{0:>8} {1:>12} {2:>10} {3:>12} {4:>10}".format("clients", "blocking", "done", "event loop", "done")
+    for nbClients in [int(c) for c in options.clients.split(",")]:
+        results = [benchClients(channelClass, echoServer.port, nbClients, options.roundTrips, message) for channelClass in [NetworkClient, EventLoopNetworkClient]]
+        print "{0:>8} {1:>12.0f} {2:>10} {3:>12.0f} {4:>10}".format(nbClients, results[0][1] / results[0][0], results[0][1], results[1][1] / results[1][0], results[1][1])
+
+    print "Simulated PING/PONG servers (opening time in seconds, round trips per second, completed round trips)"
+    print "{0:>8} {1:>6} {2:>12} {3:>10} {4:>6} {5:>12} {6:>10}".format("clients", "open", "blocking", "done", "open", "event loop", "done")
+    port = options.port
+    for nbClients in [int(c) for c in options.clients.split(",")]:
+        results = []
+        for channelClass in [NetworkServer, EventLoopNetworkServer]:
+            results.append(benchServer(channelClass, port, nbClients, options.roundTrips))
+            port += 1
+        print "{0:>8} {1:>6.2f} {2:>12.0f} {3:>10} {4:>6.2f} {5:>12.0f} {6:>10}".format(nbClients, results[0][0], results[0][2] / results[0][1], results[0][2], results[1][0], results[1][2] / results[1][1], results[1][2])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Models.L4NetworkMessage import L4NetworkMessage
+from netzob.Import.Pcap.PcapReader import PcapReader
+from netzob.Import.Pcap.PacketDecoder import PacketDecoder
+from netzob.Import.Pcap.ParallelPcapDecoder import ParallelPcapDecoder
+from common.PcapGenerator import PcapGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the parallel decoding of PCAP files
+#|   Measures the number of packets per second decoded in
+#|   L4NetworkMessages from a directory of synthetic captures, according
+#|   to the number of worker processes.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_ParallelPcap.py
+#+---------------------------------------------------------------------------+
+
+
+def decodeTask(task, namespace):
+    decoder = PacketDecoder()
+    reader = PcapReader(task.filePath)
+    if task.firstOffset is not None:
+        reader.setOffset(task.firstOffset)
+    datalink = reader.datalink()
+    results = []
+    index = task.firstPacket
+    while task.lastPacket is None or index < task.lastPacket:
+        (header, data) = reader.next()
+        if header is None:
+            break
+        l2 = decoder.decodeLayer2(datalink, data)
+        l3 = decoder.decodeLayer3(l2[4], l2[3])
+        l4 = decoder.decodeLayer4(l3[4], l3[3])
+        (secs, usecs) = header.getts()
+        message = L4NetworkMessage(ParallelPcapDecoder.createMessageID(namespace, task, index), secs + usecs / 1000000.0, l4[3].encode("hex"),
+                                   l2[0], l2[1], l2[2], l3[0], l3[1], l3[2], l4[0], l4[1], l4[2])
+        results.append(((message.getTimestamp(), task.fileIndex, index), message, data))
+        index += 1
+    reader.close()
+    return results
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-f", "--files", dest="files", type="int", default=24, help="number of capture files")
+    parser.add_option("-p", "--packets", dest="packets", type="int", default=5000, help="number of packets per file")
+    parser.add_option("-w", "--workers", dest="workers", default=None, help="comma separated numbers of workers")
+    (options, args) = parser.parse_args()
+    if options.workers is None:
+        workers = sorted(set([1, 2, 4, multiprocessing.cpu_count()]))
+    else:
+        workers = [int(nbWorkers) for nbWorkers in options.workers.split(",")]
+
+    generator = PcapGenerator(0)
+    directory = tempfile.mkdtemp()
+    try:
+        frames = generator.randomFrames(1000)
+        filePaths = []
+        for i in range(options.files):
+            filePath = os.path.join(directory, "capture{0}.pcap".format(i))
+            f = open(filePath, "wb")
+            f.write(generator.pcap((frames * (options.packets / len(frames) + 1))[:options.packets], startTime=1000000000 + i))
+            f.close()
+            filePaths.append(filePath)
+
+        print "{0:>8} {1:>12} {2:>10}".format("workers", "pps", "speedup")
+        reference = None
+        for nbWorkers in workers:
+            decoder = ParallelPcapDecoder(decodeTask, nbWorkers)
+            startTime = time.time()
+            messages = decoder.decode(decoder.splitFiles(filePaths))
+            pps = len(messages) / (time.time() - startTime)
+            if reference is None:
+                reference = pps
+            print "{0:>8} {1:>12.0f} {2:>10.2f}".format(nbWorkers, pps, pps / reference)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import os
+import tempfile
+import uuid
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Models.L4NetworkMessage import L4NetworkMessage
+from netzob.Import.Pcap.PcapReader import PcapReader
+from netzob.Import.Pcap.PacketDecoder import PacketDecoder
+from common.PcapGenerator import PcapGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the reading of PCAP files
+#|   Measures the number of packets per second read from a synthetic
+#|   capture of TCP and UDP segments, decoded up to the layer 4 and
+#|   turned into L4NetworkMessages as by the PCAPImporter, with the
+#|   built-in reader and, when they are installed, with pcapy and
+#|   impacket.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_PcapReader.py
+#+---------------------------------------------------------------------------+
+
+
+def createMessage(header, l2, l3, l4):
+    (secs, usecs) = header.getts()
+    return L4NetworkMessage(str(uuid.uuid4()), secs + (usecs / 1000000.0), l4[3].encode("hex"),
+                            l2[0], l2[1], l2[2], l3[0], l3[1], l3[2], l4[0], l4[1], l4[2])
+
+
+def benchBuiltin(filePath, decode, create):
+    decoder = PacketDecoder()
+    reader = PcapReader(filePath)
+    datalink = reader.datalink()
+    nbPackets = 0
+    startTime = time.time()
+    while True:
+        (header, data) = reader.next()
+        if header is None:
+            break
+        if decode:
+            l2 = decoder.decodeLayer2(datalink, data)
+            l3 = decoder.decodeLayer3(l2[4], l2[3])
+            l4 = decoder.decodeLayer4(l3[4], l3[3])
+            if create:
+                createMessage(header, l2, l3, l4)
+        nbPackets += 1
+    duration = time.time() - startTime
+    reader.close()
+    return nbPackets / duration
+
+
+def benchPcapy(filePath, decode, create):
+    import pcapy
+    import impacket.ImpactDecoder as Decoders
+    reader = pcapy.open_offline(filePath)
+    nbPackets = 0
+    startTime = time.time()
+    while True:
+        (header, data) = reader.next()
+        if header is None:
+            break
+        if decode:
+            # Same decoding as the PCAPImporter, IPv4 only
+            layer2 = Decoders.EthDecoder().decode(data)
+            l2Payload = data[layer2.get_header_size():]
+            if layer2.get_ether_type() == 0x0800:
+                layer3 = Decoders.IPDecoder().decode(l2Payload)
+                l3Payload = l2Payload[layer3.get_header_size():]
+                if layer3.get_ip_p() == 17:
+                    layer4 = Decoders.UDPDecoder().decode(l3Payload)
+                else:
+                    layer4 = Decoders.TCPDecoder().decode(l3Payload)
+                if create:
+                    createMessage(header, ("Ethernet", layer2.get_ether_shost(), layer2.get_ether_dhost()),
+                                  ("IP", layer3.get_ip_src(), layer3.get_ip_dst()),
+                                  ("UDP", 0, 0, layer4.get_data_as_string()))
+        nbPackets += 1
+    return nbPackets / (time.time() - startTime)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-p", "--packets", dest="packets", type="int", default=100000, help="number of packets of the capture")
+    (options, args) = parser.parse_args()
+
+    generator = PcapGenerator(0)
+    frames = generator.randomFrames(1000)
+    frames = (frames * (options.packets / len(frames) + 1))[:options.packets]
+
+    print "{0:>10} {1:>8} {2:>12} {3:>12} {4:>12}".format("reader", "format", "read (pps)", "decoded", "messages")
+    for (format, content) in [("pcap", generator.pcap(frames)), ("pcapng", generator.pcapng(frames))]:
+        (fd, filePath) = tempfile.mkstemp(suffix=".pcap")
+        os.write(fd, content)
+        os.close(fd)
+        try:
+            print "{0:>10} {1:>8} {2:>12.0f} {3:>12.0f} {4:>12.0f}".format("built-in", format, benchBuiltin(filePath, False, False), benchBuiltin(filePath, True, False), benchBuiltin(filePath, True, True))
+            try:
+                print "{0:>10} {1:>8} {2:>12.0f} {3:>12.0f} {4:>12.0f}".format("pcapy", format, benchPcapy(filePath, False, False), benchPcapy(filePath, True, False), benchPcapy(filePath, True, True))
+            except ImportError:
+                pass
+        finally:
+            os.unlink(filePath)
+
+if __name__ == "__main__":
+    main()
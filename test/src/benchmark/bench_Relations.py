@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import random
+import optparse
+import uuid
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Field import Field
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.RelationTypes.WordSizeRelationType import WordSizeRelationType
+from netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable import ComputedRelationVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the relation variables
+#|   Measures the time spent to generate a message made of
+#|   records, each record being a payload and its size, according to
+#|   the number of records (and so of relations) of the symbol. The size
+#|   precedes the payload (it is written when the payload is notified) or
+#|   follows it (it is computed from the written payload).
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_Relations.py
+#+---------------------------------------------------------------------------+
+
+
+def createWord(value):
+    return DataVariable(str(uuid.uuid4()), value, False, False, WordType(True, len(value), len(value)), TypeConvertor.stringB2bin(value))
+
+
+def createSymbol(generator, nbRecords, leading):
+    symbol = Symbol(str(uuid.uuid4()), "records", generator.getProject())
+    variables = []
+    for i in range(0, nbRecords):
+        # The payloads are constant, of 1 to 9 characters
+        payload = createWord("x" * (1 + i % 9))
+        size = ComputedRelationVariable(str(uuid.uuid4()), "size", False, False, WordSizeRelationType(True, 1, 1, None, 0.125, 0), payload.getID(), symbol)
+        if leading:
+            variables.extend([size, createWord(":"), payload, createWord(";")])
+        else:
+            variables.extend([payload, createWord(":"), size, createWord(";")])
+    for variable in variables:
+        field = Field.createDefaultField(symbol)
+        field.setVariable(variable)
+        symbol.getField().addField(field)
+    generator.getVocabulary().addSymbol(symbol)
+    return symbol
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-r", "--records", dest="records", default="4,16,64,256", help="comma separated number of records")
+    parser.add_option("-m", "--messages", dest="messages", type="int", default=200, help="number of generated messages")
+    (options, args) = parser.parse_args()
+
+    print "{0:>8} {1:>20} {2:>20}".format("records", "leading size (ms)", "trailing size (ms)")
+    for nbRecords in [int(records) for records in options.records.split(",")]:
+        times = []
+        for leading in [True, False]:
+            random.seed(0)
+            generator = AutomataGenerator(0)
+            symbol = createSymbol(generator, nbRecords, leading)
+            abstractionLayer = AbstractionLayer(None, generator.getVocabulary(), Memory())
+
+            startTime = time.time()
+            for i in range(0, options.messages):
+                abstractionLayer.specialize(symbol)
+            times.append((time.time() - startTime) / options.messages)
+
+        print "{0:>8} {1:>20.3f} {2:>20.3f}".format(nbRecords, 1000 * times[0], 1000 * times[1])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import optparse
+import select
+import socket
+import threading
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.MMSTD.MMSTD import MMSTD
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.States.impl.NormalState import NormalState
+from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
+from netzob.Common.MMSTD.Transitions.impl.OpenChannelTransition import OpenChannelTransition
+from netzob.Common.MMSTD.Transitions.impl.CloseChannelTransition import CloseChannelTransition
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+from netzob.Common.MMSTD.Actors.MMSTDVisitor import MMSTDVisitor
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkClient import NetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkServer import EventLoopNetworkServer
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the replay of sessions
+#|   Master: a visitor opens a connection (1000ms), sends PING messages
+#|   answered by a local stand-in, sends a NOP message the stand-in ignores
+#|   (the transition expects an EmptySymbol, i.e. a reception timeout) and
+#|   closes the connection (1000ms).
+#|   Client: raw TCP clients send PING messages to a simulated server
+#|   answering PONG after a reaction time of 1000ms.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_Replay.py
+#+---------------------------------------------------------------------------+
+
+
+class PongServer(threading.Thread):
+    """Single threaded stand-in which answers PONG to each PING"""
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listeningSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listeningSocket.bind(("127.0.0.1", 0))
+        self.listeningSocket.listen(socket.SOMAXCONN)
+        self.port = self.listeningSocket.getsockname()[1]
+
+    def run(self):
+        poller = select.poll()
+        poller.register(self.listeningSocket.fileno(), select.POLLIN)
+        sockets = dict()
+        while True:
+            for (fileno, event) in poller.poll():
+                if fileno == self.listeningSocket.fileno():
+                    sock = self.listeningSocket.accept()[0]
+                    sockets[sock.fileno()] = sock
+                    poller.register(sock.fileno(), select.POLLIN)
+                    continue
+                sock = sockets[fileno]
+                data = sock.recv(65536)
+                if len(data) == 0:
+                    poller.unregister(fileno)
+                    del sockets[fileno]
+                    sock.close()
+                elif data.count("PING") > 0:
+                    sock.sendall("PONG" * data.count("PING"))
+
+
+def createMasterSession(generator, nbExchanges, receptionTimeout):
+    ping = generator.createSymbol("PING")
+    pong = generator.createSymbol("PONG")
+    nop = generator.createSymbol("NOP")
+    states = [NormalState(str(i), "State " + str(i)) for i in range(0, nbExchanges + 4)]
+    automaton = MMSTD(states[0], generator.getVocabulary())
+    for state in states:
+        automaton.addState(state)
+    transitions = [OpenChannelTransition("open", "Open", states[0], states[1], 1000, 3)]
+    for i in range(1, nbExchanges + 1):
+        transition = SemiStochasticTransition(str(i), "Transition " + str(i), states[i], states[i + 1], ping)
+        transition.addOutputSymbol(pong, 100, 0)
+        transitions.append(transition)
+    transition = SemiStochasticTransition("nop", "Nop", states[nbExchanges + 1], states[nbExchanges + 2], nop)
+    transition.addOutputSymbol(EmptySymbol(), 100, 0)
+    if hasattr(transition, "setReceptionTimeout"):
+        transition.setReceptionTimeout(receptionTimeout)
+    transitions.append(transition)
+    transitions.append(CloseChannelTransition("close", "Close", states[nbExchanges + 2], states[nbExchanges + 3], 1000))
+    for transition in transitions:
+        transition.getInputState().registerTransition(transition)
+        automaton.addTransition(transition)
+    return automaton
+
+
+def replayMaster(port, nbExchanges, receptionTimeout, asFastAsPossible):
+    generator = AutomataGenerator(0)
+    automaton = createMasterSession(generator, nbExchanges, receptionTimeout)
+    client = NetworkClient("client", Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", port)
+    abstractionLayer = AbstractionLayer(client, generator.getVocabulary(), Memory())
+    visitor = MMSTDVisitor("master", "master", automaton, True, abstractionLayer)
+    if asFastAsPossible:
+        visitor.setAsFastAsPossible(True)
+    startTime = time.time()
+    visitor.run()
+    return (time.time() - startTime, len(abstractionLayer.getInputMessages()))
+
+
+def replayClient(nbExchanges, asFastAsPossible):
+    generator = AutomataGenerator(0)
+    ping = generator.createSymbol("PING")
+    pong = generator.createSymbol("PONG")
+    automaton = generator.createAutomaton(1, [(0, ping, pong, 0)])
+    for transition in automaton.getTransitions():
+        transition.setTimeForOutputSymbol(pong, 1000)
+    server = EventLoopNetworkServer("server", Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", 0)
+    if asFastAsPossible:
+        from netzob.Common.MMSTD.Actors.Scheduler import Scheduler
+        server.setScheduler(Scheduler(True))
+    server.openServer(generator.getVocabulary(), automaton.getInitialState(), False, lambda: None, lambda: None, lambda *args: None, lambda *args: None)
+    sock = socket.create_connection(server.listeningSocket.getsockname())
+    sock.settimeout(10)
+    startTime = time.time()
+    completed = 0
+    for i in range(0, nbExchanges):
+        sock.sendall("PING")
+        if sock.recv(4096) != "PONG":
+            break
+        completed += 1
+    duration = time.time() - startTime
+    sock.close()
+    server.close()
+    return (duration, completed)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-e", "--exchanges", dest="exchanges", type="int", default=5, help="number of PING/PONG exchanges per session")
+    parser.add_option("-t", "--timeout", dest="timeout", type="float", default=0.2, help="reception timeout of the NOP transition (in seconds)")
+    (options, args) = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    pongServer = PongServer()
+    pongServer.start()
+    modes = [False]
+    if hasattr(MMSTDVisitor, "setAsFastAsPossible"):
+        modes.append(True)
+
+    print "{0:>8} {1:>22} {2:>10} {3:>10}".format("role", "mode", "time (s)", "received")
+    for asFastAsPossible in modes:
+        mode = "as fast as possible" if asFastAsPossible else "reaction times"
+        (duration, received) = replayMaster(pongServer.port, options.exchanges, options.timeout, asFastAsPossible)
+        print "{0:>8} {1:>22} {2:>10.3f} {3:>10}".format("master", mode, duration, received)
+        (duration, received) = replayClient(options.exchanges, asFastAsPossible)
+        print "{0:>8} {1:>22} {2:>10.3f} {3:>10}".format("client", mode, duration, received)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import random
+import optparse
+import uuid
+from bitarray import bitarray
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Field import Field
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.RelationTypes.WordSizeRelationType import WordSizeRelationType
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable import ComputedRelationVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableWritingToken import VariableWritingToken
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the specialization of symbols
+#|   Measures the number of messages generated per second by the write
+#|   access of the variable tree and by the compiled writing program of
+#|   the symbols, for a symbol of static fields and for a symbol of static
+#|   fields followed by a size field and a random payload.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_Specialization.py
+#+---------------------------------------------------------------------------+
+
+
+def createWord(value, mutable=False, maxChars=None):
+    if maxChars is None:
+        maxChars = len(value)
+    return DataVariable(str(uuid.uuid4()), value, mutable, False, WordType(True, len(value), maxChars), TypeConvertor.stringB2bin(value))
+
+
+def createSymbol(generator, name, nbFields, dynamic):
+    symbol = Symbol(str(uuid.uuid4()), name, generator.getProject())
+    variables = [createWord(" ARG{0}".format(i)) for i in range(0, nbFields)]
+    if dynamic:
+        payload = createWord("x", mutable=True, maxChars=16)
+        size = ComputedRelationVariable(str(uuid.uuid4()), "size", False, False, WordSizeRelationType(True, 1, 3, None, 0.125, 0), payload.getID(), symbol)
+        variables.extend([createWord(" LEN="), size, createWord(":"), payload])
+    for variable in variables:
+        field = Field.createDefaultField(symbol)
+        field.setVariable(variable)
+        symbol.getField().addField(field)
+    generator.getVocabulary().addSymbol(symbol)
+    return symbol
+
+
+def treeWrite(symbol, vocabulary, memory):
+    writingToken = VariableWritingToken(False, vocabulary, memory, bitarray(''), ["random"])
+    root = AggregateVariable(symbol.getID(), symbol.getName(), False, False, None)
+    for field in symbol.getExtendedFields():
+        root.addChild(field.getVariable())
+    root.write(writingToken)
+    for field in symbol.getExtendedFields():
+        field.getVariable().removeFather(root)
+    return writingToken.getValue()
+
+
+def throughput(function, nbMessages, *args):
+    startTime = time.time()
+    for i in range(0, nbMessages):
+        function(*args)
+    return nbMessages / max(time.time() - startTime, 1e-6)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-f", "--fields", dest="fields", default="4,16,64", help="comma separated number of static fields")
+    parser.add_option("-m", "--messages", dest="messages", type="int", default=2000, help="number of generated messages")
+    parser.add_option("-r", "--seed", dest="seed", type="int", default=0, help="seed of the generator")
+    (options, args) = parser.parse_args()
+
+    print "{0:>8} {1:>8} {2:>12} {3:>12}".format("fields", "dynamic", "tree", "compiled")
+    for nbFields in [int(fields) for fields in options.fields.split(",")]:
+        for dynamic in [False, True]:
+            random.seed(options.seed)
+            generator = AutomataGenerator(options.seed)
+            symbol = createSymbol(generator, "symbol", nbFields, dynamic)
+            abstractionLayer = AbstractionLayer(None, generator.getVocabulary(), Memory())
+            print "{0:>8} {1:>8} {2:>12.1f} {3:>12.1f}".format(
+                nbFields,
+                str(dynamic),
+                throughput(treeWrite, options.messages, symbol, generator.getVocabulary(), abstractionLayer.getMemory()),
+                throughput(abstractionLayer.specialize, options.messages, symbol))
+
+if __name__ == "__main__":
+    main()
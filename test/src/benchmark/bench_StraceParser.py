@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import os
+import random
+import re
+import tempfile
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Import.Ipc.StraceCapture import StraceCapture
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the parsing of strace outputs
+#|   Measures the number of syscalls per second parsed from a recorded
+#|   output of strace -xx (or a synthetic one of read and write calls),
+#|   line by line as the IpcCapturer did, and in chunks by the
+#|   StraceCapture.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_StraceParser.py [-l strace.log]
+#+---------------------------------------------------------------------------+
+
+
+def generateLog(nbSyscalls, payloadSize):
+    random.seed(0)
+    lines = []
+    for i in range(nbSyscalls):
+        size = random.randint(1, payloadSize)
+        payload = "".join(["\\x{0:02x}".format(random.randint(0, 255)) for j in range(size)])
+        syscall = random.choice(["read", "write"])
+        lines.append('{0}({1}, "{2}", {3}) = {3}\n'.format(syscall, random.randint(3, 10), payload, size))
+        if i % 10 == 0:
+            lines.append('read(3, 0x7ffd5e1c2a10, 4096) = -1 EAGAIN (Resource temporarily unavailable)\n')
+    return "".join(lines)
+
+
+def benchLines(filePath):
+    # Parsing of the IpcCapturer, one line per callback
+    nbSyscalls = 0
+    stream = open(filePath, "rb")
+    startTime = time.time()
+    while True:
+        data = stream.readline()
+        if len(data) == 0:
+            break
+        compiledRegex = re.compile("(read|write)\((\d+), \"(.*)\", \d+\)[ \t]*=[ \t]*(\d+)")
+        m = compiledRegex.match(data)
+        if m is None:
+            continue
+        direction = data[m.start(1): m.end(1)]
+        fd = int(data[m.start(2): m.end(2)])
+        pkt = data[m.start(3): m.end(3)]
+        pkt = pkt.replace("\\x", "")
+        nbSyscalls += 1
+    duration = time.time() - startTime
+    stream.close()
+    return (nbSyscalls, duration)
+
+
+def benchChunks(filePath):
+    stream = open(filePath, "rb")
+    capture = StraceCapture(stream, lambda direction, fd, data: data, lambda messages: None)
+    startTime = time.time()
+    capture.start()
+    capture.join()
+    duration = time.time() - startTime
+    stream.close()
+    return (capture.getStatistics().nbSyscalls, duration)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-l", "--log", dest="log", help="recorded output of strace -xx")
+    parser.add_option("-s", "--syscalls", dest="syscalls", type="int", default=200000, help="number of syscalls of the synthetic output")
+    parser.add_option("-p", "--payload", dest="payload", type="int", default=256, help="maximal size of the synthetic payloads")
+    (options, args) = parser.parse_args()
+
+    filePath = options.log
+    if filePath is None:
+        (fd, filePath) = tempfile.mkstemp(suffix=".log")
+        os.write(fd, generateLog(options.syscalls, options.payload))
+        os.close(fd)
+    try:
+        size = os.path.getsize(filePath) / (1024.0 * 1024.0)
+        print "{0:>10} {1:>10} {2:>14} {3:>10}".format("parser", "syscalls", "syscalls/s", "MB/s")
+        for (name, bench) in [("lines", benchLines), ("chunks", benchChunks)]:
+            (nbSyscalls, duration) = bench(filePath)
+            print "{0:>10} {1:>10} {2:>14.0f} {3:>10.1f}".format(name, nbSyscalls, nbSyscalls / duration, size / duration)
+    finally:
+        if options.log is None:
+            os.unlink(filePath)
+
+if __name__ == "__main__":
+    main()
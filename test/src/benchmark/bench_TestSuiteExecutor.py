@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import sys
+import time
+import logging
+import random
+import optparse
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Inference.Grammar.MQCache import MQCache
+from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
+from netzob.Inference.Grammar.Oracles.SimulatedOracle import SimulatedOracle
+from netzob.Inference.Grammar.EquivalenceOracles import WMethodNetworkEquivalenceOracle as WMethodModule
+from netzob.Inference.Grammar.EquivalenceOracles.TestSuiteExecutor import TestSuiteExecutor
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the execution of W-method test suites
+#|   Validates randomly generated automata against themselves (so that
+#|   the whole suite is executed) through simulated targets answering
+#|   each query after a given latency. The suite is executed as the
+#|   WMethodNetworkEquivalenceOracle did (sequentially, every test,
+#|   linear scan of the MQ cache) and by the TestSuiteExecutor (pruned,
+#|   cached tests first, indexed cache, one worker per target).
+#|   The cache is preloaded with random queries, as left by the learner.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_TestSuiteExecutor.py
+#+---------------------------------------------------------------------------+
+
+
+class LatencyOracle(SimulatedOracle):
+    """Simulated target which answers after a network latency"""
+
+    def __init__(self, reference, latency):
+        SimulatedOracle.__init__(self, reference)
+        self.latency = latency
+
+    def submitQuery(self, query):
+        time.sleep(self.latency)
+        return SimulatedOracle.submitQuery(self, query)
+
+
+class LinearMQCache(MQCache):
+    """The MQ cache as it was: a linear scan of the cached queries"""
+
+    def __init__(self):
+        MQCache.__init__(self)
+        self.queries = []
+
+    def getCachedResult(self, mq):
+        for (cachedMQ, result) in self.queries:
+            if cachedMQ == mq:
+                return result
+        return None
+
+    def cacheResult(self, mq, result):
+        self.queries.append((mq, result))
+
+
+class SequentialExecutor(object):
+    """The execution of the tests as it was in the W-method oracle"""
+
+    def __init__(self, communicationChannels, resetScript, cache):
+        self.communicationChannel = communicationChannels[0]
+        self.cache = cache
+        self.nbExecutedTests = 0
+        self.nbCachedTests = 0
+
+    def execute(self, mmstd, tests):
+        for test in tests:
+            (traceTest, stateTest) = mmstd.getOutputTrace(mmstd.getInitialState(), test.getSymbols())
+            resultQuery = self.cache.getCachedResult(test)
+            if resultQuery is None:
+                resultQuery = self.communicationChannel.submitQuery(test)
+                self.cache.cacheResult(test, resultQuery)
+                self.nbExecutedTests += 1
+            else:
+                self.nbCachedTests += 1
+            if not MembershipQuery(traceTest).isStrictlyEqual(MembershipQuery(resultQuery)):
+                return test
+        return None
+
+    def getNbExecutedTests(self):
+        return self.nbExecutedTests
+
+    def getNbCachedTests(self):
+        return self.nbCachedTests
+
+
+def validate(reference, inputSymbols, cache, executorClass, channels):
+    WMethodModule.TestSuiteExecutor = executorClass
+    oracle = WMethodModule.WMethodNetworkEquivalenceOracle(channels[0], len(reference.getAllStates()) + 1, "", channels[1:])
+    startTime = time.time()
+    counterExample = oracle.findCounterExample(reference, inputSymbols, cache)
+    duration = time.time() - startTime
+    return (counterExample, duration, sum([channel.getNbQueries() for channel in channels]))
+
+
+def preloadCache(cache, oracle, inputSymbols, nbQueries, maxLength):
+    for i in range(nbQueries):
+        query = MembershipQuery([random.choice(inputSymbols) for j in range(random.randint(1, maxLength))])
+        cache.cacheResult(query, oracle.submitQuery(query))
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-s", "--sizes", dest="sizes", default="3,5,7", help="comma separated number of states")
+    parser.add_option("-i", "--inputs", dest="inputs", type="int", default=3, help="number of input symbols")
+    parser.add_option("-c", "--channels", dest="channels", type="int", default=4, help="number of instances of the target")
+    parser.add_option("-l", "--latency", dest="latency", type="float", default=0.005, help="latency of a query (s)")
+    parser.add_option("-q", "--queries", dest="queries", type="int", default=500, help="queries preloaded in the cache")
+    parser.add_option("-r", "--seed", dest="seed", type="int", default=0, help="seed of the generator")
+    (options, args) = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print "{0:>8} {1:>12} {2:>10} {3:>10} {4:>12} {5:>10}".format("states", "executor", "queries", "time (s)", "counterexp.", "speedup")
+    for nbStates in [int(size) for size in options.sizes.split(",")]:
+        generator = AutomataGenerator(options.seed)
+        inputSymbols = generator.createSymbols("IN", options.inputs)
+        outputSymbols = generator.createSymbols("OUT", 3)
+        reference = generator.generateAutomaton(nbStates, inputSymbols, outputSymbols)
+
+        durations = []
+        for (name, executorClass, cacheClass, nbChannels) in [("sequential", SequentialExecutor, LinearMQCache, 1),
+                                                              ("executor", TestSuiteExecutor, MQCache, options.channels)]:
+            random.seed(options.seed)
+            cache = cacheClass()
+            preloadCache(cache, SimulatedOracle(reference), inputSymbols, options.queries, 2 * nbStates)
+            channels = [LatencyOracle(reference, options.latency) for i in range(nbChannels)]
+            (counterExample, duration, nbQueries) = validate(reference, inputSymbols, cache, executorClass, channels)
+            durations.append(duration)
+            print "{0:>8} {1:>12} {2:>10} {3:>10.2f} {4:>12} {5:>10.1f}".format(nbStates, name, nbQueries, duration, str(counterExample is not None), durations[0] / duration)
+            sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
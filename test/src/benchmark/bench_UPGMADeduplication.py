@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import uuid
+import random
+import datetime
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Project import Project
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Models.RawMessage import RawMessage
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Inference.Vocabulary.Alignment.UPGMA import UPGMA
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the clustering of repetitive traces
+#|   Measures the time of the UPGMA clustering (similarity matrix and
+#|   phylogenic tree) of traces made of a given number of messages
+#|   drawn among fewer distinct payloads, with and without the
+#|   deduplication of identical payloads.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_UPGMADeduplication.py [-m 400]
+#+---------------------------------------------------------------------------+
+
+
+def generateMessages(nbMessages, nbPayloads):
+    payloads = []
+    for i in range(nbPayloads):
+        header = random.choice(["GET /", "USER ", "PING ", "\x01\x02\x03"])
+        body = "".join([random.choice("abcdefghijklmnopqrstuvwxyz0123456789") for j in range(random.randint(4, 60))])
+        payloads.append(TypeConvertor.stringToNetzobRaw(header + body))
+    return [RawMessage(str(uuid.uuid4()), i, random.choice(payloads)) for i in range(nbMessages)]
+
+
+def benchClustering(project, messages, deduplicate):
+    symbol = Symbol(str(uuid.uuid4()), "trace", project)
+    symbol.addMessages(messages)
+    startTime = time.time()
+    clusteringSolution = UPGMA(project, [symbol], 8, lambda stage, donePercent, currentMessage: None, deduplicate=deduplicate)
+    clusteringSolution.processUPGMA()
+    return (time.time() - startTime, len(clusteringSolution.symbols))
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-m", "--messages", dest="messages", type="int", default=400, help="number of messages of the traces")
+    (options, args) = parser.parse_args()
+
+    random.seed(0)
+    project = Project(str(uuid.uuid4()), "bench_UPGMADeduplication", datetime.datetime.now(), None)
+    print "{0:>10} {1:>10} {2:>10} {3:>14} {4:>10}".format("messages", "payloads", "symbols", "without (s)", "with (s)")
+    for ratio in [1, 2, 5, 10, 50]:
+        messages = generateMessages(options.messages, options.messages / ratio)
+        (durationWithout, nbSymbols) = benchClustering(project, messages, False)
+        (durationWith, nbSymbols) = benchClustering(project, messages, True)
+        print "{0:>10} {1:>10} {2:>10} {3:>14.2f} {4:>10.2f}".format(len(messages), options.messages / ratio, nbSymbols, durationWithout, durationWith)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+import optparse
+import os
+import bz2
+import random
+import resource
+import tempfile
+from base64 import b64encode, b64decode
+from lxml import etree
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Models.RawMessage import RawMessage
+from netzob.Common.Models.Factories.AbstractMessageFactory import AbstractMessageFactory
+from netzob.Common.Workspace import Workspace, WORKSPACE_NAMESPACE, COMMON_NAMESPACE
+from netzob.Import.XML.IncrementalXMLReader import IncrementalXMLReader
+
+#+---------------------------------------------------------------------------+
+#| Benchmark of the parsing of XML imports
+#|   Measures the import time and the peak memory of the parsing of
+#|   generated inputs of the XML importer (netzob messages validated
+#|   against the XSD) and of the OSpy importer (bz2 compressed logs),
+#|   by an IncrementalXMLReader and by parsing the whole documents as
+#|   the importers did. Each parsing is made in a child process, so
+#|   that its peak memory is measured alone.
+#|   Usage : PYTHONPATH=src:test/src python test/src/benchmark/bench_XMLImport.py
+#+---------------------------------------------------------------------------+
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "resources", "static", "netzob", "xsds", "0.1", "common.xsd")
+MESSAGE_TAG = "{" + COMMON_NAMESPACE + "}message"
+
+
+def generateXML(nbMessages):
+    (fd, filePath) = tempfile.mkstemp(suffix=".xml")
+    os.write(fd, "<netzob-common:messages xmlns:netzob-common=\"{0}\">".format(COMMON_NAMESPACE))
+    root = etree.Element("{" + COMMON_NAMESPACE + "}messages", nsmap={"netzob-common": COMMON_NAMESPACE})
+    for i in range(nbMessages):
+        message = RawMessage(str(i), i, os.urandom(random.randint(10, 200)).encode("hex"))
+        AbstractMessageFactory.save(message, root, WORKSPACE_NAMESPACE, COMMON_NAMESPACE)
+        if len(root) == 1000:
+            os.write(fd, "".join([etree.tostring(xmlMessage) for xmlMessage in root]))
+            root.clear()
+    os.write(fd, "".join([etree.tostring(xmlMessage) for xmlMessage in root]))
+    os.write(fd, "</netzob-common:messages>")
+    os.close(fd)
+    return filePath
+
+
+def generateOSpy(nbMessages):
+    (fd, filePath) = tempfile.mkstemp(suffix=".osd")
+    compressor = bz2.BZ2Compressor()
+    os.write(fd, compressor.compress("<?xml version=\"1.0\"?><Log>"))
+    for i in range(nbMessages):
+        os.write(fd, compressor.compress("<Messages><Timestamp>2012-01-01T00:00:{0:02}</Timestamp><FunctionName>send</FunctionName>"
+                                         "<LocalAddress>10.0.0.1</LocalAddress><PeerAddress>10.0.0.2</PeerAddress><LocalPort>1234</LocalPort>"
+                                         "<PeerPort>80</PeerPort><Direction>1</Direction><Data>{1}</Data></Messages>".format(i % 60, b64encode(os.urandom(random.randint(10, 200))))))
+    os.write(fd, compressor.compress("</Log>"))
+    os.write(fd, compressor.flush())
+    os.close(fd)
+    return filePath
+
+
+def parseWholeXML(filePath):
+    # Validation then parsing of the whole document
+    Workspace.isSchemaValidateXML(SCHEMA_PATH, filePath)
+    tree = etree.ElementTree()
+    tree.parse(filePath)
+    return len([AbstractMessageFactory.loadFromXML(xmlMessage, COMMON_NAMESPACE, "0.1") for xmlMessage in tree.getroot().findall(MESSAGE_TAG)])
+
+
+def parseIncrementalXML(filePath):
+    schema = Workspace.loadXMLSchema(SCHEMA_PATH)
+    nbMessages = 0
+    for xmlMessage in IncrementalXMLReader(filePath, MESSAGE_TAG, schema):
+        AbstractMessageFactory.loadFromXML(xmlMessage, COMMON_NAMESPACE, "0.1")
+        nbMessages += 1
+    return nbMessages
+
+
+def parseOSpyMessage(xmlMessage):
+    return (xmlMessage.find("Timestamp").text, xmlMessage.find("FunctionName").text, b64decode(xmlMessage.find("Data").text).encode("hex"))
+
+
+def parseWholeOSpy(filePath):
+    f = open(filePath, "rb")
+    xmlRoot = etree.fromstring(bz2.decompress(f.read()))
+    f.close()
+    return len([parseOSpyMessage(xmlMessage) for xmlMessage in xmlRoot.findall("Messages")])
+
+
+def parseIncrementalOSpy(filePath):
+    nbMessages = 0
+    for xmlMessage in IncrementalXMLReader(filePath, "Messages", compressed=True):
+        parseOSpyMessage(xmlMessage)
+        nbMessages += 1
+    return nbMessages
+
+
+def measure(parse, filePath):
+    # Runs the parsing in a child process and returns its results
+    (read, write) = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        startTime = time.time()
+        nbMessages = parse(filePath)
+        duration = time.time() - startTime
+        os.write(write, "{0} {1} {2}".format(nbMessages, duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+        os._exit(0)
+    os.close(write)
+    result = os.read(read, 1024).split()
+    os.close(read)
+    os.waitpid(pid, 0)
+    return (int(result[0]), float(result[1]), int(result[2]) / 1024.0)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-m", "--messages", dest="messages", type="int", default=200000, help="number of messages of the inputs")
+    (options, args) = parser.parse_args()
+
+    random.seed(0)
+    print "{0:>6} {1:>12} {2:>10} {3:>10} {4:>14}".format("input", "parsing", "messages", "time (s)", "peak RSS (MB)")
+    for (name, generate, parsers) in [("XML", generateXML, [("whole", parseWholeXML), ("incremental", parseIncrementalXML)]),
+                                      ("OSpy", generateOSpy, [("whole", parseWholeOSpy), ("incremental", parseIncrementalOSpy)])]:
+        filePath = generate(options.messages)
+        try:
+            for (parsing, parse) in parsers:
+                (nbMessages, duration, memory) = measure(parse, filePath)
+                print "{0:>6} {1:>12} {2:>10} {3:>10.1f} {4:>14.1f}".format(name, parsing, nbMessages, duration, memory)
+        finally:
+            os.unlink(filePath)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import uuid
+import random
+import datetime
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Project import Project
+from netzob.Common.Field import Field
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.MMSTD import MMSTD
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.States.impl.NormalState import NormalState
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+
+
+class AutomataGenerator(object):
+    """Generates in memory projects, vocabularies and MMSTDs used
+    as reference targets by the grammar inference tests and benchmarks"""
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+        self.project = Project(str(uuid.uuid4()), "AutomataGenerator", datetime.datetime.now(), None)
+
+    def getProject(self):
+        return self.project
+
+    def getVocabulary(self):
+        return self.project.getVocabulary()
+
+    def createSymbol(self, name, values=None):
+        """Creates a symbol made of a static field per value, by
+        default a single field which value is its name"""
+        symbol = Symbol(str(uuid.uuid4()), name, self.project)
+        if values is None:
+            values = [name]
+        fields = [symbol.getField()]
+        if len(values) > 1:
+            fields = [Field.createDefaultField(symbol) for value in values]
+            for field in fields:
+                symbol.getField().addField(field)
+        for (field, value) in zip(fields, values):
+            field.setVariable(DataVariable(str(uuid.uuid4()), value, False, False, WordType(True, len(value), len(value)), TypeConvertor.stringB2bin(value)))
+        self.project.getVocabulary().addSymbol(symbol)
+        return symbol
+
+    def createSymbols(self, prefix, nbSymbols):
+        symbols = []
+        for i in range(0, nbSymbols):
+            symbols.append(self.createSymbol("{0}{1:04d}".format(prefix, i)))
+        return symbols
+
+    def createAutomaton(self, nbStates, transitions):
+        """Creates an MMSTD given the list of its transitions
+        (startState, inputSymbol, outputSymbol, endState)"""
+        states = []
+        for i in range(0, nbStates):
+            states.append(NormalState(str(i), "State " + str(i)))
+        automaton = MMSTD(states[0], self.project.getVocabulary())
+        for state in states:
+            automaton.addState(state)
+        for (idTransition, (start, inputSymbol, outputSymbol, end)) in enumerate(transitions):
+            transition = SemiStochasticTransition(str(idTransition), "Transition " + str(idTransition), states[start], states[end], inputSymbol)
+            transition.addOutputSymbol(outputSymbol, 100, 0)
+            states[start].registerTransition(transition)
+            automaton.addTransition(transition)
+        return automaton
+
+    def generateAutomaton(self, nbStates, inputSymbols, outputSymbols):
+        """Generates a random complete Mealy machine whose states
+        are all reachable from the initial state"""
+        targets = dict()
+        # A random spanning tree ensures every state is reachable
+        for state in range(1, nbStates):
+            while True:
+                parent = self.random.randint(0, state - 1)
+                inputSymbol = self.random.randint(0, len(inputSymbols) - 1)
+                if not (parent, inputSymbol) in targets:
+                    targets[(parent, inputSymbol)] = state
+                    break
+        transitions = []
+        for state in range(0, nbStates):
+            for inputSymbol in range(0, len(inputSymbols)):
+                end = targets.get((state, inputSymbol), self.random.randint(0, nbStates - 1))
+                outputSymbol = outputSymbols[self.random.randint(0, len(outputSymbols) - 1)]
+                transitions.append((state, inputSymbols[inputSymbol], outputSymbol, end))
+        return self.createAutomaton(nbStates, transitions)
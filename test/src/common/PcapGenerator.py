@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import random
+import socket
+import struct
+
+
+class PcapGenerator(object):
+    """Generates synthetic pcap and pcapng files of Ethernet or Linux
+    SLL frames carrying TCP and UDP segments over IPv4 and IPv6, used
+    by the import tests and benchmarks"""
+
+    DLT_EN10MB = 1
+    DLT_LINUX_SLL = 113
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+
+    def ethernet(self, src, dst, etherType, payload, vlan=None):
+        frame = dst + src
+        if vlan is not None:
+            frame += struct.pack("!HH", 0x8100, vlan)
+        return frame + struct.pack("!H", etherType) + payload
+
+    def linuxSLL(self, src, etherType, payload, packetType=0):
+        return struct.pack("!HHH8sH", packetType, 1, len(src), src, etherType) + payload
+
+    def ipv4(self, src, dst, protocol, payload):
+        header = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(payload), self.random.randint(0, 0xffff), 0, 64, protocol, 0, socket.inet_aton(src), socket.inet_aton(dst))
+        return header + payload
+
+    def ipv6(self, src, dst, protocol, payload):
+        header = struct.pack("!IHBB16s16s", 0x60000000, len(payload), protocol, 64, socket.inet_pton(socket.AF_INET6, src), socket.inet_pton(socket.AF_INET6, dst))
+        return header + payload
+
+    def udp(self, srcPort, dstPort, payload):
+        return struct.pack("!HHHH", srcPort, dstPort, 8 + len(payload), 0) + payload
+
+    def tcp(self, srcPort, dstPort, payload, seq=0, ack=0, flags=0x18, options=""):
+        offset = (20 + len(options)) / 4
+        return struct.pack("!HHIIBBHHH", srcPort, dstPort, seq, ack, offset << 4, flags, 0xffff, 0, 0) + options + payload
+
+    def randomPayload(self, minSize=1, maxSize=64):
+        return "".join([chr(self.random.randint(0, 255)) for i in range(self.random.randint(minSize, maxSize))])
+
+    def randomFrames(self, nbFrames):
+        """Returns frames of TCP and UDP segments, over IPv4 or IPv6 and
+        with or without VLAN tag"""
+        macs = ["\x00\x11\x22\x33\x44\x55", "\x0a\x0b\x0c\x0d\x0e\x0f"]
+        frames = []
+        for i in range(nbFrames):
+            payload = self.randomPayload()
+            if self.random.randint(0, 1) == 0:
+                segment = self.udp(5000 + i % 7, 53, payload)
+                protocol = 17
+            else:
+                segment = self.tcp(6000 + i % 5, 80, payload, seq=i)
+                protocol = 6
+            if self.random.randint(0, 3) == 0:
+                packet = self.ipv6("2001:db8::1", "2001:db8::2", protocol, segment)
+                etherType = 0x86dd
+            else:
+                packet = self.ipv4("10.0.0.{0}".format(1 + i % 3), "10.0.1.1", protocol, segment)
+                etherType = 0x0800
+            vlan = 42 if self.random.randint(0, 4) == 0 else None
+            frames.append(self.ethernet(macs[i % 2], macs[(i + 1) % 2], etherType, packet, vlan))
+        return frames
+
+    def tcpConversation(self, writes, client=("10.0.0.1", 40000), server=("10.0.1.1", 80), mss=16, isn=(1000, 5000)):
+        """Returns the frames of a TCP flow: its handshake, the writes
+        alternately sent by the client and the server, cut in segments
+        of mss bytes whose last one has the PSH flag, and its closing"""
+        macs = ["\x00\x11\x22\x33\x44\x55", "\x0a\x0b\x0c\x0d\x0e\x0f"]
+        ends = [client, server]
+        seqs = [isn[0], isn[1]]
+
+        def frame(sender, flags, payload=""):
+            (src, dst) = (ends[sender], ends[1 - sender])
+            segment = self.tcp(src[1], dst[1], payload, seq=seqs[sender] & 0xffffffff, ack=seqs[1 - sender] & 0xffffffff, flags=flags)
+            return self.ethernet(macs[sender], macs[1 - sender], 0x0800, self.ipv4(src[0], dst[0], 6, segment))
+
+        frames = [frame(0, 0x02)]
+        seqs[0] += 1
+        frames.append(frame(1, 0x12))
+        seqs[1] += 1
+        for (i, write) in enumerate(writes):
+            sender = i % 2
+            for offset in range(0, len(write), mss):
+                payload = write[offset:offset + mss]
+                flags = 0x18 if offset + mss >= len(write) else 0x10
+                frames.append(frame(sender, flags, payload))
+                seqs[sender] += len(payload)
+        frames.append(frame(0, 0x11))
+        return frames
+
+    def pcap(self, frames, datalink=DLT_EN10MB, endianness="<", nanosecond=False, startTime=1000000000):
+        """Returns the content of a pcap file of the frames, captured
+        every millisecond"""
+        magic = 0xa1b23c4d if nanosecond else 0xa1b2c3d4
+        content = [struct.pack(endianness + "IHHiIII", magic, 2, 4, 0, 0, 65535, datalink)]
+        for (i, frame) in enumerate(frames):
+            fraction = i * 1000000 if nanosecond else i * 1000
+            content.append(struct.pack(endianness + "IIII", startTime + fraction / (10 ** 9 if nanosecond else 10 ** 6), fraction % (10 ** 9 if nanosecond else 10 ** 6), len(frame), len(frame)))
+            content.append(frame)
+        return "".join(content)
+
+    def pcapng(self, frames, datalink=DLT_EN10MB, tsresol=None, startTime=1000000000):
+        """Returns the content of a pcapng file of the frames, captured
+        every millisecond, as enhanced packet blocks of one interface"""
+        content = [self.block(0x0a0d0d0a, struct.pack("<IHHq", 0x1a2b3c4d, 1, 0, -1))]
+        options = ""
+        resolution = 1000000
+        if tsresol is not None:
+            options = struct.pack("<HHB3x", 9, 1, tsresol) + struct.pack("<HH", 0, 0)
+            resolution = 10 ** tsresol
+        content.append(self.block(0x00000001, struct.pack("<HHI", datalink, 0, 65535) + options))
+        for (i, frame) in enumerate(frames):
+            timestamp = startTime * resolution + i * resolution / 1000
+            body = struct.pack("<IIIII", 0, timestamp >> 32, timestamp & 0xffffffff, len(frame), len(frame))
+            content.append(self.block(0x00000006, body + frame + "\x00" * (-len(frame) % 4)))
+        return "".join(content)
+
+    def block(self, blockType, body):
+        length = 12 + len(body)
+        return struct.pack("<II", blockType, length) + body + struct.pack("<I", length)
@@ -31,6 +31,7 @@
 #+---------------------------------------------------------------------------+
 import unittest
 from test_netzob.test_Alignment import test_Needleman
+from test_netzob.test_Alignment import test_UPGMADeduplication
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -40,7 +41,7 @@ from test_netzob.test_Alignment import test_Needleman
 def getSuite():
     alignmentSuite = unittest.TestSuite()
 
-    modulesOfTests = [test_Needleman]
+    modulesOfTests = [test_Needleman, test_UPGMADeduplication]
     modulesOfSuites = []
 
     # Add individual tests
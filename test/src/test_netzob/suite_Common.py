@@ -30,7 +30,7 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import unittest
-from test_netzob.test_Common import suite_Type, suite_Functions, test_ExecutionContext
+from test_netzob.test_Common import suite_Type, suite_Functions, test_ExecutionContext, test_MMSTD, test_OutputTraceEvaluator, test_SymbolDispatcher, test_ReadingProgram, test_WritingProgram, test_Memory, test_EventLoop, test_Framing, test_Scheduler, test_LoadGenerator, test_SessionProfiler, test_RelationGraph, test_ImportedTraceWriter, test_PcapReader, test_TcpReassembler, test_ParallelPcapDecoder, test_PCAPImporter, test_CaptureEngine, test_StraceParser, test_ApiImport, test_DelimitedFileReader, test_IncrementalXMLReader
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -40,7 +40,7 @@ from test_netzob.test_Common import suite_Type, suite_Functions, test_ExecutionC
 def getSuite():
     commonSuite = unittest.TestSuite()
 
-    modulesOfTests = [test_ExecutionContext]
+    modulesOfTests = [test_ExecutionContext, test_MMSTD, test_OutputTraceEvaluator, test_SymbolDispatcher, test_ReadingProgram, test_WritingProgram, test_Memory, test_EventLoop, test_Framing, test_Scheduler, test_LoadGenerator, test_SessionProfiler, test_RelationGraph, test_ImportedTraceWriter, test_PcapReader, test_TcpReassembler, test_ParallelPcapDecoder, test_PCAPImporter, test_CaptureEngine, test_StraceParser, test_ApiImport, test_DelimitedFileReader, test_IncrementalXMLReader]
     modulesOfSuites = [suite_Type, suite_Functions]
 
     # Add individual tests
@@ -37,6 +37,7 @@ import sys
 #+---------------------------------------------------------------------------+
 from test_netzob import suite_Common
 from test_netzob import suite_Alignment
+from test_netzob import suite_Grammar
 #from test_netzob import suite_Import
 from common.xmlrunner import XMLTestRunner
 
@@ -46,7 +47,7 @@ def getSuite():
 
 #    modulesOfTests = [test_NetzobGui]
     modulesOfTests = []
-    modulesOfSuites = [suite_Common, suite_Alignment]
+    modulesOfSuites = [suite_Common, suite_Alignment, suite_Grammar]
 
     try:
         from test_netzob import suite_UI
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import uuid
+import random
+import datetime
+import unittest
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Project import Project
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Models.RawMessage import RawMessage
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.ProjectConfiguration import ProjectConfiguration
+from netzob.Inference.Vocabulary.Alignment.UPGMA import UPGMA
+from netzob.Inference.Vocabulary.Alignment.NeedlemanAndWunsch import NeedlemanAndWunsch
+
+
+class test_UPGMADeduplication(unittest.TestCase):
+
+    def emptyAlignmentCB(self, stage, percent, message):
+        pass
+
+    def generateMessages(self, nbPayloads, nbMessages):
+        """Generates a repetitive trace made of a few payloads"""
+        payloads = []
+        for i in range(nbPayloads):
+            header = self.random.choice(["GET /", "USER ", "\x01\x02\x03"])
+            body = "".join([self.random.choice("abcdefghijklmnopqrstuvwxyz0123456789") for j in range(self.random.randint(4, 30))])
+            payloads.append(TypeConvertor.stringToNetzobRaw(header + body))
+        return [RawMessage(str(uuid.uuid4()), i, self.random.choice(payloads)) for i in range(nbMessages)]
+
+    def cluster(self, project, messages, deduplicate):
+        """@return: the messages and the alignment of each cluster"""
+        symbol = Symbol(str(uuid.uuid4()), "trace", project)
+        symbol.addMessages(messages)
+        clusteringSolution = UPGMA(project, [symbol], 8, self.emptyAlignmentCB, deduplicate=deduplicate)
+        clusteringSolution.processUPGMA()
+
+        alignment = NeedlemanAndWunsch(8, project, False, self.emptyAlignmentCB)
+        clusters = []
+        for symbol in clusteringSolution.symbols:
+            clusterMessages = symbol.getMessages()
+            (clusterAlignment, score) = alignment.alignData([message.getReducedStringData() for message in clusterMessages])
+            clusters.append((sorted([message.getID() for message in clusterMessages]), clusterAlignment))
+        return sorted(clusters)
+
+    def test_payloadHash(self):
+        message1 = RawMessage(str(uuid.uuid4()), 0, TypeConvertor.stringToNetzobRaw("PING"))
+        message2 = RawMessage(str(uuid.uuid4()), 1, TypeConvertor.stringToNetzobRaw("PING"))
+        message3 = RawMessage(str(uuid.uuid4()), 2, TypeConvertor.stringToNetzobRaw("PONG"))
+        self.assertEqual(message1.getPayloadHash(), message2.getPayloadHash())
+        self.assertNotEqual(message1.getPayloadHash(), message3.getPayloadHash())
+
+        message2.setLeftReductionFactor(50)
+        self.assertNotEqual(message1.getPayloadHash(), message2.getPayloadHash())
+
+    def test_sameClusters(self):
+        self.random = random.Random(0)
+        project = Project(str(uuid.uuid4()), "test_UPGMADeduplication", datetime.datetime.now(), None)
+        messages = self.generateMessages(12, 80)
+
+        # The duplicates are either merged beforehand or not depending on the threshold
+        for threshold in [60, 90, 97]:
+            project.getConfiguration().setVocabularyInferenceParameter(ProjectConfiguration.VOCABULARY_EQUIVALENCE_THRESHOLD, threshold)
+            self.assertEqual(self.cluster(project, messages, False), self.cluster(project, messages, True))
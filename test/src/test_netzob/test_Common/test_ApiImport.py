@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import logging
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import time
+
+from netzob.Import.GOTPoisoning.ParasiteGenerator import ParasiteGenerator
+from netzob.Import.GOTPoisoning.ParasiteReceiver import ParasiteReceiver
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_ApiImport(unittest.TestCase):
+
+    # Number of intercepted calls of the test program
+    NB_CALLS = 20000
+
+    # Test program calling the write functions of the parasite as an
+    # hijacked function, or only making the same loop
+    PROGRAM = '''
+#define NETZOB_FUNCTION_ID 1
+void _start(void) {
+    char data[] = "GET /index.html HTTP/1.1";
+    int i;
+    for (i = 0; i < %d; i++) {
+        data[0] = 'A' + (i %% 26);
+        if (%d) {
+            _saveStringWithSize(data, 3 + (i %% 20));
+        }
+        __asm__ __volatile__ ("" : : : "memory");
+    }
+    if (%d) {
+        _saveString("END");
+        _flush();
+    }
+    _syscall(1, 0, 0, 0, 0);
+}
+'''
+
+    def setUp(self):
+        self.log = logging.getLogger('netzob.test_ApiImport.py')
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def buildProgram(self, generator, name, calls):
+        # The parasite is made of i386 code without the libc, as the test
+        # program, whose text is writable as in the injected parasite
+        source = os.path.join(self.folder, name + ".c")
+        f = open(source, "w")
+        f.write(generator.getSourceCodeOfWriteFunction() + test_ApiImport.PROGRAM % (test_ApiImport.NB_CALLS, calls, calls))
+        f.close()
+        program = os.path.join(self.folder, name)
+        try:
+            subprocess.check_call(["gcc", "-m32", "-O2", "-fPIC", "-nostdlib", "-w", "-c", source, "-o", program + ".o"], stderr=open(os.devnull, "w"))
+            subprocess.check_call(["ld", "-m", "elf_i386", "-N", "-static", "-o", program, program + ".o"], stderr=open(os.devnull, "w"))
+        except (OSError, subprocess.CalledProcessError):
+            self.skipTest("i386 programs cannot be built")
+        return program
+
+    def execute(self, program):
+        startTime = time.time()
+        returnCode = subprocess.call([program])
+        self.assertEqual(0, returnCode)
+        return time.time() - startTime
+
+    def test_parse(self):
+        receiver = ParasiteReceiver(os.path.join(self.folder, "netzob.fifo"), None)
+        data = struct.pack("=II", 0, 5) + "hello" + struct.pack("=II", 2, 0) + struct.pack("=II", 1, 3) + "\x00\n\xff"
+        records = []
+        # The records cut between two reads are parsed once complete
+        for i in range(len(data)):
+            records.extend(receiver.parse(data[i]))
+        self.assertEqual([(0, "hello"), (2, ""), (1, "\x00\n\xff")], records)
+        self.assertEqual("", receiver.remainder)
+
+    def test_parasite(self):
+        for flushSize in [ParasiteGenerator.FLUSH_SIZE, ParasiteGenerator.BUFFER_SIZE]:
+            generator = ParasiteGenerator(self.folder, flushSize=flushSize)
+            program = self.buildProgram(generator, "program", 1)
+            loop = self.buildProgram(generator, "loop", 0)
+
+            # Without reader, the records are dropped
+            self.execute(program)
+
+            records = []
+            receiver = ParasiteReceiver(generator.getFifoFile(), records.extend, batchInterval=0.01)
+            self.assertTrue(receiver.createFifo())
+            receiver.start()
+            duration = self.execute(program)
+            start = time.time()
+            while (len(records) == 0 or records[-1][2] != "END") and time.time() - start < 10:
+                time.sleep(0.01)
+            receiver.stop()
+            receiver.join()
+            os.remove(generator.getFifoFile())
+
+            # No record is lost, even by bursts
+            expected = [(1, chr(ord("A") + (i % 26)) + "ET /index.html HTTP/1.1"[:2 + (i % 20)]) for i in range(test_ApiImport.NB_CALLS)] + [(1, "END")]
+            self.assertEqual(expected, [(function, data) for (timestamp, function, data) in records])
+
+            overhead = (duration - self.execute(loop)) / test_ApiImport.NB_CALLS
+            self.log.info("Overhead per intercepted call (flush size {0}): {1:.2f} us".format(flushSize, overhead * 1000000))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import tempfile
+import time
+
+from netzob.Import.Pcap.CaptureEngine import CaptureEngine
+from netzob.Import.Pcap.PcapReader import PcapReader
+from netzob.Import.Pcap.RingBuffer import RingBuffer
+from common.PcapGenerator import PcapGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_CaptureEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = PcapGenerator(0).randomFrames(500)
+        (fd, self.filePath) = tempfile.mkstemp(suffix=".pcap")
+        os.write(fd, PcapGenerator().pcap(self.frames))
+        os.close(fd)
+        self.batches = []
+
+    def tearDown(self):
+        os.unlink(self.filePath)
+
+    def replay(self, decodePacket, **parameters):
+        engine = CaptureEngine(PcapReader(self.filePath), decodePacket, self.batches.append, live=False, **parameters)
+        engine.start()
+        engine.join(10)
+        self.assertFalse(engine.isRunning())
+        return engine.getStatistics()
+
+    def test_ringBuffer(self):
+        ringBuffer = RingBuffer(3)
+        self.assertEqual([], ringBuffer.getBatch())
+        for i in range(5):
+            ringBuffer.put(i)
+        self.assertEqual(2, ringBuffer.getNumberOfDropped())
+        self.assertEqual([0, 1], ringBuffer.getBatch(2))
+        # The items wrap around the end of the slots
+        self.assertTrue(ringBuffer.put(5))
+        self.assertTrue(ringBuffer.put(6))
+        self.assertTrue(ringBuffer.isFull())
+        self.assertEqual([2, 5, 6], ringBuffer.getBatch())
+        self.assertEqual(0, len(ringBuffer))
+
+    def test_replay(self):
+        statistics = self.replay(lambda header, data: (header.getts(), data), batchInterval=0.01)
+        messages = [message for batch in self.batches for message in batch]
+        # The messages keep the order and the microseconds of the packets
+        self.assertEqual([((1000000000, i * 1000), frame) for (i, frame) in enumerate(self.frames)], messages)
+        self.assertEqual((500, 0, 500, 0), (statistics.nbCaptured, statistics.nbDropped, statistics.nbDecoded, statistics.nbUndecodable))
+        self.assertEqual(len(self.batches), statistics.nbBatches)
+
+    def test_count(self):
+        def decodePacket(header, data):
+            if header.getts()[1] % 2000 == 0:
+                return None
+            if header.getts()[1] % 3000 == 0:
+                raise ValueError()
+            return data
+        statistics = self.replay(decodePacket, count=100)
+        self.assertEqual(100, statistics.nbCaptured)
+        self.assertEqual(100, statistics.nbDecoded + statistics.nbUndecodable)
+        self.assertEqual(len([i for i in range(100) if i % 2 != 0 and i % 3 != 0]), statistics.nbDecoded)
+
+    def test_drops(self):
+        def decodePacket(header, data):
+            time.sleep(0.0005)
+            return data
+        statistics = self.replay(decodePacket, bufferSize=8, dropWhenFull=True)
+        self.assertEqual(500, statistics.nbCaptured)
+        self.assertTrue(statistics.nbDropped > 0)
+        self.assertEqual(500, statistics.nbDropped + statistics.nbDecoded)
+        self.assertEqual(statistics.nbDecoded, len([message for batch in self.batches for message in batch]))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import tempfile
+
+from netzob.Import.File.DelimitedFileReader import DelimitedFileReader
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_DelimitedFileReader(unittest.TestCase):
+
+    CONTENT = "\r\nGET / HTTP/1.1\r\nHost: a\r\n\r\n\r\nbody\x00\r\r\n"
+
+    def setUp(self):
+        (fd, self.filePath) = tempfile.mkstemp()
+        os.write(fd, test_DelimitedFileReader.CONTENT)
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.filePath)
+
+    def read(self, delimiter, strategy):
+        # The delimiters straddling two chunks are found whatever the
+        # size of the chunks
+        results = []
+        for chunkSize in [1, 2, 3, 7, 1024]:
+            reader = DelimitedFileReader(self.filePath, delimiter, strategy, chunkSize)
+            results.append(list(reader))
+            self.assertEqual(len(test_DelimitedFileReader.CONTENT), reader.getBytesRead())
+        for result in results[1:]:
+            self.assertEqual(results[0], result)
+        return results[0]
+
+    def test_delete(self):
+        self.assertEqual(["GET / HTTP/1.1", "Host: a", "body\x00\r"], self.read("\r\n", DelimitedFileReader.DELIMITER_DELETE))
+        # Without delimiter, the file is a single message
+        self.assertEqual([test_DelimitedFileReader.CONTENT], self.read("", DelimitedFileReader.DELIMITER_DELETE))
+
+    def test_keep(self):
+        self.assertEqual(["\r\nGET / HTTP/1.1", "\r\nHost: a", "\r\n", "\r\n", "\r\nbody\x00\r", "\r\n"],
+                         self.read("\r\n", DelimitedFileReader.DELIMITER_KEEP_START))
+        self.assertEqual(["\r\n", "GET / HTTP/1.1\r\n", "Host: a\r\n", "\r\n", "\r\n", "body\x00\r\r\n"],
+                         self.read("\r\n", DelimitedFileReader.DELIMITER_KEEP_END))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import socket
+import time
+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkClient import EventLoopNetworkClient
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_EventLoop(unittest.TestCase):
+
+    def setUp(self):
+        self.eventLoop = EventLoop()
+        self.eventLoop.start()
+        self.listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listeningSocket.bind(("127.0.0.1", 0))
+        self.listeningSocket.listen(5)
+        self.port = self.listeningSocket.getsockname()[1]
+        self.accepted = []
+        self.eventLoop.listen(self.listeningSocket, lambda connection, address: self.accepted.append(connection))
+
+    def tearDown(self):
+        self.eventLoop.stop()
+        self.listeningSocket.close()
+
+    def createClient(self):
+        client = EventLoopNetworkClient("client", Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", self.port, self.eventLoop)
+        self.assertTrue(client.open())
+        return client
+
+    def waitForConnections(self, nbConnections):
+        deadline = time.time() + 5
+        while len(self.accepted) < nbConnections and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.accepted), nbConnections)
+
+    def test_exchanges(self):
+        clients = [self.createClient() for i in range(0, 20)]
+        self.waitForConnections(len(clients))
+        self.assertEqual(self.eventLoop.getNumberOfConnections(), 40)
+
+        for (i, client) in enumerate(clients):
+            client.write(TypeConvertor.stringB2bin("hello {0}".format(i)))
+        received = sorted([connection.receive(5) for connection in self.accepted])
+        self.assertEqual(received, sorted(["hello {0}".format(i) for i in range(0, len(clients))]))
+
+        # A large message is buffered by the event loop until the peer reads it.
+        message = "x" * 1000000
+        self.accepted[0].send(message)
+        data = ""
+        while len(data) < len(message):
+            data += TypeConvertor.bin2string(self.findClient(clients, self.accepted[0]).read(5))
+        self.assertEqual(data, message)
+
+    def findClient(self, clients, connection):
+        peer = connection.getSocket().getpeername()
+        for client in clients:
+            if client.getConnection().getSocket().getsockname() == peer:
+                return client
+
+    def test_timeoutAndClose(self):
+        client = self.createClient()
+        self.waitForConnections(1)
+        startTime = time.time()
+        self.assertEqual(len(client.read(0.2)), 0)
+        self.assertTrue(time.time() - startTime >= 0.2)
+
+        # The peer closes the connection: the reader is woken up.
+        self.accepted[0].close()
+        self.assertEqual(client.read(5), None)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import socket
+import time
+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Actors.Framing.DelimiterFraming import DelimiterFraming
+from netzob.Common.MMSTD.Actors.Framing.FixedSizeFraming import FixedSizeFraming
+from netzob.Common.MMSTD.Actors.Framing.LengthPrefixedFraming import LengthPrefixedFraming
+from netzob.Common.MMSTD.Actors.Framing.ReassemblyBuffer import ReassemblyBuffer
+from netzob.Common.MMSTD.Actors.Framing.SymbolFraming import SymbolFraming
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkClient import EventLoopNetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkClient import NetworkClient
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_Framing(unittest.TestCase):
+
+    def setUp(self):
+        self.messages = ["", "a", "hello", "x" * 5000, "\x00\r\n\x01", "end"]
+
+    def createFramings(self):
+        return [LengthPrefixedFraming(), LengthPrefixedFraming(4, False, True), DelimiterFraming("\r\n\r\n"), FixedSizeFraming(5000)]
+
+    def expectedMessages(self, framing):
+        if isinstance(framing, FixedSizeFraming):
+            return [message.ljust(5000, "\x00") for message in self.messages]
+        return self.messages
+
+    def test_reassembly(self):
+        for framing in self.createFramings():
+            data = "".join([framing.frame(message) for message in self.messages])
+            # Coalesced, segmented in chunks of various sizes and byte per byte.
+            for chunkSize in [len(data), 4096, 7, 1]:
+                reassemblyBuffer = ReassemblyBuffer(framing)
+                messages = []
+                for i in range(0, len(data), chunkSize):
+                    reassemblyBuffer.feed(data[i:i + chunkSize])
+                    messages.extend(reassemblyBuffer.popMessages())
+                self.assertEqual(messages, self.expectedMessages(framing), "{0} with chunks of {1} bytes".format(framing.getType(), chunkSize))
+                self.assertFalse(reassemblyBuffer.hasPendingData())
+
+    def test_compaction(self):
+        framing = DelimiterFraming("\r\n")
+        messages = ["x" * 100000] + ["message {0}".format(i) for i in range(0, 10000)]
+        data = "".join([framing.frame(message) for message in messages]) + "partial"
+        reassemblyBuffer = ReassemblyBuffer(framing)
+        received = []
+        for i in range(0, len(data), 1000):
+            reassemblyBuffer.feed(data[i:i + 1000])
+            received.extend(reassemblyBuffer.popMessages())
+            # The consumed data does not accumulate.
+            self.assertTrue(len(reassemblyBuffer.buffer) < 2 * ReassemblyBuffer.COMPACTION_SIZE + 100000)
+        self.assertEqual(received, messages)
+        self.assertEqual(reassemblyBuffer.flush(), "partial")
+
+    def test_symbolFraming(self):
+        generator = AutomataGenerator(0)
+        generator.createSymbol("HELLO")
+        generator.createSymbol("BYE")
+        framing = SymbolFraming(generator.getVocabulary())
+        reassemblyBuffer = ReassemblyBuffer(framing)
+        messages = []
+        for chunk in ["HEL", "LOBYEHE", "LLO", "BY"]:
+            reassemblyBuffer.feed(chunk)
+            messages.extend(reassemblyBuffer.popMessages())
+        self.assertEqual(messages, ["HELLO", "BYE", "HELLO"])
+        self.assertEqual(reassemblyBuffer.flush(), "BY")
+
+    def exchange(self, channelClass, eventLoop=None):
+        """Sends framed messages coalesced then segmented over loopback"""
+        listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listeningSocket.bind(("127.0.0.1", 0))
+        listeningSocket.listen(1)
+        arguments = [str(channelClass), Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", listeningSocket.getsockname()[1]]
+        if eventLoop is not None:
+            arguments.append(eventLoop)
+        client = channelClass(*arguments)
+        framing = LengthPrefixedFraming()
+        client.setFraming(framing)
+        self.assertTrue(client.open())
+        peer = listeningSocket.accept()[0]
+        peer.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Counts the reads of the client.
+        receiveData = client.receiveData
+        nbReceptions = []
+
+        def countedReceiveData(timeout):
+            nbReceptions.append(timeout)
+            return receiveData(timeout)
+        client.receiveData = countedReceiveData
+
+        nbMessages = 1000
+        peer.sendall("".join([framing.frame("message {0}".format(i)) for i in range(0, nbMessages)]))
+        for i in range(0, nbMessages):
+            self.assertEqual(TypeConvertor.bin2string(client.read(5)), "message {0}".format(i))
+        self.assertTrue(len(nbReceptions) < nbMessages / 10)
+
+        data = "".join([framing.frame(message) for message in self.messages])
+        for i in range(0, len(data), 997):
+            peer.sendall(data[i:i + 997])
+            time.sleep(0.001)
+        for message in self.messages:
+            self.assertEqual(TypeConvertor.bin2string(client.read(5)), message)
+
+        # The messages sent are framed.
+        client.write(TypeConvertor.stringB2bin("ping"))
+        received = ""
+        while len(received) < 6:
+            received += peer.recv(6)
+        self.assertEqual(received, framing.frame("ping"))
+
+        # No message is complete before the timeout.
+        peer.sendall(framing.frame("partial")[:4])
+        self.assertEqual(len(client.read(0.1)), 0)
+        peer.close()
+        self.assertEqual(client.read(5), None)
+        client.close()
+        listeningSocket.close()
+
+    def test_networkClient(self):
+        self.exchange(NetworkClient)
+
+    def test_eventLoopNetworkClient(self):
+        eventLoop = EventLoop()
+        eventLoop.start()
+        self.exchange(EventLoopNetworkClient, eventLoop)
+        eventLoop.stop()
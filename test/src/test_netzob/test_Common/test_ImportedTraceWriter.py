@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import shutil
+import tempfile
+import uuid
+
+from netzob.Common.ImportedTraceWriter import ImportedTraceWriter
+from netzob.Common.Models.RawMessage import RawMessage
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+WORKSPACE_NAMESPACE = "http://www.netzob.org/workspace"
+COMMON_NAMESPACE = "http://www.netzob.org/common"
+
+
+class test_ImportedTraceWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.pathOfTraces = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.pathOfTraces)
+
+    def createWriter(self):
+        return ImportedTraceWriter(self.pathOfTraces, "trace", "RAW", "A streamed trace", WORKSPACE_NAMESPACE, COMMON_NAMESPACE)
+
+    def test_writeBatches(self):
+        writer = self.createWriter()
+        messages = [RawMessage(str(uuid.uuid4()), i, "{0:04x}cafe".format(i)) for i in range(250)]
+        for i in range(0, len(messages), 100):
+            writer.addMessages(messages[i:i + 100])
+        importedTrace = writer.close()
+        self.assertEqual(250, writer.getNumberOfMessages())
+        self.assertEqual([], [f for f in os.listdir(self.pathOfTraces) if f.endswith(".part")])
+
+        # The messages are loaded from the trace file at their first access
+        self.assertFalse(importedTrace.traceFile is None)
+        self.assertEqual(sorted([m.getID() for m in messages]), sorted([m.getID() for m in importedTrace.getMessages()]))
+        self.assertTrue(importedTrace.traceFile is None)
+        for message in messages:
+            self.assertEqual(message.getData(), importedTrace.getMessageByID(message.getID()).getData())
+
+        sessions = importedTrace.getSessions()
+        self.assertEqual(1, len(sessions))
+        self.assertEqual("Session 1", sessions[0].getName())
+        self.assertEqual([m.getID() for m in messages], [m.getID() for m in sessions[0].getMessages()])
+
+    def test_sessions(self):
+        writer = self.createWriter()
+        messages = [RawMessage(str(uuid.uuid4()), i, "cafe") for i in range(6)]
+        writer.addMessages(messages[:2])
+        writer.addMessages(messages[2:], False)
+        writer.addSession("flow <1>", [m.getID() for m in messages[2:4]])
+        writer.addSession("flow <2>", [m.getID() for m in messages[4:]])
+        importedTrace = writer.close()
+
+        sessions = dict([(session.getName(), [m.getID() for m in session.getMessages()]) for session in importedTrace.getSessions()])
+        self.assertEqual({"Session 1": [m.getID() for m in messages[:2]],
+                          "flow <1>": [m.getID() for m in messages[2:4]],
+                          "flow <2>": [m.getID() for m in messages[4:]]}, sessions)
+
+    def test_abort(self):
+        writer = self.createWriter()
+        writer.addMessages([RawMessage(str(uuid.uuid4()), 0, "cafe")])
+        writer.abort()
+        self.assertEqual([], os.listdir(self.pathOfTraces))
+        self.assertRaises(ValueError, writer.addMessages, [])
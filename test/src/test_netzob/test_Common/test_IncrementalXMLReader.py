@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import bz2
+import os
+import tempfile
+from lxml import etree
+
+from netzob.Common.Models.RawMessage import RawMessage
+from netzob.Common.Models.Factories.AbstractMessageFactory import AbstractMessageFactory
+from netzob.Common.Workspace import Workspace, WORKSPACE_NAMESPACE, COMMON_NAMESPACE
+from netzob.Import.XML.IncrementalXMLReader import IncrementalXMLReader
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+# The schema of the sources, wherever the tests are run from
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "resources", "static", "netzob", "xsds", "0.1", "common.xsd")
+
+class test_IncrementalXMLReader(unittest.TestCase):
+
+    def setUp(self):
+        self.filePaths = []
+
+    def tearDown(self):
+        for filePath in self.filePaths:
+            os.unlink(filePath)
+
+    def createFile(self, content):
+        (fd, filePath) = tempfile.mkstemp()
+        os.write(fd, content)
+        os.close(fd)
+        self.filePaths.append(filePath)
+        return filePath
+
+    def test_messages(self):
+        root = etree.Element("{" + COMMON_NAMESPACE + "}messages", nsmap={"netzob-common": COMMON_NAMESPACE})
+        messages = [RawMessage(str(i), i, "{0:04x}".format(i)) for i in range(100)]
+        for message in messages:
+            AbstractMessageFactory.save(message, root, WORKSPACE_NAMESPACE, COMMON_NAMESPACE)
+        filePath = self.createFile(etree.tostring(root))
+        schema = Workspace.loadXMLSchema(SCHEMA_PATH)
+        self.assertNotEqual(None, schema)
+
+        reader = IncrementalXMLReader(filePath, "{" + COMMON_NAMESPACE + "}message", schema)
+        parsedMessages = []
+        for xmlMessage in reader:
+            # The previous messages are removed from the tree
+            self.assertEqual(None, xmlMessage.getprevious())
+            parsedMessages.append(AbstractMessageFactory.loadFromXML(xmlMessage, COMMON_NAMESPACE, "0.1"))
+        self.assertEqual([(m.getID(), m.getTimestamp(), m.getStringData()) for m in messages],
+                         [(m.getID(), m.getTimestamp(), m.getStringData()) for m in parsedMessages])
+        self.assertEqual(reader.getSize(), reader.getBytesRead())
+
+        # An invalid message is detected while parsing
+        del root[50].attrib["{http://www.w3.org/2001/XMLSchema-instance}type"]
+        filePath = self.createFile(etree.tostring(root))
+        self.assertRaises(etree.XMLSyntaxError, list, IncrementalXMLReader(filePath, "{" + COMMON_NAMESPACE + "}message", schema))
+
+    def test_compressed(self):
+        # Only the children of the root are given, the document being
+        # decompressed as it is parsed
+        content = "<Log>" + "".join(["<Messages><Data>{0}</Data><Messages/></Messages><Other/>".format(i) for i in range(10000)]) + "</Log>"
+        filePath = self.createFile(bz2.compress(content[:len(content) / 2]) + bz2.compress(content[len(content) / 2:]))
+        reader = IncrementalXMLReader(filePath, "Messages", compressed=True)
+        self.assertEqual([str(i) for i in range(10000)], [xmlMessage.find("Data").text for xmlMessage in reader])
+        self.assertEqual(reader.getSize(), reader.getBytesRead())
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import socket
+import threading
+
+from netzob.Common.MMSTD.Actors.LoadGenerator.LatencyHistogram import LatencyHistogram
+from netzob.Common.MMSTD.Actors.LoadGenerator.LoadGenerator import LoadGenerator
+from netzob.Common.MMSTD.Transitions.impl.OpenChannelTransition import OpenChannelTransition
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from common.AutomataGenerator import AutomataGenerator
+
+
+class test_LoadGenerator(unittest.TestCase):
+
+    def setUp(self):
+        # stand-in which answers PONG to each PING until a NOP
+        self.listeningSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listeningSocket.bind(("127.0.0.1", 0))
+        self.listeningSocket.listen(100)
+        self.port = self.listeningSocket.getsockname()[1]
+        thread = threading.Thread(target=self.serve)
+        thread.daemon = True
+        thread.start()
+
+        generator = AutomataGenerator(0)
+        self.vocabulary = generator.getVocabulary()
+        self.ping = generator.createSymbol("PING")
+        self.pong = generator.createSymbol("PONG")
+        self.generator = generator
+        self.automaton = generator.createAutomaton(3, [(0, self.ping, self.pong, 1), (1, self.ping, self.pong, 2)])
+
+    def tearDown(self):
+        self.listeningSocket.close()
+
+    def serve(self):
+        while True:
+            try:
+                sock = self.listeningSocket.accept()[0]
+            except socket.error:
+                return
+            thread = threading.Thread(target=self.answer, args=(sock,))
+            thread.daemon = True
+            thread.start()
+
+    def answer(self, sock):
+        data = sock.recv(4096)
+        while len(data) > 0:
+            sock.sendall("PONG" * data.count("PING"))
+            data = sock.recv(4096)
+        sock.close()
+
+    def test_sessions(self):
+        for nbWorkers in [1, 2]:
+            loadGenerator = LoadGenerator(self.automaton, self.vocabulary, "127.0.0.1", self.port, "TCP", "127.0.0.1")
+            loadGenerator.setNumberOfWorkers(nbWorkers)
+            loadGenerator.setNumberOfSessions(21)
+            loadGenerator.setConcurrency(10)
+            report = loadGenerator.run()
+            self.assertEqual(report.getNumberOfCompletedSessions(), 21)
+            self.assertEqual(report.getNumberOfFailedSessions(), 0)
+            self.assertEqual(report.getErrors(), dict())
+            self.assertEqual(sorted(report.getTransitionLatencies().keys()), ["Transition 0", "Transition 1"])
+            self.assertEqual(report.getNumberOfTransitions(), 42)
+            self.assertTrue(report.getSessionThroughput() > 0)
+
+    def test_copyModel(self):
+        loadGenerator = LoadGenerator(self.automaton, self.vocabulary, "127.0.0.1", self.port)
+        (automaton, vocabulary) = loadGenerator.copyModel()
+        self.assertEqual([symbol.getID() for symbol in vocabulary.getSymbols()], [symbol.getID() for symbol in self.vocabulary.getSymbols()])
+        for symbol in vocabulary.getSymbols():
+            original = self.vocabulary.getSymbolByID(symbol.getID())
+            self.assertFalse(symbol is original)
+            self.assertFalse(symbol.getRoot() is original.getRoot())
+        self.assertEqual(sorted([transition.getName() for transition in automaton.getTransitions()]), ["Transition 0", "Transition 1"])
+        for transition in automaton.getTransitions():
+            self.assertFalse(transition.getInputSymbol() is self.vocabulary.getSymbolByID(transition.getInputSymbol().getID()))
+            self.assertTrue(transition.getInputSymbol() is vocabulary.getSymbolByID(transition.getInputSymbol().getID()))
+
+    def test_openChannelTransition(self):
+        # the channel is opened by the session before the automaton is executed
+        automaton = self.generator.createAutomaton(4, [(1, self.ping, self.pong, 2), (2, self.ping, self.pong, 3)])
+        initialState = automaton.getInitialState()
+        connectedState = [state for state in automaton.getStates() if state.getID() == "1"][0]
+        transition = OpenChannelTransition("open", "Open", initialState, connectedState, 0, 1)
+        initialState.registerTransition(transition)
+        automaton.addTransition(transition)
+        loadGenerator = LoadGenerator(automaton, self.vocabulary, "127.0.0.1", self.port, "TCP", "127.0.0.1")
+        loadGenerator.setNumberOfSessions(5)
+        report = loadGenerator.run()
+        self.assertEqual(report.getNumberOfCompletedSessions(), 5)
+        self.assertEqual(report.getErrors(), dict())
+        self.assertEqual(sorted(report.getTransitionLatencies().keys()), ["Transition 0", "Transition 1"])
+
+    def test_unreachableTarget(self):
+        # a bound socket which does not listen refuses the connections
+        closedSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closedSocket.bind(("127.0.0.1", 0))
+        loadGenerator = LoadGenerator(self.automaton, self.vocabulary, "127.0.0.1", closedSocket.getsockname()[1], "TCP", "127.0.0.1")
+        loadGenerator.setNumberOfSessions(3)
+        report = loadGenerator.run()
+        closedSocket.close()
+        self.assertEqual(report.getNumberOfFailedSessions(), 3)
+        self.assertEqual(report.getErrors(), {"connection": 3})
+
+    def test_rampUp(self):
+        loadGenerator = LoadGenerator(self.automaton, self.vocabulary, "127.0.0.1", self.port)
+        loadGenerator.setRampUp(2)
+        # 10 sessions per second once the ramp-up is over: 10 sessions are started during the ramp-up
+        startTimes = [loadGenerator.computeSessionStartTime(i, 10.0) for i in range(0, 20)]
+        self.assertEqual(startTimes[0], 0)
+        self.assertAlmostEqual(startTimes[10], 2)
+        self.assertAlmostEqual(startTimes[19], 2.9)
+        self.assertTrue(startTimes[1] - startTimes[0] > startTimes[9] - startTimes[8])
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000.0)
+        merged = LatencyHistogram.fromDict(histogram.toDict())
+        merged.merge(histogram)
+        self.assertEqual(merged.getCount(), 2000)
+        self.assertEqual(merged.getMaximum(), 1.0)
+        self.assertAlmostEqual(merged.getMean(), 0.5005)
+        for percentile in [50, 90, 99]:
+            self.assertTrue(abs(merged.getPercentile(percentile) - percentile / 100.0) < percentile / 100.0 * 0.1)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+
+from netzob.Common.MMSTD.States.impl.NormalState import NormalState
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_MMSTD(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = AutomataGenerator(0)
+        self.a = self.generator.createSymbol("A")
+        self.b = self.generator.createSymbol("B")
+        self.x = self.generator.createSymbol("X")
+        self.automaton = self.generator.createAutomaton(3, [(0, self.a, self.x, 1),
+                                                            (0, self.b, self.x, 2),
+                                                            (1, self.a, self.x, 2),
+                                                            (2, self.a, self.x, 0)])
+
+    def getTransitionIDs(self, transitions):
+        return sorted([transition.getID() for transition in transitions])
+
+    def test_indexes(self):
+        state0 = self.automaton.getStateByID("0")
+        state2 = self.automaton.getStateByID("2")
+
+        self.assertEqual(state0.getName(), "State 0")
+        self.assertEqual(self.automaton.getStateByID("3"), None)
+        self.assertEqual(self.getTransitionIDs(self.automaton.getTransitionsStartingFromState(state0)), ["0", "1"])
+        self.assertEqual(self.getTransitionIDs(self.automaton.getTransitionsLeadingToState(state2)), ["1", "2"])
+
+    def test_removeTransition(self):
+        state0 = self.automaton.getStateByID("0")
+        state2 = self.automaton.getStateByID("2")
+        transition = self.automaton.getTransitionsStartingFromState(state0)[1]
+
+        self.automaton.removeTransition(transition)
+
+        self.assertEqual(self.getTransitionIDs(state0.getTransitions()), ["0"])
+        self.assertEqual(self.getTransitionIDs(self.automaton.getTransitionsStartingFromState(state0)), ["0"])
+        self.assertEqual(self.getTransitionIDs(self.automaton.getTransitionsLeadingToState(state2)), ["2"])
+        self.assertEqual(len(self.automaton.getTransitions()), 3)
+
+    def test_removeState(self):
+        state0 = self.automaton.getStateByID("0")
+        state1 = self.automaton.getStateByID("1")
+
+        self.automaton.removeState(state1)
+
+        self.assertEqual(self.automaton.getStateByID("1"), None)
+        self.assertEqual(self.getTransitionIDs(self.automaton.getTransitions()), ["1", "3"])
+        self.assertEqual(self.getTransitionIDs(self.automaton.getTransitionsStartingFromState(state0)), ["1"])
+        self.assertEqual([state.getID() for state in self.automaton.getAllStates()], ["0", "2"])
+
+    def test_getAllStates(self):
+        # An isolated state is not reachable from the initial state
+        self.automaton.addState(NormalState("3", "State 3"))
+
+        self.assertEqual(len(self.automaton.getStates()), 4)
+        self.assertEqual(sorted([state.getID() for state in self.automaton.getAllStates()]), ["0", "1", "2"])
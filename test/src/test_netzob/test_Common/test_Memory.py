@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.AlternateVariable import AlternateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken import VariableReadingToken
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_Memory(unittest.TestCase):
+
+    def createWord(self, name, value):
+        return DataVariable(name, name, True, True, WordType(True, 1, 10), TypeConvertor.stringB2bin(value))
+
+    def setValue(self, variable, value):
+        variable.setCurrentValue(TypeConvertor.stringB2bin(value))
+
+    def recall(self, memory, variable):
+        value = memory.recall(variable)
+        if value is None:
+            return None
+        return TypeConvertor.bin2string(value)
+
+    def test_transactions(self):
+        memory = Memory()
+        a = self.createWord("a", "A")
+        b = self.createWord("b", "B")
+        memory.createMemory()
+        memory.memorize(a)
+        memory.persistMemory()
+
+        memory.createMemory()
+        memory.memorize(b)
+        memory.forget(a)
+        self.assertFalse(memory.hasMemorized(a))
+        self.assertEqual(self.recall(memory, b), "B")
+        # Without persistence, the temporary memory is discarded.
+        memory.createMemory()
+        self.assertEqual(self.recall(memory, a), "A")
+        self.assertFalse(memory.hasMemorized(b))
+
+        memory.memorize(b)
+        memory.forget(a)
+        memory.persistMemory()
+        self.assertEqual(memory.recallMemory(), {"b": TypeConvertor.stringB2bin("B")})
+
+        # The restore copies back the persisted value.
+        self.setValue(b, "C")
+        memory.memorize(b)
+        memory.restore(b)
+        self.assertEqual(self.recall(memory, b), "B")
+
+        memory.cleanMemory()
+        self.assertEqual(memory.recallMemory(), {})
+        memory.createMemory()
+        self.assertEqual(self.recall(memory, b), "B")
+
+    def test_duplicate(self):
+        memory = Memory()
+        a = self.createWord("a", "A")
+        memory.memorize(a)
+        memory.persistMemory()
+
+        duplicatedMemory = memory.duplicate()
+        self.assertEqual(self.recall(duplicatedMemory, a), "A")
+        # Modifications of the duplicated memory do not affect the original and vice versa.
+        self.setValue(a, "D")
+        duplicatedMemory.memorize(a)
+        duplicatedMemory.persistMemory()
+        self.assertEqual(self.recall(memory, a), "A")
+        memory.createMemory()
+        self.assertEqual(self.recall(memory, a), "A")
+        self.setValue(a, "O")
+        memory.memorize(a)
+        memory.persistMemory()
+        self.assertEqual(self.recall(duplicatedMemory, a), "D")
+        self.assertEqual(self.recall(memory, a), "O")
+
+    def test_checkpoints(self):
+        memory = Memory()
+        a = self.createWord("a", "A")
+        b = self.createWord("b", "B")
+        memory.memorize(a)
+        memory.persistMemory()
+
+        outer = memory.checkpoint()
+        memory.memorize(b)
+        inner = memory.checkpoint()
+        self.setValue(b, "C")
+        memory.memorize(b)
+        memory.forget(a)
+        self.assertTrue(memory.rollback(inner))
+        self.assertEqual(self.recall(memory, a), "A")
+        self.assertEqual(self.recall(memory, b), "B")
+
+        memory.forget(a)
+        self.assertTrue(memory.rollback(outer))
+        self.assertEqual(memory.recallMemory(), {"a": TypeConvertor.stringB2bin("A")})
+
+        # Released modifications are kept, persistence closes the checkpoints.
+        checkpoint = memory.checkpoint()
+        memory.memorize(b)
+        memory.release(checkpoint)
+        self.assertEqual(self.recall(memory, b), "C")
+        checkpoint = memory.checkpoint()
+        memory.persistMemory()
+        self.assertFalse(memory.rollback(checkpoint))
+        self.assertEqual(memory.journal, [])
+
+    def test_backtracking(self):
+        memory = Memory()
+        learned = DataVariable("learned", "learned", True, True, WordType(True, 1, 1), None)
+        constant = DataVariable("constant", "constant", False, False, WordType(True, 1, 1), TypeConvertor.stringB2bin("A"))
+        branch = AggregateVariable("branch", "branch", False, False, [learned, constant])
+        other = DataVariable("other", "other", False, False, WordType(True, 2, 2), TypeConvertor.stringB2bin("QB"))
+        alternate = AlternateVariable("alternate", "alternate", False, False, [branch, other])
+
+        # The value learned by the failed branch is rolled back.
+        readingToken = VariableReadingToken(False, None, memory, TypeConvertor.stringB2bin("QB"), 0)
+        alternate.read(readingToken)
+        self.assertTrue(readingToken.isOk())
+        self.assertFalse(memory.hasMemorized(learned))
+        self.assertEqual(memory.journal, [])
+
+        readingToken = VariableReadingToken(False, None, memory, TypeConvertor.stringB2bin("QA"), 0)
+        alternate.read(readingToken)
+        self.assertTrue(readingToken.isOk())
+        self.assertEqual(self.recall(memory, learned), "Q")
+        self.assertEqual(memory.journal, [])
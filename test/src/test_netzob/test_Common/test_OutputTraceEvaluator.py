@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import random
+
+from netzob.Common.MMSTD.OutputTraceEvaluator import OutputTraceEvaluator
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_OutputTraceEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = AutomataGenerator(0)
+        self.random = random.Random(0)
+
+    def assertSameTraces(self, automaton, tests):
+        evaluator = OutputTraceEvaluator(automaton)
+        for test in tests:
+            (expectedTrace, expectedState) = automaton.getOutputTrace(automaton.getInitialState(), test)
+            (trace, state) = evaluator.getOutputTrace(automaton.getInitialState(), test)
+            self.assertEqual([s.getID() for s in trace], [s.getID() for s in expectedTrace])
+            self.assertEqual(state, expectedState)
+        return evaluator
+
+    def test_generatedAutomata(self):
+        inputSymbols = self.generator.createSymbols("IN", 3)
+        outputSymbols = self.generator.createSymbols("OUT", 3)
+        for nbStates in [1, 5, 20]:
+            automaton = self.generator.generateAutomaton(nbStates, inputSymbols, outputSymbols)
+            tests = []
+            for i in range(0, 20):
+                tests.append([self.random.choice(inputSymbols) for j in range(0, self.random.randint(1, 8))])
+            evaluator = self.assertSameTraces(automaton, tests)
+            self.assertTrue(evaluator.isCompiled())
+            self.assertTrue(evaluator.getNbNodes() <= sum([len(test) for test in tests]))
+
+    def test_partialAutomaton(self):
+        # B is not accepted in state 0 and state 2 has no transition
+        a = self.generator.createSymbol("A")
+        b = self.generator.createSymbol("B")
+        x = self.generator.createSymbol("X")
+        automaton = self.generator.createAutomaton(3, [(0, a, x, 1),
+                                                       (1, a, x, 0),
+                                                       (1, b, x, 2)])
+        self.assertSameTraces(automaton, [[b, a, b], [a, b, a, a], [b, b], [a, a, b]])
+
+    def test_sharedPrefixes(self):
+        a = self.generator.createSymbol("A")
+        x = self.generator.createSymbol("X")
+        automaton = self.generator.createAutomaton(1, [(0, a, x, 0)])
+        evaluator = self.assertSameTraces(automaton, [[a, a, a], [a, a], [a, a, a, a]])
+        self.assertEqual(evaluator.getNbNodes(), 4)
+
+    def test_stochasticAutomaton(self):
+        a = self.generator.createSymbol("A")
+        x = self.generator.createSymbol("X")
+        y = self.generator.createSymbol("Y")
+        automaton = self.generator.createAutomaton(1, [(0, a, x, 0)])
+        automaton.getTransitions()[0].addOutputSymbol(y, 50, 0)
+        evaluator = OutputTraceEvaluator(automaton)
+
+        self.assertFalse(evaluator.isCompiled())
+        (trace, state) = evaluator.getOutputTrace(automaton.getInitialState(), [a, a])
+        self.assertEqual(len(trace), 2)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+
+from netzob.Common.Workspace import Workspace
+from common.PcapGenerator import PcapGenerator
+
+# The plugin is imported from its sources when it is not installed
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "src", "netzob_plugins", "Importers", "PCAPImporter")
+if not PLUGIN_PATH in sys.path:
+    sys.path.append(PLUGIN_PATH)
+try:
+    from PCAPImporter.PCAPImporter import PCAPImporter
+except ImportError:
+    # pcapy, impacket or the GTK bindings are not installed
+    PCAPImporter = None
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+def messageFields(message):
+    """Returns the fields of a message compared between two imports:
+    its identifier is left aside and its timestamp is compared as it is
+    saved in a trace"""
+    getters = ["getData", "getL2Protocol", "getL2SourceAddress", "getL2DestinationAddress",
+               "getL3Protocol", "getL3SourceAddress", "getL3DestinationAddress",
+               "getL4Protocol", "getL4SourcePort", "getL4DestinationPort"]
+    return tuple([str(message.getTimestamp())] + [str(getattr(message, getter)()) for getter in getters if hasattr(message, getter)])
+
+
+@unittest.skipIf(PCAPImporter is None, "the PCAPImporter plugin cannot be imported (pcapy, impacket or gi is missing)")
+class test_PCAPImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.path, "traces"))
+        self.workspace = Workspace("test", datetime.datetime.now(), self.path, "traces", "logging/logging.conf", "prototypes", None, {})
+        self.workspace.saveConfigFile()
+        self.generator = PcapGenerator(0)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def createFrames(self, nbFrames, nbARP=0, datalink=PcapGenerator.DLT_EN10MB):
+        """Returns nbFrames frames of TCP and UDP segments over IPv4,
+        Ethernet ones with or without VLAN tag or Linux SLL ones,
+        between which nbARP ARP frames are inserted"""
+        macs = ["\x00\x11\x22\x33\x44\x55", "\x0a\x0b\x0c\x0d\x0e\x0f"]
+        frames = []
+        for i in range(nbFrames):
+            payload = self.generator.randomPayload()
+            if i % 2 == 0:
+                packet = self.generator.ipv4("10.0.0.{0}".format(1 + i % 3), "10.0.1.1", 17, self.generator.udp(5000 + i % 7, 53, payload))
+            else:
+                packet = self.generator.ipv4("10.0.0.{0}".format(1 + i % 3), "10.0.1.1", 6, self.generator.tcp(6000 + i % 5, 80, payload, seq=i))
+            if datalink == PcapGenerator.DLT_LINUX_SLL:
+                frames.append(self.generator.linuxSLL(macs[i % 2], 0x0800, packet, 4 * (i % 2)))
+            else:
+                vlan = 42 if i % 5 == 0 else None
+                frames.append(self.generator.ethernet(macs[i % 2], macs[(i + 1) % 2], 0x0800, packet, vlan))
+        for i in range(nbARP):
+            frames.insert(len(frames) - 1 - 2 * i, self.generator.ethernet(macs[0], "\xff" * 6, 0x0806, "\x00\x01\x08\x00\x06\x04\x00\x01" + "\x00" * 20))
+        return frames
+
+    def writeCapture(self, frames, datalink=PcapGenerator.DLT_EN10MB):
+        (fd, filePath) = tempfile.mkstemp(suffix=".pcap", dir=self.path)
+        os.write(fd, self.generator.pcap(frames, datalink))
+        os.close(fd)
+        return filePath
+
+    def createImporter(self, filePath, reader):
+        importer = PCAPImporter(None)
+        importer.setReader(reader)
+        importer.setSourceFiles([filePath])
+        return importer
+
+    def test_importMessagesInTrace(self):
+        filePath = self.writeCapture(self.createFrames(PCAPImporter.PREVIEW_SIZE + 300))
+        for reader in [PCAPImporter.READER_PCAPY, PCAPImporter.READER_BUILTIN]:
+            importer = self.createImporter(filePath, reader)
+            importer.readMessages()
+            expected = [messageFields(message) for message in importer.messages]
+            self.assertEqual(PCAPImporter.PREVIEW_SIZE + 300, len(expected))
+
+            statuses = []
+            importer.status_cb = lambda status, message: statuses.append(status)
+            importedTrace = importer.importMessagesInTrace(self.workspace, "trace {0}".format(reader), batchSize=128)
+            self.assertFalse(importedTrace is None)
+            self.assertTrue(importedTrace in self.workspace.getImportedTraces())
+
+            # The trace holds the messages read at once, in one session
+            self.assertEqual(sorted(expected), sorted([messageFields(message) for message in importedTrace.getMessages()]))
+            sessions = importedTrace.getSessions()
+            self.assertEqual(1, len(sessions))
+            self.assertEqual(expected, [messageFields(message) for message in sessions[0].getMessages()])
+
+            # The progress is computed on the bytes read
+            self.assertTrue(len(statuses) > 10)
+            self.assertEqual(sorted(statuses), statuses)
+            self.assertEqual(100.0, statuses[-1])
+
+            # Only the first messages are kept to be previewed
+            self.assertEqual(PCAPImporter.PREVIEW_SIZE, len(importer.messages))
+            self.assertEqual(expected[:PCAPImporter.PREVIEW_SIZE], [messageFields(message) for message in importer.messages])
+            self.assertEqual(PCAPImporter.PREVIEW_SIZE, len(importer.payloadDict))
+            self.assertEqual(0, importer.getNumberOfSkippedPackets())
+
+    def test_skippedPackets(self):
+        nbARP = 25
+        filePath = self.writeCapture(self.createFrames(200, nbARP))
+        for reader in [PCAPImporter.READER_PCAPY, PCAPImporter.READER_BUILTIN]:
+            importer = self.createImporter(filePath, reader)
+            importedTrace = importer.importMessagesInTrace(self.workspace, "trace {0}".format(reader))
+            self.assertEqual(nbARP, importer.getNumberOfSkippedPackets())
+            self.assertEqual(200, len(importedTrace.getMessages()))
+
+    def test_cancel(self):
+        filePath = self.writeCapture(self.createFrames(2000))
+        for reader in [PCAPImporter.READER_PCAPY, PCAPImporter.READER_BUILTIN]:
+            importer = self.createImporter(filePath, reader)
+            statuses = []
+
+            def status_cb(status, message):
+                statuses.append(status)
+                if status >= 50:
+                    importer.cancel()
+            importer.status_cb = status_cb
+            self.assertEqual(None, importer.importMessagesInTrace(self.workspace, "cancelled", batchSize=100))
+
+            # The reading stopped in the middle of the file and the
+            # partial trace is removed
+            self.assertTrue(statuses[-1] < 60)
+            self.assertEqual([], os.listdir(self.workspace.getPathOfTraces()))
+            self.assertEqual([], self.workspace.getImportedTraces())
+
+    def test_builtinDecoder(self):
+        # The built-in decoder gives the fields given by impacket, with
+        # and without VLAN tags and on Linux SLL captures
+        for datalink in [PcapGenerator.DLT_EN10MB, PcapGenerator.DLT_LINUX_SLL]:
+            filePath = self.writeCapture(self.createFrames(300, datalink=datalink), datalink)
+            for importLayer in [1, 2, 3, 4]:
+                messages = []
+                for reader in [PCAPImporter.READER_PCAPY, PCAPImporter.READER_BUILTIN]:
+                    importer = self.createImporter(filePath, reader)
+                    importer.setImportLayer(importLayer)
+                    importer.readMessages()
+                    messages.append(importer.messages)
+                self.assertEqual(300, len(messages[0]))
+                self.assertEqual([message.__class__ for message in messages[0]], [message.__class__ for message in messages[1]])
+                self.assertEqual([messageFields(message) for message in messages[0]], [messageFields(message) for message in messages[1]],
+                                 "datalink {0}, layer {1}".format(datalink, importLayer))
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import tempfile
+import uuid
+
+from netzob.Common.Models.L4NetworkMessage import L4NetworkMessage
+from netzob.Import.Pcap.PcapReader import PcapReader
+from netzob.Import.Pcap.PacketDecoder import PacketDecoder
+from netzob.Import.Pcap.ParallelPcapDecoder import ParallelPcapDecoder
+from common.PcapGenerator import PcapGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+def decodeTask(task, namespace):
+    """Decodes the packets of a task in L4NetworkMessages, as the
+    PCAPImporter does"""
+    decoder = PacketDecoder()
+    reader = PcapReader(task.filePath)
+    if task.firstOffset is not None:
+        reader.setOffset(task.firstOffset)
+    results = []
+    index = task.firstPacket
+    while task.lastPacket is None or index < task.lastPacket:
+        (header, data) = reader.next()
+        if header is None:
+            break
+        (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = decoder.decodeLayer2(reader.datalink(), data)
+        (l3Proto, l3SrcAddr, l3DstAddr, l3Payload, ipProtocolNum) = decoder.decodeLayer3(etherType, l2Payload)
+        (l4Proto, l4SrcPort, l4DstPort, l4Payload) = decoder.decodeLayer4(ipProtocolNum, l3Payload)
+        (secs, usecs) = header.getts()
+        message = L4NetworkMessage(ParallelPcapDecoder.createMessageID(namespace, task, index), secs + usecs / 1000000.0, l4Payload.encode("hex"),
+                                   l2Proto, l2SrcAddr, l2DstAddr, l3Proto, l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort, l4DstPort)
+        results.append(((message.getTimestamp(), task.fileIndex, index), message, data))
+        index += 1
+    reader.close()
+    return results
+
+
+def failingTask(task, namespace):
+    if task.fileIndex == 1:
+        raise ValueError("file {0}".format(task.fileIndex))
+    return []
+
+
+class test_ParallelPcapDecoder(unittest.TestCase):
+
+    def setUp(self):
+        generator = PcapGenerator(0)
+        self.files = []
+        # The captures overlap in time
+        for (i, startTime) in enumerate([1000, 1000, 1001]):
+            content = generator.pcapng(generator.randomFrames(40), startTime=startTime) if i == 1 else generator.pcap(generator.randomFrames(40), startTime=startTime)
+            (fd, filePath) = tempfile.mkstemp(suffix=".pcap")
+            os.write(fd, content)
+            os.close(fd)
+            self.files.append(filePath)
+
+    def tearDown(self):
+        for filePath in self.files:
+            os.unlink(filePath)
+
+    def decode(self, nbWorkers, chunkSize, namespace):
+        decoder = ParallelPcapDecoder(decodeTask, nbWorkers, chunkSize)
+        tasks = decoder.splitFiles(self.files)
+        return (tasks, decoder.decode(tasks, namespace=namespace))
+
+    def test_decode(self):
+        # The identifiers of the messages depend only on the namespace
+        namespace = uuid.uuid4()
+        (tasks, sequential) = self.decode(1, 1000, namespace)
+        self.assertEqual(3, len(tasks))
+        (tasks, parallel) = self.decode(3, 7, namespace)
+        self.assertEqual(3 * 6, len(tasks))
+
+        self.assertEqual(120, len(parallel))
+        self.assertEqual([(m.getID(), m.getTimestamp(), m.getData()) for (m, payload) in sequential],
+                         [(m.getID(), m.getTimestamp(), m.getData()) for (m, payload) in parallel])
+        timestamps = [m.getTimestamp() for (m, payload) in parallel]
+        self.assertEqual(sorted(timestamps), timestamps)
+        self.assertEqual(120, len(set([m.getID() for (m, payload) in parallel])))
+
+    def test_error(self):
+        decoder = ParallelPcapDecoder(failingTask, 2)
+        self.assertRaises(ValueError, decoder.decode, decoder.splitFiles(self.files))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import tempfile
+
+from netzob.Import.Pcap.PcapReader import PcapReader, PcapReaderException
+from netzob.Import.Pcap.PacketDecoder import PacketDecoder
+from common.PcapGenerator import PcapGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_PcapReader(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = PcapGenerator(0)
+        self.frames = self.generator.randomFrames(50)
+        self.files = []
+
+    def tearDown(self):
+        for filePath in self.files:
+            os.unlink(filePath)
+
+    def createFile(self, content):
+        (fd, filePath) = tempfile.mkstemp(suffix=".pcap")
+        os.write(fd, content)
+        os.close(fd)
+        self.files.append(filePath)
+        return filePath
+
+    def readAll(self, reader):
+        packets = []
+        while True:
+            (header, data) = reader.next()
+            if header is None:
+                break
+            packets.append((header.getts(), header.getcaplen(), data))
+        return packets
+
+    def expectedPackets(self):
+        return [((1000000000 + i / 1000, (i % 1000) * 1000), len(frame), frame) for (i, frame) in enumerate(self.frames)]
+
+    def test_readPcap(self):
+        for (endianness, nanosecond) in [("<", False), (">", False), ("<", True)]:
+            reader = PcapReader(self.createFile(self.generator.pcap(self.frames, endianness=endianness, nanosecond=nanosecond)))
+            self.assertEqual(PacketDecoder.DLT_EN10MB, reader.datalink())
+            self.assertEqual(self.expectedPackets(), self.readAll(reader))
+            self.assertEqual(reader.getSize(), reader.getBytesRead())
+            reader.close()
+
+    def test_readPcapng(self):
+        for tsresol in [None, 9]:
+            reader = PcapReader(self.createFile(self.generator.pcapng(self.frames, tsresol=tsresol)))
+            self.assertEqual(PacketDecoder.DLT_EN10MB, reader.datalink())
+            self.assertEqual(self.expectedPackets(), self.readAll(reader))
+            reader.close()
+
+    def test_randomAccess(self):
+        for content in [self.generator.pcap(self.frames), self.generator.pcapng(self.frames)]:
+            reader = PcapReader(self.createFile(content))
+            # The index doesn't move the sequential reading
+            reader.next()
+            self.assertEqual(len(self.frames), len(reader))
+            for i in reversed(range(len(self.frames))):
+                self.assertEqual(self.frames[i], reader.getPacket(i)[1])
+            self.assertEqual(self.frames[1], reader.next()[1])
+            self.assertEqual(len(self.frames) - 2, reader.loop(0, lambda header, data: None))
+            reader.close()
+
+    def test_invalidFile(self):
+        self.assertRaises(PcapReaderException, PcapReader, self.createFile("not a pcap file at all, really"))
+
+    def test_decode(self):
+        decoder = PacketDecoder()
+        generator = self.generator
+        payload = "netzob"
+        frames = [generator.ethernet("\x00\x11\x22\x33\x44\x55", "\x0a\x0b\x0c\x0d\x0e\x0f", 0x0800, generator.ipv4("10.0.0.1", "10.0.1.1", 17, generator.udp(5000, 53, payload))),
+                  generator.ethernet("\x00\x11\x22\x33\x44\x55", "\x0a\x0b\x0c\x0d\x0e\x0f", 0x0800, generator.ipv4("10.0.0.1", "10.0.1.1", 6, generator.tcp(6000, 80, payload, options="\x01" * 4)), vlan=42),
+                  generator.ethernet("\x00\x11\x22\x33\x44\x55", "\x0a\x0b\x0c\x0d\x0e\x0f", 0x86dd, generator.ipv6("2001:db8::1", "2001:db8::2", 17, generator.udp(5000, 53, payload)))]
+        expected = [("IP", "10.0.0.1", "10.0.1.1", "UDP", 5000, 53),
+                    ("IP", "10.0.0.1", "10.0.1.1", "TCP", 6000, 80),
+                    ("IPv6", "2001:db8::1", "2001:db8::2", "UDP", 5000, 53)]
+        for (frame, (l3Proto, l3Src, l3Dst, l4Proto, l4Src, l4Dst)) in zip(frames, expected):
+            (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = decoder.decodeLayer2(PacketDecoder.DLT_EN10MB, frame)
+            self.assertEqual(("Ethernet", "00:11:22:33:44:55", "0a:0b:0c:0d:0e:0f"), (l2Proto, l2SrcAddr, l2DstAddr))
+            (l3Proto_, l3SrcAddr, l3DstAddr, l3Payload, ipProtocolNum) = decoder.decodeLayer3(etherType, l2Payload)
+            self.assertEqual((l3Proto, l3Src, l3Dst), (l3Proto_, l3SrcAddr, l3DstAddr))
+            self.assertEqual((l4Proto, l4Src, l4Dst, payload), decoder.decodeLayer4(ipProtocolNum, l3Payload))
+
+        # The source address of a Linux SLL frame has the length of its field
+        frame = generator.linuxSLL("\x00\x11\x22\x33\x44\x55", 0x0800, generator.ipv4("10.0.0.1", "10.0.1.1", 17, generator.udp(5000, 53, payload)))
+        (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = decoder.decodeLayer2(PacketDecoder.DLT_LINUX_SLL, frame)
+        self.assertEqual(("Linux SLL", [0x00, 0x11, 0x22, 0x33, 0x44, 0x55], None, 0x0800), (l2Proto, l2SrcAddr.tolist(), l2DstAddr, etherType))
+        self.assertEqual(("IP", "10.0.0.1", "10.0.1.1"), decoder.decodeLayer3(etherType, l2Payload)[:3])
+
+        # Unsupported layers
+        self.assertEqual(None, decoder.decodeLayer2(105, frames[0]))
+        self.assertEqual(None, decoder.decodeLayer3(0x0806, ""))
+        self.assertEqual(None, decoder.decodeLayer4(1, ""))
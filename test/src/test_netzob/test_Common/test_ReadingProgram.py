@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import uuid
+
+from netzob.Common.Field import Field
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.ReadingProgram import ReadingProgram
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.AlternateVariable import AlternateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken import VariableReadingToken
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_ReadingProgram(unittest.TestCase):
+
+    def createWord(self, name, value, mutable=False, learnable=False, minChars=None, maxChars=None):
+        if minChars is None:
+            minChars = len(value)
+        if maxChars is None:
+            maxChars = len(value)
+        return DataVariable(name, name, mutable, learnable, WordType(True, minChars, maxChars), TypeConvertor.stringB2bin(value))
+
+    def createVocabulary(self):
+        """Creates a vocabulary whose variables have the same IDs at each call"""
+        generator = AutomataGenerator(0)
+        definitions = [("constant", [self.createWord("c0", "HELLO")]),
+                       ("format", [self.createWord("f0", "GET "), self.createWord("f1", "abcd", mutable=True)]),
+                       ("learnable", [self.createWord("l0", "SET "), self.createWord("l1", "x", mutable=True, learnable=True, minChars=1, maxChars=6), self.createWord("l2", "!")]),
+                       ("alternate", [AlternateVariable("a0", "a0", False, False, [self.createWord("a1", "YES"), self.createWord("a2", "NO")]), self.createWord("a3", ".")])]
+        for (name, variables) in definitions:
+            symbol = Symbol(name, name, generator.getProject())
+            for variable in variables:
+                field = Field.createDefaultField(symbol)
+                field.setVariable(variable)
+                symbol.getField().addField(field)
+            generator.getVocabulary().addSymbol(symbol)
+        return generator.getVocabulary()
+
+    def treeRead(self, symbol, readingToken):
+        """The read access of a symbol before its compilation"""
+        root = AggregateVariable(symbol.getID(), symbol.getName(), False, False, None)
+        for field in symbol.getExtendedFields():
+            root.addChild(field.getVariable())
+        root.read(readingToken)
+        return root.getCurrentValue()
+
+    def programRead(self, symbol, readingToken):
+        program = symbol.getReadingProgram()
+        program.read(readingToken)
+        return program.getRoot().getCurrentValue()
+
+    def readAll(self, read, messages):
+        vocabulary = self.createVocabulary()
+        memory = Memory()
+        accesses = []
+        memory.setMemoryAccess_cb(lambda access, variable, value: accesses.append((access, variable.getID(), value)))
+        results = []
+        for message in messages:
+            for symbol in vocabulary.getSymbols():
+                memory.createMemory()
+                readingToken = VariableReadingToken(False, vocabulary, memory, TypeConvertor.stringB2bin(message), 0)
+                value = read(symbol, readingToken)
+                if readingToken.isOk():
+                    memory.persistMemory()
+                variables = sorted([(variable.getID(), variable.getCurrentValue()) for variable in vocabulary.getVariables()])
+                results.append((symbol.getName(), message, readingToken.isOk(), readingToken.getIndex(), value, variables, sorted(memory.recallMemory().items())))
+        return (results, accesses)
+
+    def test_sameReadingResults(self):
+        messages = ["HELLO", "HELL", "GET abcd", "GET ", "GET abcdef", "SET abc!", "SET abcdefgh!", "SET !", "YES.", "NO.", "MAYBE.", ""]
+        (expectedResults, expectedAccesses) = self.readAll(self.treeRead, messages)
+        (results, accesses) = self.readAll(self.programRead, messages)
+        self.assertEqual(len(results), len(expectedResults))
+        for (result, expectedResult) in zip(results, expectedResults):
+            self.assertEqual(result, expectedResult)
+        self.assertEqual(accesses, expectedAccesses)
+
+    def test_compiledInstructions(self):
+        vocabulary = self.createVocabulary()
+        instructions = [[instruction for (instruction, variable) in symbol.getReadingProgram().getInstructions()] for symbol in vocabulary.getSymbols()]
+        self.assertEqual(instructions, [[ReadingProgram.CONSTANT],
+                                        [ReadingProgram.CONSTANT, ReadingProgram.FORMAT],
+                                        [ReadingProgram.CONSTANT, ReadingProgram.VARIABLE, ReadingProgram.CONSTANT],
+                                        [ReadingProgram.VARIABLE, ReadingProgram.CONSTANT]])
+
+    def test_invalidation(self):
+        vocabulary = self.createVocabulary()
+        symbol = vocabulary.getSymbols()[0]
+        program = symbol.getReadingProgram()
+        self.assertTrue(symbol.getReadingProgram() is program)
+        self.assertEqual(len(symbol.getExtendedFields()[0].getVariable().getFathers()), 1)
+        variable = self.createWord("c1", "BYE")
+        symbol.getExtendedFields()[0].setVariable(variable)
+        self.assertFalse(symbol.getReadingProgram() is program)
+        readingToken = VariableReadingToken(False, vocabulary, Memory(), TypeConvertor.stringB2bin("BYE"), 0)
+        symbol.getReadingProgram().read(readingToken)
+        self.assertTrue(readingToken.isOk())
+        self.assertEqual(variable.getFathers(), [symbol.getRoot()])
+
+    def test_nestedInvalidation(self):
+        vocabulary = self.createVocabulary()
+        symbol = vocabulary.getSymbols()[3]
+        program = symbol.getReadingProgram()
+        alternate = symbol.getExtendedFields()[0].getVariable()
+        alternate.addChild(self.createWord("a4", "MAYBE"))
+        self.assertFalse(symbol.getReadingProgram() is program)
+        readingToken = VariableReadingToken(False, vocabulary, Memory(), TypeConvertor.stringB2bin("MAYBE."), 0)
+        symbol.getReadingProgram().read(readingToken)
+        self.assertTrue(readingToken.isOk())
+        self.assertTrue(symbol.getReadingProgram().getVariableByID(vocabulary, "a4") is alternate.getChildren()[2])
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+from bitarray import bitarray
+
+from netzob.Common.Field import Field
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.RelationTypes.WordSizeRelationType import WordSizeRelationType
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable import ComputedRelationVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableWritingToken import VariableWritingToken
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_RelationGraph(unittest.TestCase):
+
+    def createWord(self, name, value):
+        return DataVariable(name, name, False, False, WordType(True, len(value), len(value)), TypeConvertor.stringB2bin(value))
+
+    def createSymbol(self, generator, name, variables, symbol):
+        for variable in variables:
+            field = Field.createDefaultField(symbol)
+            field.setVariable(variable)
+            symbol.getField().addField(field)
+        generator.getVocabulary().addSymbol(symbol)
+        return symbol
+
+    def createSizedSymbol(self):
+        """A size before its payload, a size after it and a size of a variable of an other symbol"""
+        generator = AutomataGenerator(0)
+        other = self.createSymbol(generator, "other", [self.createWord("o0", "OTHER")], Symbol("other", "other", generator.getProject()))
+        symbol = Symbol("sized", "sized", generator.getProject())
+        before = ComputedRelationVariable("s0", "s0", False, False, WordSizeRelationType(True, 1, 3, None, 0.125, 0), "s1", symbol)
+        after = ComputedRelationVariable("s2", "s2", False, False, WordSizeRelationType(True, 1, 3, None, 0.125, 0), "s1", symbol)
+        outside = ComputedRelationVariable("s3", "s3", False, False, WordSizeRelationType(True, 1, 3, None, 0.125, 0), "o0", symbol)
+        payload = AggregateVariable("s1", "s1", False, False, [self.createWord("s4", "PAY"), self.createWord("s5", "LOAD")])
+        self.createSymbol(generator, "sized", [before, payload, after, outside], symbol)
+        return (generator, symbol, before, payload, after, outside)
+
+    def test_directPointers(self):
+        (generator, symbol, before, payload, after, outside) = self.createSizedSymbol()
+        self.assertFalse(before.findDirectPointer())
+        self.assertTrue(after.findDirectPointer())
+        self.assertFalse(outside.findDirectPointer())
+        graph = symbol.getRelationGraph()
+        self.assertTrue(graph.getVariableByID("s1") is payload)
+        self.assertEqual(None, graph.getVariableByID("o0"))
+
+        # The graph is computed once, and again when a tree changes
+        self.assertTrue(graph is symbol.getRelationGraph())
+        inside = ComputedRelationVariable("s6", "s6", False, False, WordSizeRelationType(True, 1, 3, None, 0.125, 0), "s5", symbol)
+        payload.insertChild(0, inside)
+        self.assertFalse(graph is symbol.getRelationGraph())
+        self.assertFalse(inside.findDirectPointer())
+        payload.moveChild(inside, 2)
+        self.assertTrue(inside.findDirectPointer())
+
+        # A clone being built does not change the trees
+        graph = symbol.getRelationGraph()
+        payload.cloneVariable()
+        self.assertTrue(graph is symbol.getRelationGraph())
+
+    def test_computedValues(self):
+        relationType = WordSizeRelationType(True, 1, 3, None, 0.125, 0)
+        value = relationType.getComputedValue(TypeConvertor.stringB2bin("PAYLOAD"))
+        self.assertEqual(TypeConvertor.stringB2bin("7"), value)
+        # The tokens can modify the given value without modifying the memorized one
+        value.extend(TypeConvertor.stringB2bin("0"))
+        self.assertEqual(TypeConvertor.stringB2bin("7"), relationType.getComputedValue(TypeConvertor.stringB2bin("DAOLYAP")))
+        self.assertEqual(1, len(relationType.computedValues))
+
+    def test_writingTokenSegments(self):
+        (generator, symbol, before, payload, after, outside) = self.createSizedSymbol()
+        writingToken = VariableWritingToken(False, generator.getVocabulary(), None, bitarray(''), ["random"])
+        for (variable, value) in [(before, "TEMP"), (payload, "PAYLOAD"), (after, "7")]:
+            writingToken.write(variable, TypeConvertor.stringB2bin(value))
+        savedValue = writingToken.getValue()
+        writingToken.setValueForVariable(before, TypeConvertor.stringB2bin("7"))
+        self.assertEqual(TypeConvertor.stringB2bin("TEMPPAYLOAD7"), savedValue)
+        self.assertEqual(TypeConvertor.stringB2bin("7PAYLOAD7"), writingToken.getValue())
+        self.assertEqual(len(writingToken.getValue()), writingToken.getIndex())
+
+        # The value is made again from the segments when it does not match them anymore
+        writingToken.appendLinkedValue([outside.getID(), TypeConvertor.stringB2bin("TEMP")])
+        writingToken.setValueForVariable(outside, TypeConvertor.stringB2bin("5"))
+        self.assertEqual(TypeConvertor.stringB2bin("7PAYLOAD75"), writingToken.getValue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import threading
+import time
+
+from lxml import etree
+from netzob.Common.MMSTD.Actors.Scheduler import Scheduler
+from netzob.Common.MMSTD.States.impl.NormalState import NormalState
+from netzob.Common.MMSTD.Transitions.AbstractTransition import AbstractTransition
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from common.AutomataGenerator import AutomataGenerator
+
+
+class test_Scheduler(unittest.TestCase):
+
+    def test_reactionIsRelativeToReception(self):
+        scheduler = Scheduler()
+        scheduler.markReception()
+        time.sleep(0.1)
+        startTime = time.time()
+        scheduler.waitReaction(300)
+        duration = time.time() - startTime
+        self.assertTrue(0.15 < duration < 0.28, duration)
+
+        # a deadline already over does not wait
+        startTime = time.time()
+        scheduler.waitReaction(50)
+        self.assertTrue(time.time() - startTime < 0.05)
+
+    def test_asFastAsPossible(self):
+        scheduler = Scheduler(True)
+        scheduler.markReception()
+        startTime = time.time()
+        scheduler.waitReaction(2000)
+        scheduler.wait(2000)
+        self.assertTrue(time.time() - startTime < 0.05)
+        self.assertEqual(scheduler.getWaitedTime(), 0)
+        self.assertTrue(scheduler.duplicate().isAsFastAsPossible())
+
+    def test_waitFor(self):
+        scheduler = Scheduler()
+        status = []
+
+        def connect():
+            time.sleep(0.1)
+            status.append(True)
+            scheduler.notify()
+        threading.Thread(target=connect).start()
+        self.assertTrue(scheduler.waitFor(lambda: len(status) > 0, 5))
+        self.assertFalse(scheduler.waitFor(lambda: len(status) > 1, 0.1))
+
+    def test_receptionTimeout(self):
+        generator = AutomataGenerator(0)
+        ping = generator.createSymbol("PING")
+        pong = generator.createSymbol("PONG")
+        states = [NormalState("0", "State 0"), NormalState("1", "State 1")]
+        transition = SemiStochasticTransition("0", "Transition 0", states[0], states[1], ping)
+        transition.addOutputSymbol(pong, 100, 250)
+        transition.setReceptionTimeout(0.5)
+
+        root = etree.Element("transitions")
+        transition.save(root, "netzob")
+        loadedTransition = AbstractTransition.loadFromXML(states, generator.getVocabulary(), root[0], "netzob", "0.1")
+        self.assertEqual(loadedTransition.getReceptionTimeout(), 0.5)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import json
+import uuid
+
+from netzob.Common.MMSTD.MMSTD import MMSTD
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.States.impl.NormalState import NormalState
+from netzob.Common.MMSTD.Transitions.impl.OpenChannelTransition import OpenChannelTransition
+from netzob.Common.MMSTD.Transitions.impl.CloseChannelTransition import CloseChannelTransition
+from netzob.Common.MMSTD.Transitions.impl.SemiStochasticTransition import SemiStochasticTransition
+from netzob.Common.MMSTD.Actors.MMSTDVisitor import MMSTDVisitor
+from netzob.Common.MMSTD.Actors.SessionProfiler import SessionProfiler
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoop import EventLoop
+from netzob.Common.MMSTD.Actors.NetworkChannels.NetworkClient import NetworkClient
+from netzob.Common.MMSTD.Actors.NetworkChannels.EventLoopNetworkServer import EventLoopNetworkServer
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from common.AutomataGenerator import AutomataGenerator
+
+
+class test_SessionProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.eventLoop = EventLoop()
+        self.eventLoop.start()
+        # simulated server answering PONG to PING over the loopback
+        generator = AutomataGenerator(0)
+        server = generator.createAutomaton(1, [(0, generator.createSymbol("PING"), generator.createSymbol("PONG"), 0)])
+        self.server = EventLoopNetworkServer("server", Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", 0, self.eventLoop)
+        self.server.openServer(generator.getVocabulary(), server.getInitialState(), False, lambda: None, lambda: None, lambda *args: None, lambda *args: None)
+
+        generator = AutomataGenerator(0)
+        self.vocabulary = generator.getVocabulary()
+        ping = generator.createSymbol("PING")
+        pong = generator.createSymbol("PONG")
+        # the received value is learnt in the memory
+        pong.getField().setVariable(DataVariable(str(uuid.uuid4()), "PONG", True, True, WordType(True, 4, 4), TypeConvertor.stringB2bin("PONG")))
+
+        # master session: open, two exchanges and close
+        states = [NormalState(str(i), "State " + str(i)) for i in range(0, 5)]
+        self.automaton = MMSTD(states[0], self.vocabulary)
+        transitions = [OpenChannelTransition("open", "Open", states[0], states[1], 100, 3)]
+        for i in range(1, 3):
+            transition = SemiStochasticTransition(str(i), "Exchange " + str(i), states[i], states[i + 1], ping)
+            transition.addOutputSymbol(pong, 100, 0)
+            transitions.append(transition)
+        transitions.append(CloseChannelTransition("close", "Close", states[3], states[4], 50))
+        for state in states:
+            self.automaton.addState(state)
+        for transition in transitions:
+            transition.getInputState().registerTransition(transition)
+            self.automaton.addTransition(transition)
+
+    def tearDown(self):
+        self.server.close()
+        self.eventLoop.stop()
+
+    def createVisitor(self):
+        port = self.server.listeningSocket.getsockname()[1]
+        client = NetworkClient("client", Memory(), "TCP", "127.0.0.1", 0, "127.0.0.1", port)
+        return MMSTDVisitor("master", "master", self.automaton, True, AbstractionLayer(client, self.vocabulary, Memory()))
+
+    def test_loopbackSession(self):
+        visitor = self.createVisitor()
+        profiler = SessionProfiler("loopback")
+        visitor.setProfiler(profiler)
+        visitor.run()
+
+        self.assertEqual([step["name"] for step in profiler.getSteps()], ["Open", "Exchange 1", "Exchange 2", "Close"])
+        for phase in [SessionProfiler.PHASE_READ, SessionProfiler.PHASE_WRITE, SessionProfiler.PHASE_ABSTRACTION, SessionProfiler.PHASE_SPECIALIZATION]:
+            self.assertEqual(profiler.getPhaseCount(phase), 2)
+            for step in profiler.getSteps()[1:3]:
+                self.assertEqual(step["phases"][phase][1], 1)
+        self.assertTrue(profiler.getPhaseCount(SessionProfiler.PHASE_MEMORY) > 0)
+        # the connection time and twice the disconnection time
+        self.assertTrue(profiler.getPhaseTime(SessionProfiler.PHASE_WAIT) >= 0.19)
+        self.assertTrue(profiler.getSteps()[0]["phases"][SessionProfiler.PHASE_WAIT][0] >= 0.09)
+        self.assertTrue(profiler.getDuration() >= sum([step["duration"] for step in profiler.getSteps()]))
+
+        exported = json.loads(profiler.toJSON())
+        self.assertEqual(exported["session"], "loopback")
+        self.assertEqual(len(exported["steps"]), 4)
+        self.assertEqual(exported["phases"]["read"]["count"], 2)
+        self.assertTrue("Exchange 2" in profiler.getSummary())
+
+    def test_detachedProfiler(self):
+        visitor = self.createVisitor()
+        visitor.setProfiler(SessionProfiler("detached"))
+        visitor.setProfiler(None)
+        memory = visitor.getAbstractionLayer().getMemory()
+        for operation in Memory.PROFILED_OPERATIONS:
+            self.assertFalse(operation in memory.__dict__)
+        visitor.run()
+        self.assertEqual(visitor.getProfiler(), None)
+
+    def test_memoryPhase(self):
+        memory = Memory()
+        profiler = SessionProfiler("memory")
+        # The memory operations are accounted to a phase of the profiler
+        self.assertRaises(ValueError, memory.setProfiler, profiler)
+        self.assertRaises(ValueError, memory.setProfiler, profiler, "unknown")
+        self.assertFalse("memorize" in memory.__dict__)
+        memory.setProfiler(profiler, SessionProfiler.PHASE_MEMORY)
+        memory.memorize(DataVariable(str(uuid.uuid4()), "word", True, False, WordType(True, 1, 10), TypeConvertor.stringB2bin("value")))
+        self.assertEqual(profiler.getPhaseCount(SessionProfiler.PHASE_MEMORY), 1)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import tempfile
+
+from netzob.Import.Ipc.StraceCapture import StraceCapture
+from netzob.Import.Ipc.StraceParser import StraceParser
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_StraceParser(unittest.TestCase):
+
+    LOG = ('read(3, "\\x48\\x65\\x6c\\x6c\\x6f", 4096) = 5\n'
+           'write(1, "\\x0a", 1)                      = 1\n'
+           'read(4, 0x7ffd5e1c2a10, 4096)           = -1 EAGAIN (Resource temporarily unavailable)\n'
+           'recvfrom(5, "\\x00\\xff", 65536, 0, {sa_family=AF_INET, sin_port=htons(53), sin_addr=inet_addr("10.0.0.1")}, [16]) = 2\n'
+           '--- SIGCHLD {si_signo=SIGCHLD, si_code=CLD_EXITED} ---\n'
+           '[pid  1234] sendto(6, "\\x41\\x42"..., 2, MSG_NOSIGNAL, NULL, 0) = 2\n'
+           'read(3, "", 4096)                       = 0\n'
+           'pwrite64(7, "\\x7b\\x7d", 2, 512) = 2\n')
+
+    RECORDS = [("read", 3, "48656c6c6f"), ("write", 1, "0a"), ("read", 5, "00ff"), ("write", 6, "4142"), ("write", 7, "7b7d")]
+
+    def test_parse(self):
+        parser = StraceParser()
+        self.assertEqual(self.RECORDS, parser.parse(self.LOG))
+        self.assertEqual((8, 5), (parser.nbLines, parser.nbSyscalls))
+
+    def test_chunks(self):
+        # The lines cut between two chunks are parsed once complete
+        for chunkSize in [1, 7, 64]:
+            parser = StraceParser()
+            records = []
+            for i in range(0, len(self.LOG), chunkSize):
+                records.extend(parser.parse(self.LOG[i:i + chunkSize]))
+            self.assertEqual(self.RECORDS, records)
+        # The last line is parsed at the end of the output
+        parser = StraceParser()
+        self.assertEqual([], parser.parse('write(1, "\\x0a", 1) = 1'))
+        self.assertEqual([("write", 1, "0a")], parser.flush())
+
+    def test_capture(self):
+        (fd, filePath) = tempfile.mkstemp(suffix=".log")
+        os.write(fd, self.LOG * 100)
+        os.close(fd)
+        batches = []
+        try:
+            stream = open(filePath, "rb")
+
+            def createMessage(direction, fd, data):
+                # Keeps only the buffers read
+                if direction == "read":
+                    return (fd, data)
+            capture = StraceCapture(stream, createMessage, batches.append, chunkSize=100, batchInterval=0.01)
+            capture.start()
+            capture.join(10)
+            self.assertFalse(capture.isRunning())
+            stream.close()
+        finally:
+            os.unlink(filePath)
+        messages = [message for batch in batches for message in batch]
+        self.assertEqual([(3, "48656c6c6f"), (5, "00ff")] * 100, messages)
+        statistics = capture.getStatistics()
+        self.assertEqual((800, 500, 200), (statistics.nbLines, statistics.nbSyscalls, statistics.nbMessages))
+        self.assertEqual(len(batches), statistics.nbBatches)
+
+    def test_closedFileDescriptors(self):
+        log = ('read(3, "\\x41", 4096) = 1\n'
+               'close(3)                                = 0\n'
+               'close(9)                                = -1 EBADF (Bad file descriptor)\n'
+               '[pid  1234] dup2(4, 5) = 5\n'
+               'dup3(6, 7, O_CLOEXEC) = 7\n'
+               'read(3, "\\x42", 4096) = 1\n')
+        parser = StraceParser()
+        self.assertEqual([("read", 3, "41"), (StraceParser.CLOSE, 3, ""), (StraceParser.CLOSE, 5, ""), (StraceParser.CLOSE, 7, ""), ("read", 3, "42")], parser.parse(log))
+        self.assertEqual(2, parser.nbSyscalls)
+        # The capture reports the closed file descriptors apart from
+        # the messages
+        (fd, filePath) = tempfile.mkstemp(suffix=".log")
+        os.write(fd, log)
+        os.close(fd)
+        events = []
+        try:
+            stream = open(filePath, "rb")
+            capture = StraceCapture(stream, lambda direction, fd, data: events.append((direction, fd)), lambda messages: None, batchInterval=0.01)
+            capture.fdClosed_cb = lambda fd: events.append(("closed", fd))
+            capture.start()
+            capture.join(10)
+            stream.close()
+        finally:
+            os.unlink(filePath)
+        self.assertEqual([("read", 3), ("closed", 3), ("closed", 5), ("closed", 7), ("read", 3)], events)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import uuid
+
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.AbstractionLayer import AbstractionLayer
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.AlternateVariable import AlternateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableReadingToken import VariableReadingToken
+from netzob.Common.MMSTD.Symbols.impl.UnknownSymbol import UnknownSymbol
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_SymbolDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = AutomataGenerator(0)
+        self.vocabulary = self.generator.getVocabulary()
+        self.memory = Memory()
+        self.abstractionLayer = AbstractionLayer(None, self.vocabulary, self.memory)
+
+    def createWord(self, value, mutable=False, learnable=False, minChars=None, maxChars=None):
+        if minChars is None:
+            minChars = len(value)
+        if maxChars is None:
+            maxChars = len(value)
+        return DataVariable(str(uuid.uuid4()), value, mutable, learnable, WordType(True, minChars, maxChars), TypeConvertor.stringB2bin(value))
+
+    def createSymbol(self, name, variable):
+        symbol = Symbol(str(uuid.uuid4()), name, self.generator.getProject())
+        symbol.getExtendedFields()[0].setVariable(variable)
+        self.vocabulary.addSymbol(symbol)
+        return symbol
+
+    def createAggregate(self, children):
+        aggregate = AggregateVariable(str(uuid.uuid4()), "aggregate", False, False, None)
+        for child in children:
+            aggregate.addChild(child)
+        return aggregate
+
+    def createAlternate(self, children):
+        alternate = AlternateVariable(str(uuid.uuid4()), "alternate", False, False, None)
+        for child in children:
+            alternate.addChild(child)
+        return alternate
+
+    def sequentialAbstract(self, message):
+        """The abstraction without dispatch, which tries each symbol of the vocabulary"""
+        for symbol in self.vocabulary.getSymbols():
+            readingToken = VariableReadingToken(False, self.vocabulary, self.memory, TypeConvertor.strBitarray2Bitarray(message), 0)
+            symbol.getRoot().read(readingToken)
+            if readingToken.isOk() and readingToken.getIndex() == len(readingToken.getValue()):
+                return symbol
+        return UnknownSymbol()
+
+    def assertSameAbstraction(self, messages):
+        for message in messages:
+            bina = TypeConvertor.stringB2bin(message)
+            expected = self.sequentialAbstract(bina)
+            symbol = self.abstractionLayer.abstract(bina)
+            self.assertEqual(symbol.getType(), expected.getType())
+            if expected.getType() != UnknownSymbol.TYPE:
+                self.assertEqual(symbol.getID(), expected.getID(), "{0} abstracted in {1} instead of {2}".format(message, symbol.getName(), expected.getName()))
+
+    def test_staticSymbols(self):
+        symbols = self.generator.createSymbols("MSG", 50)
+        self.assertSameAbstraction(["MSG0000", "MSG0042", "MSG0049", "MSG0050", "MSG004", "MSG00420", "", "X"])
+        dispatcher = self.abstractionLayer.getSymbolDispatcher()
+        self.assertEqual(dispatcher.getCandidates(TypeConvertor.stringB2bin("MSG0042")), [symbols[42]])
+        self.assertEqual(dispatcher.getCandidates(TypeConvertor.stringB2bin("MSG00421")), [])
+
+    def test_mixedSymbols(self):
+        self.generator.createSymbols("MSG", 10)
+        # A static header followed by a field which is only format checked
+        self.createSymbol("header", self.createAggregate([self.createWord("MSG"), self.createWord("0001", mutable=True)]))
+        # A learnable field may abstract any message
+        self.createSymbol("learnable", self.createAggregate([self.createWord("GET "), self.createWord("x", mutable=True, learnable=True, minChars=1, maxChars=10)]))
+        self.createSymbol("alternate", self.createAlternate([self.createWord("HELLO"), self.createWord("HELP"), self.createWord("BYE")]))
+        self.createSymbol("any", self.createWord("a", mutable=True, learnable=True, minChars=0, maxChars=8))
+        self.assertSameAbstraction(["MSG0001", "MSG", "GET /", "GET /index", "GET /index.html", "HELLO", "HELP", "BYE", "HEL", "abcd", "abcdefghijkl"])
+        candidates = self.abstractionLayer.getSymbolDispatcher().getCandidates(TypeConvertor.stringB2bin("HELP"))
+        self.assertEqual([symbol.getName() for symbol in candidates], ["alternate", "any"])
+
+    def test_vocabularyChanges(self):
+        symbols = self.generator.createSymbols("MSG", 3)
+        self.assertSameAbstraction(["MSG0003"])
+        self.generator.createSymbol("MSG0003")
+        self.assertSameAbstraction(["MSG0003"])
+        self.vocabulary.removeSymbol(symbols[0])
+        self.assertSameAbstraction(["MSG0000", "MSG0001"])
+
+    def test_variablesChanges(self):
+        hello = self.createWord("HELLO")
+        alternate = self.createAlternate([hello, self.createWord("HELP")])
+        symbol = self.createSymbol("greeting", self.createAggregate([alternate]))
+        self.assertSameAbstraction(["HELLO", "BYE"])
+
+        # Nested edit of the variables of the symbol
+        alternate.addChild(self.createWord("BYE"))
+        self.assertSameAbstraction(["HELLO", "BYE"])
+        self.assertEqual(self.abstractionLayer.getSymbolDispatcher().getCandidates(TypeConvertor.stringB2bin("BYE")), [symbol])
+
+        # Edit of the value of a constant
+        hello.setCurrentValue(TypeConvertor.stringB2bin("WORLD"))
+        self.assertSameAbstraction(["HELLO", "WORLD"])
+        self.assertEqual(self.abstractionLayer.abstract(TypeConvertor.stringB2bin("WORLD")).getID(), symbol.getID())
+
+        # Edit of the flags of a constant
+        hello.setMutable(True)
+        hello.setLearnable(True)
+        self.assertSameAbstraction(["HELLO", "WORLD", "HOWDY"])
+        self.assertEqual(self.abstractionLayer.abstract(TypeConvertor.stringB2bin("HOWDY")).getID(), symbol.getID())
+
+        # Replacement of the variable of the field
+        symbol.getExtendedFields()[0].setVariable(self.createWord("QUIT"))
+        self.assertSameAbstraction(["QUIT", "BYE"])
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import os
+import tempfile
+
+from netzob.Import.Pcap.PcapReader import PcapReader
+from netzob.Import.Pcap.PacketDecoder import PacketDecoder
+from netzob.Import.Pcap.TcpReassembler import TcpReassembler
+from common.PcapGenerator import PcapGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+CLIENT = ("10.0.0.1", 40000)
+SERVER = ("10.0.1.1", 80)
+ACK = 0x10
+PSH = 0x18
+FIN = 0x11
+
+
+class test_TcpReassembler(unittest.TestCase):
+
+    def getWrites(self, reassembler):
+        return [(write.source, write.data) for write in reassembler.popWrites()]
+
+    def test_writes(self):
+        reassembler = TcpReassembler()
+        reassembler.addSegment(0.0, CLIENT, SERVER, 99, 0x02, "")
+        reassembler.addSegment(0.1, CLIENT, SERVER, 100, ACK, "GET ")
+        reassembler.addSegment(0.2, CLIENT, SERVER, 104, PSH, "/ HTTP")
+        # The server write ends when the client sends data
+        reassembler.addSegment(0.3, SERVER, CLIENT, 500, ACK, "200 ")
+        reassembler.addSegment(0.4, SERVER, CLIENT, 504, ACK, "OK")
+        self.assertEqual([(CLIENT, "GET / HTTP")], self.getWrites(reassembler))
+        reassembler.addSegment(0.5, CLIENT, SERVER, 110, ACK, "BYE")
+        self.assertEqual([(SERVER, "200 OK")], self.getWrites(reassembler))
+        reassembler.addSegment(0.6, CLIENT, SERVER, 113, FIN, "")
+        self.assertEqual([(CLIENT, "BYE")], self.getWrites(reassembler))
+        self.assertEqual([], reassembler.popClosedFlows())
+        reassembler.addSegment(0.7, SERVER, CLIENT, 506, FIN, "")
+        self.assertEqual([0], reassembler.popClosedFlows())
+        # The last ACK does not open a flow
+        reassembler.addSegment(0.8, CLIENT, SERVER, 114, ACK, "")
+        self.assertEqual(0, reassembler.getNumberOfOpenFlows())
+        reassembler.flush()
+        self.assertEqual([], reassembler.popClosedFlows())
+        self.assertEqual([], self.getWrites(reassembler))
+
+    def test_halfClose(self):
+        reassembler = TcpReassembler()
+        reassembler.addSegment(0.0, CLIENT, SERVER, 100, PSH, "SEND ALL")
+        reassembler.addSegment(0.1, CLIENT, SERVER, 108, FIN, "")
+        self.assertEqual([(CLIENT, "SEND ALL")], self.getWrites(reassembler))
+        # The server keeps sending once the client has finished
+        reassembler.addSegment(0.2, SERVER, CLIENT, 500, ACK, "part 1,")
+        reassembler.addSegment(0.3, SERVER, CLIENT, 507, ACK, " part 2")
+        reassembler.addSegment(0.4, CLIENT, SERVER, 109, ACK, "")
+        self.assertEqual(1, reassembler.getNumberOfOpenFlows())
+        self.assertEqual([], reassembler.popClosedFlows())
+        reassembler.addSegment(0.5, SERVER, CLIENT, 514, FIN | PSH, " end")
+        self.assertEqual([(SERVER, "part 1, part 2 end")], self.getWrites(reassembler))
+        self.assertEqual([0], reassembler.popClosedFlows())
+        self.assertEqual(0, reassembler.getNumberOfOpenFlows())
+        # A reset closes the flow at once
+        reassembler.addSegment(1.0, CLIENT, SERVER, 200, ACK, "abc")
+        reassembler.addSegment(1.1, SERVER, CLIENT, 600, 0x14, "")
+        self.assertEqual([(CLIENT, "abc")], self.getWrites(reassembler))
+        self.assertEqual([1], reassembler.popClosedFlows())
+
+    def test_reorderingAndRetransmission(self):
+        reassembler = TcpReassembler()
+        reassembler.addSegment(0.0, CLIENT, SERVER, 100, ACK, "abcd")
+        reassembler.addSegment(0.1, CLIENT, SERVER, 108, PSH, "ijkl")
+        reassembler.addSegment(0.2, CLIENT, SERVER, 104, ACK, "efgh")
+        self.assertEqual([(CLIENT, "abcdefghijkl")], self.getWrites(reassembler))
+        # A retransmission and a segment overlapping received data
+        reassembler.addSegment(0.3, CLIENT, SERVER, 108, PSH, "ijkl")
+        reassembler.addSegment(0.4, CLIENT, SERVER, 110, PSH, "klmn")
+        self.assertEqual([(CLIENT, "mn")], self.getWrites(reassembler))
+        self.assertEqual(1, reassembler.nbRetransmitted)
+
+    def test_sequenceWrap(self):
+        reassembler = TcpReassembler()
+        reassembler.addSegment(0.0, CLIENT, SERVER, 0xfffffffe, ACK, "abcd")
+        reassembler.addSegment(0.1, CLIENT, SERVER, 6, PSH, "ijkl")
+        reassembler.addSegment(0.2, CLIENT, SERVER, 2, ACK, "efgh")
+        self.assertEqual([(CLIENT, "abcdefghijkl")], self.getWrites(reassembler))
+
+    def test_loss(self):
+        reassembler = TcpReassembler(maxBufferSize=6)
+        reassembler.addSegment(0.0, CLIENT, SERVER, 100, ACK, "abcd")
+        # "efgh" is lost
+        reassembler.addSegment(0.1, CLIENT, SERVER, 108, ACK, "ijkl")
+        self.assertEqual([], self.getWrites(reassembler))
+        # The buffered data exceeds the limit: the gap is skipped, and
+        # the write exceeding the limit is emitted
+        reassembler.addSegment(0.2, CLIENT, SERVER, 112, ACK, "mnop")
+        self.assertEqual([(CLIENT, "abcd"), (CLIENT, "ijklmnop")], self.getWrites(reassembler))
+        # A gap remaining when the flow ends is skipped
+        reassembler.addSegment(0.3, CLIENT, SERVER, 120, ACK, "uvwx")
+        reassembler.flush()
+        self.assertEqual([(CLIENT, "uvwx")], self.getWrites(reassembler))
+        self.assertEqual(2, reassembler.nbLost)
+
+    def test_boundedFlows(self):
+        reassembler = TcpReassembler(timeout=10.0, maxFlows=2)
+        for port in range(3):
+            reassembler.addSegment(float(port), ("10.0.0.1", port), SERVER, 0, ACK, "flow{0}".format(port))
+        # The oldest flow is closed to open the third one
+        self.assertEqual([0], reassembler.popClosedFlows())
+        self.assertEqual([(("10.0.0.1", 0), "flow0")], self.getWrites(reassembler))
+        # The idle flows are closed
+        reassembler.addSegment(30.0, ("10.0.0.1", 3), SERVER, 0, ACK, "flow3")
+        self.assertEqual([1, 2], reassembler.popClosedFlows())
+        self.assertEqual(1, reassembler.getNumberOfOpenFlows())
+
+    def test_capture(self):
+        """Reassembles a generated capture whose segments are reordered
+        and partly lost"""
+        generator = PcapGenerator(0)
+        writes = ["USER netzob\r\n", "331 Password required for netzob\r\n", "PASS secret-password\r\n", "230 Logged in\r\n"]
+        frames = generator.tcpConversation(writes, mss=8)
+        # Swap two segments of the second write and retransmit one
+        frames[5], frames[6] = frames[6], frames[5]
+        frames.insert(8, frames[7])
+        other = generator.tcpConversation(["QUIT\r\n", "221 Bye\r\n"], client=("10.0.0.2", 40001), mss=4)
+        # A segment of the other flow ("Bye\r") is lost, the flows are interleaved
+        del other[-3]
+        frames = [frame for pair in map(None, frames, other) for frame in pair if frame is not None]
+
+        (fd, filePath) = tempfile.mkstemp(suffix=".pcap")
+        os.write(fd, generator.pcap(frames))
+        os.close(fd)
+        try:
+            reader = PcapReader(filePath)
+            decoder = PacketDecoder()
+            reassembler = TcpReassembler()
+            writes = {}
+            while True:
+                (header, data) = reader.next()
+                if header is None:
+                    break
+                (l2Proto, l2SrcAddr, l2DstAddr, l2Payload, etherType) = decoder.decodeLayer2(reader.datalink(), data)
+                (l3Proto, l3SrcAddr, l3DstAddr, l3Payload, ipProtocolNum) = decoder.decodeLayer3(etherType, l2Payload)
+                (l4Proto, l4SrcPort, l4DstPort, l4Payload) = decoder.decodeLayer4(ipProtocolNum, l3Payload)
+                (seq, flags) = decoder.decodeTCPSequence(l3Payload)
+                reassembler.addSegment(header.getts()[0], (l3SrcAddr, l4SrcPort), (l3DstAddr, l4DstPort), seq, flags, l4Payload)
+            reassembler.flush()
+            reader.close()
+        finally:
+            os.unlink(filePath)
+
+        for write in reassembler.popWrites():
+            writes.setdefault(write.flowID, []).append(write.data)
+        self.assertEqual({0: ["USER netzob\r\n", "331 Password required for netzob\r\n", "PASS secret-password\r\n", "230 Logged in\r\n"],
+                          1: ["QUIT\r\n", "221 ", "\n"]}, writes)
+        self.assertEqual([0, 1], sorted(reassembler.popClosedFlows()))
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+import random
+from bitarray import bitarray
+
+from netzob.Common.Field import Field
+from netzob.Common.Symbol import Symbol
+from netzob.Common.Type.TypeConvertor import TypeConvertor
+from netzob.Common.MMSTD.Dictionary.Memory import Memory
+from netzob.Common.MMSTD.Dictionary.WritingProgram import WritingProgram
+from netzob.Common.MMSTD.Dictionary.DataTypes.WordType import WordType
+from netzob.Common.MMSTD.Dictionary.RelationTypes.WordSizeRelationType import WordSizeRelationType
+from netzob.Common.MMSTD.Dictionary.Variables.AggregateVariable import AggregateVariable
+from netzob.Common.MMSTD.Dictionary.Variables.ComputedRelationVariable import ComputedRelationVariable
+from netzob.Common.MMSTD.Dictionary.Variables.DataVariable import DataVariable
+from netzob.Common.MMSTD.Dictionary.VariableProcessingToken.VariableWritingToken import VariableWritingToken
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_WritingProgram(unittest.TestCase):
+
+    def createWord(self, name, value, mutable=False, minChars=None, maxChars=None):
+        if minChars is None:
+            minChars = len(value)
+        if maxChars is None:
+            maxChars = len(value)
+        return DataVariable(name, name, mutable, False, WordType(True, minChars, maxChars), TypeConvertor.stringB2bin(value))
+
+    def createSymbol(self, generator, name, variables, symbol=None):
+        if symbol is None:
+            symbol = Symbol(name, name, generator.getProject())
+        for variable in variables:
+            field = Field.createDefaultField(symbol)
+            field.setVariable(variable)
+            symbol.getField().addField(field)
+        generator.getVocabulary().addSymbol(symbol)
+        return symbol
+
+    def createVocabulary(self):
+        """Creates a vocabulary whose variables have the same IDs at each call"""
+        generator = AutomataGenerator(0)
+        self.createSymbol(generator, "constant", [self.createWord("c0", "HELLO"), self.createWord("c1", " "), self.createWord("c2", "WORLD")])
+        symbol = Symbol("sized", "sized", generator.getProject())
+        size = ComputedRelationVariable("s0", "s0", False, False, WordSizeRelationType(True, 1, 3, None, 1, 0), "s2", symbol)
+        self.createSymbol(generator, "sized", [self.createWord("s1", "LEN "), size, self.createWord("s3", ":"), self.createWord("s2", "x", mutable=True, minChars=1, maxChars=20), self.createWord("s4", "\r\n")], symbol)
+        symbol = Symbol("trailer", "trailer", generator.getProject())
+        size = ComputedRelationVariable("t0", "t0", False, False, WordSizeRelationType(True, 1, 3, None, 1, 0), "t1", symbol)
+        self.createSymbol(generator, "trailer", [self.createWord("t1", "x", mutable=True, minChars=1, maxChars=20), self.createWord("t2", ";"), size], symbol)
+        symbol = Symbol("header", "header", generator.getProject())
+        size = ComputedRelationVariable("h0", "h0", False, False, WordSizeRelationType(True, 1, 3, None, 1, 0), "h2", symbol)
+        self.createSymbol(generator, "header", [size, self.createWord("h1", ":"), self.createWord("h2", "PAYLOAD"), self.createWord("h3", ";")], symbol)
+        return generator.getVocabulary()
+
+    def treeWrite(self, symbol, writingToken):
+        """The write access of a symbol before its compilation"""
+        root = AggregateVariable(symbol.getID(), symbol.getName(), False, False, None)
+        for field in symbol.getExtendedFields():
+            root.addChild(field.getVariable())
+        root.write(writingToken)
+        for field in symbol.getExtendedFields():
+            field.getVariable().removeFather(root)
+        return (root.getCurrentValue(), root.getTokenChoppedIndexes())
+
+    def programWrite(self, symbol, writingToken):
+        program = symbol.getWritingProgram()
+        program.write(writingToken)
+        return (program.getRoot().getCurrentValue(), program.getRoot().getTokenChoppedIndexes())
+
+    def writeAll(self, write, nbMessages):
+        vocabulary = self.createVocabulary()
+        memory = Memory()
+        results = []
+        for i in range(nbMessages):
+            for symbol in vocabulary.getSymbols():
+                random.seed(i)
+                writingToken = VariableWritingToken(False, vocabulary, memory, bitarray(''), ["random"])
+                (value, indexes) = write(symbol, writingToken)
+                variables = sorted([(variable.getID(), variable.getCurrentValue(), variable.getTokenChoppedIndexes()) for variable in vocabulary.getVariables()])
+                results.append((symbol.getName(), writingToken.isOk(), writingToken.getValue(), writingToken.getIndex(), writingToken.getLinkedValue(), value, indexes, variables))
+        return results
+
+    def test_sameWrittenValues(self):
+        expectedResults = self.writeAll(self.treeWrite, 10)
+        results = self.writeAll(self.programWrite, 10)
+        self.assertEqual(len(results), len(expectedResults))
+        for (result, expectedResult) in zip(results, expectedResults):
+            self.assertEqual(result, expectedResult)
+        # The size in bits is written as an ASCII number
+        message = TypeConvertor.bin2string(results[1][2])
+        self.assertTrue(message.startswith("LEN "))
+        self.assertEqual(int(message[4:message.index(":")]), (len(message) - message.index(":") - 3) * 8)
+
+    def test_compiledInstructions(self):
+        vocabulary = self.createVocabulary()
+        instructions = [[instruction for (instruction, variables, template) in symbol.getWritingProgram().getInstructions()] for symbol in vocabulary.getSymbols()]
+        self.assertEqual(instructions, [[WritingProgram.CONSTANT],
+                                        [WritingProgram.CONSTANT, WritingProgram.RELATION, WritingProgram.CONSTANT, WritingProgram.GENERATE, WritingProgram.CONSTANT],
+                                        [WritingProgram.GENERATE, WritingProgram.CONSTANT, WritingProgram.RELATION],
+                                        [WritingProgram.RELATION, WritingProgram.CONSTANT]])
+        self.assertEqual(TypeConvertor.bin2string(vocabulary.getSymbols()[0].getWritingProgram().getInstructions()[0][2]), "HELLO WORLD")
+
+    def test_constantChanges(self):
+        vocabulary = self.createVocabulary()
+        symbol = vocabulary.getSymbols()[0]
+        writingToken = VariableWritingToken(False, vocabulary, Memory(), bitarray(''), ["random"])
+        symbol.write(writingToken)
+        self.assertEqual(TypeConvertor.bin2string(writingToken.getValue()), "HELLO WORLD")
+        vocabulary.getVariableByID("c2").setCurrentValue(TypeConvertor.stringB2bin("THERE"))
+        writingToken = VariableWritingToken(False, vocabulary, Memory(), bitarray(''), ["random"])
+        symbol.write(writingToken)
+        self.assertEqual(TypeConvertor.bin2string(writingToken.getValue()), "HELLO THERE")
+
+    def test_nestedChanges(self):
+        generator = AutomataGenerator(0)
+        symbol = Symbol("nested", "nested", generator.getProject())
+        left = AggregateVariable("n0", "n0", False, False, [self.createWord("n1", "<")])
+        size = ComputedRelationVariable("n2", "n2", False, False, WordSizeRelationType(True, 1, 3, None, 1, 0), "n4", symbol)
+        payload = self.createWord("n4", "PAYLOAD")
+        right = AggregateVariable("n3", "n3", False, False, [payload])
+        self.createSymbol(generator, "nested", [left, size, right], symbol)
+        vocabulary = generator.getVocabulary()
+        writingToken = VariableWritingToken(False, vocabulary, Memory(), bitarray(''), ["random"])
+        symbol.write(writingToken)
+        self.assertEqual(TypeConvertor.bin2string(writingToken.getValue()), "<56PAYLOAD")
+        # The size now points to its left, within the children of the root.
+        right.removeChild(payload)
+        left.addChild(payload)
+        for write in [self.treeWrite, self.programWrite]:
+            writingToken = VariableWritingToken(False, vocabulary, Memory(), bitarray(''), ["random"])
+            write(symbol, writingToken)
+            self.assertEqual(TypeConvertor.bin2string(writingToken.getValue()), "<PAYLOAD56")
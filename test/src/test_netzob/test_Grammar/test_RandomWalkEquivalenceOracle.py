@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+
+from netzob.Inference.Grammar.MQCache import MQCache
+from netzob.Inference.Grammar.Oracles.SimulatedOracle import SimulatedOracle
+from netzob.Inference.Grammar.EquivalenceOracles.RandomWalkEquivalenceOracle import RandomWalkEquivalenceOracle
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_RandomWalkEquivalenceOracle(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = AutomataGenerator(0)
+        self.login = self.generator.createSymbol("LOGIN")
+        self.logout = self.generator.createSymbol("LOGOUT")
+        self.ok = self.generator.createSymbol("OK")
+        self.ko = self.generator.createSymbol("KO")
+
+    def createReference(self):
+        # LOGIN is only accepted once, LOGOUT resets the session
+        return self.generator.createAutomaton(2, [(0, self.login, self.ok, 1),
+                                                  (0, self.logout, self.ko, 0),
+                                                  (1, self.login, self.ko, 1),
+                                                  (1, self.logout, self.ok, 0)])
+
+    def test_noCounterExampleOnEquivalentHypothesis(self):
+        oracle = RandomWalkEquivalenceOracle(SimulatedOracle(self.createReference()), "", maxTests=50, seed=0)
+        counterExample = oracle.findCounterExample(self.createReference(), [self.login, self.logout], MQCache())
+
+        self.assertEqual(counterExample, None)
+        statistics = oracle.getStatistics()
+        self.assertEqual(statistics["tests"], 50)
+        self.assertTrue(statistics["queries"] <= 50)
+        self.assertEqual(statistics["stateCoverage"], 1.0)
+        self.assertEqual(statistics["transitionCoverage"], 1.0)
+
+    def test_counterExampleOnWrongHypothesis(self):
+        # The hypothesis accepts LOGIN in every state
+        hypothesis = self.generator.createAutomaton(1, [(0, self.login, self.ok, 0),
+                                                        (0, self.logout, self.ko, 0)])
+        oracle = RandomWalkEquivalenceOracle(SimulatedOracle(self.createReference()), "", maxTests=200, seed=0)
+        cache = MQCache()
+        counterExample = oracle.findCounterExample(hypothesis, [self.login, self.logout], cache)
+
+        self.assertNotEqual(counterExample, None)
+        (ourTrace, state) = hypothesis.getOutputTrace(hypothesis.getInitialState(), counterExample.getSymbols())
+        self.assertNotEqual([s.getID() for s in ourTrace], [s.getID() for s in cache.getCachedResult(counterExample)])
+
+    def test_queryBudget(self):
+        simulatedOracle = SimulatedOracle(self.createReference())
+        oracle = RandomWalkEquivalenceOracle(simulatedOracle, "", maxTests=-1, maxQueries=5, seed=0)
+        oracle.findCounterExample(self.createReference(), [self.login, self.logout], MQCache())
+
+        self.assertTrue(oracle.getStatistics()["queries"] <= 5)
+        self.assertEqual(oracle.getStatistics()["queries"], simulatedOracle.getNbQueries())
+
+    def test_queryBudgetWithCachedWalks(self):
+        # Only 6 distinct walks exist, the budget of queries can't be reached
+        simulatedOracle = SimulatedOracle(self.createReference())
+        oracle = RandomWalkEquivalenceOracle(simulatedOracle, "", maxTests=-1, maxQueries=100, minLength=1, maxLength=2, seed=0)
+        counterExample = oracle.findCounterExample(self.createReference(), [self.login, self.logout], MQCache())
+
+        self.assertEqual(counterExample, None)
+        self.assertTrue(oracle.getStatistics()["queries"] < 100)
+        self.assertEqual(oracle.getStatistics()["queries"], simulatedOracle.getNbQueries())
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+
+from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
+from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
+from netzob.Inference.Grammar.Oracles.SimulatedOracle import SimulatedOracle
+from common.AutomataGenerator import AutomataGenerator
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_SimulatedOracle(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = AutomataGenerator(0)
+        self.a = self.generator.createSymbol("A")
+        self.b = self.generator.createSymbol("B")
+        self.x = self.generator.createSymbol("X")
+        self.y = self.generator.createSymbol("Y")
+
+    def test_submitQuery(self):
+        # B is not accepted in the initial state
+        reference = self.generator.createAutomaton(2, [(0, self.a, self.x, 1),
+                                                       (1, self.a, self.y, 0),
+                                                       (1, self.b, self.x, 1)])
+        oracle = SimulatedOracle(reference)
+
+        result = oracle.submitQuery(MembershipQuery([self.b, self.a, self.b, self.a]))
+
+        self.assertEqual(result[0].getID(), EmptySymbol().getID())
+        self.assertEqual([s.getID() for s in result[1:]], [self.x.getID(), self.x.getID(), self.y.getID()])
+        self.assertEqual(oracle.getNbQueries(), 1)
+        self.assertEqual(oracle.getNbSymbols(), 4)
+
+    def test_sameTraceAsModel(self):
+        reference = self.generator.generateAutomaton(8, [self.a, self.b], [self.x, self.y])
+        oracle = SimulatedOracle(reference)
+
+        query = MembershipQuery([self.a, self.b, self.b, self.a, self.a, self.b])
+        (trace, state) = reference.getOutputTrace(reference.getInitialState(), query.getSymbols())
+
+        self.assertEqual([s.getID() for s in oracle.submitQuery(query)], [s.getID() for s in trace])
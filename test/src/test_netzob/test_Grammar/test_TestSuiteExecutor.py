@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011 Georges Bossert and Frédéric Guihéry                   |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import uuid
+import datetime
+import unittest
+
+from netzob.Common.Project import Project
+from netzob.Common.Symbol import Symbol
+from netzob.Common.MMSTD.Symbols.impl.DictionarySymbol import DictionarySymbol
+from netzob.Common.MMSTD.Symbols.impl.EmptySymbol import EmptySymbol
+from netzob.Inference.Grammar.Queries.MembershipQuery import MembershipQuery
+from netzob.Inference.Grammar.MQCache import MQCache
+from netzob.Inference.Grammar.EquivalenceOracles.TestSuiteExecutor import TestSuiteExecutor
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+
+
+class test_TestSuiteExecutor(unittest.TestCase):
+
+    def setUp(self):
+        project = Project(str(uuid.uuid4()), "test_TestSuiteExecutor", datetime.datetime.now(), None)
+        self.a = DictionarySymbol(Symbol(str(uuid.uuid4()), "A", project))
+        self.b = DictionarySymbol(Symbol(str(uuid.uuid4()), "B", project))
+
+    def test_pruneTests(self):
+        tests = [MembershipQuery([EmptySymbol(), self.a]),
+                 MembershipQuery([self.a, self.b]),
+                 MembershipQuery([self.a, self.b, self.a]),
+                 MembershipQuery([self.a, self.b]),
+                 MembershipQuery([self.b]),
+                 MembershipQuery([self.b, self.b])]
+
+        prunedTests = TestSuiteExecutor.pruneTests(tests)
+
+        prunedKeys = sorted([test.getKey() for test in prunedTests])
+        expectedKeys = sorted([MembershipQuery([self.a, self.b, self.a]).getKey(), MembershipQuery([self.b, self.b]).getKey()])
+        self.assertEqual(prunedKeys, expectedKeys)
+
+    def test_cachedTestsFirst(self):
+        cache = MQCache()
+        cachedTest = MembershipQuery([self.b, self.a])
+        cache.cacheResult(MembershipQuery([self.b, self.a]), [])
+
+        executor = TestSuiteExecutor([], "", cache)
+        (cachedTests, testsToExecute) = executor.orderTests([MembershipQuery([self.a]), cachedTest])
+
+        self.assertEqual(len(cachedTests), 1)
+        self.assertTrue(cachedTests[0].isStrictlyEqual(cachedTest))
+        self.assertEqual(len(testsToExecute), 1)